@@ -208,7 +208,7 @@ def main() -> int:
     print(f"docker compose -p {SCRAPING_COMPOSE_PROJECT} -f docker-compose.scraping.yml logs -f scraper-beat")
     print(
         f"docker compose -p {SCRAPING_COMPOSE_PROJECT} -f docker-compose.scraping.yml "
-        "restart scraper-gijiroku scraper-reiki scraper-gijiroku-index scraper-reiki-index scraper-beat"
+        "restart scraper-gijiroku scraper-reiki scraper-gijiroku-index scraper-reiki-index scraper-index-worker scraper-beat"
     )
     print(
         "docker compose -p miyabe-tools-scraping -f docker-compose.scraping.yml exec scraper-gijiroku "
@@ -192,24 +192,21 @@ def _rebuild_command(kind: str, name_filter: str) -> list[str]:
 
 
 # 自治体 1 件分だけ OpenSearch index を増分更新するコマンドを作る。
+# MIYABE_INDEX_WORKER_SOCKET があれば常駐 index worker 経由で実行する（出力・終了コードは同じ）。
 def _index_update_command(doc_type: str, slug: str) -> list[str]:
-    return _python_command() + [
-        "tools/search/build_opensearch_index.py",
-        "--mode",
-        "update",
-        "--doc-type",
-        doc_type,
-        "--slug",
-        slug,
-    ]
+    index_args = ["--mode", "update", "--doc-type", doc_type, "--slug", slug]
+    worker_socket = celery_runtime.env_text("MIYABE_INDEX_WORKER_SOCKET", "")
+    if worker_socket:
+        return _python_command() + ["tools/search/index_worker.py", "run", "--socket", worker_socket, "--", *index_args]
+    return _python_command() + ["tools/search/build_opensearch_index.py", *index_args]
 
 
 # slug から target 定義を探し、見つからない場合も表示用の最低限情報を返す。
 def _target_by_slug(kind: str, slug: str) -> dict[str, object]:
-    targets = gijiroku_targets.iter_gijiroku_targets() if kind == "gijiroku" else reiki_targets.iter_reiki_targets()
-    for target in targets:
-        if str(target.get("slug") or "").strip() == slug:
-            return target
+    registry = gijiroku_targets.gijiroku_target_registry() if kind == "gijiroku" else reiki_targets.reiki_target_registry()
+    target = registry.get(slug)
+    if target is not None:
+        return target
     return {"slug": slug, "code": "", "name": slug, "full_name": slug, "system_type": "", "source_url": ""}
 
 
@@ -27,6 +27,7 @@ function load_background_task_status(string $task): array
 
         $decoded = json_decode((string)file_get_contents($path), true);
         if (is_array($decoded)) {
+            $decoded = background_task_state_with_journal($path, $decoded);
             management_db_store_task_status($task, $decoded, $sourceMtime);
             return $decoded;
         }
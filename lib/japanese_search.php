@@ -60,8 +60,75 @@ function japanese_search_python_candidates(): array
     )));
 }
 
+function japanese_search_tokenizer_server_address(): string
+{
+    $address = trim((string)getenv('MIYABE_TOKENIZER_SOCKET'));
+    if ($address === '') {
+        return '';
+    }
+    // パスだけが渡された場合は Unix socket とみなす。tcp://host:port も使える。
+    return preg_match('#^[a-z]+://#i', $address) === 1 ? $address : 'unix://' . $address;
+}
+
+// 常駐 tokenizer（japanese_search_tokenizer.py --mode serve）へ 1 行 JSON で問い合わせる。
+// 起動していない・応答が壊れている場合は null を返し、呼び出し側は子プロセス起動へ戻る。
+function japanese_search_request_tokenizer_server(string $mode, string $text): ?array
+{
+    static $unavailable = false;
+    if ($unavailable) {
+        return null;
+    }
+
+    $address = japanese_search_tokenizer_server_address();
+    if ($address === '') {
+        $unavailable = true;
+        return null;
+    }
+
+    $request = json_encode(['op' => $mode, 'text' => $text], JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES);
+    if ($request === false) {
+        return null;
+    }
+
+    $socket = @stream_socket_client($address, $errno, $errstr, 0.5);
+    if (!is_resource($socket)) {
+        $unavailable = true;
+        return null;
+    }
+    stream_set_timeout($socket, 5);
+
+    $payload = $request . "\n";
+    $written = 0;
+    $length = strlen($payload);
+    while ($written < $length) {
+        $chunk = @fwrite($socket, substr($payload, $written));
+        if ($chunk === false || $chunk === 0) {
+            fclose($socket);
+            return null;
+        }
+        $written += $chunk;
+    }
+    $line = fgets($socket);
+    fclose($socket);
+    if (!is_string($line)) {
+        return null;
+    }
+
+    $decoded = json_decode($line, true);
+    if (!is_array($decoded) || ($decoded['ok'] ?? false) !== true || !is_array($decoded['result'] ?? null)) {
+        return null;
+    }
+    return $decoded['result'];
+}
+
 function japanese_search_run_tokenizer(string $mode, string $text): ?array
 {
+    // 常駐 server があれば Python 起動と Sudachi 辞書読み込みを毎回払わずに済む。
+    $served = japanese_search_request_tokenizer_server($mode, $text);
+    if ($served !== null) {
+        return $served;
+    }
+
     static $unavailable = false;
     if ($unavailable) {
         return null;
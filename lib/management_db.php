@@ -170,6 +170,7 @@ SQL);
     $pdo->exec('ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS freshness_date date');
     $pdo->exec("ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS freshness_basis text NOT NULL DEFAULT ''");
     $pdo->exec("ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS last_checked_at_text text NOT NULL DEFAULT ''");
+    $pdo->exec('ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS item_position integer');
     $pdo->exec(
         'CREATE INDEX IF NOT EXISTS idx_processing_task_items_freshness ON processing_task_items (task_key, freshness_date, last_checked_at_text)'
     );
@@ -426,6 +427,29 @@ SQL);
     }
 }
 
+function management_db_attach_task_items(PDO $pdo, string $taskKey, array $status): array
+{
+    // Python 側は heartbeat ごとの書き込みを軽くするため items を status_json に埋め込まず、
+    // processing_task_items を正とする。その場合はここで元の並び順の items を組み立て直す。
+    if (empty($status['items_table'])) {
+        return $status;
+    }
+    unset($status['items_table']);
+    $stmt = $pdo->prepare(
+        'SELECT slug, item_json FROM processing_task_items WHERE task_key = :task_key ORDER BY item_position NULLS LAST, slug'
+    );
+    $stmt->execute([':task_key' => $taskKey]);
+    $items = [];
+    foreach ($stmt->fetchAll() as $row) {
+        $item = management_db_json_decode($row['item_json'] ?? '');
+        if (is_array($item)) {
+            $items[(string)$row['slug']] = $item;
+        }
+    }
+    $status['items'] = $items;
+    return $status;
+}
+
 function management_db_task_status(string $taskKey): ?array
 {
     $taskKey = trim($taskKey);
@@ -444,7 +468,7 @@ function management_db_task_status(string $taskKey): ?array
             return null;
         }
         $status = management_db_json_decode($row['status_json'] ?? '');
-        return is_array($status) ? $status : null;
+        return is_array($status) ? management_db_attach_task_items($pdo, $taskKey, $status) : null;
     } catch (Throwable $error) {
         error_log('[management_db] task status fetch failed: ' . $error->getMessage());
         return null;
@@ -474,7 +498,7 @@ function management_db_task_status_if_fresh(string $taskKey, float $sourceMtime)
             return null;
         }
         $status = management_db_json_decode($row['status_json'] ?? '');
-        return is_array($status) ? $status : null;
+        return is_array($status) ? management_db_attach_task_items($pdo, $taskKey, $status) : null;
     } catch (Throwable $error) {
         error_log('[management_db] task status fetch failed: ' . $error->getMessage());
         return null;
@@ -341,6 +341,46 @@ function read_json_cache_file(string $path, int $ttlSeconds = 0): ?array
     return is_array($decoded) ? $decoded : null;
 }
 
+function background_task_state_with_journal(string $path, array $status): array
+{
+    // Python 側は実行中の差分を <task>.journal.ndjson に追記し、snapshot の書き直しを間引く。
+    // snapshot と同じ journal_id の行だけを順に重ねる。書きかけの末尾行はそこで打ち切る。
+    $journalId = (string)($status['journal_id'] ?? '');
+    unset($status['journal_id']);
+    if ($journalId === '') {
+        return $status;
+    }
+    $handle = @fopen(preg_replace('/\.json$/', '', $path) . '.journal.ndjson', 'rb');
+    if ($handle === false) {
+        return $status;
+    }
+    while (($line = fgets($handle)) !== false) {
+        $entry = json_decode($line, true);
+        if (!is_array($entry)) {
+            break;
+        }
+        if (($entry['journal'] ?? '') !== $journalId) {
+            continue;
+        }
+        foreach (is_array($entry['state'] ?? null) ? $entry['state'] : [] as $key => $value) {
+            if ($key !== 'items') {
+                $status[$key] = $value;
+            }
+        }
+        $changedItems = is_array($entry['items'] ?? null) ? $entry['items'] : [];
+        if ($changedItems !== []) {
+            if (!is_array($status['items'] ?? null)) {
+                $status['items'] = [];
+            }
+            foreach ($changedItems as $slug => $item) {
+                $status['items'][$slug] = $item;
+            }
+        }
+    }
+    fclose($handle);
+    return $status;
+}
+
 function json_cache_file_is_fresh(string $path, int $ttlSeconds = 0, array $dependencyPaths = []): bool
 {
     if (!is_file($path)) {
@@ -559,7 +599,11 @@ function municipality_feature_metadata_has_data(string $task, string $slug): boo
 
     foreach ($statusNames as $statusName) {
         if (!array_key_exists($statusName, $itemsByTask)) {
-            $status = read_json_cache_file(data_path('background_tasks/' . $statusName . '.json'), 0);
+            $statusPath = data_path('background_tasks/' . $statusName . '.json');
+            $status = read_json_cache_file($statusPath, 0);
+            if (is_array($status)) {
+                $status = background_task_state_with_journal($statusPath, $status);
+            }
             $itemsByTask[$statusName] = is_array($status) && is_array($status['items'] ?? null)
                 ? $status['items']
                 : [];
@@ -2,10 +2,18 @@
 from __future__ import annotations
 
 import argparse
+import importlib.metadata
 import json
 import locale
+import os
 import re
+import signal
+import socket
+import socketserver
 import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from functools import lru_cache
 
 from sudachipy import Dictionary, SplitMode
@@ -20,6 +28,20 @@ QUERY_TOKEN_PATTERN = re.compile(
 NON_WORD_PATTERN = re.compile(r"^[\W_]+$", re.UNICODE)
 TOKENIZER_SPLIT_PATTERN = re.compile(r"(\n+|[。．！？?!])")
 MAX_SUDACHI_INPUT_BYTES = 40000
+# serve モード: 1 リクエスト行の上限、応答待ちで詰まったクライアントを切る秒数、query 結果の LRU 件数。
+MAX_SERVER_REQUEST_BYTES = 8 * 1024 * 1024
+SERVER_CLIENT_TIMEOUT_SECONDS = 10.0
+DEFAULT_QUERY_CACHE_SIZE = 4096
+SUDACHI_DICT = "core"
+SUDACHI_SPLIT_MODE_NAME = "B"
+# document_terms_text の出力形式を変えたら上げる。terms キャッシュのキーに含まれる。
+TERMS_FORMAT_VERSION = 1
+# document_terms_many: この文字数以下のフィールドは tokenize 結果をプロセス内で覚えておく。
+# 部署名・タグ・分類パスは同じ値が何千回も出る。
+SHORT_FIELD_MAX_CHARS = 256
+SHORT_TERMS_MEMO_SIZE = 65536
+_SHORT_TERMS_MEMO: OrderedDict[str, str] = OrderedDict()
+_SHORT_TERMS_LOCK = threading.Lock()
 
 
 def normalize_fragment(value: str) -> str:
@@ -38,12 +60,43 @@ def unique_preserve(values: list[str]) -> list[str]:
 
 
 @lru_cache(maxsize=1)
+def sudachi_dictionary() -> Dictionary:
+    return Dictionary(dict=SUDACHI_DICT)
+
+
+_THREAD_STATE = threading.local()
+
+
 def sudachi_tokenizer():
-    # B 分割は「短すぎず長すぎず」で、会議録と例規集の両方で扱いやすい。
-    dictionary = Dictionary(dict="core")
-    return dictionary.create(
-        mode=SplitMode.B,
-        fields={"pos", "normalized_form", "dictionary_form"},
+    # SudachiPy の tokenizer はスレッド間で共有できないので、辞書だけ共有してスレッドごとに作る。
+    tokenizer = getattr(_THREAD_STATE, "tokenizer", None)
+    if tokenizer is None:
+        # B 分割は「短すぎず長すぎず」で、会議録と例規集の両方で扱いやすい。
+        tokenizer = sudachi_dictionary().create(
+            mode=getattr(SplitMode, SUDACHI_SPLIT_MODE_NAME),
+            fields={"pos", "normalized_form", "dictionary_form"},
+        )
+        _THREAD_STATE.tokenizer = tokenizer
+    return tokenizer
+
+
+def package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=1)
+def tokenizer_fingerprint() -> str:
+    # 同じ入力でも SudachiPy・辞書の版や分割モードが違えば terms が変わりうる。
+    return ";".join(
+        [
+            f"sudachipy={package_version('sudachipy')}",
+            f"dict={SUDACHI_DICT}:{package_version('sudachidict_' + SUDACHI_DICT)}",
+            f"mode={SUDACHI_SPLIT_MODE_NAME}",
+            f"format={TERMS_FORMAT_VERSION}",
+        ]
     )
 
 
@@ -156,17 +209,59 @@ def tokenize_text(text: str):
 
 
 def document_terms_text(text: str) -> str:
+    # 文書側は表記ゆれを吸収したいので、表層形と正規形を両方入れる。
+    return terms_from_morphemes(tokenize_text(text))
+
+
+def terms_from_morphemes(morphemes) -> str:
     terms: list[str] = []
-    for morpheme in tokenize_text(text):
-        if not morpheme_is_searchable(morpheme):
-            continue
-        # 文書側は表記ゆれを吸収したいので、表層形と正規形を両方入れる。
-        terms.extend(morpheme_variants(morpheme))
+    for morpheme in morphemes:
+        if morpheme_is_searchable(morpheme):
+            terms.extend(morpheme_variants(morpheme))
     return " ".join(terms)
 
 
+def remember_short_terms(text: str, terms: str) -> None:
+    with _SHORT_TERMS_LOCK:
+        _SHORT_TERMS_MEMO[text] = terms
+        _SHORT_TERMS_MEMO.move_to_end(text)
+        while len(_SHORT_TERMS_MEMO) > SHORT_TERMS_MEMO_SIZE:
+            _SHORT_TERMS_MEMO.popitem(last=False)
+
+
+def recall_short_terms(text: str) -> str | None:
+    with _SHORT_TERMS_LOCK:
+        terms = _SHORT_TERMS_MEMO.get(text)
+        if terms is not None:
+            _SHORT_TERMS_MEMO.move_to_end(text)
+        return terms
+
+
+def document_terms_many(texts: list[str]) -> list[str]:
+    """document_terms_text を複数テキストへまとめて適用する。結果の順は入力と同じ。
+
+    短いテキストは重複を除いて 1 件ずつ tokenize し、結果をプロセス内で覚えておく。
+    複数のテキストを 1 回の tokenize に束ねると、区切りの前後で形態素解析の結果が変わりうる
+    （どのテキストと一緒に束ねたかで terms が変わる）ため束ねない。長い本文は覚えない。"""
+    results: list[str] = [""] * len(texts)
+    for position, text in enumerate(texts):
+        text = text or ""
+        if text == "":
+            continue
+        if len(text) > SHORT_FIELD_MAX_CHARS:
+            results[position] = document_terms_text(text)
+            continue
+        terms = recall_short_terms(text)
+        if terms is None:
+            terms = document_terms_text(text)
+            remember_short_terms(text, terms)
+        results[position] = terms
+    return results
+
+
 def document_terms_map(values: dict[str, str]) -> dict[str, str]:
-    return {key: document_terms_text(value) for key, value in values.items()}
+    keys = list(values)
+    return dict(zip(keys, document_terms_many([values[key] for key in keys])))
 
 
 def searchable_morphemes(text: str):
@@ -317,30 +412,161 @@ def build_query(text: str) -> str:
     return str(build_query_payload(text)["fts_query"])
 
 
+def tokenize_payload(
+    mode: str,
+    text: str,
+    *,
+    query_payload: Callable[[str], dict[str, object]] = build_query_payload,
+) -> dict[str, object]:
+    if mode == "document":
+        return {
+            "terms_text": document_terms_text(text),
+            "surface_terms": surface_terms(text),
+        }
+    if mode == "fields":
+        decoded = json.loads(text or "{}")
+        if not isinstance(decoded, dict):
+            raise ValueError("fields mode expects a JSON object")
+        return document_terms_map({str(key): str(value) for key, value in decoded.items()})
+    if mode == "query":
+        return query_payload(text)
+    raise ValueError(f"unknown mode: {mode}")
+
+
+class TokenizerRequestHandler(socketserver.StreamRequestHandler):
+    """1 行 1 JSON の要求 {"op": ..., "text": ...} に 1 行 1 JSON で応答する。
+
+    同じ接続で複数の要求を続けて送ってよい。接続ごとにスレッドを立てて処理するので、
+    書き込みの遅い client がいても他の検索要求は待たされない（tokenizer はスレッドごとに持つ）。"""
+
+    timeout = SERVER_CLIENT_TIMEOUT_SECONDS
+
+    def handle(self) -> None:
+        while True:
+            try:
+                raw = self.rfile.readline(MAX_SERVER_REQUEST_BYTES + 1)
+            except (OSError, socket.timeout):
+                return
+            if not raw:
+                return
+            if len(raw) > MAX_SERVER_REQUEST_BYTES:
+                self.respond({"ok": False, "error": "request too large"})
+                return
+            self.respond(self.server.dispatch(raw))  # type: ignore[attr-defined]
+
+    def respond(self, payload: dict[str, object]) -> None:
+        try:
+            self.wfile.write(json.dumps(payload, ensure_ascii=True).encode("ascii") + b"\n")
+            self.wfile.flush()
+        except (OSError, socket.timeout):
+            pass
+
+
+class TokenizerServerMixin:
+    def setup_tokenizer(self, cache_size: int) -> None:
+        # query は同じ検索語が短時間に集中しやすいので、整形済み payload を LRU で再利用する。
+        self.query_payload = lru_cache(maxsize=max(1, cache_size))(build_query_payload)
+
+    def dispatch(self, raw: bytes) -> dict[str, object]:
+        try:
+            request = json.loads(raw.decode("utf-8"))
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            op = str(request.get("op") or "")
+            if op == "ping":
+                return {"ok": True, "result": {"tokenizer": tokenizer_fingerprint()}}
+            if op == "stats":
+                info = self.query_payload.cache_info()
+                return {
+                    "ok": True,
+                    "result": {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize},
+                }
+            if op == "fields" and isinstance(request.get("fields"), dict):
+                text = json.dumps(request["fields"], ensure_ascii=False)
+            else:
+                text = str(request.get("text") or "")
+            return {"ok": True, "result": tokenize_payload(op, text, query_payload=self.query_payload)}
+        except Exception as exc:
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+
+class UnixTokenizerServer(TokenizerServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TcpTokenizerServer(TokenizerServerMixin, socketserver.ThreadingMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def create_server(*, socket_path: str = "", listen: str = "", cache_size: int = DEFAULT_QUERY_CACHE_SIZE):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+        server = UnixTokenizerServer(socket_path, TokenizerRequestHandler)
+        # php-fpm（www-data）から接続できるようにする。
+        os.chmod(socket_path, 0o666)
+    else:
+        host, _, port = (listen or "127.0.0.1:8765").rpartition(":")
+        server = TcpTokenizerServer((host or "127.0.0.1", int(port)), TokenizerRequestHandler)
+    server.setup_tokenizer(cache_size)
+    return server
+
+
+def serve(*, socket_path: str, listen: str, cache_size: int) -> int:
+    # 辞書読み込みは起動時に一度だけ行い、最初の検索要求を待たせない。
+    sudachi_tokenizer()
+    server = create_server(socket_path=socket_path, listen=listen, cache_size=cache_size)
+    address = socket_path or listen
+    print(f"[SERVE] japanese_search_tokenizer listening on {address}", file=sys.stderr, flush=True)
+
+    def stop(_signum, _frame) -> None:
+        raise KeyboardInterrupt
+
+    # docker stop（SIGTERM）でも socket ファイルを片付けてから終わる。
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="SudachiPy ベースの全文検索トークナイザ")
-    parser.add_argument("--mode", choices=["document", "query", "fields"], required=True)
+    parser.add_argument("--mode", choices=["document", "query", "fields", "serve"], required=True)
     parser.add_argument("--text", default=None, help="未指定時は stdin から読み取る")
     parser.add_argument("--json", action="store_true", help="JSON で出力する")
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get("MIYABE_TOKENIZER_SOCKET", ""),
+        help="serve モードで待ち受ける Unix socket のパス",
+    )
+    parser.add_argument("--listen", default="", help="serve モードで Unix socket の代わりに待ち受ける host:port")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_QUERY_CACHE_SIZE,
+        help="serve モードで保持する query 結果の LRU 件数",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    text = args.text if args.text is not None else read_stdin_text()
+    if args.mode == "serve":
+        if not args.socket and not args.listen:
+            print("[ERROR] --mode serve requires --socket or --listen.", file=sys.stderr, flush=True)
+            return 2
+        return serve(socket_path=args.socket, listen=args.listen, cache_size=args.cache_size)
 
-    if args.mode == "document":
-        payload = {
-            "terms_text": document_terms_text(text),
-            "surface_terms": surface_terms(text),
-        }
-    elif args.mode == "fields":
-        decoded = json.loads(text or "{}")
-        if not isinstance(decoded, dict):
-            raise ValueError("fields mode expects a JSON object")
-        payload = document_terms_map({str(key): str(value) for key, value in decoded.items()})
-    else:
-        payload = build_query_payload(text)
+    text = args.text if args.text is not None else read_stdin_text()
+    payload = tokenize_payload(args.mode, text)
 
     if args.json:
         print(json.dumps(payload, ensure_ascii=True))
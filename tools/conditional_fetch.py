@@ -0,0 +1,140 @@
+"""前回の ETag / Last-Modified / 本文 hash を使い、変わっていない文書の取得・再生成を省く。
+
+d1_law.download_file は manifest の source_etag / source_last_modified で条件付き GET を
+送っていたが、static_catalog（jourei_v5 / joureikun）と requests 系会議録スクレイパ
+（msearch / amivoice / static_kaigiroku_dir）は更新確認のたびに全件を取り直し、
+本文抽出と書き込みもやり直していた。ここでは URL ごとの検証子を
+
+    {"source_etag": "...", "source_last_modified": "...", "source_sha256": "<応答本文の sha256>"}
+
+の形で manifest 行・scrape_state の item に残し、次回は
+
+    result = conditional_fetch.conditional_get(session.get, url, previous=row, timeout=...)
+    if result.unchanged:
+        ...  # 既存の出力をそのまま使う（304 か、200 でも本文 hash が前回と同じ）
+    row.update(result.validators.as_fields())
+
+とする。get には session.get と同じ引数を受け付けるもの（FetchPipeline.get など）を渡せる。
+
+注意:
+- 検証子は既存の出力があるときだけ渡すこと。出力が消えているのに 304 を受けると作り直せない。
+- source_sha256 は保存した出力ではなく応答本文（展開前の HTML / PDF バイト列）の hash。
+  ヘッダを返さないサーバでも、本文が同じなら抽出と書き込みは省ける（転送は省けない）。
+- 4xx / 5xx は従来どおり requests.HTTPError を送出する。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import requests
+
+
+FIELD_PREFIX = "source_"
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def response_header(response: requests.Response, name: str) -> str:
+    return str(response.headers.get(name) or "").strip()
+
+
+@dataclass(frozen=True)
+class Validators:
+    """URL 1 つ分の検証子。"""
+
+    etag: str = ""
+    last_modified: str = ""
+    sha256: str = ""
+
+    @classmethod
+    def from_fields(cls, row: Mapping[str, Any] | None) -> "Validators":
+        row = row if isinstance(row, Mapping) else {}
+        return cls(
+            etag=str(row.get(FIELD_PREFIX + "etag") or "").strip(),
+            last_modified=str(row.get(FIELD_PREFIX + "last_modified") or "").strip(),
+            sha256=str(row.get(FIELD_PREFIX + "sha256") or "").strip(),
+        )
+
+    def as_fields(self) -> dict[str, str]:
+        return {
+            FIELD_PREFIX + "etag": self.etag,
+            FIELD_PREFIX + "last_modified": self.last_modified,
+            FIELD_PREFIX + "sha256": self.sha256,
+        }
+
+    def request_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def __bool__(self) -> bool:
+        return bool(self.etag or self.last_modified or self.sha256)
+
+
+@dataclass
+class FetchResult:
+    response: requests.Response
+    validators: Validators
+    not_modified: bool = False  # 304 を受けた
+    same_content: bool = False  # 200 だが本文 hash が前回と同じ
+    conditional: bool = False  # If-None-Match / If-Modified-Since を送った
+
+    @property
+    def unchanged(self) -> bool:
+        return self.not_modified or self.same_content
+
+    @property
+    def status(self) -> str:
+        """CSV・state に書く取得結果。変わっていなければ not_modified / unchanged。"""
+        if self.not_modified:
+            return "not_modified"
+        return "unchanged" if self.same_content else "fetched"
+
+
+def conditional_get(
+    get: Callable[..., requests.Response],
+    url: str,
+    *,
+    previous: Validators | Mapping[str, Any] | None = None,
+    headers: Mapping[str, str] | None = None,
+    **kwargs: Any,
+) -> FetchResult:
+    """previous の検証子を付けて GET する。304 なら previous を引き継いだ結果を返す。"""
+    if not isinstance(previous, Validators):
+        previous = Validators.from_fields(previous)
+    conditional_headers = previous.request_headers()
+    request_headers = {**dict(headers or {}), **conditional_headers}
+    if request_headers:
+        kwargs["headers"] = request_headers
+    response = get(url, **kwargs)
+    if response.status_code == 304 and previous:
+        return FetchResult(
+            response=response,
+            validators=Validators(
+                etag=response_header(response, "ETag") or previous.etag,
+                last_modified=response_header(response, "Last-Modified") or previous.last_modified,
+                sha256=previous.sha256,
+            ),
+            not_modified=True,
+            conditional=bool(conditional_headers),
+        )
+    response.raise_for_status()
+    digest = sha256_bytes(response.content)
+    return FetchResult(
+        response=response,
+        validators=Validators(
+            etag=response_header(response, "ETag"),
+            last_modified=response_header(response, "Last-Modified"),
+            sha256=digest,
+        ),
+        same_content=bool(previous.sha256) and previous.sha256 == digest,
+        conditional=bool(conditional_headers),
+    )
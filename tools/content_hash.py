@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""保存済み成果物の内容 hash を拡張属性に控え、未変更判定で本体を読まないようにする。
+
+gijiroku_storage.write_bytes / reiki_io.write_bytes は、上書き前に既存ファイルを読んで
+（.gz なら展開して）新しい内容とバイト比較していた。d1_law も manifest 用の hash のために
+既存ファイルを毎回読み直す。再取得 1 回で数万件になるため、書き込み時に
+
+    user.miyabe.sha256 = "<展開後の内容の sha256>:<ファイルサイズ>:<mtime_ns>"
+
+を拡張属性として残し、以後の比較は hash 同士で済ませる。
+
+単体で実行すると、data/work 配下で記録が無い・古いファイルの hash を並列に作り直す
+（--verify を付けると記録済みのファイルも読み直して突き合わせる）。
+
+注意:
+- 記録したときとファイルサイズか mtime が違えば記録は無視して本体を読む。
+  write_bytes を通さずに書き換えられたファイルはこれで拾う。
+- xattr を扱えない OS・ファイルシステムでは何も記録せず、従来どおり本体を読む。
+- shutil.copy2 は xattr と mtime を一緒に複製するので、_archive 側の記録もそのまま正しい。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import os
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+
+XATTR_NAME = "user.miyabe.sha256"
+ARCHIVE_MARKER = "_archive"
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
+COLLECTIONS = ("gijiroku", "reiki")
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_logical_bytes(path: Path) -> bytes:
+    raw = path.read_bytes()
+    if path.suffix.lower() == ".gz":
+        return gzip.decompress(raw)
+    return raw
+
+
+def recorded_sha256(path: Path) -> str | None:
+    """記録済みで、記録後に書き換えられていなければ hash を返す。本体は読まない。"""
+    try:
+        raw = os.getxattr(path, XATTR_NAME)
+        stat = os.stat(path)
+    except (AttributeError, OSError):
+        return None
+    try:
+        digest, size, mtime_ns = raw.decode("ascii").split(":")
+        if int(size) != stat.st_size or int(mtime_ns) != stat.st_mtime_ns:
+            return None
+    except ValueError:
+        return None
+    return digest or None
+
+
+def record_sha256(path: Path, digest: str) -> bool:
+    try:
+        stat = os.stat(path)
+        os.setxattr(path, XATTR_NAME, f"{digest}:{stat.st_size}:{stat.st_mtime_ns}".encode("ascii"))
+    except (AttributeError, OSError):
+        return False
+    return True
+
+
+def content_sha256(path: Path) -> str:
+    """展開後の内容の sha256。記録が使えなければ本体を読んで計算し、記録し直す。"""
+    digest = recorded_sha256(path)
+    if digest is None:
+        digest = sha256_bytes(read_logical_bytes(path))
+        record_sha256(path, digest)
+    return digest
+
+
+def iter_files(root: Path) -> Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        # _archive は置換前の複製なので、記録は copy2 で一緒に運ばれている。
+        dirnames[:] = [name for name in dirnames if name != ARCHIVE_MARKER]
+        for name in filenames:
+            if not name.endswith(".tmp"):
+                yield Path(dirpath) / name
+
+
+def rebuild_one(path: Path, verify: bool) -> str:
+    recorded = recorded_sha256(path)
+    if recorded is not None and not verify:
+        return "recorded"
+    try:
+        digest = sha256_bytes(read_logical_bytes(path))
+    except (OSError, EOFError, zlib.error) as exc:
+        print(f"[WARN] content hash failed path={path}: {exc}", file=sys.stderr, flush=True)
+        return "failed"
+    if not record_sha256(path, digest):
+        return "unsupported"
+    if recorded is None:
+        return "rebuilt"
+    if recorded != digest:
+        print(f"[WARN] content hash mismatch path={path} recorded={recorded} actual={digest}", file=sys.stderr, flush=True)
+        return "mismatched"
+    return "verified"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="保存済み成果物の内容 hash（拡張属性）を作り直します。")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="対象のディレクトリ。既定は <data-root>/{gijiroku,reiki} と <work-root>/{gijiroku,reiki} です。",
+    )
+    parser.add_argument(
+        "--workspace-root",
+        help="ワークスペース root。既定はこの script の親ディレクトリです。",
+    )
+    parser.add_argument(
+        "--data-root",
+        help="gijiroku/reiki の実データ root。既定は <workspace-root>/data です。",
+    )
+    parser.add_argument(
+        "--work-root",
+        help="gijiroku/reiki の work root。既定は <workspace-root>/work です。",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=int(os.environ.get("MIYABE_CONTENT_HASH_JOBS", str(min(8, os.cpu_count() or 1)))),
+        help="並列に読むファイル数。sha256 と gzip 展開は GIL を手放すので thread で並べます。",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="記録済みのファイルも読み直し、記録と内容が食い違うものを報告して記録し直します。",
+    )
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    workspace_root = Path(args.workspace_root).resolve() if args.workspace_root else WORKSPACE_ROOT
+    data_root = Path(args.data_root).resolve() if args.data_root else (workspace_root / "data")
+    work_root = Path(args.work_root).resolve() if args.work_root else (workspace_root / "work")
+    if args.paths:
+        roots = [Path(path).resolve() for path in args.paths]
+    else:
+        roots = [root / collection for root in (data_root, work_root) for collection in COLLECTIONS]
+    roots = [root for root in roots if root.is_dir()]
+
+    counts: dict[str, int] = {}
+    jobs = max(1, int(args.jobs))
+    files = (path for root in roots for path in iter_files(root))
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="content-hash") as pool:
+        # Executor.map は入力を先に全部 submit するので、数万件を一度に抱えないよう区切って流す。
+        while batch := list(islice(files, jobs * 64)):
+            for result in pool.map(lambda path: rebuild_one(path, args.verify), batch):
+                counts[result] = counts.get(result, 0) + 1
+            if counts.get("unsupported"):
+                print("[ERROR] extended attributes are not supported on this filesystem", flush=True)
+                return 2
+    summary = " ".join(
+        f"{key}={counts.get(key, 0)}" for key in ("recorded", "rebuilt", "verified", "mismatched", "failed")
+    )
+    print(f"[DONE] roots={len(roots)} {summary}", flush=True)
+    return 1 if counts.get("mismatched") or counts.get("failed") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,6 +14,8 @@ from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from tools.tasks import status as batch_status
+
 
 TOKYO = timezone(timedelta(hours=9))
 FRESHNESS_SKIP_DAYS = 30
@@ -135,16 +137,11 @@ def max_normalized_date(values: list[Any]) -> str:
 
 
 def status_item(task_name: str, slug: str) -> dict[str, Any]:
-    path = Path(__file__).resolve().parents[1] / "data" / "background_tasks" / f"{task_name}.json"
     if task_name in _STATUS_CACHE:
         payload = _STATUS_CACHE[task_name]
     else:
-        try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            payload = {}
-        if not isinstance(payload, dict):
-            payload = {}
+        # 実行中の snapshot は最大 SNAPSHOT_INTERVAL_SECONDS 遅れるので、journal も重ねて読む。
+        payload = batch_status.read_state(task_name)
         _STATUS_CACHE[task_name] = payload
     item = payload.get("items", {}).get(slug) if isinstance(payload, dict) else None
     return item if isinstance(item, dict) else {}
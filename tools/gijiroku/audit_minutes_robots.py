@@ -12,16 +12,14 @@ import os
 import sys
 import tempfile
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 
-import requests
-
-
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
+from tools import http_transport  # noqa: E402
 from tools.gijiroku.crawl_policy import (  # noqa: E402
     policy_fingerprint,
     policy_fingerprint_is_current,
@@ -72,16 +70,24 @@ class AuditSummary:
     statuses: dict[str, int]
     reasons: dict[str, int]
     wrote: bool
+    http: dict[str, int] = field(default_factory=dict)
 
 
-def fetch_robots(url: str, *, timeout: float) -> RobotsResult:
+def build_http_transport(workers: int) -> http_transport.HttpTransport:
+    # robots.txt はホストごとに 1 件なので、pool はホスト数（= 同時実行数）ぶん持つ。
+    return http_transport.HttpTransport(
+        user_agent=USER_AGENT,
+        headers={"Accept": "text/plain,*/*;q=0.1"},
+        pool_hosts=max(1, workers),
+    )
+
+
+def fetch_robots(url: str, *, timeout: float, transport: http_transport.HttpTransport | None = None) -> RobotsResult:
+    if transport is None:
+        with build_http_transport(1) as own_transport:
+            return fetch_robots(url, timeout=timeout, transport=own_transport)
     try:
-        response = requests.get(
-            url,
-            headers={"User-Agent": USER_AGENT, "Accept": "text/plain,*/*;q=0.1"},
-            timeout=timeout,
-            allow_redirects=True,
-        )
+        response = transport.get(url, timeout=timeout, allow_redirects=True)
         return RobotsResult(url=url, status_code=response.status_code, body=response.text)
     except Exception as exc:
         return RobotsResult(url=url, status_code=None, body="", error=f"{type(exc).__name__}: {exc}")
@@ -324,6 +330,7 @@ def audit_registry(
     selected_indexes = {index for index, row in enumerate(rows) if is_selected(row)}
     robots_urls: list[str] = []
     results: dict[str, RobotsResult] = {}
+    http_stats: dict[str, int] = {}
     if not stamp_fingerprints:
         robots_urls = sorted(
             {
@@ -332,11 +339,15 @@ def audit_registry(
                 if str(rows[index].get("url", "")).strip()
             }
         )
-        with cf.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
-            futures = {executor.submit(fetch_robots, url, timeout=max(1.0, timeout)): url for url in robots_urls}
+        with build_http_transport(workers) as transport, cf.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(fetch_robots, url, timeout=max(1.0, timeout), transport=transport): url
+                for url in robots_urls
+            }
             for future in cf.as_completed(futures):
                 url = futures[future]
                 results[url] = future.result()
+        http_stats = transport.stats.as_dict()
 
     audit_date = checked_at or date.today().isoformat()
     audited: list[dict[str, str]] = []
@@ -390,6 +401,7 @@ def audit_registry(
         statuses=dict(counts),
         reasons=dict(reasons),
         wrote=wrote,
+        http=http_stats,
     )
 
 
@@ -437,6 +449,8 @@ def main() -> int:
     )
     print("statuses " + " ".join(f"{key}={value}" for key, value in sorted(summary.statuses.items())))
     print("reasons " + " ".join(f"{key}={value}" for key, value in sorted(summary.reasons.items())))
+    if summary.http:
+        print("http " + " ".join(f"{key}={value}" for key, value in summary.http.items()))
     if summary.wrote:
         print(f"[WROTE] {args.tsv}")
     elif args.write:
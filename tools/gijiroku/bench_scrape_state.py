@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""scrape_state の 1 件ごとの書き込みコストを、従来の全体書き直しと journal 追記で比べる。
+
+会議 --items 件を 1 件ずつ記録し（従来方式は emit_progress の書き直しも含めて 1 件 2 回）、
+--chunk 件ごとの 1 件あたり時間を出す。従来方式は件数に比例して伸び、journal 方式は
+SCRAPE_STATE_COMPACT_SECONDS ごとの snapshot 書き直しを均しても横ばいになる。
+
+    python -m tools.gijiroku.bench_scrape_state [--items 5000] [--chunk 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from tools.gijiroku import gijiroku_storage
+
+
+# 比較用の従来実装: state 全体を indent=2 で書き直す。
+def legacy_save_state(path: Path, state: dict) -> None:
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    temp_path.write_text(json.dumps(state, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def synthetic_item(index: int) -> dict:
+    return {
+        "title": f"令和6年第{index % 4 + 1}回定例会 本会議 第{index % 7 + 1}号",
+        "year_label": "令和6年",
+        "held_on": f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+        "url": f"https://example.jp/minutes/{index}",
+        "status": "saved",
+        "output_rel_path": f"meetings/2024/{index:05d}.txt.gz",
+        "updated_at": "2024-06-01T00:00:00",
+    }
+
+
+def run(label: str, state_path: Path, items: int, chunk: int) -> None:
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state = {"version": 1, "items": {}}
+    started = time.perf_counter()
+    for index in range(items):
+        key = f"meeting-{index}"
+        if label == "legacy":
+            state["items"][key] = synthetic_item(index)
+            legacy_save_state(state_path, state)
+            state.update(progress_current=index + 1, progress_total=items, progress_unit="meeting")
+            legacy_save_state(state_path, state)
+        else:
+            gijiroku_storage.record_item(state_path, state, key, synthetic_item(index))
+            gijiroku_storage.set_progress(state_path, state, current=index + 1, total=items)
+        if (index + 1) % chunk == 0:
+            elapsed = time.perf_counter() - started
+            print(f"[BENCH] store={label} items={index + 1} per_item_us={elapsed / chunk * 1e6:.1f}", flush=True)
+            started = time.perf_counter()
+    if label != "legacy":
+        gijiroku_storage.compact_state_journals()
+    loaded = gijiroku_storage.load_state(state_path)
+    print(f"[INFO] store={label} reloaded_items={len(loaded['items'])}", flush=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--chunk", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(
+        f"[INFO] items={args.items} compact_seconds={gijiroku_storage.SCRAPE_STATE_COMPACT_SECONDS:g}",
+        flush=True,
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for label in ("legacy", "journal"):
+            run(label, Path(temp_dir) / label / "scrape_state.json", args.items, max(1, args.chunk))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,335 @@
+"""Playwright 系スクレイパの一覧巡回・本文取得を、worker thread ごとの page / APIRequestContext で並列化する。
+
+dbsr / kaigiroku.net / gijiroku.com は Chromium・context・page を 1 つずつ開き、会議本文を
+1 件ずつ取得していた。sync API の Playwright オブジェクトは作った thread でしか使えないので、
+ここでは worker thread ごとに sync_playwright を起動し、
+
+- request_worker_opener: ブラウザを持たない APIRequestContext だけ（kaigiroku.net の API 取得など）
+- page_worker_opener   : 親プロセスの Chromium に CDP で繋ぎ、context と page を持つ（dbsr の一覧・gijiroku.com）
+
+のどちらかを持たせる。メインスレッドの context の cookie は storage_state で引き継ぐ。
+
+    browser, cdp_url = browser_pool.launch_browser(playwright, headless=..., shareable=parallel > 1)
+    with browser_pool.PlaywrightPool(
+        browser_pool.page_worker_opener(cdp_url, storage_state=context.storage_state(), ...),
+        parallel=parallel, delay_seconds=args.delay_seconds, inline_worker=PlaywrightWorker(page=page, request=context.request),
+    ) as pool:
+        for plan, result in pool.map(fetch_one, work_items, host_of=lambda plan: host):
+            ...  # state / CSV / 進捗はメインスレッドで投入順に書く
+
+注意:
+- --delay-seconds は会議（一覧ページ）ごとの開始間隔としてホスト単位に守る。従来の
+  「1 件終えて sleep」と同じ単位で、1 件の中の複数リクエストは間隔を空けない。
+- ホストごとの同時数は MIYABE_PLAYWRIGHT_POOL_BY_HOST（"host=n,host=n"）で上書きできる。
+  サブドメインにも効くので、共有ホスティングの親ドメインを 1 つ書けばよい。
+- MIYABE_PLAYWRIGHT_CDP_URL に常駐 Chromium の CDP endpoint を書くと、launch せずにそこへ繋ぐ。
+  同じホストの自治体を --per-host-parallel で並べても Chromium は 1 つで済み、自治体ごとの
+  context は分かれたまま。
+- shareable=True（並列数 > 1）の launch は Chromium の CDP ポートを 127.0.0.1 に認証なしで開く。
+  動いている間は同じホスト（同じ network namespace）の任意のプロセス・ユーザーがブラウザを
+  操作でき、cookie も読める。スクレイパ専用のコンテナ／ホストで動かす前提で、他のユーザーと
+  共有するホストでは並列数 1（CDP ポートを開かない）で動かすこと。MIYABE_PLAYWRIGHT_CDP_URL
+  の常駐 Chromium も同じ前提。
+- 並列数が 1 で inline_worker があれば thread は作らず、メインスレッドの page をそのまま使う。
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from queue import SimpleQueue
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import fetch_pipeline
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+SHARED_BROWSER_ENV = "MIYABE_PLAYWRIGHT_CDP_URL"
+
+
+def default_pool_size() -> int:
+    try:
+        return max(1, int(os.environ.get("MIYABE_PLAYWRIGHT_POOL", "2")))
+    except ValueError:
+        return 2
+
+
+def host_pool_overrides(value: str | None = None) -> dict[str, int]:
+    raw = os.environ.get("MIYABE_PLAYWRIGHT_POOL_BY_HOST", "") if value is None else value
+    overrides: dict[str, int] = {}
+    for entry in raw.split(","):
+        host, sep, count = entry.partition("=")
+        host = host.strip().lower().lstrip(".")
+        if not sep or not host:
+            continue
+        try:
+            overrides[host] = max(1, int(count.strip()))
+        except ValueError:
+            continue
+    return overrides
+
+
+def pool_size_for_host(host: str, requested: int, overrides: dict[str, int] | None = None) -> int:
+    """ホストごとの上書きがあればそれを、無ければ requested を返す。最も長く一致した指定が勝つ。"""
+    overrides = host_pool_overrides() if overrides is None else overrides
+    host = (host or "").strip().lower()
+    best = ""
+    for candidate in overrides:
+        if (host == candidate or host.endswith("." + candidate)) and len(candidate) > len(best):
+            best = candidate
+    return overrides[best] if best else max(1, int(requested))
+
+
+def url_host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _free_local_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return int(probe.getsockname()[1])
+
+
+def launch_browser(playwright, *, headless: bool, args: Iterable[str] = (), shareable: bool = False):
+    """Chromium を用意して (browser, cdp_url) を返す。
+
+    MIYABE_PLAYWRIGHT_CDP_URL があればそこへ繋ぐ（close しても切断だけで、ブラウザは残る）。
+    shareable なら worker thread から繋げるよう CDP port を開けて launch する。"""
+    shared_url = os.environ.get(SHARED_BROWSER_ENV, "").strip()
+    if shared_url:
+        print(f"[INFO] Shared browser: {shared_url}", flush=True)
+        return playwright.chromium.connect_over_cdp(shared_url), shared_url
+    launch_args = list(args)
+    cdp_url = ""
+    if shareable:
+        port = _free_local_port()
+        launch_args.extend([f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"])
+        cdp_url = f"http://127.0.0.1:{port}"
+    return playwright.chromium.launch(headless=headless, args=launch_args), cdp_url
+
+
+@dataclass
+class PlaywrightWorker:
+    """worker thread が持つ Playwright オブジェクト。request は APIRequestContext 互換。"""
+
+    request: Any
+    page: Any = None
+
+
+WorkerOpener = Callable[[], "tuple[PlaywrightWorker, Callable[[], None]]"]
+
+
+def request_worker_opener(
+    *,
+    storage_state: dict | None = None,
+    user_agent: str | None = None,
+    ignore_https_errors: bool = False,
+    extra_http_headers: dict[str, str] | None = None,
+) -> WorkerOpener:
+    def open_worker() -> tuple[PlaywrightWorker, Callable[[], None]]:
+        from playwright.sync_api import sync_playwright
+
+        playwright = sync_playwright().start()
+        try:
+            request = playwright.request.new_context(
+                storage_state=storage_state,
+                user_agent=user_agent,
+                ignore_https_errors=ignore_https_errors,
+                extra_http_headers=extra_http_headers,
+            )
+        except Exception:
+            playwright.stop()
+            raise
+
+        def close() -> None:
+            try:
+                request.dispose()
+            finally:
+                playwright.stop()
+
+        return PlaywrightWorker(request=request), close
+
+    return open_worker
+
+
+def page_worker_opener(
+    cdp_url: str,
+    *,
+    storage_state: dict | None = None,
+    timeout_ms: int | None = None,
+    **context_options: Any,
+) -> WorkerOpener:
+    def open_worker() -> tuple[PlaywrightWorker, Callable[[], None]]:
+        from playwright.sync_api import sync_playwright
+
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.connect_over_cdp(cdp_url)
+            context = browser.new_context(storage_state=storage_state, **context_options)
+            page = context.new_page()
+            if timeout_ms:
+                page.set_default_timeout(timeout_ms)
+        except Exception:
+            playwright.stop()
+            raise
+
+        def close() -> None:
+            try:
+                context.close()
+                # connect_over_cdp の browser.close() は切断だけで、親の Chromium は閉じない。
+                browser.close()
+            finally:
+                playwright.stop()
+
+        return PlaywrightWorker(request=context.request, page=page), close
+
+    return open_worker
+
+
+_STOP = object()
+
+
+class PlaywrightPool:
+    """worker thread ごとに Playwright を持ち、fn(worker, item) を並列に実行して投入順に返す。"""
+
+    def __init__(
+        self,
+        open_worker: WorkerOpener,
+        *,
+        parallel: int,
+        delay_seconds: float,
+        inline_worker: PlaywrightWorker | None = None,
+        host_overrides: dict[str, int] | None = None,
+    ) -> None:
+        self.parallel = max(1, int(parallel))
+        self.limiter = fetch_pipeline.HostRateLimiter(delay_seconds)
+        self._open_worker = open_worker
+        self._inline_worker = inline_worker if self.parallel == 1 else None
+        self._host_overrides = host_pool_overrides() if host_overrides is None else host_overrides
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+        self._tasks: SimpleQueue = SimpleQueue()
+        self._threads: list[threading.Thread] = []
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(pool_size_for_host(host, self.parallel, self._host_overrides))
+                self._host_slots[host] = slot
+            return slot
+
+    def _call(self, worker: PlaywrightWorker, fn: Callable[[PlaywrightWorker, T], R], item: T, host: str | None) -> R:
+        if host is None:
+            return fn(worker, item)
+        with self._slot(host):
+            self.limiter.acquire(host)
+            return fn(worker, item)
+
+    def _run_worker(self) -> None:
+        worker: PlaywrightWorker | None = None
+        close: Callable[[], None] | None = None
+        open_error: BaseException | None = None
+        try:
+            worker, close = self._open_worker()
+        except BaseException as exc:
+            open_error = exc
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is _STOP:
+                    return
+                fn, item, host, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if open_error is not None:
+                    future.set_exception(open_error)
+                    continue
+                try:
+                    future.set_result(self._call(worker, fn, item, host))
+                except BaseException as exc:
+                    future.set_exception(exc)
+        finally:
+            if close is not None:
+                try:
+                    close()
+                except Exception as exc:
+                    print(f"[WARN] Playwright worker close failed: {exc}", file=sys.stderr, flush=True)
+
+    def _ensure_threads(self) -> None:
+        while len(self._threads) < self.parallel:
+            thread = threading.Thread(
+                target=self._run_worker,
+                name=f"playwright-worker-{len(self._threads) + 1}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def map(
+        self,
+        fn: Callable[[PlaywrightWorker, T], R],
+        items: Iterable[T],
+        *,
+        host_of: Callable[[T], str | None] = lambda item: None,
+    ) -> Iterator[tuple[T, R]]:
+        """fn(worker, item) を実行し (item, 結果) を投入順に返す。
+
+        host_of(item) がホスト名を返した item だけ、そのホストの同時数と開始間隔を守る。
+        既存ファイルで済ませる item は None を返せば待たない。先読みは並列数の 2 倍まで。"""
+        if self._inline_worker is not None:
+            for item in items:
+                yield item, self._call(self._inline_worker, fn, item, host_of(item))
+            return
+
+        self._ensure_threads()
+        pending: deque[tuple[T, Future]] = deque()
+        window = self.parallel * 2
+        try:
+            for item in items:
+                future: Future = Future()
+                self._tasks.put((fn, item, host_of(item), future))
+                pending.append((item, future))
+                if len(pending) >= window:
+                    head, head_future = pending.popleft()
+                    yield head, head_future.result()
+            while pending:
+                head, head_future = pending.popleft()
+                yield head, head_future.result()
+        finally:
+            # 途中で打ち切られた（max_meetings や例外）ときは、未着手の item を捨てる。
+            for _, future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        for _ in self._threads:
+            self._tasks.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def __enter__(self) -> "PlaywrightPool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def inline_pool(worker: PlaywrightWorker, *, delay_seconds: float = 0.0) -> PlaywrightPool:
+    """thread を作らず、呼び出し元の page / request をそのまま使う pool。"""
+    return PlaywrightPool(
+        lambda: (worker, lambda: None),
+        parallel=1,
+        delay_seconds=delay_seconds,
+        inline_worker=worker,
+    )
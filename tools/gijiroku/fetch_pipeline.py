@@ -0,0 +1,172 @@
+"""requests 系会議録スクレイパの本文取得を、ホストごとの流量制限つきで並列化する。
+
+msearch / amivoice / static_kaigiroku_dir / gikai_pdf / kami_city_pdf は、会議ごとに
+session.get → 本文抽出 → gzip 書き込み → time.sleep(delay) を 1 件ずつ繰り返していた。
+ここでは会議ごとの処理を少数の thread に渡し、ある会議の応答待ちと別の会議の抽出・書き込みを
+重ねる。一方で同じホストへのリクエスト開始は token bucket で delay_seconds 間隔に揃えるので、
+ホストから見た流量は従来の逐次取得を超えない。
+
+    pipeline = FetchPipeline(session, delay_seconds=args.delay_seconds, parallel=args.fetch_parallel,
+                             robots_txt_url=target["robots_txt_url"])
+    for plan, result in pipeline.map(lambda plan: fetch_one(pipeline, plan), work_items):
+        ...  # state / CSV / 進捗はメインスレッドで投入順に書く
+
+pipeline.get() は session.get と同じ引数を受け付けるので、request_text(session, ...) のような
+既存ヘルパへ session の代わりに渡せる。
+
+注意:
+- robots.txt に Crawl-delay があれば、並列数は 1 にしてその間隔（delay_seconds より長ければ）に従う。
+- 並列数は 1 プロセス内の上限。親バッチの --per-host-parallel で同じホストの自治体を
+  複数同時に動かす場合は、その積がホストへの同時接続数になる。
+- worker に渡す処理は例外を自分で握りつぶして結果を返すこと（従来のループと同じ扱い）。
+  state や CSV はメインスレッドだけが触る。
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import robots_rules
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def default_parallel() -> int:
+    try:
+        return max(1, int(os.environ.get("MIYABE_MINUTES_FETCH_PARALLEL", "2")))
+    except ValueError:
+        return 2
+
+
+class HostRateLimiter:
+    """ホストごとの token bucket。interval 秒ごとに token が 1 つ貯まり、burst 個まで持てる。
+
+    token が無ければ次の token が貯まる時刻を予約して待つので、同時に呼ばれても
+    リクエスト開始は interval 間隔に並ぶ。"""
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        *,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.interval = max(0.0, float(interval_seconds))
+        self.burst = max(1, int(burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # host -> (残り token, 最終更新時刻)
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def acquire(self, host: str) -> float:
+        """token を 1 つ取る。待った秒数を返す。"""
+        if self.interval <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            tokens, updated_at = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated_at) / self.interval)
+            wait = 0.0 if tokens >= 1.0 else (1.0 - tokens) * self.interval
+            self._buckets[host] = (tokens - 1.0, now)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class FetchPipeline:
+    """会議ごとの取得処理を thread pool で並べ、結果を投入順に返す。"""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        *,
+        delay_seconds: float,
+        parallel: int,
+        robots_txt_url: str = "",
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        self.session = session
+        self.parallel = max(1, int(parallel))
+        interval = max(0.0, float(delay_seconds))
+        crawl_delay = self._robots_crawl_delay(robots_txt_url, timeout_seconds) if robots_txt_url else None
+        if crawl_delay is not None:
+            self.parallel = 1
+            interval = max(interval, crawl_delay)
+        self.interval = interval
+        self.limiter = HostRateLimiter(interval)
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+        if self.parallel > 1:
+            # 既定の接続プールを超えて並べると接続が使い捨てになるので、並列数に合わせて広げる。
+            adapter = HTTPAdapter(pool_connections=self.parallel, pool_maxsize=self.parallel)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.parallel, thread_name_prefix="minutes-fetch")
+        print(
+            f"[INFO] Fetch pipeline: parallel={self.parallel} interval={self.interval:.2f}s"
+            + (f" robots_crawl_delay={crawl_delay:g}s" if crawl_delay is not None else ""),
+            flush=True,
+        )
+
+    def _robots_crawl_delay(self, robots_txt_url: str, timeout_seconds: float) -> float | None:
+        try:
+            response = self.session.get(robots_txt_url, timeout=max(1.0, timeout_seconds))
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        user_agent = str(self.session.headers.get("User-Agent") or "")
+        return robots_rules.robots_crawl_delay(response.text, user_agent)
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.parallel)
+                self._host_slots[host] = slot
+            return slot
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """session.get と同じ。ホストの同時接続数と開始間隔を守ってから送る。"""
+        host = (urlsplit(url).hostname or "").lower()
+        with self._slot(host):
+            self.limiter.acquire(host)
+            return self.session.get(url, **kwargs)
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[tuple[T, R]]:
+        """fn(item) を並列に実行し、(item, 結果) を投入順に返す。先読みは並列数の 2 倍まで。"""
+        pending: deque[tuple[T, Future]] = deque()
+        window = self.parallel * 2
+        for item in items:
+            pending.append((item, self._executor.submit(fn, item)))
+            if len(pending) >= window:
+                head, future = pending.popleft()
+                yield head, future.result()
+        while pending:
+            head, future = pending.popleft()
+            yield head, future.result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "FetchPipeline":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
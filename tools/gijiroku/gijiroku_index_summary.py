@@ -0,0 +1,330 @@
+"""会議録 index JSON の件数サマリを sidecar に保存して使い回す。
+
+backfill と一括スクレイパの完了判定は、自治体ごとの meetings_index.json(.gz) から
+「一意な会議数」と「そのうち本文を保存済みの数」を数える。これまでは index を 2 回
+丸ごと展開・json.loads し、downloads 配下も毎回 rglob していた。
+
+ここでは index を 1 回だけストリームで読み、一意な会議ごとの保存名（stem）を並べた
+サマリを meetings_index.summary.json に保存する。
+
+    {"version": 1, "index": {"name": ..., "mtime_ns": ..., "size": ...},
+     "row_count": N, "unique_count": U, "stems": [...],
+     "downloads": {"scanned_at_ns": ..., "dirs": {"<相対パス>": mtime_ns}, "file_count": D},
+     "present": "<stems と同じ順の保存済みビット列 (base64)>"}
+
+次回は index の mtime・サイズが同じなら stems を再利用し、downloads 配下のディレクトリを
+stat して mtime が 1 つも変わっていなければ present もそのまま使う（ファイルの追加・削除・
+改名はそのディレクトリの mtime を変える）。
+
+注意:
+- 走査時刻から RACY_WINDOW_NS 以内の mtime を持つディレクトリがあれば、次回は読み直す。
+- stem の組み立て規則（gijiroku_planning.sanitize_filename など）を変えたら
+  SUMMARY_VERSION を上げること。
+- sidecar を書けない場合も件数はそのまま返す（次回また数え直すだけ）。
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import gijiroku_planning
+import gijiroku_storage
+
+
+SUMMARY_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000
+READ_CHUNK_CHARS = 1 << 20
+MINUTES_SUFFIXES = {".txt", ".html", ".htm"}
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+@dataclass(frozen=True)
+class IndexSummary:
+    row_count: int
+    unique_count: int
+    # index に載っている会議のうち、本文を保存済みの数。
+    indexed_downloaded_count: int
+    # downloads 配下の本文の数（index と突き合わせない）。
+    download_count: int
+
+
+def existing_index_path(path: Path) -> Path | None:
+    candidates = [path]
+    if path.suffix.lower() == ".gz":
+        candidates.append(path.with_suffix(""))
+    else:
+        candidates.append(path.with_name(path.name + ".gz"))
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def summary_path(index_json_path: Path) -> Path:
+    logical = gijiroku_storage.logical_path(index_json_path)
+    return logical.with_name(logical.stem + ".summary.json")
+
+
+def iter_json_array(path: Path) -> Iterator[Any]:
+    """JSON 配列の要素を 1 つずつ返す。全体を 1 つの文字列・list に載せない。
+
+    配列でない・途中で壊れている場合は ValueError。"""
+    decoder = json.JSONDecoder()
+    opener = gzip.open if path.suffix.lower() == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill() -> None:
+            nonlocal buffer, position, eof
+            chunk = handle.read(READ_CHUNK_CHARS)
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = chunk == ""
+
+        def next_char() -> str:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in _WHITESPACE:
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if eof:
+                    return ""
+                fill()
+
+        fill()
+        if next_char() != "[":
+            raise ValueError(f"not a JSON array: {path}")
+        position += 1
+        expect_value = True
+        while True:
+            char = next_char()
+            if char == "]":
+                position += 1
+                if next_char() != "":
+                    raise ValueError(f"trailing data after JSON array: {path}")
+                return
+            if char == "":
+                raise ValueError(f"unterminated JSON array: {path}")
+            if not expect_value:
+                if char != ",":
+                    raise ValueError(f"expected ',' in JSON array: {path}")
+                position += 1
+                expect_value = True
+                continue
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    fill()
+                    continue
+                cut_number = (
+                    end < len(buffer)
+                    and isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                    and buffer[end] in _NUMBER_CHARS
+                )
+                if (end == len(buffer) or cut_number) and not eof:
+                    # 数値がチャンク境界で切れている（"2." や "1e" まで）可能性があるので、続きを読んでから確定する。
+                    fill()
+                    continue
+                break
+            position = end
+            expect_value = False
+            yield value
+
+
+def index_output_stem(row: dict[str, Any]) -> str:
+    year_dir = gijiroku_planning.sanitize_filename(str(row.get("year_label") or "unknown").strip(), "unknown")
+    group = str(row.get("meeting_group") or "").strip()
+    group_dir = gijiroku_planning.sanitize_filename(group, "meeting") if group else ""
+    stem = gijiroku_planning.sanitize_filename(str(row.get("title") or ""), "meeting")
+    return "/".join(part for part in [year_dir, group_dir, stem] if part)
+
+
+def indexed_item_key(row: dict[str, Any]) -> str:
+    url = str(row.get("url") or "").strip()
+    return "url:" + url if url else "row:" + gijiroku_storage.item_signature(row)
+
+
+def scan_index(path: Path) -> tuple[int, list[str]]:
+    """(行数, 一意な会議ごとの保存 stem) を返す。stem はスクレイパの保存名と同じ規則で作る。"""
+    row_count = 0
+    stems: list[str] = []
+    seen_items: set[str] = set()
+    seen_output_stems: dict[str, int] = {}
+    for row in iter_json_array(path):
+        if not isinstance(row, dict):
+            continue
+        row_count += 1
+        item_key = indexed_item_key(row)
+        if item_key in seen_items:
+            continue
+        seen_items.add(item_key)
+        rel_stem = index_output_stem(row)
+        occurrence_index = seen_output_stems.get(rel_stem, 0)
+        seen_output_stems[rel_stem] = occurrence_index + 1
+        if occurrence_index > 0:
+            rel_stem = gijiroku_storage.disambiguated_stem(
+                rel_stem,
+                gijiroku_storage.item_signature(row),
+                occurrence_index,
+            )
+        stems.append(rel_stem)
+    return row_count, stems
+
+
+def scan_downloads(downloads_dir: Path) -> tuple[set[str], dict[str, int], int]:
+    """(保存済み本文の stem, ディレクトリごとの mtime_ns, 走査時刻) を返す。symlink のディレクトリには降りない。"""
+    scanned_at_ns = time.time_ns()
+    stems: set[str] = set()
+    dirs: dict[str, int] = {}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        path = downloads_dir / rel if rel else downloads_dir
+        try:
+            dirs[rel] = path.stat().st_mtime_ns
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    child = f"{rel}/{entry.name}" if rel else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(child)
+                        elif entry.is_file() and gijiroku_storage.logical_suffix(Path(entry.name)) in MINUTES_SUFFIXES:
+                            stems.add(gijiroku_storage.source_key(downloads_dir / child, downloads_dir))
+                    except OSError:
+                        continue
+        except OSError:
+            dirs.pop(rel, None)
+            continue
+    return stems, dirs, scanned_at_ns
+
+
+def downloads_unchanged(downloads_dir: Path, downloads: Any) -> bool:
+    if not isinstance(downloads, dict) or not isinstance(downloads.get("dirs"), dict):
+        return False
+    dirs: dict[str, Any] = downloads["dirs"]
+    if not dirs:
+        return not downloads_dir.exists()
+    racy_after = int(downloads.get("scanned_at_ns") or 0) - RACY_WINDOW_NS
+    for rel, mtime_ns in dirs.items():
+        try:
+            current = (downloads_dir / rel if rel else downloads_dir).stat().st_mtime_ns
+        except OSError:
+            return False
+        if current != mtime_ns or current >= racy_after:
+            return False
+    return True
+
+
+def encode_presence(stems: list[str], existing: set[str]) -> tuple[str, int]:
+    bits = bytearray((len(stems) + 7) // 8)
+    present = 0
+    for position, stem in enumerate(stems):
+        if stem in existing:
+            bits[position // 8] |= 1 << (position % 8)
+            present += 1
+    return base64.b64encode(bytes(bits)).decode("ascii"), present
+
+
+def count_presence(encoded: str) -> int:
+    return sum(bin(byte).count("1") for byte in base64.b64decode(encoded))
+
+
+def load_summary(path: Path) -> dict[str, Any] | None:
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(loaded, dict) or loaded.get("version") != SUMMARY_VERSION:
+        return None
+    return loaded
+
+
+def save_summary(path: Path, summary: dict[str, Any]) -> None:
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        temp_path.write_text(json.dumps(summary, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(temp_path, path)
+    except OSError as exc:
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        print(f"[WARN] index summary write failed path={path}: {exc}", file=sys.stderr, flush=True)
+
+
+def index_fingerprint(path: Path) -> dict[str, Any] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return {"name": path.name, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def summarize(index_json_path: Path, downloads_dir: Path, *, count_downloads: bool = True) -> IndexSummary:
+    """index と downloads の件数。sidecar が新しければ index の展開も downloads の走査もしない。"""
+    index_path = existing_index_path(index_json_path)
+    if index_path is None:
+        # index が無い自治体は本文の数だけを見る（sidecar の置き場も無いことが多い）。
+        download_count = len(scan_downloads(downloads_dir)[0]) if count_downloads else 0
+        return IndexSummary(0, 0, 0, download_count)
+
+    sidecar_path = summary_path(index_json_path)
+    fingerprint = index_fingerprint(index_path)
+    summary = load_summary(sidecar_path)
+    dirty = False
+    if summary is None or fingerprint is None or summary.get("index") != fingerprint:
+        try:
+            row_count, stems = scan_index(index_path)
+        except (OSError, ValueError, EOFError):
+            # 壊れた index は従来どおり 0 件として扱い、sidecar も書かない。
+            download_count = len(scan_downloads(downloads_dir)[0]) if count_downloads else 0
+            return IndexSummary(0, 0, 0, download_count)
+        summary = {
+            "version": SUMMARY_VERSION,
+            "index": fingerprint,
+            "row_count": row_count,
+            "unique_count": len(stems),
+            "stems": stems,
+            "downloads": None,
+            "present": "",
+        }
+        dirty = True
+
+    indexed_downloaded = 0
+    download_count = 0
+    if count_downloads:
+        if downloads_unchanged(downloads_dir, summary.get("downloads")):
+            download_count = int(summary["downloads"].get("file_count") or 0)
+            indexed_downloaded = count_presence(str(summary.get("present") or ""))
+        else:
+            existing, dirs, scanned_at_ns = scan_downloads(downloads_dir)
+            encoded, indexed_downloaded = encode_presence(list(summary.get("stems") or []), existing)
+            download_count = len(existing)
+            summary["downloads"] = {"scanned_at_ns": scanned_at_ns, "dirs": dirs, "file_count": download_count}
+            summary["present"] = encoded
+            dirty = True
+    if dirty:
+        save_summary(sidecar_path, summary)
+    return IndexSummary(
+        int(summary.get("row_count") or 0),
+        int(summary.get("unique_count") or 0),
+        indexed_downloaded,
+        download_count,
+    )
@@ -2,26 +2,51 @@
 
 圧縮テキスト・JSON の書き込み、置換前アーカイブ、文字コード fallback、
 digest 計算をここへまとめ、source system が違っても保存の振る舞いを揃える。
+
+scrape_state.json は会議 1 件ごとに丸ごと書き直すと、件数の 2 乗で書き込みが増える。
+record_item / set_progress は変わった item と進捗だけを隣の
+scrape_state.journal.ndjson に 1 行追記し、snapshot（scrape_state.json 本体）の
+書き直しは SCRAPE_STATE_COMPACT_SECONDS に 1 回までにまとめる:
+
+    {"journal": "<snapshot の journal_id>", "state": {...}, "items": {"<resume_key>": {...}}}
+
+load_state は snapshot の journal_id と一致する行だけを重ねるので、途中で止まっても
+記録済みの item は次回のレジュームに残る。
+
+注意:
+- journal を読まない読み手（親バッチの進捗表示・freshness_metadata など）から見た snapshot は、
+  実行中は最大 SCRAPE_STATE_COMPACT_SECONDS 遅れる。終了時（atexit）と save_state では必ず書き直す。
+- state の上位フィールドを直接書き換えたあとは save_state を呼ぶこと（journal には載らない）。
 """
 
 from __future__ import annotations
 
+import atexit
 import gzip
 import hashlib
 import json
 import os
 import shutil
+import sys
+import threading
+import time
+import uuid
 from datetime import datetime
 from dataclasses import asdict, is_dataclass
 from pathlib import Path
 from typing import Any
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import content_hash
+
 
 TEXT_ENCODINGS = ("utf-8", "cp932", "shift_jis", "euc_jp")
 ARCHIVE_MARKER = "_archive"
 SCRAPE_VALIDATION_MODE = "classified_scrape_result"
 SCRAPE_EXCLUDED_STATUSES = frozenset({"empty_text", "empty_pdf_text"})
 SCRAPE_FAILED_STATUSES = frozenset({"error", "timeout", "not_found"})
+SCRAPE_STATE_COMPACT_SECONDS = max(0.0, float(os.environ.get("MIYABE_SCRAPE_STATE_COMPACT_SECONDS", "2") or 2))
+SCRAPE_STATE_JOURNAL_MAX_BYTES = 4 * 1024 * 1024
 
 
 def gzip_path(path: Path) -> Path:
@@ -118,9 +143,11 @@ def write_bytes(path: Path, data: bytes, *, compress: bool = False) -> Path:
     final_path.parent.mkdir(parents=True, exist_ok=True)
     existing = existing_output(path)
     archived_existing: Path | None = None
+    digest = content_hash.sha256_bytes(data)
     if existing is not None:
         try:
-            if read_bytes(existing) != data:
+            # 書き込み時に残した hash と比べ、既存ファイルは記録が無いときだけ読む。
+            if content_hash.content_sha256(existing) != digest:
                 archive_existing_file(existing, reason="overwrite")
                 archived_existing = existing.resolve()
         except Exception:
@@ -141,6 +168,7 @@ def write_bytes(path: Path, data: bytes, *, compress: bool = False) -> Path:
             if archived_existing != gz_path.resolve():
                 archive_existing_file(gz_path, reason="delete")
             gz_path.unlink()
+    content_hash.record_sha256(final_path, digest)
     return final_path
 
 
@@ -193,6 +221,58 @@ def disambiguated_stem(stem: str, discriminator: str, occurrence_index: int) ->
     return f"{stem}-{token}"
 
 
+def state_journal_path(path: Path) -> Path:
+    return path.with_name(path.stem + ".journal.ndjson")
+
+
+class _StateJournal:
+    """scrape_state.json 1 つ分の journal の書き込み状況。"""
+
+    def __init__(self) -> None:
+        self.journal_id = ""
+        self.snapshot_at = 0.0
+        self.journal_bytes = 0
+        self.state: dict[str, Any] | None = None
+        self.dirty = False
+
+
+_STATE_JOURNALS: dict[Path, _StateJournal] = {}
+_STATE_JOURNALS_LOCK = threading.RLock()
+
+
+def _state_journal(path: Path) -> _StateJournal:
+    key = path.absolute()
+    journal = _STATE_JOURNALS.get(key)
+    if journal is None:
+        journal = _STATE_JOURNALS[key] = _StateJournal()
+    return journal
+
+
+def apply_state_journal(state: dict[str, Any], path: Path) -> dict[str, Any]:
+    """snapshot と同じ journal_id の行だけを順に重ねる。途中で切れた末尾行は捨てる。"""
+    journal_id = str(state.pop("journal_id", "") or "")
+    if journal_id == "":
+        return state
+    try:
+        with state_journal_path(path).open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not isinstance(entry, dict) or entry.get("journal") != journal_id:
+                    continue
+                fields = entry.get("state")
+                if isinstance(fields, dict):
+                    state.update((key, value) for key, value in fields.items() if key != "items")
+                changed_items = entry.get("items")
+                if isinstance(changed_items, dict):
+                    state["items"].update(changed_items)
+    except OSError:
+        pass
+    return state
+
+
 def load_state(path: Path) -> dict[str, Any]:
     state = load_json(path, {"version": 1, "items": {}})
     if not isinstance(state, dict):
@@ -200,15 +280,77 @@ def load_state(path: Path) -> dict[str, Any]:
     if not isinstance(state.get("items"), dict):
         state["items"] = {}
     state.setdefault("version", 1)
-    return state
+    return apply_state_journal(state, path)
 
 
 def save_state(path: Path, state: dict[str, Any]) -> None:
+    """state 全体を snapshot として書き直し、journal を空にする。"""
     path.parent.mkdir(parents=True, exist_ok=True)
     temp_path = path.with_suffix(path.suffix + ".tmp")
-    payload = json.dumps(state, ensure_ascii=False, indent=2) + "\n"
-    temp_path.write_text(payload, encoding="utf-8")
-    os.replace(temp_path, path)
+    journal_id = uuid.uuid4().hex[:16]
+    payload = json.dumps({**state, "journal_id": journal_id}, ensure_ascii=False, indent=2) + "\n"
+    with _STATE_JOURNALS_LOCK:
+        temp_path.write_text(payload, encoding="utf-8")
+        os.replace(temp_path, path)
+        # snapshot を置き換えたあとで消すので、古い journal は新しい journal_id と一致せず読まれない。
+        state_journal_path(path).unlink(missing_ok=True)
+        journal = _state_journal(path)
+        journal.journal_id = journal_id
+        journal.snapshot_at = time.monotonic()
+        journal.journal_bytes = 0
+        journal.state = state
+        journal.dirty = False
+
+
+def _append_state_journal(path: Path, state: dict[str, Any], entry: dict[str, Any]) -> None:
+    with _STATE_JOURNALS_LOCK:
+        journal = _state_journal(path)
+        if (
+            journal.journal_id == ""
+            or journal.state is not state
+            or time.monotonic() - journal.snapshot_at >= SCRAPE_STATE_COMPACT_SECONDS
+            or journal.journal_bytes >= SCRAPE_STATE_JOURNAL_MAX_BYTES
+        ):
+            # 変更は state 側に反映済みなので、snapshot に含めて書けば journal 行は要らない。
+            save_state(path, state)
+            return
+        line = json.dumps({"journal": journal.journal_id, **entry}, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            with state_journal_path(path).open("a", encoding="utf-8") as handle:
+                handle.write(line)
+        except OSError:
+            save_state(path, state)
+            return
+        journal.journal_bytes += len(line.encode("utf-8"))
+        journal.dirty = True
+
+
+def record_item(path: Path, state: dict[str, Any], key: str, item: dict[str, Any]) -> None:
+    """会議 1 件の結果を state に入れ、journal に追記する。"""
+    state["items"][key] = item
+    _append_state_journal(path, state, {"items": {key: item}})
+
+
+def set_progress(path: Path, state: dict[str, Any], *, current: int, total: int, unit: str = "meeting") -> None:
+    fields = {
+        "progress_current": max(0, int(current)),
+        "progress_total": max(0, int(total)),
+        "progress_unit": str(unit).strip() or "meeting",
+    }
+    state.update(fields)
+    _append_state_journal(path, state, {"state": fields})
+
+
+@atexit.register
+def compact_state_journals() -> None:
+    """journal にだけある変更を snapshot へ書き戻す。終了時に自動で呼ばれる。"""
+    with _STATE_JOURNALS_LOCK:
+        for path, journal in list(_STATE_JOURNALS.items()):
+            if journal.dirty and journal.state is not None:
+                try:
+                    save_state(path, journal.state)
+                except OSError as exc:
+                    print(f"[WARN] scrape state compaction failed: {path} [{type(exc).__name__}] {exc}", flush=True)
 
 
 def update_progress_state(path: Path, *, current: int, total: int, unit: str = "meeting") -> None:
@@ -16,8 +16,11 @@ from pathlib import Path
 from urllib.parse import urlsplit, urlunsplit
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
+import municipality_slugs
 from municipality_slugs import code_name_slug, sanitize_slug_token
+from gijiroku import crawl_policy
 from gijiroku.crawl_policy import policy_fingerprint
+from target_registry import TargetRegistry, load_registry
 
 
 WORKSPACE_ROOT = Path(__file__).resolve().parents[2]
@@ -284,35 +287,18 @@ def build_target_entry(
     }
 
 
-def iter_gijiroku_targets(
-    expected_system: str | None = None,
-    *,
-    include_inactive: bool = True,
-) -> list[dict]:
-    """URL登録済み対象を返す。
-
-    検索・既存データ整理から登録情報が消えないよう、既定ではrobots除外も含める。
-    新規取得に使う呼び出し元は iter_scrapeable_gijiroku_targets() を使う。
-    """
+def build_gijiroku_targets() -> list[dict]:
+    """URL 登録済みの全対象を、system_type・crawl_status で絞らずに組み立てる。"""
     url_index = load_local_minutes_url_index()
     master_index = load_municipality_master_index()
     homepage_index = load_municipality_homepage_index()
-    accepted_system_types = accepted_minutes_system_types(expected_system)
     targets: list[dict] = []
 
     for code, url_entry in sorted(url_index.items()):
-        system_type = str(url_entry.get("system_type", "")).strip()
-        if accepted_system_types is not None and system_type not in accepted_system_types:
-            continue
-
         source_url = str(url_entry.get("url", "")).strip()
         if source_url == "":
             continue
 
-        crawl_status = str(url_entry.get("crawl_status", CRAWL_STATUS_ENABLED)).strip()
-        if not include_inactive and crawl_status != CRAWL_STATUS_ENABLED:
-            continue
-
         master_entry = master_index.get(code)
         slug = canonical_slug_for_minutes(
             code,
@@ -325,9 +311,9 @@ def iter_gijiroku_targets(
                 slug=slug,
                 code=code,
                 source_url=source_url,
-                system_type=system_type,
+                system_type=str(url_entry.get("system_type", "")).strip(),
                 master_entry=master_entry,
-                crawl_status=crawl_status,
+                crawl_status=str(url_entry.get("crawl_status", CRAWL_STATUS_ENABLED)).strip(),
                 exclusion_reason=str(url_entry.get("exclusion_reason", "")).strip(),
                 exclusion_detail=str(url_entry.get("exclusion_detail", "")).strip(),
                 policy_checked_at=str(url_entry.get("policy_checked_at", "")).strip(),
@@ -338,6 +324,44 @@ def iter_gijiroku_targets(
     return targets
 
 
+def gijiroku_target_registry() -> TargetRegistry:
+    """組み立て済みの全対象。元の TSV / CSV が変わるまでプロセス内で使い回す。"""
+    municipalities_dir = DATA_ROOT / "municipalities"
+    return load_registry(
+        "gijiroku",
+        [
+            municipalities_dir / "assembly_minutes_system_urls.tsv",
+            municipalities_dir / "municipality_master.tsv",
+            municipalities_dir / "municipality_homepages.csv",
+            Path(__file__),
+            Path(crawl_policy.__file__),
+            Path(municipality_slugs.__file__),
+        ],
+        build_gijiroku_targets,
+        gijiroku_target_aliases,
+        extra=(str(DATA_ROOT), str(WORK_ROOT)),
+    )
+
+
+def iter_gijiroku_targets(
+    expected_system: str | None = None,
+    *,
+    include_inactive: bool = True,
+) -> list[dict]:
+    """URL登録済み対象を返す。
+
+    検索・既存データ整理から登録情報が消えないよう、既定ではrobots除外も含める。
+    新規取得に使う呼び出し元は iter_scrapeable_gijiroku_targets() を使う。
+    """
+    accepted_system_types = accepted_minutes_system_types(expected_system)
+    return [
+        dict(target)
+        for target in gijiroku_target_registry().targets
+        if (accepted_system_types is None or target["system_type"] in accepted_system_types)
+        and (include_inactive or target["crawl_status"] == CRAWL_STATUS_ENABLED)
+    ]
+
+
 def iter_scrapeable_gijiroku_targets(expected_system: str | None = None) -> list[dict]:
     """robots監査で明示的に enabled となった対象だけを返す。"""
     return iter_gijiroku_targets(expected_system=expected_system, include_inactive=False)
@@ -368,8 +392,9 @@ def load_gijiroku_target(
     *,
     allow_inactive: bool = False,
 ) -> dict:
-    for target in iter_gijiroku_targets(expected_system=expected_system):
-        if gijiroku_target_matches_slug(target, slug):
+    accepted_system_types = accepted_minutes_system_types(expected_system)
+    for target in gijiroku_target_registry().lookup(slug):
+        if accepted_system_types is None or target["system_type"] in accepted_system_types:
             if not allow_inactive and str(target.get("crawl_status", "")) != CRAWL_STATUS_ENABLED:
                 reason = str(target.get("exclusion_reason", "")).strip() or "crawl_policy"
                 detail = str(target.get("exclusion_detail", "")).strip()
@@ -382,11 +407,8 @@ def load_gijiroku_target(
     raise ValueError(f"Municipality slug not found: {slug}")
 
 
-def gijiroku_target_matches_slug(target: dict, slug: str) -> bool:
-    candidate = str(slug).strip()
-    if candidate == "":
-        return False
-
+def gijiroku_target_aliases(target: dict) -> set[str]:
+    """slug・自治体コード・ローマ字名・コード-ローマ字名。"""
     target_slug = str(target.get("slug", "")).strip()
     code = str(target.get("code", "")).strip()
     name_romaji = sanitize_slug_token(str(target.get("name_romaji", "")).strip())
@@ -397,7 +419,14 @@ def gijiroku_target_matches_slug(target: dict, slug: str) -> bool:
         aliases.add(name_romaji)
         if code:
             aliases.add(f"{code}-{name_romaji}")
-    return candidate in aliases
+    return aliases
+
+
+def gijiroku_target_matches_slug(target: dict, slug: str) -> bool:
+    candidate = str(slug).strip()
+    if candidate == "":
+        return False
+    return candidate in gijiroku_target_aliases(target)
 
 
 def derive_base_url(source_url: str) -> str:
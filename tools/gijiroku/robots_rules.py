@@ -92,3 +92,46 @@ def robots_can_fetch(text: str, user_agent: str, url: str) -> bool:
     best_length = max(len(rule.pattern.rstrip("$")) for rule in matching_rules)
     best_rules = [rule for rule in matching_rules if len(rule.pattern.rstrip("$")) == best_length]
     return any(rule.allow for rule in best_rules)
+
+
+def robots_crawl_delay(text: str, user_agent: str) -> float | None:
+    """最長一致の User-agent 群に書かれた Crawl-delay（秒）。指定が無ければ None。
+
+    Crawl-delay は RFC 9309 の外だが、書かれていれば並列取得をやめてその間隔に従う。"""
+    groups: list[tuple[list[str], float | None]] = []
+    agents: list[str] = []
+    delay: float | None = None
+    in_rules = False
+    for raw_line in text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if not line or ":" not in line:
+            continue
+        field, value = line.split(":", 1)
+        field = field.strip().lower()
+        value = value.strip()
+        if field == "user-agent":
+            if in_rules:
+                groups.append((agents, delay))
+                agents, delay, in_rules = [], None, False
+            agents.append(value.lower())
+        elif agents and field in {"allow", "disallow", "crawl-delay"}:
+            in_rules = True
+            if field == "crawl-delay":
+                try:
+                    delay = max(0.0, float(value))
+                except ValueError:
+                    pass
+    if agents:
+        groups.append((agents, delay))
+
+    matched: list[tuple[int, float | None]] = []
+    for group_agents, group_delay in groups:
+        specificities = [agent_specificity(agent, user_agent) for agent in group_agents]
+        matching = [value for value in specificities if value is not None]
+        if matching:
+            matched.append((max(matching), group_delay))
+    if not matched:
+        return None
+    best_agent = max(specificity for specificity, _delay in matched)
+    delays = [group_delay for specificity, group_delay in matched if specificity == best_agent and group_delay is not None]
+    return max(delays) if delays else None
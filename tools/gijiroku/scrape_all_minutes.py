@@ -21,8 +21,8 @@ sys.path.append(str(Path(__file__).parent))
 # Docker ではこの batch runner をファイルパス指定で実行する。
 # package install なしでも共通 tools、会議録モジュール、隣接モジュールを import できるようにする。
 import freshness_metadata
+import gijiroku_index_summary
 import gijiroku_targets
-from tools.tasks import backfill as task_backfill
 from tools.tasks import batch as scraping_batch
 from tools.tasks import priority as scraping_priority
 
@@ -232,11 +232,13 @@ def actual_scrape_progress(target: dict) -> tuple[int, int]:
 
     downloads_dir = Path(str(target.get("downloads_dir") or ""))
     index_json_path = Path(str(target.get("index_json_path") or ""))
-    indexed_total_count = task_backfill.load_gijiroku_index_unique_count(index_json_path)
+    # ここで書いた sidecar を、次の backfill がそのまま使う。
+    summary = gijiroku_index_summary.summarize(index_json_path, downloads_dir)
+    indexed_total_count = summary.unique_count
     if indexed_total_count > 0:
-        downloaded_count = task_backfill.count_gijiroku_indexed_downloads(index_json_path, downloads_dir)
+        downloaded_count = summary.indexed_downloaded_count
     else:
-        downloaded_count = task_backfill.count_gijiroku_downloads(downloads_dir)
+        downloaded_count = summary.download_count
     total_count = max(indexed_total_count, downloaded_count)
     return max(0, downloaded_count), max(0, total_count)
 
@@ -30,6 +30,7 @@ MODULE_DIR = SCRAPER_DIR.parent
 # そのため、隣接モジュールを sys.path に明示的に入れる。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+import browser_pool
 import gijiroku_planning
 import gijiroku_storage
 import gijiroku_targets
@@ -98,10 +99,7 @@ def emit_progress(
     print(f"[PROGRESS] unit=meeting current={max(0, current)} total={max(0, total)}", flush=True)
     if state_path is not None:
         if state is not None:
-            state["progress_current"] = max(0, int(current))
-            state["progress_total"] = max(0, int(total))
-            state["progress_unit"] = "meeting"
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.set_progress(state_path, state, current=current, total=total, unit="meeting")
         else:
             gijiroku_storage.update_progress_state(state_path, current=current, total=total, unit="meeting")
 
@@ -663,6 +661,7 @@ def discover_meeting_items(
     previous_items: list[MeetingItem] | None = None,
     quick_update: bool = False,
     discovery_timeout_seconds: int = DEFAULT_DISCOVERY_TIMEOUT_SECONDS,
+    pool: browser_pool.PlaywrightPool | None = None,
 ) -> list[MeetingItem]:
     deadline = discovery_deadline(discovery_timeout_seconds)
     base_url = str(target["base_url"])
@@ -672,17 +671,24 @@ def discover_meeting_items(
     meetings: list[MeetingItem] = []
     seen_titles: set[tuple[str, str, str]] = set()
     known_urls_by_list_url = previous_doc_urls_by_list_url(previous_items or []) if quick_update else {}
-
-    for list_index, list_page in enumerate(list_pages, start=1):
+    if pool is None:
+        pool = browser_pool.inline_pool(browser_pool.PlaywrightWorker(request=page.context.request, page=page))
+
+    def collect(
+        worker: browser_pool.PlaywrightWorker,
+        job: tuple[int, ListPage],
+    ) -> tuple[str, list[DocumentRow] | None]:
+        # 一覧ページごとに別の page で巡回する。結果は投入順に受け取るので、会議の並びは逐次と同じ。
+        list_index, list_page = job
         ensure_discovery_time(deadline, f"{list_index}/{len(list_pages)} {list_page.title}")
         print(
             f"[INFO] 会議一覧を確認中 {list_index}/{len(list_pages)} {list_page.year_label} {list_page.meeting_group}",
             flush=True,
         )
+        list_url = list_url_with_origin(list_page.url, base_url)
         try:
-            list_url = list_url_with_origin(list_page.url, base_url)
-            rows = collect_list_page_documents(
-                page,
+            return list_url, collect_list_page_documents(
+                worker.page,
                 list_url,
                 timeout_ms,
                 known_urls=known_urls_by_list_url.get(list_url),
@@ -693,6 +699,13 @@ def discover_meeting_items(
             raise
         except Exception as exc:
             print(f"[WARN] 会議一覧の確認に失敗: {list_page.title} ({exc})", flush=True)
+            return list_url, None
+
+    # 一覧の巡回は --delay-seconds の間隔を空けない（同時数は pool の大きさまで）。間隔を守ると
+    # 一覧ページの多い自治体では待ち時間だけで discovery_timeout_seconds を使い切ってしまう。
+    collected = pool.map(collect, enumerate(list_pages, start=1))
+    for (_, list_page), (list_url, rows) in collected:
+        if rows is None:
             continue
 
         for group in build_day_groups(list_page, list_url, rows):
@@ -795,8 +808,11 @@ def fetch_meeting_text(request_context, item: MeetingItem, timeout_ms: int) -> t
 
     sections: list[str] = []
     fragment_count = 0
+    sample_html = ""
     for doc_url in item.doc_urls:
         page_html = request_text(request_context, doc_url, timeout_ms, referer=item.list_url or item.url)
+        if not sample_html:
+            sample_html = page_html
         body_text = extract_document_body(page_html)
         heading = extract_document_heading(page_html)
         section_lines: list[str] = []
@@ -818,7 +834,6 @@ def fetch_meeting_text(request_context, item: MeetingItem, timeout_ms: int) -> t
         header_lines.append(item.meeting_group)
     header_lines.append(item.year_label)
 
-    sample_html = request_text(request_context, item.doc_urls[0], timeout_ms, referer=item.list_url or item.url)
     held_on_label = document_date_label(sample_html, item)
     if held_on_label:
         header_lines.append(f"開催日: {held_on_label}")
@@ -830,6 +845,40 @@ def fetch_meeting_text(request_context, item: MeetingItem, timeout_ms: int) -> t
     return fragment_count, "\n".join(header_lines).strip() + "\n"
 
 
+def fetch_meeting(
+    worker: browser_pool.PlaywrightWorker,
+    plan: dict,
+    timeout_ms: int,
+    pages_dir: Path | None,
+) -> tuple[str, str, str, int]:
+    """会議 1 件を取得・保存し、(status, output, error, fragments) を返す。browser pool の worker で動く。"""
+    item: MeetingItem = plan["item"]
+    fragment_count = 0
+    try:
+        fragment_count, meeting_text = fetch_meeting_text(worker.request, item, timeout_ms)
+        if not meeting_text:
+            return "not_found", "", "", fragment_count
+        dest = gijiroku_storage.write_text(plan["dest_base"], meeting_text, compress=True)
+        return "saved_text", str(dest), "", fragment_count
+    except PlaywrightTimeoutError as exc:
+        return "timeout", "", str(exc), fragment_count
+    except Exception as exc:
+        if pages_dir is not None and item.doc_urls:
+            debug_path = pages_dir / plan["year_dir_name"]
+            if plan["meeting_group_dir"]:
+                debug_path = debug_path / plan["meeting_group_dir"]
+            try:
+                sample_html = request_text(worker.request, item.doc_urls[0], timeout_ms, referer=item.url)
+                gijiroku_storage.write_text(
+                    debug_path / (plan["stem"] + ".html"),
+                    sample_html,
+                    compress=True,
+                )
+            except Exception:
+                pass
+        return "error", "", str(exc), fragment_count
+
+
 def save_debug_html(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(text, encoding="utf-8")
@@ -895,6 +944,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="既存の保存結果を無視して最初から取り直す",
     )
+    parser.add_argument(
+        "--page-pool",
+        type=int,
+        default=browser_pool.default_pool_size(),
+        help="一覧巡回・本文取得に使う page 数。ホスト単位の開始間隔は --delay-seconds のまま（既定は MIYABE_PLAYWRIGHT_POOL または 2）",
+    )
     return parser
 
 
@@ -933,96 +988,146 @@ def main() -> int:
     print(f"[INFO] Source URL: {target['source_url']}")
     print(f"[INFO] Base URL: {target['base_url']}")
 
+    host = browser_pool.url_host(str(target["source_url"]))
+    pool_size = browser_pool.pool_size_for_host(host, args.page_pool)
     with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=not args.headful)
-        context = browser.new_context(accept_downloads=False, locale="ja-JP", user_agent=DEFAULT_USER_AGENT)
+        browser, cdp_url = browser_pool.launch_browser(playwright, headless=not args.headful, shareable=pool_size > 1)
+        context_options = {"accept_downloads": False, "locale": "ja-JP", "user_agent": DEFAULT_USER_AGENT}
+        context = browser.new_context(**context_options)
         page = context.new_page()
         page.set_default_timeout(args.timeout_ms)
+        # worker の context は新規に作る（main の context の cookie は storage_state で引き継がない）。
+        pool = browser_pool.PlaywrightPool(
+            browser_pool.page_worker_opener(cdp_url, timeout_ms=args.timeout_ms, **context_options),
+            parallel=pool_size,
+            delay_seconds=args.delay_seconds,
+            inline_worker=browser_pool.PlaywrightWorker(request=context.request, page=page),
+        )
+        try:
+            print(f"[INFO] Page pool: {pool_size} (host={host})", flush=True)
+
+            print("[INFO] 会議一覧を収集中...")
+            previous_items = [] if args.no_resume or args.max_meetings > 0 else load_previous_meeting_items(index_json)
+            quick_update = bool(previous_items) and should_quick_update_from_state(state)
+            if quick_update:
+                print(
+                    f"[INFO] Quick update listing enabled: previous_index={len(previous_items)}",
+                    flush=True,
+                )
+            meeting_items = discover_meeting_items(
+                page,
+                target,
+                args.timeout_ms,
+                args.max_meetings,
+                previous_items=previous_items,
+                quick_update=quick_update,
+                discovery_timeout_seconds=args.discovery_timeout_seconds,
+                pool=pool,
+            )
+            print(f"[INFO] 会議候補 {len(meeting_items)} 件")
 
-        print("[INFO] 会議一覧を収集中...")
-        previous_items = [] if args.no_resume or args.max_meetings > 0 else load_previous_meeting_items(index_json)
-        quick_update = bool(previous_items) and should_quick_update_from_state(state)
-        if quick_update:
-            print(
-                f"[INFO] Quick update listing enabled: previous_index={len(previous_items)}",
-                flush=True,
+            index_json.parent.mkdir(parents=True, exist_ok=True)
+            index_json.write_text(
+                json.dumps([asdict(item) for item in meeting_items], ensure_ascii=False, indent=2),
+                encoding="utf-8",
             )
-        meeting_items = discover_meeting_items(
-            page,
-            target,
-            args.timeout_ms,
-            args.max_meetings,
-            previous_items=previous_items,
-            quick_update=quick_update,
-            discovery_timeout_seconds=args.discovery_timeout_seconds,
-        )
-        print(f"[INFO] 会議候補 {len(meeting_items)} 件")
+            emit_progress(0, len(meeting_items), state_path, state)
 
-        index_json.parent.mkdir(parents=True, exist_ok=True)
-        index_json.write_text(
-            json.dumps([asdict(item) for item in meeting_items], ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-        emit_progress(0, len(meeting_items), state_path, state)
+            with result_csv.open("w", encoding="utf-8", newline="") as handle:
+                writer = csv.DictWriter(
+                    handle,
+                    fieldnames=["title", "year", "url", "status", "output", "error", "documents", "fragments"],
+                )
+                writer.writeheader()
+
+                planned_items = [
+                    gijiroku_planning.attach_text_output(plan)
+                    for plan in gijiroku_planning.build_base_plans(meeting_items, downloads_dir)
+                ]
+                previous_missing = gijiroku_planning.previous_missing_count(state)
+                planned_items, work_items, missing_count = gijiroku_planning.select_work_items(
+                    planned_items,
+                    no_resume=args.no_resume,
+                    previous_missing_count=previous_missing,
+                )
+                date_range = gijiroku_planning.describe_date_range(planned_items)
+                if date_range:
+                    print(f"[INFO] Discovered meeting date range: {date_range}", flush=True)
+                gijiroku_planning.save_plan_summary(state_path, state, planned_items, missing_count, previous_missing)
+                if missing_count > 0:
+                    work_mode = gijiroku_planning.work_mode_label(missing_count, previous_missing)
+                    if work_mode == "update_check":
+                        print(f"[INFO] Update check found new outputs: {missing_count}/{len(planned_items)}", flush=True)
+                    else:
+                        print(f"[INFO] Resume missing outputs first: {missing_count}/{len(planned_items)}", flush=True)
+                if not args.no_resume and not work_items:
+                    print("[INFO] All expected outputs already exist; skipping download loop.", flush=True)
+                    emit_progress(len(meeting_items), len(meeting_items), state_path, state)
+
+                def skips_fetch(plan: dict) -> bool:
+                    return not args.no_resume and plan["existing_output"] is not None
+
+                results = pool.map(
+                    lambda worker, plan: None
+                    if skips_fetch(plan)
+                    else fetch_meeting(worker, plan, args.timeout_ms, pages_dir if args.save_html else None),
+                    work_items,
+                    host_of=lambda plan: None if skips_fetch(plan) else host,
+                )
+                for idx, (plan, fetched) in enumerate(results, start=1):
+                    item = plan["item"]
+                    print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
+                    document_count = len(item.doc_urls or [])
+                    resume_key = plan["resume_key"]
+                    existing_output = plan["existing_output"]
+
+                    if fetched is None:
+                        output_path = str(existing_output)
+                        status = "skipped_existing"
+                        gijiroku_storage.record_item(
+                            state_path,
+                            state,
+                            resume_key,
+                            {
+                                "title": item.title,
+                                "year_label": item.year_label,
+                                "url": item.url,
+                                "status": "saved_text",
+                                "output_rel_path": str(existing_output.relative_to(downloads_dir)),
+                                "updated_at": now_ts(),
+                            },
+                        )
+                        writer.writerow(
+                            {
+                                "title": item.title,
+                                "year": item.year_label,
+                                "url": item.url,
+                                "status": status,
+                                "output": output_path,
+                                "error": "",
+                                "documents": len(item.doc_urls or []),
+                                "fragments": 0,
+                            }
+                        )
+                        handle.flush()
+                        emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
+                        continue
+
+                    status, output_path, error_msg, fragment_count = fetched
+                    gijiroku_storage.record_item(
+                        state_path,
+                        state,
+                        resume_key,
+                        {
+                            "title": item.title,
+                            "year_label": item.year_label,
+                            "url": item.url,
+                            "status": status,
+                            "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                            "updated_at": now_ts(),
+                        },
+                    )
 
-        with result_csv.open("w", encoding="utf-8", newline="") as handle:
-            writer = csv.DictWriter(
-                handle,
-                fieldnames=["title", "year", "url", "status", "output", "error", "documents", "fragments"],
-            )
-            writer.writeheader()
-
-            planned_items = [
-                gijiroku_planning.attach_text_output(plan)
-                for plan in gijiroku_planning.build_base_plans(meeting_items, downloads_dir)
-            ]
-            previous_missing = gijiroku_planning.previous_missing_count(state)
-            planned_items, work_items, missing_count = gijiroku_planning.select_work_items(
-                planned_items,
-                no_resume=args.no_resume,
-                previous_missing_count=previous_missing,
-            )
-            date_range = gijiroku_planning.describe_date_range(planned_items)
-            if date_range:
-                print(f"[INFO] Discovered meeting date range: {date_range}", flush=True)
-            gijiroku_planning.save_plan_summary(state_path, state, planned_items, missing_count, previous_missing)
-            if missing_count > 0:
-                work_mode = gijiroku_planning.work_mode_label(missing_count, previous_missing)
-                if work_mode == "update_check":
-                    print(f"[INFO] Update check found new outputs: {missing_count}/{len(planned_items)}", flush=True)
-                else:
-                    print(f"[INFO] Resume missing outputs first: {missing_count}/{len(planned_items)}", flush=True)
-            if not args.no_resume and not work_items:
-                print("[INFO] All expected outputs already exist; skipping download loop.", flush=True)
-                emit_progress(len(meeting_items), len(meeting_items), state_path, state)
-
-            for idx, plan in enumerate(work_items, start=1):
-                item = plan["item"]
-                print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
-                status = ""
-                output_path = ""
-                error_msg = ""
-                document_count = len(item.doc_urls or [])
-                fragment_count = 0
-                year_dir_name = plan["year_dir_name"]
-                meeting_group_dir = plan["meeting_group_dir"]
-                stem = plan["stem"]
-                resume_key = plan["resume_key"]
-                dest_base = plan["dest_base"]
-                existing_output = plan["existing_output"]
-
-                if not args.no_resume and existing_output is not None:
-                    output_path = str(existing_output)
-                    status = "skipped_existing"
-                    state["items"][resume_key] = {
-                        "title": item.title,
-                        "year_label": item.year_label,
-                        "url": item.url,
-                        "status": "saved_text",
-                        "output_rel_path": str(existing_output.relative_to(downloads_dir)),
-                        "updated_at": now_ts(),
-                    }
-                    gijiroku_storage.save_state(state_path, state)
                     writer.writerow(
                         {
                             "title": item.title,
@@ -1030,71 +1135,17 @@ def main() -> int:
                             "url": item.url,
                             "status": status,
                             "output": output_path,
-                            "error": "",
-                            "documents": len(item.doc_urls or []),
-                            "fragments": 0,
+                            "error": error_msg,
+                            "documents": document_count,
+                            "fragments": fragment_count,
                         }
                     )
                     handle.flush()
                     emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
-                    continue
-
-                try:
-                    fragment_count, meeting_text = fetch_meeting_text(context.request, item, args.timeout_ms)
-                    if not meeting_text:
-                        status = "not_found"
-                    else:
-                        dest = gijiroku_storage.write_text(dest_base, meeting_text, compress=True)
-                        output_path = str(dest)
-                        status = "saved_text"
-                except PlaywrightTimeoutError as exc:
-                    status = "timeout"
-                    error_msg = str(exc)
-                except Exception as exc:
-                    status = "error"
-                    error_msg = str(exc)
-                    if args.save_html and item.doc_urls:
-                        debug_path = pages_dir / year_dir_name
-                        if meeting_group_dir:
-                            debug_path = debug_path / meeting_group_dir
-                        try:
-                            sample_html = request_text(context.request, item.doc_urls[0], args.timeout_ms, referer=item.url)
-                            gijiroku_storage.write_text(
-                                debug_path / (stem + ".html"),
-                                sample_html,
-                                compress=True,
-                            )
-                        except Exception:
-                            pass
-
-                state["items"][resume_key] = {
-                    "title": item.title,
-                    "year_label": item.year_label,
-                    "url": item.url,
-                    "status": status,
-                    "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                    "updated_at": now_ts(),
-                }
-                gijiroku_storage.save_state(state_path, state)
-
-                writer.writerow(
-                    {
-                        "title": item.title,
-                        "year": item.year_label,
-                        "url": item.url,
-                        "status": status,
-                        "output": output_path,
-                        "error": error_msg,
-                        "documents": document_count,
-                        "fragments": fragment_count,
-                    }
-                )
-                handle.flush()
-                emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
-                if args.delay_seconds > 0 and idx < len(work_items):
-                    time.sleep(args.delay_seconds)
-
-        browser.close()
+        finally:
+            # 途中で例外になっても worker thread の CDP 接続とブラウザを閉じる。
+            pool.close()
+            browser.close()
 
     print(f"[DONE] Saved index: {index_json}")
     print(f"[DONE] Result log : {result_csv}")
@@ -31,6 +31,7 @@ MODULE_DIR = SCRAPER_DIR.parent
 # repository root から直接実行できるように import path を補う。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+import browser_pool
 import gijiroku_planning
 import gijiroku_storage
 import gijiroku_targets
@@ -61,10 +62,7 @@ def emit_progress(
     print(f"[PROGRESS] unit=meeting current={max(0, current)} total={max(0, total)}", flush=True)
     if state_path is not None:
         if state is not None:
-            state["progress_current"] = max(0, int(current))
-            state["progress_total"] = max(0, int(total))
-            state["progress_unit"] = "meeting"
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.set_progress(state_path, state, current=current, total=total, unit="meeting")
         else:
             gijiroku_storage.update_progress_state(state_path, current=current, total=total, unit="meeting")
 
@@ -294,6 +292,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="既存の保存結果を無視して最初から取り直す",
     )
+    parser.add_argument(
+        "--page-pool",
+        type=int,
+        default=browser_pool.default_pool_size(),
+        help="会議詳細を並べて開く page 数。ホスト単位の開始間隔は --delay-seconds のまま（既定は MIYABE_PLAYWRIGHT_POOL または 2）",
+    )
     return parser
 
 
@@ -578,6 +582,40 @@ def try_download_from_detail(page, item: MeetingItem, output_dir: Path, timeout_
     return "not_found", ""
 
 
+def fetch_meeting(
+    worker: browser_pool.PlaywrightWorker,
+    plan: dict,
+    timeout_ms: int,
+    pages_dir: Path | None,
+) -> tuple[str, str, str]:
+    """会議 1 件を worker の page で取得し、(status, output, error) を返す。browser pool の worker で動く。"""
+    status = ""
+    output_path = ""
+    try:
+        status, output_path = try_download_from_detail(
+            worker.page,
+            plan["item"],
+            plan["meeting_download_dir"],
+            timeout_ms,
+            plan["stem"],
+        )
+        if pages_dir is not None and status == "not_found":
+            page_year_dir = pages_dir / plan["year_dir_name"]
+            if plan["meeting_group_dir"]:
+                page_year_dir = page_year_dir / plan["meeting_group_dir"]
+            page_year_dir.mkdir(parents=True, exist_ok=True)
+            gijiroku_storage.write_text(
+                page_year_dir / (plan["stem"] + ".html"),
+                worker.page.content(),
+                compress=True,
+            )
+    except PlaywrightTimeoutError as exc:
+        return "timeout", output_path, str(exc)
+    except Exception as exc:
+        return "error", output_path, str(exc)
+    return status, output_path, ""
+
+
 def main() -> int:
     args = build_parser().parse_args()
     target = gijiroku_targets.load_gijiroku_target(args.slug, expected_system="gijiroku.com")
@@ -613,8 +651,10 @@ def main() -> int:
     print(f"[INFO] Source URL: {target['source_url']}")
     print(f"[INFO] Base URL: {target['base_url']}")
 
+    host = browser_pool.url_host(str(target["base_url"]))
+    pool_size = browser_pool.pool_size_for_host(host, args.page_pool)
     with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=not args.headful)
+        browser, cdp_url = browser_pool.launch_browser(playwright, headless=not args.headful, shareable=pool_size > 1)
         context = browser.new_context(accept_downloads=True, locale="ja-JP")
         page = context.new_page()
         page.set_default_timeout(args.timeout_ms)
@@ -698,35 +738,84 @@ def main() -> int:
                 print("[INFO] All expected outputs already exist; skipping download loop.", flush=True)
                 emit_progress(len(meeting_items), len(meeting_items), state_path, state)
 
-            for idx, plan in enumerate(work_items, start=1):
-                item = plan["item"]
-                print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
-                status = ""
-                output_path = ""
-                error_msg = ""
-                year_dir_name = plan["year_dir_name"]
-                meeting_group_dir = plan["meeting_group_dir"]
-                meeting_download_dir = plan["meeting_download_dir"]
-                stem = plan["stem"]
-                resume_key = plan["resume_key"]
-                existing_outputs = plan["existing_outputs"]
-                existing_text_output = plan["existing_text_output"]
-                existing_html_output = plan["existing_html_output"]
-                should_retry_fallback_html = plan["should_retry_fallback_html"]
-
-                if not args.no_resume and existing_outputs and not should_retry_fallback_html:
-                    preferred_output = existing_text_output or existing_html_output or existing_outputs[0]
-                    output_path = str(preferred_output)
-                    status = "skipped_existing"
-                    state["items"][resume_key] = {
-                        "title": item.title,
-                        "year_label": item.year_label,
-                        "url": item.url,
-                        "status": "saved",
-                        "output_rel_path": str(preferred_output.relative_to(downloads_dir)),
-                        "updated_at": now_ts(),
-                    }
-                    gijiroku_storage.save_state(state_path, state)
+            def skips_fetch(plan: dict) -> bool:
+                return not args.no_resume and bool(plan["existing_outputs"]) and not plan["should_retry_fallback_html"]
+
+            # 一覧巡回で付いた session cookie を worker の context へ引き継ぐ。
+            with browser_pool.PlaywrightPool(
+                browser_pool.page_worker_opener(
+                    cdp_url,
+                    storage_state=context.storage_state(),
+                    timeout_ms=args.timeout_ms,
+                    accept_downloads=True,
+                    locale="ja-JP",
+                ),
+                parallel=pool_size,
+                delay_seconds=args.delay_seconds,
+                inline_worker=browser_pool.PlaywrightWorker(request=context.request, page=page),
+            ) as pool:
+                print(f"[INFO] Page pool: {pool_size} (host={host})", flush=True)
+                results = pool.map(
+                    lambda worker, plan: None
+                    if skips_fetch(plan)
+                    else fetch_meeting(worker, plan, args.timeout_ms, pages_dir if args.save_html else None),
+                    work_items,
+                    host_of=lambda plan: None if skips_fetch(plan) else host,
+                )
+                for idx, (plan, fetched) in enumerate(results, start=1):
+                    item = plan["item"]
+                    print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
+                    resume_key = plan["resume_key"]
+                    existing_outputs = plan["existing_outputs"]
+                    existing_text_output = plan["existing_text_output"]
+                    existing_html_output = plan["existing_html_output"]
+
+                    if fetched is None:
+                        preferred_output = existing_text_output or existing_html_output or existing_outputs[0]
+                        output_path = str(preferred_output)
+                        status = "skipped_existing"
+                        gijiroku_storage.record_item(
+                            state_path,
+                            state,
+                            resume_key,
+                            {
+                                "title": item.title,
+                                "year_label": item.year_label,
+                                "url": item.url,
+                                "status": "saved",
+                                "output_rel_path": str(preferred_output.relative_to(downloads_dir)),
+                                "updated_at": now_ts(),
+                            },
+                        )
+                        writer.writerow(
+                            {
+                                "title": item.title,
+                                "year": item.year_label,
+                                "url": item.url,
+                                "status": status,
+                                "output": output_path,
+                                "error": "",
+                            }
+                        )
+                        handle.flush()
+                        emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
+                        continue
+
+                    status, output_path, error_msg = fetched
+                    gijiroku_storage.record_item(
+                        state_path,
+                        state,
+                        resume_key,
+                        {
+                            "title": item.title,
+                            "year_label": item.year_label,
+                            "url": item.url,
+                            "status": status,
+                            "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                            "updated_at": now_ts(),
+                        },
+                    )
+
                     writer.writerow(
                         {
                             "title": item.title,
@@ -734,61 +823,11 @@ def main() -> int:
                             "url": item.url,
                             "status": status,
                             "output": output_path,
-                            "error": "",
+                            "error": error_msg,
                         }
                     )
                     handle.flush()
                     emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
-                    continue
-                try:
-                    status, output_path = try_download_from_detail(
-                        page,
-                        item,
-                        meeting_download_dir,
-                        args.timeout_ms,
-                        stem,
-                    )
-                    if args.save_html and status == "not_found":
-                        page_year_dir = pages_dir / year_dir_name
-                        if meeting_group_dir:
-                            page_year_dir = page_year_dir / meeting_group_dir
-                        page_year_dir.mkdir(parents=True, exist_ok=True)
-                        gijiroku_storage.write_text(
-                            page_year_dir / (stem + ".html"),
-                            page.content(),
-                            compress=True,
-                        )
-                except PlaywrightTimeoutError as exc:
-                    status = "timeout"
-                    error_msg = str(exc)
-                except Exception as exc:
-                    status = "error"
-                    error_msg = str(exc)
-
-                state["items"][resume_key] = {
-                    "title": item.title,
-                    "year_label": item.year_label,
-                    "url": item.url,
-                    "status": status,
-                    "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                    "updated_at": now_ts(),
-                }
-                gijiroku_storage.save_state(state_path, state)
-
-                writer.writerow(
-                    {
-                        "title": item.title,
-                        "year": item.year_label,
-                        "url": item.url,
-                        "status": status,
-                        "output": output_path,
-                        "error": error_msg,
-                    }
-                )
-                handle.flush()
-                emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
-                if args.delay_seconds > 0 and idx < len(work_items):
-                    time.sleep(args.delay_seconds)
 
         context.close()
         browser.close()
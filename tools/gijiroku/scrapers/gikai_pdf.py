@@ -26,7 +26,6 @@ import csv
 import json
 import re
 import sys
-import time
 from collections import deque
 from dataclasses import asdict
 from pathlib import Path
@@ -39,6 +38,7 @@ SCRAPER_DIR = Path(__file__).resolve().parent
 MODULE_DIR = SCRAPER_DIR.parent
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+import fetch_pipeline  # noqa: E402
 import gijiroku_planning  # noqa: E402
 import gijiroku_storage  # noqa: E402
 import gijiroku_targets  # noqa: E402
@@ -50,14 +50,12 @@ from kami_city_pdf import (  # noqa: E402
     PdfMeetingItem,
     attachment_id,
     clean_pdf_label,
-    composed_minutes_text,
     emit_progress,
-    extract_pdf_text,
     extract_year_info,
+    fetch_pdf_minutes,
     looks_like_generic_minutes_page,
     now_ts,
     page_title,
-    request_bytes,
     request_text,
 )
 
@@ -93,6 +91,12 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--save-html", action="store_true", help="互換用（未使用）")
     parser.add_argument("--headful", action="store_true", help="互換用（HTTPなので無視）")
     parser.add_argument("--no-resume", action="store_true", help="既存の保存結果を無視して取り直す")
+    parser.add_argument(
+        "--fetch-parallel",
+        type=int,
+        default=fetch_pipeline.default_parallel(),
+        help="本文取得の同時接続数。開始間隔は --delay-seconds のまま（既定は MIYABE_MINUTES_FETCH_PARALLEL または 2）。",
+    )
     return parser
 
 
@@ -209,7 +213,13 @@ def main() -> int:
 
     saved_count = 0
     status_counts: dict[str, int] = {}
-    with result_csv.open("w", encoding="utf-8", newline="") as handle:
+    with result_csv.open("w", encoding="utf-8", newline="") as handle, fetch_pipeline.FetchPipeline(
+        session,
+        delay_seconds=args.delay_seconds,
+        parallel=args.fetch_parallel,
+        robots_txt_url=str(target.get("robots_txt_url") or ""),
+        timeout_seconds=max(args.timeout_ms / 1000.0, 1.0),
+    ) as pipeline:
         writer = csv.DictWriter(handle, fieldnames=["title", "year", "url", "status", "output", "pdf", "error"])
         writer.writeheader()
 
@@ -229,43 +239,29 @@ def main() -> int:
         saved_count = 0 if args.no_resume else sum(1 for plan in planned_items if plan.get("existing_output") is not None)
         emit_progress(saved_count, len(meeting_items), state_path, state)
 
-        for idx, plan in enumerate(work_items, start=1):
+        results = pipeline.map(
+            lambda plan: fetch_pdf_minutes(pipeline, plan, args.timeout_ms, no_resume=args.no_resume),
+            work_items,
+        )
+        for idx, (plan, (status, output_path, error_msg)) in enumerate(results, start=1):
             item = plan["item"]
             print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
-            text_base = plan["text_base"]
             pdf_path = plan["pdf_path"]
-            existing_output = plan["existing_output"]
-            status = ""
-            output_path = ""
-            error_msg = ""
-            if not args.no_resume and existing_output is not None:
-                status = "skipped_existing"
-                output_path = str(existing_output)
-            else:
-                try:
-                    pdf_bytes = request_bytes(session, item.url, args.timeout_ms)
-                    gijiroku_storage.write_bytes(pdf_path, pdf_bytes, compress=False)
-                    extracted = extract_pdf_text(pdf_bytes)
-                    if not extracted:
-                        status = "empty_pdf_text"
-                    else:
-                        dest = gijiroku_storage.write_text(text_base, composed_minutes_text(item, extracted), compress=True)
-                        output_path = str(dest)
-                        status = "saved_text"
-                except Exception as exc:
-                    status = "error"
-                    error_msg = str(exc)
             if status:
                 status_counts[status] = status_counts.get(status, 0) + 1
-            state["items"][plan["resume_key"]] = {
-                "title": item.title,
-                "year_label": item.year_label,
-                "url": item.url,
-                "status": status,
-                "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                "updated_at": now_ts(),
-            }
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.record_item(
+                state_path,
+                state,
+                plan["resume_key"],
+                {
+                    "title": item.title,
+                    "year_label": item.year_label,
+                    "url": item.url,
+                    "status": status,
+                    "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                    "updated_at": now_ts(),
+                },
+            )
             writer.writerow(
                 {
                     "title": item.title,
@@ -281,8 +277,6 @@ def main() -> int:
             if status == "saved_text":
                 saved_count += 1
             emit_progress(saved_count, len(meeting_items), state_path, state)
-            if args.delay_seconds > 0 and idx < len(work_items):
-                time.sleep(args.delay_seconds)
 
     validation = gijiroku_storage.apply_classified_scrape_validation(
         state_path,
@@ -29,6 +29,7 @@ MODULE_DIR = SCRAPER_DIR.parent
 # package install ではなく tools ツリー相対で import できるようにする。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+import browser_pool
 import gijiroku_planning
 import gijiroku_storage
 import gijiroku_targets
@@ -67,10 +68,7 @@ def emit_progress(
     print(f"[PROGRESS] unit=meeting current={max(0, current)} total={max(0, total)}", flush=True)
     if state_path is not None:
         if state is not None:
-            state["progress_current"] = max(0, int(current))
-            state["progress_total"] = max(0, int(total))
-            state["progress_unit"] = "meeting"
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.set_progress(state_path, state, current=current, total=total, unit="meeting")
         else:
             gijiroku_storage.update_progress_state(state_path, current=current, total=total, unit="meeting")
 
@@ -400,11 +398,11 @@ def fragment_to_text(title: str, body_html: str, page_no: int | None) -> str:
     return "\n".join(lines).strip()
 
 
-def fetch_council_index_text(page, api_root: str, item: MeetingItem, timeout_ms: int) -> str:
+def fetch_council_index_text(request_context, api_root: str, item: MeetingItem, timeout_ms: int) -> str:
     if item.tenant_id is None or item.council_id is None:
         return ""
     data = api_post(
-        page.request,
+        request_context,
         api_root,
         "minutes/get_index",
         {
@@ -421,17 +419,17 @@ def fetch_council_index_text(page, api_root: str, item: MeetingItem, timeout_ms:
     return html_to_text(str(council_index.get("council_index", "") or ""))
 
 
-def fetch_schedule_minutes(page, api_root: str, item: MeetingItem, timeout_ms: int) -> tuple[int, str]:
+def fetch_schedule_minutes(request_context, api_root: str, item: MeetingItem, timeout_ms: int) -> tuple[int, str]:
     if item.tenant_id is None or item.council_id is None or item.schedule_id is None:
         return 0, ""
 
     if "目次" in item.title:
-        index_text = fetch_council_index_text(page, api_root, item, timeout_ms)
+        index_text = fetch_council_index_text(request_context, api_root, item, timeout_ms)
         if index_text:
             return 1, index_text
 
     minute_data = api_post(
-        page.request,
+        request_context,
         api_root,
         "minutes/get_minute",
         {
@@ -463,7 +461,7 @@ def fetch_schedule_minutes(page, api_root: str, item: MeetingItem, timeout_ms: i
 
     if not fragment_sections:
         fallback_data = api_post(
-            page.request,
+            request_context,
             api_root,
             "minutes/get_schedule",
             {
@@ -515,6 +513,53 @@ def save_debug_json(path: Path, data: dict) -> None:
     gijiroku_storage.write_json(path, data, compress=True)
 
 
+def fetch_meeting(
+    worker: browser_pool.PlaywrightWorker,
+    plan: dict,
+    api_root: str,
+    timeout_ms: int,
+    debug_dir: Path | None,
+) -> tuple[str, str, str, int, int]:
+    """会議 1 件を取得・保存し、(status, output, error, schedules, fragments) を返す。browser pool の worker で動く。"""
+    item: MeetingItem = plan["item"]
+    schedule_count = 0
+    fragment_count = 0
+    try:
+        if item.tenant_id is None or item.council_id is None or item.schedule_id is None:
+            raise RuntimeError("meeting item に tenant_id / council_id / schedule_id がありません。")
+
+        schedule_count = 1
+        fragment_count, section_text = fetch_schedule_minutes(worker.request, api_root, item, timeout_ms)
+        if not section_text:
+            return "not_found", "", "", schedule_count, fragment_count
+        dest = gijiroku_storage.write_text(
+            plan["meeting_download_dir"] / (plan["stem"] + ".txt"),
+            build_meeting_text(item, section_text),
+            compress=True,
+        )
+        return "saved_text", str(dest), "", schedule_count, fragment_count
+    except PlaywrightTimeoutError as exc:
+        return "timeout", "", str(exc), schedule_count, fragment_count
+    except Exception as exc:
+        error_msg = str(exc)
+        if debug_dir is not None:
+            debug_path = debug_dir / plan["year_dir_name"]
+            if plan["meeting_group_dir"]:
+                debug_path = debug_path / plan["meeting_group_dir"]
+            save_debug_json(
+                debug_path / (plan["stem"] + ".json"),
+                {
+                    "title": item.title,
+                    "year_label": item.year_label,
+                    "url": item.url,
+                    "tenant_id": item.tenant_id,
+                    "council_id": item.council_id,
+                    "error": error_msg,
+                },
+            )
+        return "error", "", error_msg, schedule_count, fragment_count
+
+
 def build_parser() -> argparse.ArgumentParser:
     default_slug = gijiroku_targets.default_slug_for_system("kaigiroku.net")
     parser = argparse.ArgumentParser(
@@ -575,6 +620,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="既存の保存結果を無視して最初から取り直す",
     )
+    parser.add_argument(
+        "--page-pool",
+        type=int,
+        default=browser_pool.default_pool_size(),
+        help="本文 API を並べて呼ぶ数。ホスト単位の開始間隔は --delay-seconds のまま（既定は MIYABE_PLAYWRIGHT_POOL または 2）",
+    )
     return parser
 
 
@@ -614,7 +665,7 @@ def main() -> int:
     print(f"[INFO] Base URL: {target['base_url']}")
 
     with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=not args.headful)
+        browser, _ = browser_pool.launch_browser(playwright, headless=not args.headful)
         context = browser.new_context(accept_downloads=False, locale="ja-JP", user_agent=DEFAULT_USER_AGENT)
         page = context.new_page()
         page.set_default_timeout(args.timeout_ms)
@@ -635,65 +686,117 @@ def main() -> int:
         emit_progress(0, len(meeting_items), state_path, state)
 
         api_root = source_api_root(str(target["source_url"]))
+        host = browser_pool.url_host(api_root)
+        pool_size = browser_pool.pool_size_for_host(host, args.page_pool)
+        # 本文は API だけで取れるので、worker はブラウザを持たない APIRequestContext にする。
+        pool = browser_pool.PlaywrightPool(
+            browser_pool.request_worker_opener(
+                storage_state=context.storage_state(),
+                user_agent=DEFAULT_USER_AGENT,
+                extra_http_headers={"Accept-Language": "ja-JP"},
+            ),
+            parallel=pool_size,
+            delay_seconds=args.delay_seconds,
+            inline_worker=browser_pool.PlaywrightWorker(request=page.request, page=page),
+        )
+        try:
+            print(f"[INFO] Request pool: {pool_size} (host={host})", flush=True)
+
+            with result_csv.open("w", encoding="utf-8", newline="") as handle:
+                writer = csv.DictWriter(
+                    handle,
+                    fieldnames=["title", "year", "url", "status", "output", "error", "schedules", "fragments"],
+                )
+                writer.writeheader()
+
+                planned_items = [
+                    gijiroku_planning.attach_named_outputs(plan)
+                    for plan in gijiroku_planning.build_base_plans(meeting_items, downloads_dir)
+                ]
+                previous_missing = gijiroku_planning.previous_missing_count(state)
+                planned_items, work_items, missing_count = gijiroku_planning.select_work_items(
+                    planned_items,
+                    no_resume=args.no_resume,
+                    previous_missing_count=previous_missing,
+                )
+                date_range = gijiroku_planning.describe_date_range(planned_items)
+                if date_range:
+                    print(f"[INFO] Discovered meeting date range: {date_range}", flush=True)
+                gijiroku_planning.save_plan_summary(state_path, state, planned_items, missing_count, previous_missing)
+                if missing_count > 0:
+                    work_mode = gijiroku_planning.work_mode_label(missing_count, previous_missing)
+                    if work_mode == "update_check":
+                        print(f"[INFO] Update check found new outputs: {missing_count}/{len(planned_items)}", flush=True)
+                    else:
+                        print(f"[INFO] Resume missing outputs first: {missing_count}/{len(planned_items)}", flush=True)
+                if not args.no_resume and not work_items:
+                    print("[INFO] All expected outputs already exist; skipping download loop.", flush=True)
+                    emit_progress(len(meeting_items), len(meeting_items), state_path, state)
+
+                def skips_fetch(plan: dict) -> bool:
+                    return not args.no_resume and bool(plan["existing_outputs"])
+
+                results = pool.map(
+                    lambda worker, plan: None
+                    if skips_fetch(plan)
+                    else fetch_meeting(worker, plan, api_root, args.timeout_ms, debug_dir if args.save_debug_json else None),
+                    work_items,
+                    host_of=lambda plan: None if skips_fetch(plan) else host,
+                )
+                for idx, (plan, fetched) in enumerate(results, start=1):
+                    item = plan["item"]
+                    print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
+                    resume_key = plan["resume_key"]
+                    existing_outputs = plan["existing_outputs"]
+                    if fetched is None:
+                        output_path = str(existing_outputs[0])
+                        status = "skipped_existing"
+                        gijiroku_storage.record_item(
+                            state_path,
+                            state,
+                            resume_key,
+                            {
+                                "title": item.title,
+                                "year_label": item.year_label,
+                                "held_on": item.held_on,
+                                "url": item.url,
+                                "status": "saved",
+                                "output_rel_path": str(existing_outputs[0].relative_to(downloads_dir)),
+                                "updated_at": now_ts(),
+                            },
+                        )
+                        writer.writerow(
+                            {
+                                "title": item.title,
+                                "year": item.year_label,
+                                "url": item.url,
+                                "status": status,
+                                "output": output_path,
+                                "error": "",
+                                "schedules": 0,
+                                "fragments": 0,
+                            }
+                        )
+                        handle.flush()
+                        emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
+                        continue
+
+                    status, output_path, error_msg, schedule_count, fragment_count = fetched
+                    gijiroku_storage.record_item(
+                        state_path,
+                        state,
+                        resume_key,
+                        {
+                                "title": item.title,
+                                "year_label": item.year_label,
+                                "held_on": item.held_on,
+                                "url": item.url,
+                                "status": status,
+                                "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                            "updated_at": now_ts(),
+                        },
+                    )
 
-        with result_csv.open("w", encoding="utf-8", newline="") as handle:
-            writer = csv.DictWriter(
-                handle,
-                fieldnames=["title", "year", "url", "status", "output", "error", "schedules", "fragments"],
-            )
-            writer.writeheader()
-
-            planned_items = [
-                gijiroku_planning.attach_named_outputs(plan)
-                for plan in gijiroku_planning.build_base_plans(meeting_items, downloads_dir)
-            ]
-            previous_missing = gijiroku_planning.previous_missing_count(state)
-            planned_items, work_items, missing_count = gijiroku_planning.select_work_items(
-                planned_items,
-                no_resume=args.no_resume,
-                previous_missing_count=previous_missing,
-            )
-            date_range = gijiroku_planning.describe_date_range(planned_items)
-            if date_range:
-                print(f"[INFO] Discovered meeting date range: {date_range}", flush=True)
-            gijiroku_planning.save_plan_summary(state_path, state, planned_items, missing_count, previous_missing)
-            if missing_count > 0:
-                work_mode = gijiroku_planning.work_mode_label(missing_count, previous_missing)
-                if work_mode == "update_check":
-                    print(f"[INFO] Update check found new outputs: {missing_count}/{len(planned_items)}", flush=True)
-                else:
-                    print(f"[INFO] Resume missing outputs first: {missing_count}/{len(planned_items)}", flush=True)
-            if not args.no_resume and not work_items:
-                print("[INFO] All expected outputs already exist; skipping download loop.", flush=True)
-                emit_progress(len(meeting_items), len(meeting_items), state_path, state)
-
-            for idx, plan in enumerate(work_items, start=1):
-                item = plan["item"]
-                print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
-                status = ""
-                output_path = ""
-                error_msg = ""
-                schedule_count = 0
-                fragment_count = 0
-                year_dir_name = plan["year_dir_name"]
-                meeting_group_dir = plan["meeting_group_dir"]
-                meeting_download_dir = plan["meeting_download_dir"]
-                stem = plan["stem"]
-                resume_key = plan["resume_key"]
-                existing_outputs = plan["existing_outputs"]
-                if not args.no_resume and existing_outputs:
-                    output_path = str(existing_outputs[0])
-                    status = "skipped_existing"
-                    state["items"][resume_key] = {
-                        "title": item.title,
-                        "year_label": item.year_label,
-                        "held_on": item.held_on,
-                        "url": item.url,
-                        "status": "saved",
-                        "output_rel_path": str(existing_outputs[0].relative_to(downloads_dir)),
-                        "updated_at": now_ts(),
-                    }
-                    gijiroku_storage.save_state(state_path, state)
                     writer.writerow(
                         {
                             "title": item.title,
@@ -701,85 +804,17 @@ def main() -> int:
                             "url": item.url,
                             "status": status,
                             "output": output_path,
-                            "error": "",
-                            "schedules": 0,
-                            "fragments": 0,
+                            "error": error_msg,
+                            "schedules": schedule_count,
+                            "fragments": fragment_count,
                         }
                     )
                     handle.flush()
                     emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
-                    continue
-
-                try:
-                    if item.tenant_id is None or item.council_id is None or item.schedule_id is None:
-                        raise RuntimeError("meeting item に tenant_id / council_id / schedule_id がありません。")
-
-                    schedule_count = 1
-                    fragment_count, section_text = fetch_schedule_minutes(page, api_root, item, args.timeout_ms)
-
-                    if not section_text:
-                        status = "not_found"
-                    else:
-                        meeting_text = build_meeting_text(item, section_text)
-                        dest = gijiroku_storage.write_text(
-                            meeting_download_dir / (stem + ".txt"),
-                            meeting_text,
-                            compress=True,
-                        )
-                        output_path = str(dest)
-                        status = "saved_text"
-                except PlaywrightTimeoutError as exc:
-                    status = "timeout"
-                    error_msg = str(exc)
-                except Exception as exc:
-                    status = "error"
-                    error_msg = str(exc)
-                    if args.save_debug_json:
-                        debug_path = debug_dir / year_dir_name
-                        if meeting_group_dir:
-                            debug_path = debug_path / meeting_group_dir
-                        debug_path = debug_path / (stem + ".json")
-                        save_debug_json(
-                            debug_path,
-                            {
-                                "title": item.title,
-                                "year_label": item.year_label,
-                                "url": item.url,
-                                "tenant_id": item.tenant_id,
-                                "council_id": item.council_id,
-                                "error": error_msg,
-                            },
-                        )
-
-                state["items"][resume_key] = {
-                        "title": item.title,
-                        "year_label": item.year_label,
-                        "held_on": item.held_on,
-                        "url": item.url,
-                        "status": status,
-                        "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                    "updated_at": now_ts(),
-                }
-                gijiroku_storage.save_state(state_path, state)
-
-                writer.writerow(
-                    {
-                        "title": item.title,
-                        "year": item.year_label,
-                        "url": item.url,
-                        "status": status,
-                        "output": output_path,
-                        "error": error_msg,
-                        "schedules": schedule_count,
-                        "fragments": fragment_count,
-                    }
-                )
-                handle.flush()
-                emit_progress(len(meeting_items) - len(work_items) + idx, len(meeting_items), state_path, state)
-                if args.delay_seconds > 0 and idx < len(work_items):
-                    time.sleep(args.delay_seconds)
-
-        browser.close()
+        finally:
+            # 途中で例外になっても worker thread の CDP 接続とブラウザを閉じる。
+            pool.close()
+            browser.close()
 
     print(f"[DONE] Saved index: {index_json}")
     print(f"[DONE] Result log : {result_csv}")
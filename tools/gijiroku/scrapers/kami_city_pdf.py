@@ -28,6 +28,7 @@ MODULE_DIR = SCRAPER_DIR.parent
 # scraper ディレクトリとその親の両方を import 対象にする。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+import fetch_pipeline
 import gijiroku_planning
 import gijiroku_storage
 import gijiroku_targets
@@ -139,10 +140,7 @@ def emit_progress(current: int, total: int, state_path: Path | None = None, stat
     if state_path is None:
         return
     if state is not None:
-        state["progress_current"] = max(0, int(current))
-        state["progress_total"] = max(0, int(total))
-        state["progress_unit"] = "meeting"
-        gijiroku_storage.save_state(state_path, state)
+        gijiroku_storage.set_progress(state_path, state, current=current, total=total, unit="meeting")
     else:
         gijiroku_storage.update_progress_state(state_path, current=current, total=total, unit="meeting")
 
@@ -160,12 +158,22 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--save-html", action="store_true", help="取得した一覧ページHTMLを work 側へ保存する")
     parser.add_argument("--headful", action="store_true", help="互換オプション。HTTPスクレイパーなので無視します")
     parser.add_argument("--no-resume", action="store_true", help="既存の保存結果を無視して取り直す")
+    parser.add_argument(
+        "--fetch-parallel",
+        type=int,
+        default=fetch_pipeline.default_parallel(),
+        help="本文取得の同時接続数。開始間隔は --delay-seconds のまま（既定は MIYABE_MINUTES_FETCH_PARALLEL または 2）。",
+    )
     return parser
 
 
 def request_text(session: requests.Session, url: str, timeout_ms: int) -> str:
     response = session.get(url, timeout=max(timeout_ms / 1000.0, 1.0))
     response.raise_for_status()
+    return decode_response_text(response)
+
+
+def decode_response_text(response: requests.Response) -> str:
     raw = response.content
     for encoding in ("utf-8", response.apparent_encoding, response.encoding, "cp932"):
         if not encoding:
@@ -371,6 +379,30 @@ def composed_minutes_text(item: PdfMeetingItem, pdf_text: str) -> str:
     return "\n".join(header) + "\n\n" + pdf_text.strip() + "\n"
 
 
+def fetch_pdf_minutes(
+    fetcher: fetch_pipeline.FetchPipeline,
+    plan: dict,
+    timeout_ms: int,
+    *,
+    no_resume: bool,
+) -> tuple[str, str, str]:
+    """PDF 1 件を取得して本文を保存し、(status, output, error) を返す。fetch pipeline の worker で動く。"""
+    existing_output = plan["existing_output"]
+    if not no_resume and existing_output is not None:
+        return "skipped_existing", str(existing_output), ""
+    item = plan["item"]
+    try:
+        pdf_bytes = request_bytes(fetcher, item.url, timeout_ms)
+        gijiroku_storage.write_bytes(plan["pdf_path"], pdf_bytes, compress=False)
+        extracted = extract_pdf_text(pdf_bytes)
+        if not extracted:
+            return "empty_pdf_text", "", ""
+        dest = gijiroku_storage.write_text(plan["text_base"], composed_minutes_text(item, extracted), compress=True)
+    except Exception as exc:
+        return "error", "", str(exc)
+    return "saved_text", str(dest), ""
+
+
 def normalize_year_dir(year_label: str) -> str:
     return sanitize_filename(year_label or "unknown", "unknown")
 
@@ -435,7 +467,13 @@ def main() -> int:
     state = gijiroku_storage.load_state(state_path)
     emit_progress(0, len(meeting_items), state_path, state)
 
-    with result_csv.open("w", encoding="utf-8", newline="") as handle:
+    with result_csv.open("w", encoding="utf-8", newline="") as handle, fetch_pipeline.FetchPipeline(
+        session,
+        delay_seconds=args.delay_seconds,
+        parallel=args.fetch_parallel,
+        robots_txt_url=str(target.get("robots_txt_url") or ""),
+        timeout_seconds=max(args.timeout_ms / 1000.0, 1.0),
+    ) as pipeline:
         writer = csv.DictWriter(
             handle,
             fieldnames=["title", "year", "url", "status", "output", "pdf", "error", "documents", "fragments"],
@@ -476,47 +514,32 @@ def main() -> int:
         status_counts: dict[str, int] = {}
         emit_progress(saved_count, len(meeting_items), state_path, state)
 
-        for idx, plan in enumerate(work_items, start=1):
+        results = pipeline.map(
+            lambda plan: fetch_pdf_minutes(pipeline, plan, args.timeout_ms, no_resume=args.no_resume),
+            work_items,
+        )
+        for idx, (plan, (status, output_path, error_msg)) in enumerate(results, start=1):
             item = plan["item"]
             print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
             resume_key = plan["resume_key"]
-            text_base = plan["text_base"]
             pdf_path = plan["pdf_path"]
-            existing_output = plan["existing_output"]
-            status = ""
-            output_path = ""
-            error_msg = ""
-
-            if not args.no_resume and existing_output is not None:
-                status = "skipped_existing"
-                output_path = str(existing_output)
-            else:
-                try:
-                    pdf_bytes = request_bytes(session, item.url, args.timeout_ms)
-                    gijiroku_storage.write_bytes(pdf_path, pdf_bytes, compress=False)
-                    extracted = extract_pdf_text(pdf_bytes)
-                    if not extracted:
-                        status = "empty_pdf_text"
-                    else:
-                        dest = gijiroku_storage.write_text(text_base, composed_minutes_text(item, extracted), compress=True)
-                        output_path = str(dest)
-                        status = "saved_text"
-                except Exception as exc:
-                    status = "error"
-                    error_msg = str(exc)
 
             if status:
                 status_counts[status] = status_counts.get(status, 0) + 1
-            state["items"][resume_key] = {
-                "title": item.title,
-                "year_label": item.year_label,
-                "url": item.url,
-                "status": status,
-                "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                "pdf_rel_path": str(pdf_path.relative_to(work_dir)) if pdf_path.exists() else "",
-                "updated_at": now_ts(),
-            }
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.record_item(
+                state_path,
+                state,
+                resume_key,
+                {
+                    "title": item.title,
+                    "year_label": item.year_label,
+                    "url": item.url,
+                    "status": status,
+                    "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                    "pdf_rel_path": str(pdf_path.relative_to(work_dir)) if pdf_path.exists() else "",
+                    "updated_at": now_ts(),
+                },
+            )
 
             writer.writerow(
                 {
@@ -535,8 +558,6 @@ def main() -> int:
             if status == "saved_text":
                 saved_count += 1
             emit_progress(saved_count, len(meeting_items), state_path, state)
-            if args.delay_seconds > 0 and idx < len(work_items):
-                time.sleep(args.delay_seconds)
 
     validation = gijiroku_storage.apply_classified_scrape_validation(
         state_path,
@@ -18,10 +18,8 @@ import sys
 import time
 from collections import deque
 from dataclasses import asdict, dataclass
-from http.cookiejar import CookieJar
 from pathlib import Path
 from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
-from urllib.request import HTTPCookieProcessor, Request, build_opener
 
 SCRAPER_DIR = Path(__file__).resolve().parent
 MODULE_DIR = SCRAPER_DIR.parent
@@ -29,9 +27,11 @@ MODULE_DIR = SCRAPER_DIR.parent
 # package install に頼らず、共有の会議録モジュールディレクトリを明示的に追加する。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+sys.path.append(str(MODULE_DIR.parent))
 import gijiroku_planning
 import gijiroku_storage
 import gijiroku_targets
+import http_transport
 
 
 DEFAULT_WAIT_MS = 10_000
@@ -87,10 +87,7 @@ def emit_progress(
     print(f"[PROGRESS] unit=meeting current={max(0, current)} total={max(0, total)}", flush=True)
     if state_path is not None:
         if state is not None:
-            state["progress_current"] = max(0, int(current))
-            state["progress_total"] = max(0, int(total))
-            state["progress_unit"] = "meeting"
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.set_progress(state_path, state, current=current, total=total, unit="meeting")
         else:
             gijiroku_storage.update_progress_state(state_path, current=current, total=total, unit="meeting")
 
@@ -142,16 +139,23 @@ def decode_html(body: bytes) -> str:
     return body.decode("utf-8", errors="ignore")
 
 
-def build_http_client():
-    opener = build_opener(HTTPCookieProcessor(CookieJar()))
-    opener.addheaders = [
-        ("User-Agent", DEFAULT_USER_AGENT),
-        ("Accept-Language", "ja,en-US;q=0.9,en;q=0.8"),
-    ]
-    return opener
+def build_http_client() -> http_transport.HttpTransport:
+    # See.exe の session は cookie で持ち回るので、1 run で 1 つの transport を使い回す。
+    return http_transport.HttpTransport(
+        user_agent=DEFAULT_USER_AGENT,
+        headers={"Accept-Language": "ja,en-US;q=0.9,en;q=0.8"},
+        max_per_host=1,
+    )
 
 
-def request_text(opener, url: str, timeout_ms: int, *, data: dict[str, str] | None = None, referer: str | None = None) -> tuple[str, str]:
+def request_text(
+    client: http_transport.HttpTransport,
+    url: str,
+    timeout_ms: int,
+    *,
+    data: dict[str, str] | None = None,
+    referer: str | None = None,
+) -> tuple[str, str]:
     payload = None
     headers: dict[str, str] = {}
     if referer:
@@ -160,11 +164,14 @@ def request_text(opener, url: str, timeout_ms: int, *, data: dict[str, str] | No
         payload = urlencode(data, encoding="cp932").encode("ascii")
         headers["Content-Type"] = "application/x-www-form-urlencoded"
 
-    request = Request(url, data=payload, headers=headers)
-    with opener.open(request, timeout=max(timeout_ms / 1000.0, 1.0)) as response:
-        body = response.read()
-        final_url = response.geturl()
-    return decode_html(body), final_url
+    timeout = max(timeout_ms / 1000.0, 1.0)
+    if payload is None:
+        response = client.get(url, headers=headers, timeout=timeout)
+    else:
+        response = client.post(url, data=payload, headers=headers, timeout=timeout)
+    # urllib の client と同じく 4xx / 5xx は例外にする。
+    response.raise_for_status()
+    return decode_html(response.content), response.url
 
 
 def extract_title(page_html: str) -> str:
@@ -312,9 +319,9 @@ def saved_output_count(planned_items: list[dict]) -> int:
     return sum(1 for plan in planned_items if plan.get("existing_output") is not None)
 
 
-def resolve_see_context(opener, target: dict, timeout_ms: int) -> SeeContext:
+def resolve_see_context(client, target: dict, timeout_ms: int) -> SeeContext:
     source_url = str(target["source_url"])
-    source_html, resolved_source_url = request_text(opener, source_url, timeout_ms)
+    source_html, resolved_source_url = request_text(client, source_url, timeout_ms)
 
     if "See.exe" in urlsplit(resolved_source_url).path:
         see_url = resolved_source_url
@@ -328,7 +335,7 @@ def resolve_see_context(opener, target: dict, timeout_ms: int) -> SeeContext:
     if not code:
         raise RuntimeError("kensakusystem の Code パラメータを取得できませんでした。")
 
-    see_html, resolved_see_url = request_text(opener, see_url, timeout_ms, referer=resolved_source_url)
+    see_html, resolved_see_url = request_text(client, see_url, timeout_ms, referer=resolved_source_url)
     post_action = extract_viewtree_action(see_html)
     if post_action:
         post_url = urljoin(resolved_see_url, post_action)
@@ -345,9 +352,9 @@ def resolve_see_context(opener, target: dict, timeout_ms: int) -> SeeContext:
     )
 
 
-def fetch_tree_page(opener, context: SeeContext, depth: str, timeout_ms: int) -> str:
+def fetch_tree_page(client, context: SeeContext, depth: str, timeout_ms: int) -> str:
     page_html, _ = request_text(
-        opener,
+        client,
         context.post_url,
         timeout_ms,
         data={
@@ -361,8 +368,8 @@ def fetch_tree_page(opener, context: SeeContext, depth: str, timeout_ms: int) ->
     return page_html
 
 
-def discover_meeting_items(opener, target: dict, timeout_ms: int, max_meetings: int = 0) -> list[MeetingItem]:
-    context = resolve_see_context(opener, target, timeout_ms)
+def discover_meeting_items(client, target: dict, timeout_ms: int, max_meetings: int = 0) -> list[MeetingItem]:
+    context = resolve_see_context(client, target, timeout_ms)
     pending: deque[tuple[str | None, str]] = deque([(None, context.root_html)])
     seen_depths: set[str] = set()
     seen_urls: set[str] = set()
@@ -385,7 +392,7 @@ def discover_meeting_items(opener, target: dict, timeout_ms: int, max_meetings:
                 continue
             seen_depths.add(depth_key)
             try:
-                child_html = fetch_tree_page(opener, context, depth, timeout_ms)
+                child_html = fetch_tree_page(client, context, depth, timeout_ms)
             except Exception as exc:
                 print(f"[WARN] tree fetch failed: {depth_key} ({exc})")
                 continue
@@ -426,21 +433,21 @@ def extract_document_body(page_html: str) -> str:
     return html_to_text(body_only).strip()
 
 
-def fetch_meeting_text(opener, item: MeetingItem, timeout_ms: int) -> tuple[int, str]:
-    result_frame_html, result_frame_url = request_text(opener, item.url, timeout_ms, referer=item.url)
+def fetch_meeting_text(client, item: MeetingItem, timeout_ms: int) -> tuple[int, str]:
+    result_frame_html, result_frame_url = request_text(client, item.url, timeout_ms, referer=item.url)
     text_frame_src = first_frame_src(result_frame_html, "r_TextFrame.exe")
     if not text_frame_src:
         raise RuntimeError(f"ResultFrame から本文フレームを取得できませんでした: {item.url}")
 
     text_frame_url = urljoin(result_frame_url, text_frame_src)
-    text_frame_html, resolved_text_frame_url = request_text(opener, text_frame_url, timeout_ms, referer=result_frame_url)
+    text_frame_html, resolved_text_frame_url = request_text(client, text_frame_url, timeout_ms, referer=result_frame_url)
     get_text_src = first_frame_src(text_frame_html, "GetText3.exe")
     if not get_text_src:
         raise RuntimeError(f"r_TextFrame から GetText3 を取得できませんでした: {text_frame_url}")
 
     get_text_url = urljoin(resolved_text_frame_url, get_text_src)
     full_text_url = build_print_all_url(get_text_url)
-    full_html, _ = request_text(opener, full_text_url, timeout_ms, referer=resolved_text_frame_url)
+    full_html, _ = request_text(client, full_text_url, timeout_ms, referer=resolved_text_frame_url)
     body_text = extract_document_body(full_html)
     if not body_text:
         raise RuntimeError(f"本文テキストを抽出できませんでした: {item.url}")
@@ -547,79 +554,137 @@ def main() -> int:
     print(f"[INFO] Source URL: {target['source_url']}")
     print(f"[INFO] Base URL: {target['base_url']}")
 
-    opener = build_http_client()
+    # 途中で例外になっても keep-alive 接続を閉じる。
+    with build_http_client() as client:
+        print("[INFO] 会議一覧を収集中...")
+        meeting_items = discover_meeting_items(client, target, args.timeout_ms, args.max_meetings)
+        print(f"[INFO] 会議候補 {len(meeting_items)} 件")
 
-    print("[INFO] 会議一覧を収集中...")
-    meeting_items = discover_meeting_items(opener, target, args.timeout_ms, args.max_meetings)
-    print(f"[INFO] 会議候補 {len(meeting_items)} 件")
+        index_json.parent.mkdir(parents=True, exist_ok=True)
+        index_json.write_text(
+            json.dumps([asdict(item) for item in meeting_items], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        emit_progress(0, len(meeting_items), state_path, state)
 
-    index_json.parent.mkdir(parents=True, exist_ok=True)
-    index_json.write_text(
-        json.dumps([asdict(item) for item in meeting_items], ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    emit_progress(0, len(meeting_items), state_path, state)
+        with result_csv.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.DictWriter(
+                handle,
+                fieldnames=["title", "year", "url", "status", "output", "error", "documents", "fragments"],
+            )
+            writer.writeheader()
+
+            planned_items = [
+                gijiroku_planning.attach_text_output(plan)
+                for plan in gijiroku_planning.build_base_plans(meeting_items, downloads_dir)
+            ]
+            previous_missing = gijiroku_planning.previous_missing_count(state)
+            planned_items, work_items, missing_count = gijiroku_planning.select_work_items(
+                planned_items,
+                no_resume=args.no_resume,
+                previous_missing_count=previous_missing,
+            )
+            date_range = gijiroku_planning.describe_date_range(planned_items)
+            if date_range:
+                print(f"[INFO] Discovered meeting date range: {date_range}", flush=True)
+            gijiroku_planning.save_plan_summary(state_path, state, planned_items, missing_count, previous_missing)
+            if missing_count > 0:
+                work_mode = gijiroku_planning.work_mode_label(missing_count, previous_missing)
+                if work_mode == "update_check":
+                    print(f"[INFO] Update check found new outputs: {missing_count}/{len(planned_items)}", flush=True)
+                else:
+                    print(f"[INFO] Resume missing outputs first: {missing_count}/{len(planned_items)}", flush=True)
+            if not args.no_resume and not work_items:
+                print("[INFO] All expected outputs already exist; skipping download loop.", flush=True)
+                emit_progress(len(meeting_items), len(meeting_items), state_path, state)
+
+            saved_count = saved_output_count(planned_items)
+            emit_progress(saved_count, len(meeting_items), state_path, state)
 
-    with result_csv.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=["title", "year", "url", "status", "output", "error", "documents", "fragments"],
-        )
-        writer.writeheader()
+            for idx, plan in enumerate(work_items, start=1):
+                item = plan["item"]
+                print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
+                status = ""
+                output_path = ""
+                error_msg = ""
+                fragment_count = 0
+                year_dir_name = plan["year_dir_name"]
+                meeting_group_dir = plan["meeting_group_dir"]
+                stem = plan["stem"]
+                resume_key = plan["resume_key"]
+                dest_base = plan["dest_base"]
+                existing_output = plan["existing_output"]
+
+                if not args.no_resume and existing_output is not None:
+                    output_path = str(existing_output)
+                    status = "skipped_existing"
+                    gijiroku_storage.record_item(
+                        state_path,
+                        state,
+                        resume_key,
+                        {
+                            "title": item.title,
+                            "year_label": item.year_label,
+                            "url": item.url,
+                            "status": "saved_text",
+                            "output_rel_path": str(existing_output.relative_to(downloads_dir)),
+                            "updated_at": now_ts(),
+                        },
+                    )
+                    writer.writerow(
+                        {
+                            "title": item.title,
+                            "year": item.year_label,
+                            "url": item.url,
+                            "status": status,
+                            "output": output_path,
+                            "error": "",
+                            "documents": 1,
+                            "fragments": 0,
+                        }
+                    )
+                    handle.flush()
+                    saved_count += 1
+                    emit_progress(saved_count, len(meeting_items), state_path, state)
+                    continue
+
+                try:
+                    fragment_count, meeting_text = fetch_meeting_text(client, item, args.timeout_ms)
+                    dest = gijiroku_storage.write_text(dest_base, meeting_text, compress=True)
+                    output_path = str(dest)
+                    status = "saved_text"
+                    saved_count += 1
+                except Exception as exc:
+                    status = "error"
+                    error_msg = str(exc)
+                    if args.save_html:
+                        debug_path = pages_dir / year_dir_name
+                        if meeting_group_dir:
+                            debug_path = debug_path / meeting_group_dir
+                        try:
+                            debug_html, _ = request_text(client, item.url, args.timeout_ms, referer=item.url)
+                            gijiroku_storage.write_text(
+                                debug_path / (stem + ".html"),
+                                debug_html,
+                                compress=True,
+                            )
+                        except Exception:
+                            pass
+
+                gijiroku_storage.record_item(
+                    state_path,
+                    state,
+                    resume_key,
+                    {
+                        "title": item.title,
+                        "year_label": item.year_label,
+                        "url": item.url,
+                        "status": status,
+                        "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                        "updated_at": now_ts(),
+                    },
+                )
 
-        planned_items = [
-            gijiroku_planning.attach_text_output(plan)
-            for plan in gijiroku_planning.build_base_plans(meeting_items, downloads_dir)
-        ]
-        previous_missing = gijiroku_planning.previous_missing_count(state)
-        planned_items, work_items, missing_count = gijiroku_planning.select_work_items(
-            planned_items,
-            no_resume=args.no_resume,
-            previous_missing_count=previous_missing,
-        )
-        date_range = gijiroku_planning.describe_date_range(planned_items)
-        if date_range:
-            print(f"[INFO] Discovered meeting date range: {date_range}", flush=True)
-        gijiroku_planning.save_plan_summary(state_path, state, planned_items, missing_count, previous_missing)
-        if missing_count > 0:
-            work_mode = gijiroku_planning.work_mode_label(missing_count, previous_missing)
-            if work_mode == "update_check":
-                print(f"[INFO] Update check found new outputs: {missing_count}/{len(planned_items)}", flush=True)
-            else:
-                print(f"[INFO] Resume missing outputs first: {missing_count}/{len(planned_items)}", flush=True)
-        if not args.no_resume and not work_items:
-            print("[INFO] All expected outputs already exist; skipping download loop.", flush=True)
-            emit_progress(len(meeting_items), len(meeting_items), state_path, state)
-
-        saved_count = saved_output_count(planned_items)
-        emit_progress(saved_count, len(meeting_items), state_path, state)
-
-        for idx, plan in enumerate(work_items, start=1):
-            item = plan["item"]
-            print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
-            status = ""
-            output_path = ""
-            error_msg = ""
-            fragment_count = 0
-            year_dir_name = plan["year_dir_name"]
-            meeting_group_dir = plan["meeting_group_dir"]
-            stem = plan["stem"]
-            resume_key = plan["resume_key"]
-            dest_base = plan["dest_base"]
-            existing_output = plan["existing_output"]
-
-            if not args.no_resume and existing_output is not None:
-                output_path = str(existing_output)
-                status = "skipped_existing"
-                state["items"][resume_key] = {
-                    "title": item.title,
-                    "year_label": item.year_label,
-                    "url": item.url,
-                    "status": "saved_text",
-                    "output_rel_path": str(existing_output.relative_to(downloads_dir)),
-                    "updated_at": now_ts(),
-                }
-                gijiroku_storage.save_state(state_path, state)
                 writer.writerow(
                     {
                         "title": item.title,
@@ -627,66 +692,17 @@ def main() -> int:
                         "url": item.url,
                         "status": status,
                         "output": output_path,
-                        "error": "",
+                        "error": error_msg,
                         "documents": 1,
-                        "fragments": 0,
+                        "fragments": fragment_count,
                     }
                 )
                 handle.flush()
-                saved_count += 1
                 emit_progress(saved_count, len(meeting_items), state_path, state)
-                continue
-
-            try:
-                fragment_count, meeting_text = fetch_meeting_text(opener, item, args.timeout_ms)
-                dest = gijiroku_storage.write_text(dest_base, meeting_text, compress=True)
-                output_path = str(dest)
-                status = "saved_text"
-                saved_count += 1
-            except Exception as exc:
-                status = "error"
-                error_msg = str(exc)
-                if args.save_html:
-                    debug_path = pages_dir / year_dir_name
-                    if meeting_group_dir:
-                        debug_path = debug_path / meeting_group_dir
-                    try:
-                        debug_html, _ = request_text(opener, item.url, args.timeout_ms, referer=item.url)
-                        gijiroku_storage.write_text(
-                            debug_path / (stem + ".html"),
-                            debug_html,
-                            compress=True,
-                        )
-                    except Exception:
-                        pass
-
-            state["items"][resume_key] = {
-                "title": item.title,
-                "year_label": item.year_label,
-                "url": item.url,
-                "status": status,
-                "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                "updated_at": now_ts(),
-            }
-            gijiroku_storage.save_state(state_path, state)
-
-            writer.writerow(
-                {
-                    "title": item.title,
-                    "year": item.year_label,
-                    "url": item.url,
-                    "status": status,
-                    "output": output_path,
-                    "error": error_msg,
-                    "documents": 1,
-                    "fragments": fragment_count,
-                }
-            )
-            handle.flush()
-            emit_progress(saved_count, len(meeting_items), state_path, state)
-            if args.delay_seconds > 0 and idx < len(work_items):
-                time.sleep(args.delay_seconds)
+                if args.delay_seconds > 0 and idx < len(work_items):
+                    time.sleep(args.delay_seconds)
 
+    print(f"[INFO] HTTP {client.stats.summary()}", flush=True)
     print(f"[DONE] Saved index: {index_json}")
     print(f"[DONE] Result log : {result_csv}")
     return 0
@@ -22,6 +22,9 @@ SCRAPER_DIR = Path(__file__).resolve().parent
 MODULE_DIR = SCRAPER_DIR.parent
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+sys.path.append(str(MODULE_DIR.parent))
+import conditional_fetch
+import fetch_pipeline
 import gijiroku_planning
 import gijiroku_storage
 import gijiroku_targets
@@ -142,12 +145,52 @@ def build_minutes_text(item: MeetingItem, body: str) -> str:
     )
 
 
+def fetch_minutes(
+    fetcher: fetch_pipeline.FetchPipeline,
+    plan: dict,
+    timeout_seconds: float,
+    pages_dir: Path | None,
+) -> tuple[str, str, str, conditional_fetch.Validators]:
+    """会議 1 件を取得・保存し、(status, output, error, 検証子) を返す。fetch pipeline の worker で動く。
+
+    既存の出力があれば前回の検証子で条件付き GET を送り、304 か本文が同じなら書き直さない。"""
+    item: MeetingItem = plan["item"]
+    validators: conditional_fetch.Validators = plan.get("previous_validators", conditional_fetch.Validators())
+    output_path = ""
+    try:
+        result = conditional_fetch.conditional_get(
+            fetcher.get, item.url, previous=validators, timeout=timeout_seconds
+        )
+        validators = result.validators
+        if result.unchanged:
+            return result.status, str(plan["existing_outputs"][0]), "", validators
+        raw_html = decode_response(result.response)
+        body = parse_body(raw_html)
+        if not body:
+            raise RuntimeError("会議録本文を抽出できませんでした。")
+        destination = gijiroku_storage.write_text(
+            plan["meeting_download_dir"] / (plan["stem"] + ".txt"),
+            build_minutes_text(item, body),
+            compress=True,
+        )
+        output_path = str(destination)
+        if pages_dir is not None:
+            page_dir = pages_dir / plan["year_dir_name"]
+            if plan["meeting_group_dir"]:
+                page_dir = page_dir / plan["meeting_group_dir"]
+            gijiroku_storage.write_text(
+                page_dir / (plan["stem"] + ".html"),
+                raw_html,
+                compress=True,
+            )
+    except Exception as exc:
+        return "error", output_path, str(exc), validators
+    return "saved_text", output_path, "", validators
+
+
 def emit_progress(current: int, total: int, state_path: Path, state: dict) -> None:
     print(f"[PROGRESS] unit=meeting current={current} total={total}", flush=True)
-    state["progress_current"] = current
-    state["progress_total"] = total
-    state["progress_unit"] = "meeting"
-    gijiroku_storage.save_state(state_path, state)
+    gijiroku_storage.set_progress(state_path, state, current=current, total=total, unit="meeting")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -161,6 +204,12 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--headful", action="store_true", help="HTTP取得方式では互換性のため受け付けるだけです。")
     parser.add_argument("--save-html", action="store_true")
     parser.add_argument("--no-resume", action="store_true")
+    parser.add_argument(
+        "--fetch-parallel",
+        type=int,
+        default=fetch_pipeline.default_parallel(),
+        help="本文取得の同時接続数。開始間隔は --delay-seconds のまま（既定は MIYABE_MINUTES_FETCH_PARALLEL または 2）。",
+    )
     return parser
 
 
@@ -206,6 +255,10 @@ def main() -> int:
         existing = gijiroku_storage.existing_named_outputs(plan["meeting_download_dir"], plan["stem"])
         plan["existing_outputs"] = existing
         plan["needs_work"] = not existing
+        # --no-resume で取り直すときは、前回の検証子で条件付き GET にする。
+        plan["previous_validators"] = conditional_fetch.Validators.from_fields(
+            state["items"].get(plan["resume_key"]) if existing else None
+        )
     previous_missing = gijiroku_planning.previous_missing_count(state)
     plans, work_items, missing_count = gijiroku_planning.select_work_items(
         plans,
@@ -215,50 +268,36 @@ def main() -> int:
     gijiroku_planning.save_plan_summary(state_path, state, plans, missing_count, previous_missing)
     emit_progress(len(plans) - len(work_items), len(plans), state_path, state)
 
-    with result_csv.open("w", encoding="utf-8", newline="") as handle:
+    with result_csv.open("w", encoding="utf-8", newline="") as handle, fetch_pipeline.FetchPipeline(
+        session,
+        delay_seconds=args.delay_seconds,
+        parallel=args.fetch_parallel,
+        robots_txt_url=str(target.get("robots_txt_url") or ""),
+        timeout_seconds=timeout_seconds,
+    ) as pipeline:
         writer = csv.DictWriter(handle, fieldnames=["title", "year", "url", "status", "output", "error"])
         writer.writeheader()
-        for idx, plan in enumerate(work_items, start=1):
+        results = pipeline.map(
+            lambda plan: fetch_minutes(pipeline, plan, timeout_seconds, pages_dir if args.save_html else None),
+            work_items,
+        )
+        for idx, (plan, (status, output_path, error_text, validators)) in enumerate(results, start=1):
             item: MeetingItem = plan["item"]
-            status = ""
-            output_path = ""
-            error_text = ""
-            try:
-                detail = session.get(item.url, timeout=timeout_seconds)
-                detail.raise_for_status()
-                raw_html = decode_response(detail)
-                body = parse_body(raw_html)
-                if not body:
-                    raise RuntimeError("会議録本文を抽出できませんでした。")
-                destination = gijiroku_storage.write_text(
-                    plan["meeting_download_dir"] / (plan["stem"] + ".txt"),
-                    build_minutes_text(item, body),
-                    compress=True,
-                )
-                output_path = str(destination)
-                status = "saved_text"
-                if args.save_html:
-                    page_dir = pages_dir / plan["year_dir_name"]
-                    if plan["meeting_group_dir"]:
-                        page_dir = page_dir / plan["meeting_group_dir"]
-                    gijiroku_storage.write_text(
-                        page_dir / (plan["stem"] + ".html"),
-                        raw_html,
-                        compress=True,
-                    )
-            except Exception as exc:
-                status = "error"
-                error_text = str(exc)
-            state["items"][plan["resume_key"]] = {
-                "title": item.title,
-                "year_label": item.year_label,
-                "held_on": item.held_on,
-                "url": item.url,
-                "status": "saved" if status == "saved_text" else status,
-                "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                "updated_at": now_ts(),
-            }
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.record_item(
+                state_path,
+                state,
+                plan["resume_key"],
+                {
+                    "title": item.title,
+                    "year_label": item.year_label,
+                    "held_on": item.held_on,
+                    "url": item.url,
+                    "status": "saved" if status in {"saved_text", "not_modified", "unchanged"} else status,
+                    "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                    "updated_at": now_ts(),
+                    **validators.as_fields(),
+                },
+            )
             writer.writerow(
                 {
                     "title": item.title,
@@ -271,8 +310,6 @@ def main() -> int:
             )
             handle.flush()
             emit_progress(len(plans) - len(work_items) + idx, len(plans), state_path, state)
-            if args.delay_seconds > 0 and idx < len(work_items):
-                time.sleep(args.delay_seconds)
 
     print(f"[DONE] Saved index: {index_json}")
     print(f"[DONE] Result log : {result_csv}")
@@ -13,7 +13,6 @@ import csv
 import json
 import re
 import sys
-import time
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from urllib.parse import urljoin, urlsplit, urlunsplit
@@ -27,6 +26,9 @@ MODULE_DIR = SCRAPER_DIR.parent
 # scraper container 内で隣接モジュールを import できるよう path を追加する。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+sys.path.append(str(MODULE_DIR.parent))
+import conditional_fetch
+import fetch_pipeline
 import gijiroku_planning
 import gijiroku_storage
 import gijiroku_targets
@@ -34,6 +36,7 @@ from kami_city_pdf import (
     DEFAULT_USER_AGENT,
     attachment_id,
     clean_pdf_label,
+    decode_response_text,
     emit_progress,
     extract_pdf_text,
     extract_year_info,
@@ -42,7 +45,6 @@ from kami_city_pdf import (
     normalize_year_dir,
     now_ts,
     page_title,
-    request_bytes,
     request_text,
     sanitize_filename,
 )
@@ -114,6 +116,12 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--headful", action="store_true", help="互換オプション。HTTPスクレイパーなので無視します")
     parser.add_argument("--no-resume", action="store_true", help="既存の保存結果を無視して取り直す")
     parser.add_argument("--no-html-documents", action="store_true", help="HTML本文ページを文書候補に含めない")
+    parser.add_argument(
+        "--fetch-parallel",
+        type=int,
+        default=fetch_pipeline.default_parallel(),
+        help="本文取得の同時接続数。開始間隔は --delay-seconds のまま（既定は MIYABE_MINUTES_FETCH_PARALLEL または 2）。",
+    )
     return parser
 
 
@@ -361,9 +369,43 @@ def composed_minutes_text(item: StaticMinutesItem, body_text: str) -> str:
     return "\n".join(header) + "\n\n" + body_text.strip() + "\n"
 
 
-def extract_html_document_text(session: requests.Session, url: str, timeout_ms: int) -> str:
-    page_html = request_text(session, url, timeout_ms)
-    return text_from_html(BeautifulSoup(page_html, "html.parser"))
+def fetch_document(
+    fetcher: fetch_pipeline.FetchPipeline,
+    plan: dict,
+    timeout_ms: int,
+    *,
+    no_resume: bool,
+) -> tuple[str, str, str, str, conditional_fetch.Validators]:
+    """文書 1 件を取得して本文を保存し、(status, output, pdf, error, 検証子) を返す。fetch pipeline の worker で動く。
+
+    --no-resume で既存の出力があれば前回の検証子で条件付き GET を送り、304 か本文が同じなら
+    PDF 展開と書き込みを省く。"""
+    existing_output = plan["existing_output"]
+    validators: conditional_fetch.Validators = plan.get("previous_validators", conditional_fetch.Validators())
+    if not no_resume and existing_output is not None:
+        return "skipped_existing", str(existing_output), "", "", validators
+    item = plan["item"]
+    pdf_output = ""
+    try:
+        result = conditional_fetch.conditional_get(
+            fetcher.get, item.url, previous=validators, timeout=max(timeout_ms / 1000.0, 1.0)
+        )
+        validators = result.validators
+        if result.unchanged and existing_output is not None:
+            return result.status, str(existing_output), "", "", validators
+        if item.doc_type == "pdf":
+            pdf_bytes = result.response.content
+            gijiroku_storage.write_bytes(plan["pdf_path"], pdf_bytes, compress=False)
+            pdf_output = str(plan["pdf_path"])
+            extracted = extract_pdf_text(pdf_bytes)
+        else:
+            extracted = text_from_html(BeautifulSoup(decode_response_text(result.response), "html.parser"))
+        if not extracted:
+            return "empty_text", "", pdf_output, "", validators
+        dest = gijiroku_storage.write_text(plan["text_base"], composed_minutes_text(item, extracted), compress=True)
+    except Exception as exc:
+        return "error", "", pdf_output, str(exc), validators
+    return "saved_text", str(dest), pdf_output, "", validators
 
 
 def main() -> int:
@@ -417,7 +459,13 @@ def main() -> int:
     state = gijiroku_storage.load_state(state_path)
     emit_progress(0, len(meeting_items), state_path, state)
 
-    with result_csv.open("w", encoding="utf-8", newline="") as handle:
+    with result_csv.open("w", encoding="utf-8", newline="") as handle, fetch_pipeline.FetchPipeline(
+        session,
+        delay_seconds=args.delay_seconds,
+        parallel=args.fetch_parallel,
+        robots_txt_url=str(target.get("robots_txt_url") or ""),
+        timeout_seconds=max(args.timeout_ms / 1000.0, 1.0),
+    ) as pipeline:
         writer = csv.DictWriter(
             handle,
             fieldnames=["title", "year", "url", "doc_type", "status", "output", "pdf", "error", "documents", "fragments"],
@@ -429,6 +477,9 @@ def main() -> int:
             item = plan["item"]
             gijiroku_planning.attach_text_output(plan, key="text_base")
             plan["pdf_path"] = pdf_dir / plan["year_dir"] / f"{item.source_fino or plan['original_idx']}_{plan['stem']}.pdf"
+            plan["previous_validators"] = conditional_fetch.Validators.from_fields(
+                state["items"].get(plan["resume_key"]) if plan["existing_output"] is not None else None
+            )
             planned_items.append(plan)
 
         previous_missing = gijiroku_planning.previous_missing_count(state)
@@ -457,55 +508,36 @@ def main() -> int:
         status_counts: dict[str, int] = {}
         emit_progress(saved_count, len(meeting_items), state_path, state)
 
-        for idx, plan in enumerate(work_items, start=1):
+        results = pipeline.map(
+            lambda plan: fetch_document(pipeline, plan, args.timeout_ms, no_resume=args.no_resume),
+            work_items,
+        )
+        for idx, (plan, (status, output_path, pdf_output, error_msg, validators)) in enumerate(results, start=1):
             item = plan["item"]
             print(f"[{idx}/{len(work_items)}] {item.year_label} {item.title}")
-            year_dir = plan["year_dir"]
             resume_key = plan["resume_key"]
-            text_base = plan["text_base"]
             pdf_path = plan["pdf_path"]
-            existing_output = plan["existing_output"]
-            status = ""
-            output_path = ""
-            pdf_output = ""
-            error_msg = ""
-
-            if not args.no_resume and existing_output is not None:
-                status = "skipped_existing"
-                output_path = str(existing_output)
-            else:
-                try:
-                    if item.doc_type == "pdf":
-                        pdf_bytes = request_bytes(session, item.url, args.timeout_ms)
-                        gijiroku_storage.write_bytes(pdf_path, pdf_bytes, compress=False)
-                        pdf_output = str(pdf_path)
-                        extracted = extract_pdf_text(pdf_bytes)
-                    else:
-                        extracted = extract_html_document_text(session, item.url, args.timeout_ms)
-                    if not extracted:
-                        status = "empty_text"
-                    else:
-                        dest = gijiroku_storage.write_text(text_base, composed_minutes_text(item, extracted), compress=True)
-                        output_path = str(dest)
-                        status = "saved_text"
-                        saved_count += 1
-                except Exception as exc:
-                    status = "error"
-                    error_msg = str(exc)
+            if status in {"saved_text", "not_modified", "unchanged"}:
+                saved_count += 1
 
             if status:
                 status_counts[status] = status_counts.get(status, 0) + 1
-            state["items"][resume_key] = {
-                "title": item.title,
-                "year_label": item.year_label,
-                "url": item.url,
-                "doc_type": item.doc_type,
-                "status": status,
-                "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
-                "pdf_rel_path": str(pdf_path.relative_to(work_dir)) if pdf_path.exists() else "",
-                "updated_at": now_ts(),
-            }
-            gijiroku_storage.save_state(state_path, state)
+            gijiroku_storage.record_item(
+                state_path,
+                state,
+                resume_key,
+                {
+                    "title": item.title,
+                    "year_label": item.year_label,
+                    "url": item.url,
+                    "doc_type": item.doc_type,
+                    "status": status,
+                    "output_rel_path": str(Path(output_path).relative_to(downloads_dir)) if output_path else "",
+                    "pdf_rel_path": str(pdf_path.relative_to(work_dir)) if pdf_path.exists() else "",
+                    "updated_at": now_ts(),
+                    **validators.as_fields(),
+                },
+            )
 
             writer.writerow(
                 {
@@ -523,8 +555,6 @@ def main() -> int:
             )
             handle.flush()
             emit_progress(saved_count, len(meeting_items), state_path, state)
-            if args.delay_seconds > 0 and idx < len(work_items):
-                time.sleep(args.delay_seconds)
 
     validation = gijiroku_storage.apply_classified_scrape_validation(
         state_path,
@@ -0,0 +1,136 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tools.gijiroku import browser_pool
+
+
+class _FakeRequest:
+    def __init__(self) -> None:
+        self.owner = threading.get_ident()
+
+
+def _fake_opener(opened: list[int], closed: list[int]):
+    def open_worker():
+        worker = browser_pool.PlaywrightWorker(request=_FakeRequest())
+        opened.append(worker.request.owner)
+        return worker, lambda: closed.append(threading.get_ident())
+
+    return open_worker
+
+
+class PoolSizeTest(unittest.TestCase):
+    def test_host_override_matches_subdomains_and_longest_wins(self) -> None:
+        overrides = browser_pool.host_pool_overrides("kaigiroku.net=3, ssp.kaigiroku.net=1,broken,x=abc")
+        self.assertEqual(overrides, {"kaigiroku.net": 3, "ssp.kaigiroku.net": 1})
+        self.assertEqual(browser_pool.pool_size_for_host("ssp.kaigiroku.net", 2, overrides), 1)
+        self.assertEqual(browser_pool.pool_size_for_host("abc.kaigiroku.net", 2, overrides), 3)
+        self.assertEqual(browser_pool.pool_size_for_host("notkaigiroku.net", 2, overrides), 2)
+
+
+class PlaywrightPoolTest(unittest.TestCase):
+    def test_each_worker_is_used_only_on_its_own_thread(self) -> None:
+        opened: list[int] = []
+        closed: list[int] = []
+        pool = browser_pool.PlaywrightPool(_fake_opener(opened, closed), parallel=3, delay_seconds=0, host_overrides={})
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def work(worker, value: int) -> int:
+            self.assertEqual(worker.request.owner, threading.get_ident())
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05 if value % 2 else 0.01)
+            with lock:
+                active[0] -= 1
+            return value * 10
+
+        with pool:
+            results = list(pool.map(work, range(9), host_of=lambda value: "example.jp"))
+        self.assertEqual(results, [(value, value * 10) for value in range(9)])
+        self.assertEqual(peak[0], 3)
+        self.assertEqual(sorted(opened), sorted(closed))
+        self.assertEqual(len(opened), 3)
+
+    def test_host_override_caps_concurrency_and_skipped_items_do_not_wait(self) -> None:
+        pool = browser_pool.PlaywrightPool(
+            _fake_opener([], []),
+            parallel=3,
+            delay_seconds=0,
+            host_overrides={"example.jp": 1},
+        )
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def work(_worker, value: int) -> int:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return value
+
+        with pool:
+            list(pool.map(work, range(6), host_of=lambda value: "example.jp"))
+        self.assertEqual(peak[0], 1)
+
+        waits: list[float] = []
+        pool = browser_pool.PlaywrightPool(_fake_opener([], []), parallel=2, delay_seconds=5, host_overrides={})
+        pool.limiter._sleep = waits.append
+        with pool:
+            list(pool.map(lambda _worker, value: value, range(4), host_of=lambda value: None))
+            list(pool.map(lambda _worker, value: value, range(2), host_of=lambda value: "example.jp"))
+        self.assertEqual(len(waits), 1)
+
+    def test_single_worker_runs_inline_on_caller_thread(self) -> None:
+        worker = browser_pool.PlaywrightWorker(request=_FakeRequest())
+        pool = browser_pool.inline_pool(worker)
+        results = list(pool.map(lambda current, value: (current is worker, threading.get_ident()), [1, 2]))
+        self.assertEqual([result for _, result in results], [(True, threading.get_ident())] * 2)
+
+    def test_worker_open_failure_is_raised_from_map(self) -> None:
+        def open_worker():
+            raise RuntimeError("driver missing")
+
+        with browser_pool.PlaywrightPool(open_worker, parallel=2, delay_seconds=0, host_overrides={}) as pool:
+            with self.assertRaisesRegex(RuntimeError, "driver missing"):
+                list(pool.map(lambda _worker, value: value, range(3)))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        body = f"{self.path} {self.headers.get('User-Agent')}".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        return None
+
+
+class RequestWorkerTest(unittest.TestCase):
+    def test_request_workers_fetch_from_their_own_playwright(self) -> None:
+        try:
+            import playwright.sync_api  # noqa: F401
+        except ImportError:
+            self.skipTest("playwright is not installed")
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        opener = browser_pool.request_worker_opener(user_agent="miyabe-test")
+        with browser_pool.PlaywrightPool(opener, parallel=2, delay_seconds=0, host_overrides={}) as pool:
+            results = list(pool.map(lambda worker, path: worker.request.get(base + path).text(), ["/a", "/b", "/c"]))
+        self.assertEqual([body for _, body in results], ["/a miyabe-test", "/b miyabe-test", "/c miyabe-test"])
+
+
+if __name__ == "__main__":
+    unittest.main()
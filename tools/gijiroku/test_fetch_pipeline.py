@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from tools.gijiroku import fetch_pipeline
+from tools.gijiroku.robots_rules import robots_crawl_delay
+
+
+class _Response:
+    def __init__(self, status_code: int = 200, text: str = "") -> None:
+        self.status_code = status_code
+        self.text = text
+
+
+class HostRateLimiterTest(unittest.TestCase):
+    def test_requests_are_spaced_by_interval_per_host(self) -> None:
+        now = [0.0]
+        waits: list[float] = []
+
+        def sleep(seconds: float) -> None:
+            waits.append(seconds)
+
+        limiter = fetch_pipeline.HostRateLimiter(1.5, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual([limiter.acquire("a.example.jp") for _ in range(3)], [0.0, 1.5, 3.0])
+        self.assertEqual(limiter.acquire("b.example.jp"), 0.0)
+        now[0] = 10.0
+        self.assertEqual(limiter.acquire("a.example.jp"), 0.0)
+        self.assertEqual(waits, [1.5, 3.0])
+
+
+class RobotsCrawlDelayTest(unittest.TestCase):
+    def test_most_specific_group_wins(self) -> None:
+        text = "User-agent: *\nCrawl-delay: 10\n\nUser-agent: miyabe-tools\nDisallow: /private\nCrawl-delay: 3\n"
+        self.assertEqual(robots_crawl_delay(text, "miyabe-tools/1.0"), 3.0)
+        self.assertEqual(robots_crawl_delay(text, "other-bot"), 10.0)
+        self.assertIsNone(robots_crawl_delay("User-agent: *\nDisallow: /x\n", "miyabe-tools/1.0"))
+
+
+class FetchPipelineTest(unittest.TestCase):
+    def _pipeline(self, robots_text: str | None, **kwargs) -> fetch_pipeline.FetchPipeline:
+        session = requests.Session()
+        response = _Response(200, robots_text) if robots_text is not None else _Response(404)
+        with mock.patch.object(session, "get", return_value=response):
+            pipeline = fetch_pipeline.FetchPipeline(
+                session, robots_txt_url="https://example.jp/robots.txt", **kwargs
+            )
+        self.addCleanup(pipeline.close)
+        return pipeline
+
+    def test_map_overlaps_work_and_keeps_submission_order(self) -> None:
+        pipeline = self._pipeline(None, delay_seconds=0, parallel=3)
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def work(value: int) -> int:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05 if value % 2 else 0.01)
+            with lock:
+                active[0] -= 1
+            return value * 10
+
+        self.assertEqual(list(pipeline.map(work, range(8))), [(value, value * 10) for value in range(8)])
+        self.assertEqual(peak[0], 3)
+
+    def test_robots_crawl_delay_forces_serial_fetches(self) -> None:
+        pipeline = self._pipeline("User-agent: *\nCrawl-delay: 5\n", delay_seconds=1.5, parallel=4)
+        self.assertEqual(pipeline.parallel, 1)
+        self.assertEqual(pipeline.interval, 5.0)
+
+    def test_get_waits_for_host_token(self) -> None:
+        pipeline = self._pipeline(None, delay_seconds=2.0, parallel=2)
+        with mock.patch.object(pipeline.session, "get", return_value=_Response()) as get, mock.patch.object(
+            pipeline.limiter, "_sleep"
+        ) as sleep:
+            pipeline.get("https://example.jp/a", timeout=1)
+            pipeline.get("https://example.jp/b", timeout=1)
+        self.assertEqual(get.call_count, 2)
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args[0][0], 2.0, places=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.gijiroku import gijiroku_index_summary
+
+
+ROWS = [
+    {"url": "https://example.jp/a", "year_label": "令和6年", "meeting_group": "本会議", "title": "第1回定例会"},
+    {"url": "https://example.jp/a", "year_label": "令和6年", "meeting_group": "本会議", "title": "第1回定例会"},
+    {"url": "https://example.jp/b", "year_label": "令和6年", "meeting_group": "本会議", "title": "第1回定例会"},
+    {"year_label": "令和5年", "title": "臨時会", "score": 12345.5e-3},
+    "not a row",
+]
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+    def test_values_split_across_chunk_boundaries(self) -> None:
+        values = [12345678, 2.5e-3, {"title": "会議 \"録\"", "n": [1, 2.5, None]}, "x" * 10, True, -0.25]
+        path = self.root / "rows.json"
+        path.write_text(" [\n" + " ,\n ".join(json.dumps(value, ensure_ascii=False) for value in values) + "\n] \n", encoding="utf-8")
+        for chunk_chars in (1, 2, 3, 7):
+            with mock.patch.object(gijiroku_index_summary, "READ_CHUNK_CHARS", chunk_chars):
+                self.assertEqual(list(gijiroku_index_summary.iter_json_array(path)), values)
+
+    def test_gzip_and_broken_input(self) -> None:
+        path = self.root / "rows.json.gz"
+        path.write_bytes(gzip.compress(json.dumps(ROWS, ensure_ascii=False).encode("utf-8")))
+        self.assertEqual(list(gijiroku_index_summary.iter_json_array(path)), ROWS)
+
+        for text in ['{"a": 1}', "[1, 2", "[1 2]", "[1,, 2]", "[1] 2"]:
+            broken = self.root / "broken.json"
+            broken.write_text(text, encoding="utf-8")
+            with self.assertRaises(ValueError, msg=text):
+                list(gijiroku_index_summary.iter_json_array(broken))
+
+
+class SummarizeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.index_path = self.root / "meetings_index.json"
+        self.index_path.write_text(json.dumps(ROWS, ensure_ascii=False), encoding="utf-8")
+        self.downloads = self.root / "downloads"
+        self.stems = gijiroku_index_summary.scan_index(self.index_path)[1]
+        self._write_download(self.stems[0] + ".html")
+        self._write_download("unlisted.txt")
+        self._write_download("ignored.pdf")
+        # scan したばかりのディレクトリは racy 扱いになるので、mtime を過去へずらす。
+        self._age_downloads()
+
+    def _write_download(self, rel: str) -> None:
+        path = self.downloads / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("本文", encoding="utf-8")
+
+    def _age_downloads(self, mtime_ns: int = 1_000_000_000) -> None:
+        for directory in [self.downloads, *[path for path in self.downloads.rglob("*") if path.is_dir()]]:
+            os.utime(directory, ns=(0, mtime_ns))
+
+    def _counts(self) -> tuple[int, int, int]:
+        summary = gijiroku_index_summary.summarize(self.index_path, self.downloads)
+        return summary.unique_count, summary.indexed_downloaded_count, summary.download_count
+
+    def test_counts_and_reuses_sidecar(self) -> None:
+        # 重複 URL の行は 1 件、URL の無い行は item_signature で数える。.pdf は本文として数えない。
+        self.assertEqual(len(self.stems), 3)
+        self.assertEqual(self._counts(), (3, 1, 2))
+        sidecar = gijiroku_index_summary.summary_path(self.index_path)
+        self.assertEqual(json.loads(sidecar.read_text(encoding="utf-8"))["row_count"], 4)
+
+        with mock.patch.object(gijiroku_index_summary, "scan_index") as scan_index, mock.patch.object(
+            gijiroku_index_summary, "scan_downloads"
+        ) as scan_downloads:
+            self.assertEqual(self._counts(), (3, 1, 2))
+        scan_index.assert_not_called()
+        scan_downloads.assert_not_called()
+
+    def test_new_download_or_index_invalidates_sidecar(self) -> None:
+        self._counts()
+        self._write_download(self.stems[2] + ".txt.gz")
+        self._age_downloads(2_000_000_000)
+        self.assertEqual(self._counts(), (3, 2, 3))
+
+        self.index_path.write_text(json.dumps(ROWS[:1], ensure_ascii=False), encoding="utf-8")
+        stat = self.index_path.stat()
+        os.utime(self.index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self._counts(), (1, 1, 3))
+
+    def test_broken_or_missing_index_counts_downloads_only(self) -> None:
+        self.index_path.write_text("[{", encoding="utf-8")
+        self.assertEqual(self._counts(), (0, 0, 2))
+        self.assertFalse(gijiroku_index_summary.summary_path(self.index_path).exists())
+
+        self.index_path.unlink()
+        self.assertEqual(self._counts(), (0, 0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
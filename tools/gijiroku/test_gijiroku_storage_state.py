@@ -0,0 +1,74 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.gijiroku import gijiroku_storage
+
+
+class ScrapeStateJournalTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.state_path = Path(temp_dir.name) / "scrape_state.json"
+        self.journal_path = gijiroku_storage.state_journal_path(self.state_path)
+        patcher = mock.patch.object(gijiroku_storage, "SCRAPE_STATE_COMPACT_SECONDS", 3600.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(gijiroku_storage._STATE_JOURNALS.pop, self.state_path.absolute(), None)
+
+    def _snapshot(self) -> dict:
+        return json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def test_items_are_appended_and_replayed_on_load(self) -> None:
+        state = gijiroku_storage.load_state(self.state_path)
+        gijiroku_storage.record_item(self.state_path, state, "a", {"status": "saved"})
+        gijiroku_storage.record_item(self.state_path, state, "b", {"status": "error"})
+        gijiroku_storage.record_item(self.state_path, state, "b", {"status": "saved"})
+        gijiroku_storage.set_progress(self.state_path, state, current=2, total=5)
+
+        # 最初の 1 件は snapshot、残りは journal だけに載る。
+        self.assertEqual(set(self._snapshot()["items"]), {"a"})
+        self.assertEqual(len(self.journal_path.read_text(encoding="utf-8").splitlines()), 3)
+
+        loaded = gijiroku_storage.load_state(self.state_path)
+        self.assertEqual(loaded["items"], {"a": {"status": "saved"}, "b": {"status": "saved"}})
+        self.assertEqual((loaded["progress_current"], loaded["progress_total"]), (2, 5))
+        self.assertNotIn("journal_id", loaded)
+
+    def test_stale_journal_and_torn_tail_are_ignored(self) -> None:
+        state = gijiroku_storage.load_state(self.state_path)
+        gijiroku_storage.record_item(self.state_path, state, "a", {"status": "saved"})
+        gijiroku_storage.record_item(self.state_path, state, "b", {"status": "saved"})
+        with self.journal_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"journal": "other", "items": {"x": {}}}) + "\n")
+            handle.write('{"journal": "')
+
+        loaded = gijiroku_storage.load_state(self.state_path)
+        self.assertEqual(set(loaded["items"]), {"a", "b"})
+
+    def test_compaction_rewrites_snapshot_and_clears_journal(self) -> None:
+        state = gijiroku_storage.load_state(self.state_path)
+        for key in ("a", "b", "c"):
+            gijiroku_storage.record_item(self.state_path, state, key, {"status": "saved"})
+        gijiroku_storage.set_progress(self.state_path, state, current=3, total=3)
+        self.assertTrue(self.journal_path.exists())
+
+        gijiroku_storage.compact_state_journals()
+        snapshot = self._snapshot()
+        self.assertEqual(set(snapshot["items"]), {"a", "b", "c"})
+        self.assertEqual(snapshot["progress_current"], 3)
+        self.assertFalse(self.journal_path.exists())
+
+    def test_interval_elapsed_writes_snapshot_instead_of_journal(self) -> None:
+        state = gijiroku_storage.load_state(self.state_path)
+        gijiroku_storage.record_item(self.state_path, state, "a", {"status": "saved"})
+        with mock.patch.object(gijiroku_storage, "SCRAPE_STATE_COMPACT_SECONDS", 0.0):
+            gijiroku_storage.record_item(self.state_path, state, "b", {"status": "saved"})
+        self.assertEqual(set(self._snapshot()["items"]), {"a", "b"})
+        self.assertFalse(self.journal_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+"""keep-alive 接続の使い回し・再試行・ホストごとの同時接続数上限を持つ共通 HTTP transport。
+
+kensakusystem は urllib の opener、audit_minutes_robots は素の requests.get で取得していて、
+どちらもリクエストごとに TCP/TLS 接続を張り直し、一時的な 5xx や接続断でそのまま失敗していた。
+ここでは requests.Session の上に
+
+    transport = http_transport.HttpTransport(user_agent=USER_AGENT, max_per_host=4)
+    response = transport.get(url, timeout=10, headers={"Referer": referer})
+    response = transport.post(url, data=payload, headers={"Content-Type": "..."})
+    ...
+    print(f"[INFO] HTTP {transport.stats.summary()}", flush=True)
+
+の形で、ホストごとの接続 pool・冪等メソッドの再試行（jitter つき指数 backoff、Retry-After を尊重）・
+gzip / deflate（brotli が入っていれば br も）の展開・既定 timeout・ホストごとの同時接続数上限を揃える。
+stats は接続の新規 / 再利用の数、再試行回数、受信バイト数（展開前と展開後）を数える。
+
+注意:
+- HTTP/1.1 keep-alive のみ。requests / urllib3 は HTTP/2 を話さない（httpx / h2 は依存に無い）。
+- 再試行するのは GET / HEAD だけ。POST は送り直さず、最初の失敗をそのまま返す。
+- 4xx / 5xx は例外にしない（requests と同じ）。必要なら呼び出し側で raise_for_status() する。
+  再試行対象の status（RETRY_STATUSES）は回数を使い切ったら最後の応答を返す。
+- stream=True で受けた応答の受信バイト数は数えない。
+- session の cookie は transport 単位で共有される。cookie を分けたい取得は transport も分ける。
+- backoff の jitter は urllib3 2.x の Retry(backoff_jitter=...) に任せる。requirements は
+  requests しか固定していないので、urllib3 1.26 では jitter なしの指数 backoff になる。
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_TIMEOUT_SECONDS = 15.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_SECONDS = 0.5
+DEFAULT_BACKOFF_JITTER_SECONDS = 0.5
+DEFAULT_MAX_PER_HOST = 4
+# 時間をおけば通る見込みがある status。
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+
+def retry_supports_backoff_jitter() -> bool:
+    return "backoff_jitter" in inspect.signature(Retry.__init__).parameters
+
+
+def accept_encoding() -> str:
+    """urllib3 が展開できる Content-Encoding。br は brotli / brotlicffi があるときだけ。"""
+    encodings = ["gzip", "deflate"]
+    for module_name in ("brotli", "brotlicffi"):
+        try:
+            __import__(module_name)
+        except ImportError:
+            continue
+        encodings.append("br")
+        break
+    return ", ".join(encodings)
+
+
+@dataclass
+class TransportStats:
+    """transport 1 つ分の累計。thread から同時に足されてもよい。"""
+
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes_received: int = 0  # 展開前（転送量）
+    bytes_decoded: int = 0  # 展開後の本文
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+                "retries": self.retries,
+                "errors": self.errors,
+                "bytes_received": self.bytes_received,
+                "bytes_decoded": self.bytes_decoded,
+            }
+
+    def summary(self) -> str:
+        return " ".join(f"{name}={value}" for name, value in self.as_dict().items())
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """応答ごとに、使った socket が初見なら新規接続、見たことがあれば再利用として数える。"""
+
+    def __init__(self, stats: TransportStats, **kwargs: Any) -> None:
+        self.stats = stats
+        # 閉じた socket は自然に消えるよう弱参照で持つ。
+        self._seen_sockets: weakref.WeakSet = weakref.WeakSet()
+        self._seen_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        try:
+            response = super().send(request, *args, **kwargs)
+        except requests.RequestException:
+            self.stats.add(errors=1)
+            raise
+        raw = response.raw
+        history = getattr(getattr(raw, "retries", None), "history", ()) or ()
+        sock = getattr(getattr(raw, "connection", None), "sock", None)
+        reused = False
+        if sock is not None:
+            with self._seen_lock:
+                reused = sock in self._seen_sockets
+                if not reused:
+                    self._seen_sockets.add(sock)
+        self.stats.add(
+            requests=1,
+            retries=len(history),
+            connections_reused=int(reused),
+            connections_opened=int(sock is not None and not reused),
+        )
+        return response
+
+
+class HttpTransport:
+    """requests.Session を包み、ホストごとの同時接続数を max_per_host に抑えて送る。"""
+
+    def __init__(
+        self,
+        *,
+        user_agent: str = "",
+        headers: dict[str, str] | None = None,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT_SECONDS,
+        retries: int = DEFAULT_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        backoff_jitter_seconds: float = DEFAULT_BACKOFF_JITTER_SECONDS,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        pool_hosts: int = 10,
+    ) -> None:
+        self.timeout = timeout
+        self.max_per_host = max(1, int(max_per_host))
+        self.stats = TransportStats()
+        retry_options: dict[str, Any] = {}
+        if retry_supports_backoff_jitter():
+            retry_options["backoff_jitter"] = max(0.0, float(backoff_jitter_seconds))
+        retry = Retry(
+            total=max(0, int(retries)),
+            backoff_factor=max(0.0, float(backoff_seconds)),
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            raise_on_redirect=False,
+            **retry_options,
+        )
+        self.adapter = CountingHTTPAdapter(
+            self.stats,
+            pool_connections=max(1, int(pool_hosts)),
+            pool_maxsize=self.max_per_host,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers["Accept-Encoding"] = accept_encoding()
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        self.session.headers.update(headers or {})
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        with self._slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """session.request と同じ。timeout を省けば transport の既定値を使う。"""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._slot(url):
+            response = self.session.request(method, url, **kwargs)
+        if not kwargs.get("stream"):
+            for hop in [*response.history, response]:
+                tell = getattr(hop.raw, "tell", None)
+                self.stats.add(
+                    bytes_received=int(tell()) if callable(tell) else len(hop.content),
+                    bytes_decoded=len(hop.content),
+                )
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
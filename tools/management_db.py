@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
 from pathlib import Path
@@ -17,7 +18,7 @@ from urllib.parse import parse_qs, quote, unquote, urlparse, urlunparse
 _AVAILABLE: bool | None = None
 _MIGRATED = False
 _CONN = None
-# (task_key -> slug -> item の JSON 文字列)。前回書き込みと同一の行は UPSERT を省く。
+# (task_key -> slug -> "位置:item の JSON 文字列")。前回書き込みと同一の行は UPSERT を省く。
 _ITEM_CACHE: dict[str, dict[str, str]] = {}
 
 
@@ -164,6 +165,7 @@ def migrate(conn) -> None:
     conn.execute("ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS freshness_date date")
     conn.execute("ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS freshness_basis text NOT NULL DEFAULT ''")
     conn.execute("ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS last_checked_at_text text NOT NULL DEFAULT ''")
+    conn.execute("ALTER TABLE processing_task_items ADD COLUMN IF NOT EXISTS item_position integer")
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_processing_task_items_freshness "
         "ON processing_task_items (task_key, freshness_date, last_checked_at_text)"
@@ -194,6 +196,100 @@ def _task_area(item: dict[str, Any]) -> str:
     return "index" if "インデックス" in message or index_status else "scrape"
 
 
+_ITEM_COLUMNS = (
+    "task_key", "slug", "code", "name", "full_name", "feature_key", "task_area",
+    "status", "message", "host", "system_type", "source_url",
+    "started_at_text", "finished_at_text", "updated_at_text",
+    "progress_updated_at_text", "returncode", "pid", "progress_current",
+    "progress_total", "progress_unit", "warning_count", "warning_lines",
+    "freshness_date", "freshness_basis", "last_checked_at_text",
+    "item_position", "item_json",
+)
+_ITEM_PLACEHOLDERS = {"warning_lines": "%s::jsonb", "freshness_date": "%s::date", "item_json": "%s::jsonb"}
+_ITEM_UPDATE_SET = ",\n    ".join(
+    f"{column} = EXCLUDED.{column}" for column in _ITEM_COLUMNS if column not in {"task_key", "slug"}
+)
+_ITEM_UPSERT_SQL = f"""
+INSERT INTO processing_task_items ({", ".join(_ITEM_COLUMNS)}, updated_at)
+VALUES ({", ".join(_ITEM_PLACEHOLDERS.get(column, "%s") for column in _ITEM_COLUMNS)}, now())
+ON CONFLICT (task_key, slug) DO UPDATE SET
+    {_ITEM_UPDATE_SET},
+    updated_at = now()
+"""
+_ITEM_STAGE_SQL = (
+    "CREATE TEMP TABLE IF NOT EXISTS processing_task_items_stage "
+    "(LIKE processing_task_items INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+)
+_ITEM_MERGE_SQL = f"""
+INSERT INTO processing_task_items ({", ".join(_ITEM_COLUMNS)}, updated_at)
+SELECT {", ".join(_ITEM_COLUMNS)}, now() FROM processing_task_items_stage
+ON CONFLICT (task_key, slug) DO UPDATE SET
+    {_ITEM_UPDATE_SET},
+    updated_at = now()
+"""
+# 変更行がこれ以上なら COPY で一時表へ流してから 1 文で MERGE する（プロセス初回のフル同期など）。
+ITEM_COPY_MIN_ROWS = 64
+# status_json に items を埋め込まず processing_task_items 側を正とする印。PHP 側が items を組み立て直す。
+ITEMS_TABLE_MARKER = "items_table"
+
+
+def _item_row(task_key: str, slug: str, item: dict[str, Any], serialized: str, position: int) -> tuple[Any, ...]:
+    warning_lines = item.get("warning_lines")
+    if not isinstance(warning_lines, list):
+        warning_lines = []
+    freshness_date = str(item.get("freshness_date", "")).strip()
+    return (
+        task_key,
+        slug,
+        str(item.get("code", "")),
+        str(item.get("name", "")),
+        str(item.get("full_name", "")),
+        _feature_key(task_key),
+        _task_area(item),
+        str(item.get("status", "")),
+        str(item.get("message", "")),
+        str(item.get("host", "")),
+        str(item.get("system_type", "")),
+        str(item.get("source_url", "")),
+        str(item.get("started_at", "")),
+        str(item.get("finished_at", "")),
+        str(item.get("updated_at", "")),
+        str(item.get("progress_updated_at", "")),
+        _optional_int(item.get("returncode")),
+        _optional_int(item.get("pid")),
+        _optional_int(item.get("progress_current")),
+        _optional_int(item.get("progress_total")),
+        str(item.get("progress_unit", "")),
+        max(0, int(item.get("warning_count") or 0)),
+        json.dumps(warning_lines, ensure_ascii=False),
+        freshness_date or None,
+        str(item.get("freshness_basis", "")),
+        str(item.get("last_checked_at", "")),
+        position,
+        serialized,
+    )
+
+
+def _pipeline(conn):
+    # libpq 14 未満や古い psycopg では pipeline mode が使えないので、そのまま逐次送る。
+    try:
+        import psycopg
+
+        if psycopg.Pipeline.is_supported():
+            return conn.pipeline()
+    except Exception:
+        pass
+    return contextlib.nullcontext()
+
+
+def _merge_items_via_copy(cursor, rows: list[tuple[Any, ...]]) -> None:
+    cursor.execute(_ITEM_STAGE_SQL)
+    with cursor.copy(f"COPY processing_task_items_stage ({', '.join(_ITEM_COLUMNS)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+    cursor.execute(_ITEM_MERGE_SQL)
+
+
 def store_task_status(task_key: str, status: dict[str, Any], source_path: Path | None = None) -> None:
     task_key = str(task_key).strip()
     if task_key == "" or not isinstance(status, dict):
@@ -205,23 +301,31 @@ def store_task_status(task_key: str, status: dict[str, Any], source_path: Path |
     items = status.get("items")
     if not isinstance(items, dict):
         items = {}
-    # item 行は内容が変わったときだけ書く。heartbeat のたびに全自治体を
+    # item 行は内容か並び順が変わったときだけ書く。heartbeat のたびに全自治体を
     # UPSERT すると、数千行 × 数秒間隔で DB 側が支配的なコストになる。
-    normalized_items: dict[str, dict[str, Any]] = {}
     serialized_items: dict[str, str] = {}
+    changed_rows: list[tuple[Any, ...]] = []
+    previous_items = _ITEM_CACHE.get(task_key)
+    full_sync = previous_items is None
     for raw_slug, raw_item in items.items():
         if not isinstance(raw_item, dict):
             continue
         item = dict(raw_item)
         slug = str(item.get("slug") or raw_slug).strip()
-        if slug == "":
+        if slug == "" or slug in serialized_items:
             continue
         item["slug"] = slug
-        normalized_items[slug] = item
-        serialized_items[slug] = json.dumps(item, ensure_ascii=False)
+        position = len(serialized_items)
+        serialized = json.dumps(item, ensure_ascii=False)
+        # キャッシュには位置も含めて覚え、並び替えだけの変化も item_position に反映する。
+        serialized_items[slug] = f"{position}:{serialized}"
+        if full_sync or previous_items.get(slug) != serialized_items[slug]:
+            changed_rows.append(_item_row(task_key, slug, item, serialized, position))
 
-    previous_items = _ITEM_CACHE.get(task_key)
-    full_sync = previous_items is None
+    # task 行には items を埋め込まない。数千自治体分の JSON を heartbeat ごとに
+    # 作り直して書くと、それだけで数 MB/回になるため。
+    task_status = {key: value for key, value in status.items() if key != "items"}
+    task_status[ITEMS_TABLE_MARKER] = True
 
     try:
         with conn.transaction():
@@ -232,129 +336,53 @@ def store_task_status(task_key: str, status: dict[str, Any], source_path: Path |
                     source_mtime = float(source_path.stat().st_mtime)
                 except Exception:
                     source_mtime = 0.0
-            conn.execute(
-                """
-                INSERT INTO management_task_statuses (
-                    task_key, running, heartbeat_at, updated_at_text,
-                    source_mtime, status_json, updated_at
-                ) VALUES (%s, %s, %s, %s, %s, %s::jsonb, now())
-                ON CONFLICT (task_key) DO UPDATE SET
-                    running = EXCLUDED.running,
-                    heartbeat_at = EXCLUDED.heartbeat_at,
-                    updated_at_text = EXCLUDED.updated_at_text,
-                    source_mtime = EXCLUDED.source_mtime,
-                    status_json = EXCLUDED.status_json,
-                    updated_at = now()
-                """,
-                (
-                    task_key,
-                    bool(status.get("running", False)),
-                    str(status.get("heartbeat_at", "")),
-                    str(status.get("updated_at", "")),
-                    source_mtime,
-                    json.dumps(status, ensure_ascii=False),
-                ),
-            )
-            for slug, item in normalized_items.items():
-                if not full_sync and previous_items.get(slug) == serialized_items[slug]:
-                    continue
-                warning_lines = item.get("warning_lines")
-                if not isinstance(warning_lines, list):
-                    warning_lines = []
-                conn.execute(
-                    """
-                    INSERT INTO processing_task_items (
-                        task_key, slug, code, name, full_name, feature_key, task_area,
-                        status, message, host, system_type, source_url,
-                        started_at_text, finished_at_text, updated_at_text,
-                        progress_updated_at_text, returncode, pid, progress_current,
-                        progress_total, progress_unit, warning_count, warning_lines,
-                        freshness_date, freshness_basis, last_checked_at_text,
-                        item_json, updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s, %s, %s::jsonb,
-                        NULLIF(%s, '')::date, %s, %s,
-                        %s::jsonb,
-                        now()
-                    )
-                    ON CONFLICT (task_key, slug) DO UPDATE SET
-                        code = EXCLUDED.code,
-                        name = EXCLUDED.name,
-                        full_name = EXCLUDED.full_name,
-                        feature_key = EXCLUDED.feature_key,
-                        task_area = EXCLUDED.task_area,
-                        status = EXCLUDED.status,
-                        message = EXCLUDED.message,
-                        host = EXCLUDED.host,
-                        system_type = EXCLUDED.system_type,
-                        source_url = EXCLUDED.source_url,
-                        started_at_text = EXCLUDED.started_at_text,
-                        finished_at_text = EXCLUDED.finished_at_text,
-                        updated_at_text = EXCLUDED.updated_at_text,
-                        progress_updated_at_text = EXCLUDED.progress_updated_at_text,
-                        returncode = EXCLUDED.returncode,
-                        pid = EXCLUDED.pid,
-                        progress_current = EXCLUDED.progress_current,
-                        progress_total = EXCLUDED.progress_total,
-                        progress_unit = EXCLUDED.progress_unit,
-                        freshness_date = EXCLUDED.freshness_date,
-                        freshness_basis = EXCLUDED.freshness_basis,
-                        last_checked_at_text = EXCLUDED.last_checked_at_text,
-                        warning_count = EXCLUDED.warning_count,
-                        warning_lines = EXCLUDED.warning_lines,
-                        item_json = EXCLUDED.item_json,
-                        updated_at = now()
-                    """,
-                    (
-                        task_key,
-                        slug,
-                        str(item.get("code", "")),
-                        str(item.get("name", "")),
-                        str(item.get("full_name", "")),
-                        _feature_key(task_key),
-                        _task_area(item),
-                        str(item.get("status", "")),
-                        str(item.get("message", "")),
-                        str(item.get("host", "")),
-                        str(item.get("system_type", "")),
-                        str(item.get("source_url", "")),
-                        str(item.get("started_at", "")),
-                        str(item.get("finished_at", "")),
-                        str(item.get("updated_at", "")),
-                        str(item.get("progress_updated_at", "")),
-                        _optional_int(item.get("returncode")),
-                        _optional_int(item.get("pid")),
-                        _optional_int(item.get("progress_current")),
-                        _optional_int(item.get("progress_total")),
-                        str(item.get("progress_unit", "")),
-                        max(0, int(item.get("warning_count") or 0)),
-                        json.dumps(warning_lines, ensure_ascii=False),
-                        str(item.get("freshness_date", "")),
-                        str(item.get("freshness_basis", "")),
-                        str(item.get("last_checked_at", "")),
-                        serialized_items[slug],
-                    ),
-                )
-            if full_sync:
-                # プロセス初回は DB 側の残骸も同期し直す。
-                if serialized_items:
-                    conn.execute(
-                        "DELETE FROM processing_task_items WHERE task_key = %s AND NOT (slug = ANY(%s))",
-                        (task_key, list(serialized_items)),
-                    )
-                else:
-                    conn.execute("DELETE FROM processing_task_items WHERE task_key = %s", (task_key,))
-            else:
-                removed = [slug for slug in previous_items if slug not in serialized_items]
-                if removed:
-                    conn.execute(
-                        "DELETE FROM processing_task_items WHERE task_key = %s AND slug = ANY(%s)",
-                        (task_key, removed),
+            with conn.cursor() as cursor:
+                if len(changed_rows) >= ITEM_COPY_MIN_ROWS:
+                    # COPY は pipeline の中では使えないので先に済ませる。
+                    _merge_items_via_copy(cursor, changed_rows)
+                    changed_rows = []
+                with _pipeline(conn):
+                    cursor.execute(
+                        """
+                        INSERT INTO management_task_statuses (
+                            task_key, running, heartbeat_at, updated_at_text,
+                            source_mtime, status_json, updated_at
+                        ) VALUES (%s, %s, %s, %s, %s, %s::jsonb, now())
+                        ON CONFLICT (task_key) DO UPDATE SET
+                            running = EXCLUDED.running,
+                            heartbeat_at = EXCLUDED.heartbeat_at,
+                            updated_at_text = EXCLUDED.updated_at_text,
+                            source_mtime = EXCLUDED.source_mtime,
+                            status_json = EXCLUDED.status_json,
+                            updated_at = now()
+                        """,
+                        (
+                            task_key,
+                            bool(status.get("running", False)),
+                            str(status.get("heartbeat_at", "")),
+                            str(status.get("updated_at", "")),
+                            source_mtime,
+                            json.dumps(task_status, ensure_ascii=False),
+                        ),
                     )
+                    if changed_rows:
+                        cursor.executemany(_ITEM_UPSERT_SQL, changed_rows)
+                    if full_sync:
+                        # プロセス初回は DB 側の残骸も同期し直す。
+                        if serialized_items:
+                            cursor.execute(
+                                "DELETE FROM processing_task_items WHERE task_key = %s AND NOT (slug = ANY(%s))",
+                                (task_key, list(serialized_items)),
+                            )
+                        else:
+                            cursor.execute("DELETE FROM processing_task_items WHERE task_key = %s", (task_key,))
+                    else:
+                        removed = [slug for slug in previous_items if slug not in serialized_items]
+                        if removed:
+                            cursor.execute(
+                                "DELETE FROM processing_task_items WHERE task_key = %s AND slug = ANY(%s)",
+                                (task_key, removed),
+                            )
     except Exception:
         # 接続が壊れた可能性があるので作り直し、差分キャッシュも破棄して次回フル同期する。
         _reset_connection()
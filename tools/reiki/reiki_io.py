@@ -3,6 +3,21 @@
 例規集スクレイパは source HTML、正規化 HTML、Markdown、manifest、JSON メタデータを
 生成する。IO をここへ集約し、例規集固有のパスを扱いつつ、圧縮とアーカイブの
 振る舞いを会議録側と揃える。
+
+source_manifest.json.gz は ManifestWriter で書く。実行中は行を
+source_manifest.segments.ndjson.gz に gzip member として追記するだけにし、
+JSON 配列（従来形式）への書き直しは finish で 1 回だけ行う:
+
+    writer = reiki_io.ManifestWriter(work_root / "source_manifest.json.gz")
+    for ...:
+        writer.append(row)
+    writer.finish()
+
+注意:
+- 途中で止まった実行の segment は残る。load_manifest_rows は従来の配列に segment の行を
+  source_file 単位で上書きして返すので、次回の実行や index 作成は segment を読み落とさない。
+- 件数だけを数える読み手（load_json_array_count など）は配列しか見ない。実行中・停止後の
+  件数は前回完了時のもの。
 """
 
 from __future__ import annotations
@@ -12,9 +27,13 @@ import hashlib
 import json
 import os
 import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import content_hash
 
 
 TEXT_ENCODINGS = ("utf-8", "utf-8-sig", "cp932", "shift_jis", "euc_jp")
@@ -87,9 +106,11 @@ def write_bytes(path: Path, data: bytes, *, compress: bool = False) -> Path:
     final_path.parent.mkdir(parents=True, exist_ok=True)
     existing = existing_path(path)
     archived_existing: Path | None = None
+    digest = content_hash.sha256_bytes(data)
     if existing is not None:
         try:
-            if read_bytes(existing) != data:
+            # 書き込み時に残した hash と比べ、既存ファイルは記録が無いときだけ読む。
+            if content_hash.content_sha256(existing) != digest:
                 archive_existing_file(existing, reason="overwrite")
                 archived_existing = existing.resolve()
         except Exception:
@@ -110,6 +131,7 @@ def write_bytes(path: Path, data: bytes, *, compress: bool = False) -> Path:
             if archived_existing != gz_path.resolve():
                 archive_existing_file(gz_path, reason="delete")
             gz_path.unlink()
+    content_hash.record_sha256(final_path, digest)
     return final_path
 
 
@@ -136,7 +158,8 @@ def sha256_bytes(data: bytes) -> str:
 
 
 def sha256_path(path: Path) -> str:
-    return sha256_bytes(read_bytes(path))
+    # write_bytes が残した記録が新しければ本体は読まない。
+    return content_hash.content_sha256(path)
 
 
 def existing_path(path: Path) -> Path | None:
@@ -178,3 +201,85 @@ def update_progress_state(path: Path, *, current: int, total: int, unit: str = "
             "progress_unit": str(unit).strip() or "ordinance",
         },
     )
+
+
+def manifest_segment_path(path: Path) -> Path:
+    """source_manifest.json(.gz) に対応する、実行中の追記先を返す。"""
+    logical = logical_path(path)
+    return logical.with_name(logical.stem + ".segments.ndjson.gz")
+
+
+def _manifest_row_key(row: dict[str, Any]) -> str:
+    return str(row.get("source_file") or row.get("stored_source_file") or "").strip()
+
+
+def iter_manifest_segment_rows(path: Path) -> Iterator[dict[str, Any]]:
+    """segment の行を追記順に返す。書きかけの末尾 member や行は捨てる。"""
+    segment_path = manifest_segment_path(path)
+    if not segment_path.exists():
+        return
+    try:
+        with gzip.open(segment_path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    return
+                if isinstance(row, dict):
+                    yield row
+    except (OSError, EOFError):
+        return
+
+
+def load_manifest_rows(path: Path) -> list[dict[str, Any]]:
+    """従来形式の配列と segment を合わせた manifest を返す。同じ source_file は segment が勝つ。"""
+    existing = existing_path(logical_path(path))
+    loaded = load_json(existing, []) if existing is not None else []
+    rows = [row for row in loaded if isinstance(row, dict)] if isinstance(loaded, list) else []
+    positions = {key: index for index, row in enumerate(rows) if (key := _manifest_row_key(row))}
+    for row in iter_manifest_segment_rows(path):
+        key = _manifest_row_key(row)
+        if key and key in positions:
+            rows[positions[key]] = row
+            continue
+        if key:
+            positions[key] = len(rows)
+        rows.append(row)
+    return rows
+
+
+class ManifestWriter:
+    """manifest 行を segment へ追記し、finish で従来形式の JSON 配列にまとめる。"""
+
+    def __init__(self, path: Path, *, flush_every: int = 25) -> None:
+        self.path = path
+        self.segment_path = manifest_segment_path(path)
+        self.flush_every = max(1, int(flush_every))
+        self.rows: list[dict[str, Any]] = []
+        self._flushed = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, row: dict[str, Any]) -> None:
+        self.rows.append(row)
+        if len(self.rows) - self._flushed >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """まだ書いていない行を 1 つの gzip member として追記する。"""
+        pending = self.rows[self._flushed :]
+        if not pending:
+            return
+        payload = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in pending).encode("utf-8")
+        self.segment_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.segment_path.open("ab") as handle:
+            handle.write(gzip.compress(payload, compresslevel=6))
+        self._flushed = len(self.rows)
+
+    def finish(self) -> Path:
+        """今回の行だけで manifest を書き直し、segment を消す。"""
+        final_path = write_json(self.path, self.rows, compress=True)
+        self.segment_path.unlink(missing_ok=True)
+        self._flushed = len(self.rows)
+        return final_path
@@ -15,7 +15,9 @@ from pathlib import Path
 from urllib.parse import urlsplit, urlunsplit
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
+import municipality_slugs
 from municipality_slugs import code_name_slug, sanitize_slug_token
+from target_registry import TargetRegistry, load_registry
 
 
 WORKSPACE_ROOT = Path(__file__).resolve().parents[2]
@@ -215,17 +217,14 @@ def build_target_entry(
     }
 
 
-def iter_reiki_targets(expected_system: str | None = None) -> list[dict]:
+def build_reiki_targets() -> list[dict]:
+    """URL 登録済みの全対象を、system_type で絞らずに組み立てる。"""
     url_index = load_local_reiki_url_index()
     master_index = load_municipality_master_index()
     homepage_index = load_municipality_homepage_index()
     targets: list[dict] = []
 
     for code, url_entry in sorted(url_index.items()):
-        system_type = str(url_entry.get("system_type", "")).strip()
-        if expected_system is not None and system_type != expected_system:
-            continue
-
         source_url = str(url_entry.get("url", "")).strip()
         if source_url == "":
             continue
@@ -242,7 +241,7 @@ def iter_reiki_targets(expected_system: str | None = None) -> list[dict]:
                 slug=slug,
                 code=code,
                 source_url=source_url,
-                system_type=system_type,
+                system_type=str(url_entry.get("system_type", "")).strip(),
                 master_entry=master_entry,
             )
         )
@@ -250,6 +249,32 @@ def iter_reiki_targets(expected_system: str | None = None) -> list[dict]:
     return targets
 
 
+def reiki_target_registry() -> TargetRegistry:
+    """組み立て済みの全対象。元の TSV / CSV が変わるまでプロセス内で使い回す。"""
+    municipalities_dir = DATA_ROOT / "municipalities"
+    return load_registry(
+        "reiki",
+        [
+            municipalities_dir / "reiki_system_urls.tsv",
+            municipalities_dir / "municipality_master.tsv",
+            municipalities_dir / "municipality_homepages.csv",
+            Path(__file__),
+            Path(municipality_slugs.__file__),
+        ],
+        build_reiki_targets,
+        reiki_target_aliases,
+        extra=(str(DATA_ROOT), str(WORK_ROOT)),
+    )
+
+
+def iter_reiki_targets(expected_system: str | None = None) -> list[dict]:
+    return [
+        dict(target)
+        for target in reiki_target_registry().targets
+        if expected_system is None or target["system_type"] == expected_system
+    ]
+
+
 def default_slug_for_system(expected_system: str | None = None) -> str:
     config = load_config()
     preferred_slug = str(config.get("DEFAULT_SLUG", "")).strip()
@@ -270,18 +295,15 @@ def default_slug_for_system(expected_system: str | None = None) -> str:
 
 
 def load_reiki_target(slug: str, expected_system: str | None = None) -> dict:
-    for target in iter_reiki_targets(expected_system=expected_system):
-        if reiki_target_matches_slug(target, slug):
+    for target in reiki_target_registry().lookup(slug):
+        if expected_system is None or target["system_type"] == expected_system:
             return target
 
     raise ValueError(f"Municipality slug not found: {slug}")
 
 
-def reiki_target_matches_slug(target: dict, slug: str) -> bool:
-    candidate = str(slug).strip()
-    if candidate == "":
-        return False
-
+def reiki_target_aliases(target: dict) -> set[str]:
+    """slug・自治体コード・ローマ字名・コード-ローマ字名。"""
     target_slug = str(target.get("slug", "")).strip()
     code = str(target.get("code", "")).strip()
     name_romaji = sanitize_slug_token(str(target.get("name_romaji", "")).strip())
@@ -292,4 +314,11 @@ def reiki_target_matches_slug(target: dict, slug: str) -> bool:
         aliases.add(name_romaji)
         if code:
             aliases.add(f"{code}-{name_romaji}")
-    return candidate in aliases
+    return aliases
+
+
+def reiki_target_matches_slug(target: dict, slug: str) -> bool:
+    candidate = str(slug).strip()
+    if candidate == "":
+        return False
+    return candidate in reiki_target_aliases(target)
@@ -524,7 +524,7 @@ def main():
     if total_regulations <= 0:
         print("[WARN] No regulations found.", flush=True)
 
-    previous_manifest_records = reiki_io.load_json(manifest_path, [])
+    previous_manifest_records = reiki_io.load_manifest_rows(manifest_path)
     previous_catalog_version = first_manifest_catalog_version(previous_manifest_records)
     if catalog_version == "":
         catalog_changed: bool | None = None
@@ -579,7 +579,7 @@ def main():
     parsed_count = 0
     skipped_count = 0
     processed_work_count = 0
-    manifest_entries = []
+    manifest = reiki_io.ManifestWriter(manifest_path)
     for index, plan in enumerate(plans):
         source_item = plan["source_item"]
         code = str(plan["code"])
@@ -643,33 +643,29 @@ def main():
             )
             parsed_count += 1
 
-        manifest_entries.append(
-            {
-                "code": code,
-                "detail_url": url,
-                "source_file": logical_source.name,
-                "stored_source_file": source_file_path.name,
-                "source_sha256": source_hash or (reiki_io.sha256_path(source_file_path) if source_file_path.exists() else ""),
-                "source_etag": str(metadata.get("etag") or ""),
-                "source_last_modified": str(metadata.get("last_modified") or ""),
-                "source_http_status": str(metadata.get("status_code") or ""),
-                "source_not_modified": bool(metadata.get("not_modified")),
-                "source_conditional_request": bool(metadata.get("conditional")),
-                "catalog_content_current": catalog_version,
-                "checked_updates": bool(args.check_updates),
-            }
-        )
+        manifest_entry = {
+            "code": code,
+            "detail_url": url,
+            "source_file": logical_source.name,
+            "stored_source_file": source_file_path.name,
+            "source_sha256": source_hash or (reiki_io.sha256_path(source_file_path) if source_file_path.exists() else ""),
+            "source_etag": str(metadata.get("etag") or ""),
+            "source_last_modified": str(metadata.get("last_modified") or ""),
+            "source_http_status": str(metadata.get("status_code") or ""),
+            "source_not_modified": bool(metadata.get("not_modified")),
+            "source_conditional_request": bool(metadata.get("conditional")),
+            "catalog_content_current": catalog_version,
+            "checked_updates": bool(args.check_updates),
+        }
         if isinstance(source_item, dict):
-            manifest_entries[-1]["mokujicd"] = str(source_item.get("mokujicd", ""))
-
-        if ((index + 1) % 25) == 0 or (index + 1) == total_regulations:
-            # 途中停止しても後追い補完が source_url 等を復元できるよう、manifest を定期保存する。
-            reiki_io.write_json(manifest_path, manifest_entries, compress=True)
+            manifest_entry["mokujicd"] = str(source_item.get("mokujicd", ""))
+        # 途中停止しても後追い補完が source_url 等を復元できるよう、25 件ごとに segment へ追記される。
+        manifest.append(manifest_entry)
         if should_work:
             processed_work_count += 1
             emit_progress(progress_base + processed_work_count, total_regulations, state_path)
 
-    reiki_io.write_json(manifest_path, manifest_entries, compress=True)
+    manifest.finish()
     print(f"Finished. Downloaded {downloaded_count} files.")
     print(f"Checked existing: {checked_count}")
     print(f"Conditional requests: {conditional_count}")
@@ -3,18 +3,27 @@
 
 downloader はまず生の source ページを保存する。この parser は source 1 件を
 clean HTML、Markdown、JSON メタデータ、コピー済み画像参照へ展開する。
+
+注意:
+- --workers N で source の解析・書き出しを N process に分ける。1 ページの処理は
+  BeautifulSoup の木の構築と走査が大半で、parser を lxml に替えても bs4 経由では
+  速くならないため、並列化で稼ぐ。
+- 画像は process ごとの http_transport（keep-alive・再試行つき）で取得し、同じファイル名は
+  1 run で 1 度だけ取りに行く（process をまたぐ重複は既存ファイルの skip で吸収する）。
+  取得間隔 IMAGE_DELAY は process ごとにかかる。
 """
 
 from __future__ import annotations
 
 import argparse
+import os
 import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
-import requests
 from bs4 import BeautifulSoup
 
 SCRAPER_DIR = Path(__file__).resolve().parent
@@ -23,12 +32,15 @@ MODULE_DIR = SCRAPER_DIR.parent
 # tools ツリーを package install しなくても import できるようにする。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+sys.path.append(str(MODULE_DIR.parent))
+import http_transport
 import reiki_io
 import reiki_targets
 
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 OPENSEARCH_INIT_PATH_RE = re.compile(r"/opensearch/sr[a-z0-9]+/init$", re.I)
+IMAGE_DELAY = 0.3
 
 
 def is_opensearch_mokuji_source_url(source_url):
@@ -81,33 +93,69 @@ def derive_d1_law_base_url(source_url):
     return urlunsplit((parts.scheme or "https", parts.netloc, base_path, "", ""))
 
 
-def download_image(img_filename, kno, images_dir, base_url, stats=None):
-    if img_filename.startswith("http") or img_filename.startswith("../"):
-        return img_filename
-
-    full_url = f"{base_url}{kno}/{img_filename}"
-    local_path = images_dir / img_filename
+class ImageFetcher:
+    """本文中の画像を共通 transport で取得し、ファイル名ごとの結果を run 中は覚えておく。"""
+
+    def __init__(self, *, delay=IMAGE_DELAY, transport=None):
+        self.delay = delay
+        self.transport = transport
+        self.results = {}
+
+    def get_transport(self):
+        if self.transport is None:
+            self.transport = http_transport.HttpTransport(user_agent=USER_AGENT)
+        return self.transport
+
+    def fetch(self, img_filename, kno, images_dir, base_url, stats=None):
+        if img_filename.startswith("http") or img_filename.startswith("../"):
+            return img_filename
+
+        local_path = images_dir / img_filename
+        key = str(local_path)
+        cached = self.results.get(key)
+        if cached is not None:
+            # 取得に失敗したファイル名も run 中は再試行せず、数え直さずに元の src のまま返す。
+            if stats is not None and cached != img_filename:
+                stats["images_skipped"] += 1
+            return cached
+
+        if local_path.exists() and local_path.stat().st_size > 0:
+            if stats is not None:
+                stats["images_skipped"] += 1
+            result = f"../images/{img_filename}"
+        else:
+            result = self.download(f"{base_url}{kno}/{img_filename}", img_filename, local_path, images_dir, stats)
+        self.results[key] = result
+        return result
+
+    def download(self, full_url, img_filename, local_path, images_dir, stats):
+        try:
+            images_dir.mkdir(parents=True, exist_ok=True)
+            response = self.get_transport().get(full_url, timeout=15)
+            response.raise_for_status()
+            reiki_io.write_bytes(local_path, response.content)
+
+            if stats is not None:
+                stats["images_downloaded"] += 1
+            time.sleep(self.delay)
+            return f"../images/{img_filename}"
+        except Exception as exc:
+            if stats is not None:
+                stats["images_failed"] += 1
+            print(f"  Failed to download image {img_filename}: {exc}")
+            return img_filename
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+
+IMAGE_FETCHER = ImageFetcher()
 
-    if local_path.exists() and local_path.stat().st_size > 0:
-        if stats is not None:
-            stats["images_skipped"] += 1
-        return f"../images/{img_filename}"
 
-    try:
-        images_dir.mkdir(parents=True, exist_ok=True)
-        response = requests.get(full_url, headers={"User-Agent": USER_AGENT}, timeout=15)
-        response.raise_for_status()
-        reiki_io.write_bytes(local_path, response.content)
-
-        if stats is not None:
-            stats["images_downloaded"] += 1
-        time.sleep(0.3)
-        return f"../images/{img_filename}"
-    except Exception as exc:
-        if stats is not None:
-            stats["images_failed"] += 1
-        print(f"  Failed to download image {img_filename}: {exc}")
-        return img_filename
+def download_image(img_filename, kno, images_dir, base_url, stats=None):
+    return IMAGE_FETCHER.fetch(img_filename, kno, images_dir, base_url, stats=stats)
 
 
 def parse_opensearch_html(soup, *, base_url, image_public_url):
@@ -231,38 +279,45 @@ def parse_html(file_path, *, base_url, images_dir, image_public_url, stats=None)
         date_str = wareki_to_seireki(raw_date_text)
 
     content_div = soup.find("div", class_="USER-SET-STYLE")
-    markdown_content = []
+    # 子に div / table を持たない末端の段落と table。Markdown と HTML の両方で同じ並びを使う。
+    leaf_elements = []
     if content_div:
-        for element in content_div.find_all(["div", "table"]):
-            if element.name == "table" or not element.find(["div", "table"]):
-                img_tag = element.find("img")
-                if img_tag:
-                    img_src = img_tag.get("src", "")
-                    img_alt = img_tag.get("alt", "image")
-                    markdown_content.append(f"![{img_alt}]({img_src})")
-                    continue
-
-                text = element.get_text().strip()
-                if not text:
-                    continue
-                if text == f"○{title}" or text == title:
-                    continue
-                if date_div and text == date_div.get_text().strip():
-                    continue
-                if markdown_content and markdown_content[-1] == text:
-                    continue
-
-                markdown_content.append(text)
+        leaf_elements = [
+            element
+            for element in content_div.find_all(["div", "table"])
+            if element.name == "table" or not element.find(["div", "table"])
+        ]
+
+    markdown_content = []
+    for element in leaf_elements:
+        img_tag = element.find("img")
+        if img_tag:
+            img_src = img_tag.get("src", "")
+            img_alt = img_tag.get("alt", "image")
+            markdown_content.append(f"![{img_alt}]({img_src})")
+            continue
+
+        text = element.get_text().strip()
+        if not text:
+            continue
+        if text == f"○{title}" or text == title:
+            continue
+        if date_div and text == raw_date_text:
+            continue
+        if markdown_content and markdown_content[-1] == text:
+            continue
+
+        markdown_content.append(text)
 
     full_markdown = f"# {title}\n\n"
     if date_div:
-        full_markdown += f"**日付:** {date_div.get_text().strip()} ({date_str})\n\n"
+        full_markdown += f"**日付:** {raw_date_text} ({date_str})\n\n"
     full_markdown += "---\n\n"
     full_markdown += "\n\n".join(markdown_content)
 
     html_parts = [f'<div class="law-title">{title}</div>']
     if date_div:
-        html_parts.append(f'<div class="law-date">{date_div.get_text().strip()} ({date_str})</div>')
+        html_parts.append(f'<div class="law-date">{raw_date_text} ({date_str})</div>')
     html_parts.append('<div class="law-content">')
 
     if content_div:
@@ -272,9 +327,7 @@ def parse_html(file_path, *, base_url, images_dir, image_public_url, stats=None)
             if src.startswith("../images/") or src.startswith("../kawasaki_images/"):
                 img["src"] = f"{image_public_url.rstrip('/')}/{Path(src).name}"
 
-        for element in content_div.find_all(["div", "table"]):
-            if element.name == "table" or not element.find(["div", "table"]):
-                html_parts.append(str(element))
+        html_parts.extend(str(element) for element in leaf_elements)
 
     html_parts.append("</div>")
     clean_html = "\n".join(html_parts)
@@ -321,11 +374,52 @@ def process_file(
         return False
 
 
+def new_image_stats():
+    return {
+        "images_downloaded": 0,
+        "images_skipped": 0,
+        "images_failed": 0,
+    }
+
+
+WORKER_OPTIONS = {}
+
+
+def init_parse_worker(options):
+    # fork 元の session と画像結果を引き継がず、worker ごとに pool を持ち直す。
+    global IMAGE_FETCHER
+    IMAGE_FETCHER = ImageFetcher()
+    WORKER_OPTIONS.clear()
+    WORKER_OPTIONS.update(options)
+
+
+def process_file_job(file_path):
+    stats = new_image_stats()
+    options = WORKER_OPTIONS
+    process_file(
+        file_path,
+        options["md_output_dir"],
+        options["html_output_dir"],
+        base_url=options["base_url"],
+        images_dir=options["images_dir"],
+        image_public_url=options["image_public_url"],
+        stats=stats,
+        force=options["force"],
+    )
+    return stats
+
+
 def main():
     default_slug = reiki_targets.default_slug_for_system("d1-law")
     parser = argparse.ArgumentParser(description="Process D1-Law ordinance HTML files.")
     parser.add_argument("--slug", default=default_slug, help="Municipality slug resolved from data/municipalities")
     parser.add_argument("--force", action="store_true", help="Rebuild outputs even when unchanged")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("MIYABE_D1_PARSER_WORKERS", "1")),
+        help="Number of processes used to parse files (1 parses in the main process)",
+    )
     args = parser.parse_args()
 
     target = reiki_targets.load_reiki_target(args.slug, expected_system="d1-law")
@@ -335,49 +429,64 @@ def main():
     html_dir = target["html_dir"]
     images_dir = target["image_dir"]
     image_public_url = target["image_public_url"]
+    workers = max(1, args.workers)
 
     files = reiki_io.collect_matching_files(source_dir, ["*_j.html", "*_j.html.gz"])
     print(f"Target: {target['name']} ({target['slug']}, {target['system_type']})")
     print(f"Found {len(files)} files to process.")
+    print(f"Workers: {workers}")
 
-    processed = 0
     skipped = 0
-    stats = {
-        "images_downloaded": 0,
-        "images_skipped": 0,
-        "images_failed": 0,
-    }
-
-    for index, file_path in enumerate(files):
+    pending = []
+    for file_path in files:
         logical_source = reiki_io.logical_path(file_path)
         html_output = html_dir / f"{logical_source.stem}.html"
         if not args.force and html_output.exists():
             if html_output.stat().st_mtime >= file_path.stat().st_mtime:
                 skipped += 1
-                if (index + 1) % 100 == 0:
-                    print(f"Progress: {index + 1}/{len(files)} checked ({processed} processed, {skipped} skipped)...")
                 continue
+        pending.append(file_path)
+    if skipped:
+        print(f"Skipped {skipped} up-to-date files.")
+
+    options = {
+        "md_output_dir": markdown_dir,
+        "html_output_dir": html_dir,
+        "base_url": base_url,
+        "images_dir": images_dir,
+        "image_public_url": image_public_url,
+        "force": args.force,
+    }
+    stats = new_image_stats()
+    processed = 0
 
-        process_file(
-            file_path,
-            markdown_dir,
-            html_dir,
-            base_url=base_url,
-            images_dir=images_dir,
-            image_public_url=image_public_url,
-            stats=stats,
-            force=args.force,
-        )
+    def report(file_stats):
+        nonlocal processed
         processed += 1
-
-        if (index + 1) % 100 == 0:
+        for key, value in file_stats.items():
+            stats[key] += value
+        if processed % 100 == 0:
             img_summary = ""
             if stats["images_downloaded"] > 0:
                 img_summary = f"{stats['images_downloaded']} downloaded, {stats['images_skipped']} skipped"
-            progress_msg = f"Progress: {index + 1}/{len(files)} checked ({processed} processed, {skipped} skipped)"
+            progress_msg = f"Progress: {skipped + processed}/{len(files)} checked ({processed} processed, {skipped} skipped)"
             if img_summary:
                 progress_msg += f" | Images: {img_summary}"
-            print(progress_msg)
+            print(progress_msg, flush=True)
+
+    if workers <= 1 or len(pending) <= 1:
+        init_parse_worker(options)
+        for file_path in pending:
+            report(process_file_job(file_path))
+        IMAGE_FETCHER.close()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_parse_worker,
+            initargs=(options,),
+        ) as pool:
+            for file_stats in pool.map(process_file_job, pending, chunksize=8):
+                report(file_stats)
 
     print("\nFinished conversion:")
     print(f"  Files processed: {processed}")
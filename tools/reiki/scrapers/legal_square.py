@@ -15,6 +15,10 @@ JSF + RichFaces + クライアント側ビューアで構成され、本文(条
 制約: 詳細検索は最大 1000 件で打ち切られる。1000 件超の自治体は超過分を取得
 できない（その場合は警告を出す）。
 
+--page-pool N を付けると、一覧の行を N 件ずつクリックしてポップアップを同時に開き、
+ビューアの描画待ちを重ねる。クリックは前のポップアップの DOMContentLoaded を待ってから
+--delay-seconds 間隔で行う。ビューアが開いた文書をセッション側で持つ構成に備えて既定は 1。
+
 共通の正規化 HTML/Markdown/manifest 生成は static_catalog のヘルパを再利用する。
 """
 
@@ -23,7 +27,6 @@ from __future__ import annotations
 import argparse
 import hashlib
 import sys
-import time
 from pathlib import Path
 
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
@@ -33,6 +36,10 @@ SCRAPER_DIR = Path(__file__).resolve().parent
 MODULE_DIR = SCRAPER_DIR.parent
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+# ブラウザ共有と流量制限は会議録側の Playwright スクレイパと同じ部品を使う。
+sys.path.append(str(MODULE_DIR.parent / "gijiroku"))
+import browser_pool  # noqa: E402
+import fetch_pipeline  # noqa: E402
 import reiki_io  # noqa: E402
 import reiki_targets  # noqa: E402
 import static_catalog  # noqa: E402
@@ -92,7 +99,26 @@ def extract_body_html(popup) -> str:
     return "\n".join(p for p in parts if p and p.strip())
 
 
-def run(slug: str, expected_system: str, *, force: bool, check_updates: bool, limit: int, headful: bool, timeout_ms: int) -> int:
+def open_popup(page, anchor, timeout_ms: int):
+    with page.expect_popup(timeout=timeout_ms) as pi:
+        anchor.click()
+    popup = pi.value
+    popup.wait_for_load_state("domcontentloaded")
+    return popup
+
+
+def run(
+    slug: str,
+    expected_system: str,
+    *,
+    force: bool,
+    check_updates: bool,
+    limit: int,
+    headful: bool,
+    timeout_ms: int,
+    page_pool: int = 1,
+    delay_seconds: float = 0.1,
+) -> int:
     target = reiki_targets.load_reiki_target(slug, expected_system=expected_system)
     source_dir = Path(target["source_dir"])
     html_dir = Path(target["html_dir"])
@@ -107,12 +133,17 @@ def run(slug: str, expected_system: str, *, force: bool, check_updates: bool, li
     print(f"Target: {target['name']} ({target['slug']}, {target['system_type']})", flush=True)
     print(f"Source URL: {source_url}", flush=True)
 
-    manifest: list[dict] = []
+    manifest = reiki_io.ManifestWriter(manifest_path)
     seen_stems: set[str] = set()
     downloaded = failed = 0
 
+    host = browser_pool.url_host(source_url)
+    pool_size = browser_pool.pool_size_for_host(host, page_pool)
+    limiter = fetch_pipeline.HostRateLimiter(delay_seconds)
+    print(f"[INFO] Popup pool: {pool_size} (host={host})", flush=True)
+
     with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=not headful, args=["--ignore-certificate-errors"])
+        browser, _ = browser_pool.launch_browser(pw, headless=not headful, args=["--ignore-certificate-errors"])
         context = browser.new_context(ignore_https_errors=True, locale="ja-JP", user_agent=USER_AGENT)
         page = context.new_page()
         page.set_default_timeout(timeout_ms)
@@ -129,6 +160,7 @@ def run(slug: str, expected_system: str, *, force: bool, check_updates: bool, li
             rows = page.evaluate(ROW_EVAL)
             anchors = page.query_selector_all("a.viewerOpener")
             count = min(len(rows), len(anchors))
+            pending: list[tuple[int, str, str, str, str, str, Path, Path, str]] = []
             for i in range(count):
                 meta = rows[i]
                 title = str(meta.get("title", "")).strip()
@@ -146,36 +178,54 @@ def run(slug: str, expected_system: str, *, force: bool, check_updates: bool, li
                     manifest.append(_manifest_row(filename, source_url, title, number, iso_date))
                     emit_total += 1
                     continue
-
-                body_html = ""
-                try:
-                    with page.expect_popup(timeout=timeout_ms) as pi:
-                        anchors[i].click()
-                    popup = pi.value
-                    body_html = extract_body_html(popup)
-                    popup.close()
-                except PlaywrightTimeoutError:
-                    print(f"[WARN] popup timeout: {title[:30]}", flush=True)
-                except Exception as exc:
-                    print(f"[WARN] body fetch failed {title[:30]}: {exc}", flush=True)
-
-                if not body_html.strip():
-                    failed += 1
-                    continue
-
-                parsed = ParsedArticle(title=title, content_html=body_html, date_text=date_text, number=number)
-                content_text = static_catalog.html_to_plain(body_html)
-                reiki_io.write_text(source_dir / filename, body_html, compress=True)
-                reiki_io.write_text(clean_path, static_catalog.build_clean_html(parsed, iso_date))
-                reiki_io.write_text(markdown_path, static_catalog.build_markdown(parsed, iso_date, content_text), compress=True)
-                manifest.append(_manifest_row(filename, source_url, title, number, iso_date))
-                downloaded += 1
-                emit_total += 1
-                static_catalog.emit_progress(emit_total, max(emit_total, len(rows) * page_no), state_path)
-                reiki_io.write_json(manifest_path, manifest, compress=True)
-                time.sleep(0.1)
-                if limit > 0 and emit_total >= limit:
-                    break
+                pending.append((i, title, date_text, number, filename, stem, clean_path, markdown_path, iso_date))
+
+            while pending and not (limit > 0 and emit_total >= limit):
+                batch_size = pool_size if limit <= 0 else min(pool_size, limit - emit_total)
+                batch, pending = pending[:batch_size], pending[batch_size:]
+                # 先に batch 分のポップアップを開き、ビューアの描画を並行させてから順に読む。
+                popups = []
+                for i, title, *_ in batch:
+                    limiter.acquire(host)
+                    try:
+                        popups.append(open_popup(page, anchors[i], timeout_ms))
+                    except PlaywrightTimeoutError:
+                        print(f"[WARN] popup timeout: {title[:30]}", flush=True)
+                        popups.append(None)
+                    except Exception as exc:
+                        print(f"[WARN] body fetch failed {title[:30]}: {exc}", flush=True)
+                        popups.append(None)
+
+                for (_, title, date_text, number, filename, _stem, clean_path, markdown_path, iso_date), popup in zip(
+                    batch, popups
+                ):
+                    body_html = ""
+                    if popup is not None:
+                        try:
+                            body_html = extract_body_html(popup)
+                        except PlaywrightTimeoutError:
+                            print(f"[WARN] popup timeout: {title[:30]}", flush=True)
+                        except Exception as exc:
+                            print(f"[WARN] body fetch failed {title[:30]}: {exc}", flush=True)
+                        try:
+                            popup.close()
+                        except Exception:
+                            pass
+
+                    if not body_html.strip():
+                        failed += 1
+                        continue
+
+                    parsed = ParsedArticle(title=title, content_html=body_html, date_text=date_text, number=number)
+                    content_text = static_catalog.html_to_plain(body_html)
+                    reiki_io.write_text(source_dir / filename, body_html, compress=True)
+                    reiki_io.write_text(clean_path, static_catalog.build_clean_html(parsed, iso_date))
+                    reiki_io.write_text(markdown_path, static_catalog.build_markdown(parsed, iso_date, content_text), compress=True)
+                    manifest.append(_manifest_row(filename, source_url, title, number, iso_date))
+                    downloaded += 1
+                    emit_total += 1
+                    static_catalog.emit_progress(emit_total, max(emit_total, len(rows) * page_no), state_path)
+                manifest.flush()
 
             if limit > 0 and emit_total >= limit:
                 break
@@ -196,7 +246,7 @@ def run(slug: str, expected_system: str, *, force: bool, check_updates: bool, li
 
     if not manifest:
         raise RuntimeError("No ordinances collected; refusing to mark target as scraped.")
-    reiki_io.write_json(manifest_path, manifest, compress=True)
+    manifest.finish()
     static_catalog.emit_progress(emit_total, emit_total, state_path)
     print(f"Finished. downloaded={downloaded} failed={failed} manifest={len(manifest)} -> {manifest_path}", flush=True)
     return 0
@@ -222,6 +272,8 @@ def main() -> int:
     parser.add_argument("--limit", type=int, default=0)
     parser.add_argument("--headful", action="store_true")
     parser.add_argument("--timeout-ms", type=int, default=30000)
+    parser.add_argument("--page-pool", type=int, default=1, help="同時に開く本文ポップアップ数（既定 1）")
+    parser.add_argument("--delay-seconds", type=float, default=0.1, help="本文ポップアップを開く間隔（秒）")
     args = parser.parse_args()
 
     slug = args.slug.strip() or reiki_targets.default_slug_for_system("legal-square")
@@ -234,6 +286,8 @@ def main() -> int:
         limit=args.limit,
         headful=args.headful,
         timeout_ms=args.timeout_ms,
+        page_pool=args.page_pool,
+        delay_seconds=args.delay_seconds,
     )
 
 
@@ -12,7 +12,8 @@ index builder（tools/search）が読む契約に合わせ、成果物は
 - work/reiki/{slug}/markdown/{stem}.md … Markdown（補強用）
 - work/reiki/{slug}/source/{stem}.html.gz … 取得時の生 HTML
 - work/reiki/{slug}/source_manifest.json.gz … source_file/detail_url/日付などの台帳
-を生成する。
+を生成する。--check-updates では manifest の source_etag / source_last_modified /
+source_sha256 で条件付き GET を送り、変わっていない例規は正規化・書き込みを省く。
 """
 
 from __future__ import annotations
@@ -32,6 +33,8 @@ MODULE_DIR = SCRAPER_DIR.parent
 # batch runner はこのファイルを直接実行する兄弟スクリプトから import する。
 sys.path.append(str(MODULE_DIR))
 sys.path.append(str(SCRAPER_DIR))
+sys.path.append(str(MODULE_DIR.parent))
+import conditional_fetch  # noqa: E402
 import reiki_io  # noqa: E402
 import reiki_targets  # noqa: E402
 
@@ -135,19 +138,33 @@ def html_to_plain(value: str) -> str:
     return text.strip()
 
 
-def fetch_text(session: requests.Session, url: str, *, referer: str = "") -> str | None:
+def response_text(response: requests.Response) -> str:
+    if not response.encoding or response.encoding.lower() in {"iso-8859-1", "ascii"}:
+        response.encoding = response.apparent_encoding or "utf-8"
+    return response.text
+
+
+def fetch_if_changed(
+    session: requests.Session,
+    url: str,
+    *,
+    referer: str = "",
+    previous: dict | None = None,
+) -> conditional_fetch.FetchResult | None:
+    """previous（manifest 行）の検証子を付けて取得する。失敗したら None。"""
     headers = {"User-Agent": USER_AGENT}
     if referer:
         headers["Referer"] = referer
     try:
-        response = session.get(url, headers=headers, timeout=TIMEOUT)
-        response.raise_for_status()
+        return conditional_fetch.conditional_get(session.get, url, previous=previous, headers=headers, timeout=TIMEOUT)
     except Exception as exc:
         print(f"[WARN] fetch failed {url}: {exc}", flush=True)
         return None
-    if not response.encoding or response.encoding.lower() in {"iso-8859-1", "ascii"}:
-        response.encoding = response.apparent_encoding or "utf-8"
-    return response.text
+
+
+def fetch_text(session: requests.Session, url: str, *, referer: str = "") -> str | None:
+    result = fetch_if_changed(session, url, referer=referer)
+    return response_text(result.response) if result is not None else None
 
 
 def emit_progress(current: int, total: int, state_path: Path) -> None:
@@ -199,8 +216,12 @@ def run(
 
     emit_progress(0, total, state_path)
 
-    manifest: list[dict] = []
+    previous_rows = {
+        str(row.get("source_file") or ""): row for row in reiki_io.load_manifest_rows(manifest_path)
+    }
+    manifest = reiki_io.ManifestWriter(manifest_path)
     downloaded = 0
+    unchanged = 0
     skipped = 0
     failed = 0
     seen_stems: set[str] = set()
@@ -223,37 +244,52 @@ def run(
             and existing_markdown is not None
         )
 
+        previous_row = previous_rows.get(filename) or {}
+        validators = conditional_fetch.Validators.from_fields(previous_row)
         parsed: ParsedArticle | None = None
         iso_date = ""
         if force or check_updates or not complete:
-            raw = fetch_text(session, article.url, referer=source_url)
-            if raw is None:
-                failed += 1
-                continue
-            try:
-                parsed = parse_article(raw, article.url)
-            except Exception as exc:
-                print(f"[WARN] parse failed {article.url}: {exc}", flush=True)
-                parsed = None
-            if parsed is None or not parsed.content_html.strip():
+            # 出力が揃っている例規の更新確認だけ、前回の検証子を付けて 304 / 同一本文なら作り直さない。
+            result = fetch_if_changed(
+                session,
+                article.url,
+                referer=source_url,
+                previous=previous_row if complete and not force else None,
+            )
+            if result is None:
                 failed += 1
                 continue
-            reiki_io.write_text(source_path, raw, compress=True)
-            iso_date = to_seireki(parsed.date_text)
-            clean_html = build_clean_html(parsed, iso_date)
-            content_text = html_to_plain(parsed.content_html)
-            reiki_io.write_text(clean_path, clean_html)
-            reiki_io.write_text(markdown_path, build_markdown(parsed, iso_date, content_text), compress=True)
-            downloaded += 1
-            time.sleep(delay)
+            if result.unchanged:
+                validators = result.validators
+                unchanged += 1
+                time.sleep(delay)
+            else:
+                raw = response_text(result.response)
+                try:
+                    parsed = parse_article(raw, article.url)
+                except Exception as exc:
+                    print(f"[WARN] parse failed {article.url}: {exc}", flush=True)
+                    parsed = None
+                if parsed is None or not parsed.content_html.strip():
+                    failed += 1
+                    continue
+                validators = result.validators
+                reiki_io.write_text(source_path, raw, compress=True)
+                iso_date = to_seireki(parsed.date_text)
+                clean_html = build_clean_html(parsed, iso_date)
+                content_text = html_to_plain(parsed.content_html)
+                reiki_io.write_text(clean_path, clean_html)
+                reiki_io.write_text(markdown_path, build_markdown(parsed, iso_date, content_text), compress=True)
+                downloaded += 1
+                time.sleep(delay)
         else:
             skipped += 1
 
-        title = article.title or (parsed.title if parsed else "")
-        number = parsed.number if parsed else ""
-        date_text = parsed.date_text if parsed else ""
-        if not iso_date and date_text:
-            iso_date = to_seireki(date_text)
+        # 取り直さなかった例規は、前回の manifest 行から番号・日付を引き継ぐ。
+        title = article.title or (parsed.title if parsed else str(previous_row.get("title") or ""))
+        number = parsed.number if parsed else str(previous_row.get("number") or "")
+        if parsed is None:
+            iso_date = str(previous_row.get("enactment_date") or "")
         manifest.append(
             {
                 "code": article.code,
@@ -264,18 +300,18 @@ def run(
                 "title": title,
                 "number": number,
                 "enactment_date": iso_date,
-                "taxonomy_path": parsed.taxonomy_path if parsed else "",
+                "taxonomy_path": parsed.taxonomy_path if parsed else str(previous_row.get("taxonomy_path") or ""),
+                **validators.as_fields(),
             }
         )
 
         if ((index + 1) % 25) == 0 or (index + 1) == total:
-            reiki_io.write_json(manifest_path, manifest, compress=True)
             emit_progress(index + 1, total, state_path)
 
-    reiki_io.write_json(manifest_path, manifest, compress=True)
+    manifest.finish()
     emit_progress(total, total, state_path)
     print(
-        f"Finished. downloaded={downloaded} skipped={skipped} failed={failed} "
+        f"Finished. downloaded={downloaded} unchanged={unchanged} skipped={skipped} failed={failed} "
         f"manifest={len(manifest)} -> {manifest_path}",
         flush=True,
     )
@@ -0,0 +1,127 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+from tools.reiki import reiki_io
+from tools.reiki.scrapers import d1_parser
+
+
+TESTDATA_DIR = Path(__file__).resolve().parent / "testdata" / "d1_parser"
+BASE_URL = "https://www.d1-law.com/d1w_reiki/000000000000000/"
+IMAGE_PUBLIC_URL = "/reiki-images/sample"
+
+
+def _response(status_code: int, content: bytes = b"") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.url = BASE_URL
+    return response
+
+
+class _Session:
+    def __init__(self, status_code: int = 200) -> None:
+        self.status_code = status_code
+        self.urls: list[str] = []
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.urls.append(url)
+        return _response(self.status_code, b"GIF89a")
+
+
+class D1ParserGoldenTest(unittest.TestCase):
+    """testdata の source ページを解析し、保存済みの出力と突き合わせる。"""
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.images_dir = self.root / "images"
+        self.images_dir.mkdir()
+        # 画像は取得済みとして扱い、ネットワークに出ない。
+        for name in ("1000001_01.gif", "1000002_01.gif"):
+            (self.images_dir / name).write_bytes(b"GIF89a")
+
+    def expected(self, source: Path) -> tuple[str, str]:
+        stem = source.name.removesuffix(".html")
+        # CRLF の source は本文中の CR も出力に残るため、改行を変換せずに読む。
+        return (
+            (TESTDATA_DIR / f"{stem}.expected.md").read_bytes().decode("utf-8"),
+            (TESTDATA_DIR / f"{stem}.expected.html").read_bytes().decode("utf-8"),
+        )
+
+    def test_outputs_match_golden_files(self) -> None:
+        sources = sorted(TESTDATA_DIR.glob("*_j.html"))
+        self.assertGreaterEqual(len(sources), 3)
+        for source in sources:
+            with self.subTest(source=source.name):
+                _, _, markdown, clean_html = d1_parser.parse_html(
+                    source,
+                    base_url=BASE_URL,
+                    images_dir=self.images_dir,
+                    image_public_url=IMAGE_PUBLIC_URL,
+                )
+                self.assertEqual((markdown, clean_html), self.expected(source))
+
+    def test_worker_job_writes_golden_outputs(self) -> None:
+        source = TESTDATA_DIR / "1000002_j.html"
+        options = {
+            "md_output_dir": self.root / "md",
+            "html_output_dir": self.root / "html",
+            "base_url": BASE_URL,
+            "images_dir": self.images_dir,
+            "image_public_url": IMAGE_PUBLIC_URL,
+            "force": True,
+        }
+        self.addCleanup(setattr, d1_parser, "IMAGE_FETCHER", d1_parser.IMAGE_FETCHER)
+        d1_parser.init_parse_worker(options)
+
+        stats = d1_parser.process_file_job(source)
+        self.assertEqual(stats, {"images_downloaded": 0, "images_skipped": 2, "images_failed": 0})
+        expected_markdown, expected_html = self.expected(source)
+        self.assertEqual(reiki_io.read_text_auto(self.root / "md" / "1000002_j.md.gz"), expected_markdown)
+        self.assertEqual(reiki_io.read_text_auto(self.root / "html" / "1000002_j.html"), expected_html)
+
+
+class ImageFetcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.images_dir = Path(temp_dir.name) / "images"
+        self.stats = d1_parser.new_image_stats()
+
+    def test_same_filename_is_fetched_once_per_run(self) -> None:
+        session = _Session()
+        fetcher = d1_parser.ImageFetcher(delay=0, transport=session)
+        first = fetcher.fetch("shared.gif", "1000001", self.images_dir, BASE_URL, stats=self.stats)
+        (self.images_dir / "shared.gif").unlink()
+        second = fetcher.fetch("shared.gif", "1000002", self.images_dir, BASE_URL, stats=self.stats)
+
+        self.assertEqual(first, "../images/shared.gif")
+        self.assertEqual(second, first)
+        self.assertEqual(session.urls, [f"{BASE_URL}1000001/shared.gif"])
+        self.assertEqual(self.stats, {"images_downloaded": 1, "images_skipped": 1, "images_failed": 0})
+        self.assertEqual(
+            fetcher.fetch("http://example.jp/logo.gif", "1000001", self.images_dir, BASE_URL),
+            "http://example.jp/logo.gif",
+        )
+
+    def test_failed_image_is_not_retried_and_keeps_source_name(self) -> None:
+        session = _Session(status_code=404)
+        fetcher = d1_parser.ImageFetcher(delay=0, transport=session)
+        with mock.patch("builtins.print"):
+            for kno in ("1000001", "1000002"):
+                self.assertEqual(
+                    fetcher.fetch("missing.gif", kno, self.images_dir, BASE_URL, stats=self.stats),
+                    "missing.gif",
+                )
+        self.assertEqual(len(session.urls), 1)
+        self.assertEqual(self.stats["images_failed"], 1)
+        self.assertFalse((self.images_dir / "missing.gif").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
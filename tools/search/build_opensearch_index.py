@@ -11,13 +11,17 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import multiprocessing
+import multiprocessing.util
 import os
 import re
 import sys
+import threading
 import time
 from collections import deque
 from collections.abc import Callable, Iterable, Iterator
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -35,6 +39,10 @@ sys.path.append(str(Path(__file__).resolve().parents[2] / "lib" / "python"))
 import gijiroku_targets  # type: ignore
 import reiki_targets  # type: ignore
 import build_locks  # type: ignore
+import dead_letter  # type: ignore
+import delta_manifest  # type: ignore
+import source_listing  # type: ignore
+import terms_cache  # type: ignore
 from opensearch_mappings import build_index_body
 from scraped_source_records import (  # type: ignore
     build_alias_map,
@@ -43,6 +51,7 @@ from scraped_source_records import (  # type: ignore
     choose_minutes_source_files,
     collect_reiki_preferred_files,
     load_reiki_manifest_index,
+    normalize_title,
     parse_minutes_source_meta,
     reiki_sortable_prefixes,
 )
@@ -109,7 +118,7 @@ DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?(
 
 
 # OpenSearch への素の HTTP クライアントは opensearch_client.py へ分離した。
-from opensearch_client import OpenSearchClient, OpenSearchRequestError  # type: ignore  # noqa: E402
+from opensearch_client import BulkOutcome, OpenSearchClient, OpenSearchRequestError  # type: ignore  # noqa: E402
 
 # rebuild の進捗 state 書き込み（UI 補助）は rebuild_status.py へ分離した。
 from rebuild_status import (  # type: ignore  # noqa: E402
@@ -126,11 +135,13 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--mode",
-        choices=["auto", "rebuild", "update", "resume"],
+        choices=["auto", "rebuild", "update", "delta", "resume"],
         default="auto",
         help=(
             "auto は --slug 指定時だけ増分更新し、それ以外は versioned rebuild します。"
             " update は current alias に slug 単位で delete+bulk します。"
+            " delta は前回からの追加・変更ファイルだけを投入し、消えたファイルの文書だけを削除します"
+            "（--slug 未指定なら全自治体）。"
             " resume は中断した rebuild を --resume-index の途中状態から再開します。"
         ),
     )
@@ -179,6 +190,81 @@ def parse_args() -> argparse.Namespace:
         default=int(os.environ.get("MIYABE_OPENSEARCH_BULK_CONCURRENCY", "2")),
         help="同時にインフライトさせる _bulk リクエスト数。文書の解析と索引付けを重ねる。",
     )
+    parser.add_argument(
+        "--bulk-adaptive",
+        action=argparse.BooleanOptionalAction,
+        default=os.environ.get("MIYABE_OPENSEARCH_BULK_ADAPTIVE", "").lower() in {"1", "true", "yes", "on"},
+        help=(
+            "_bulk の応答時間と拒否（429）を見て件数・バイト数・同時数を自動調整する。"
+            " --bulk-size / --bulk-bytes / --bulk-concurrency は初期値になる。"
+        ),
+    )
+    parser.add_argument(
+        "--bulk-target-ms",
+        type=int,
+        default=int(os.environ.get("MIYABE_OPENSEARCH_BULK_TARGET_MS", "2000")),
+        help="--bulk-adaptive で目標にする 1 回の _bulk 応答時間（ミリ秒）",
+    )
+    parser.add_argument(
+        "--bulk-max-concurrency",
+        type=int,
+        default=int(os.environ.get("MIYABE_OPENSEARCH_BULK_MAX_CONCURRENCY", "8")),
+        help="--bulk-adaptive で増やしてよい同時 _bulk 数の上限",
+    )
+    parser.add_argument(
+        "--bulk-max-bytes",
+        type=int,
+        default=int(os.environ.get("MIYABE_OPENSEARCH_BULK_MAX_BYTES", str(64 * 1024 * 1024))),
+        help="--bulk-adaptive で増やしてよい 1 回の _bulk のバイト数上限（http.max_content_length 未満にする）",
+    )
+    parser.add_argument(
+        "--max-failed-documents",
+        type=int,
+        default=int(os.environ.get("MIYABE_OPENSEARCH_MAX_FAILED_DOCUMENTS", "1000")),
+        help="再送しても投入できず dead-letter（work/search/dead_letter/）へ回してよい文書数の上限。超えたら失敗終了する。",
+    )
+    parser.add_argument(
+        "--bulk-gzip",
+        action=argparse.BooleanOptionalAction,
+        default=os.environ.get("MIYABE_OPENSEARCH_BULK_GZIP", "1").lower() in {"1", "true", "yes", "on"},
+        help="_bulk 本文を gzip 圧縮（Content-Encoding: gzip）して送る。既定は有効。",
+    )
+    parser.add_argument(
+        "--prepare-workers",
+        type=int,
+        default=int(os.environ.get("MIYABE_OPENSEARCH_PREPARE_WORKERS", "1")),
+        help="文書の読み込み・解析・tokenize を並列化する process 数。1 ならメインプロセスで直列に処理する。",
+    )
+    parser.add_argument(
+        "--slug-parallel",
+        type=int,
+        default=int(os.environ.get("MIYABE_OPENSEARCH_SLUG_PARALLEL", "1")),
+        help=(
+            "rebuild / resume で同時に投入する自治体数。自治体ごとに文書の読み込みと _bulk を持ち、"
+            "完了した自治体から部分公開する。2 以上では文書準備を process pool で行う。"
+        ),
+    )
+    parser.add_argument(
+        "--terms-cache",
+        default=str(terms_cache.default_path()),
+        help="tokenize 済み terms の永続キャッシュ（SQLite）。入力テキストと tokenizer の版が同じなら再利用する。",
+    )
+    parser.add_argument("--no-terms-cache", action="store_true", help="terms キャッシュを使わずに毎回 tokenize する。")
+    parser.add_argument(
+        "--terms-cache-max-mb",
+        type=int,
+        default=int(os.environ.get("MIYABE_TERMS_CACHE_MAX_MB", str(terms_cache.DEFAULT_MAX_BYTES // (1024 * 1024)))),
+        help="terms キャッシュの上限サイズ（MB）。超えた分は最終利用の古い順に削る。",
+    )
+    parser.add_argument(
+        "--listing-cache",
+        action=argparse.BooleanOptionalAction,
+        default=os.environ.get("MIYABE_LISTING_CACHE", "").lower() in {"1", "true", "yes", "on"},
+        help=(
+            "成果物ディレクトリのファイル一覧を work/search/listing_cache/ に保存し、次回はディレクトリの mtime が"
+            "変わった所だけ読み直す（NFS など走査が遅い環境向け）。"
+        ),
+    )
     parser.add_argument("--limit", type=int, default=0, help="Development limit per document type.")
     parser.add_argument("--no-switch-alias", action="store_true")
     return parser.parse_args()
@@ -263,15 +349,569 @@ def preferred_reiki_sidecar(files: dict[str, Path], key: str) -> Path | None:
     return files.get(key) or files.get(Path(key).name)
 
 
-def iter_minutes_documents(
+@dataclass
+class IndexStageStats:
+    """文書準備（読み込み・解析・tokenize）と _bulk 送信の段階別処理量。
+
+    prepare_seconds / bulk_seconds は各段階の作業時間の合計で、並列数で割った
+    実効時間から段階ごとの docs/s を出す。どちらが律速かをログだけで判断するため。"""
+
+    prepare_workers: int = 1
+    bulk_concurrency: int = 1
+    prepared_count: int = 0
+    prepare_seconds: float = 0.0
+    bulk_count: int = 0
+    bulk_seconds: float = 0.0
+    terms_cache_enabled: bool = False
+    terms_cache_hits: int = 0
+    terms_cache_misses: int = 0
+    bulk_retried: int = 0
+    bulk_failed: int = 0
+    failed_doc_ids: list[str] = field(default_factory=list)
+    dead_letter_path: str = ""
+    started_monotonic: float = field(default_factory=time.monotonic)
+    # --slug-parallel では複数の自治体 thread が同じ stats へ加算する。
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_prepare(
+        self, seconds: float, *, produced: bool = True, cache_hits: int = 0, cache_misses: int = 0
+    ) -> None:
+        # 文書にならなかった task（解析失敗で飛ばしたもの等）は時間だけ足し、件数には数えない。
+        with self._lock:
+            self.prepared_count += int(produced)
+            self.prepare_seconds += max(0.0, seconds)
+            self.terms_cache_hits += max(0, cache_hits)
+            self.terms_cache_misses += max(0, cache_misses)
+
+    def record_bulk(self, count: int, seconds: float, *, retried: int = 0) -> None:
+        with self._lock:
+            self.bulk_count += max(0, int(count))
+            self.bulk_seconds += max(0.0, seconds)
+            self.bulk_retried += max(0, int(retried))
+
+    def record_failures(self, doc_ids: list[str], dead_letter_path: Path) -> None:
+        with self._lock:
+            self.bulk_failed += len(doc_ids)
+            self.failed_doc_ids.extend(doc_ids)
+            self.dead_letter_path = str(dead_letter_path)
+
+    def summary(self) -> str:
+        def rate(count: int, seconds: float, parallel: int) -> float:
+            effective = seconds / max(1, parallel)
+            return count / effective if effective > 0 else 0.0
+
+        elapsed = max(1e-9, time.monotonic() - self.started_monotonic)
+        return (
+            f"prepare_workers={self.prepare_workers} "
+            f"prepare_docs={self.prepared_count} "
+            f"prepare_docs_per_sec={rate(self.prepared_count, self.prepare_seconds, self.prepare_workers):.1f} "
+            f"bulk_docs={self.bulk_count} "
+            f"bulk_docs_per_sec={rate(self.bulk_count, self.bulk_seconds, self.bulk_concurrency):.1f} "
+            f"wall_docs_per_sec={self.bulk_count / elapsed:.1f}"
+        )
+
+    def done_suffix(self) -> str:
+        # [DONE] 行の末尾に足す。batch.py / Celery は count= だけを読むので項目追加は互換。
+        suffix = ""
+        if self.terms_cache_enabled:
+            suffix += f" terms_cache_hits={self.terms_cache_hits} terms_cache_misses={self.terms_cache_misses}"
+        if self.bulk_retried or self.bulk_failed:
+            suffix += f" bulk_retried={self.bulk_retried} dead_letter_docs={self.bulk_failed}"
+        return suffix
+
+
+@dataclass
+class BulkController:
+    """_bulk 1 回あたりの件数・バイト数と同時インフライト数。
+
+    adaptive=False なら CLI の固定値のまま。adaptive=True では各 _bulk の応答時間を
+    target_seconds と比べて調整する: 拒否（429）が出たら半分に縮めて同時数も 1 減らし、
+    目標の半分未満で返り続ける間はバイト数を 1.25 倍ずつ、3 回続けば同時数を 1 増やす。
+    OpenSearch を溢れさせず、かといって遊ばせもしない位置を rebuild 中に探るため。
+    --slug-parallel では自治体ごとの index_documents が同じ controller を共有するので、
+    調整と失敗件数の加算は lock の下で行う。"""
+
+    bulk_size: int
+    bulk_bytes: int
+    concurrency: int
+    adaptive: bool = False
+    target_seconds: float = 2.0
+    max_concurrency: int = 8
+    max_bulk_bytes: int = 64 * 1024 * 1024
+    min_bulk_bytes: int = 512 * 1024
+    # dead-letter へ逃がしてよい文書数の上限（run 全体）。超えたら index 側の異常とみなして止める。
+    max_failed_documents: int = 1000
+    failed_documents: int = 0
+    fast_streak: int = 0
+    base_bulk_size: int = 0
+    base_bulk_bytes: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.bulk_size = max(1, int(self.bulk_size))
+        self.bulk_bytes = max(1, int(self.bulk_bytes))
+        self.concurrency = max(1, int(self.concurrency))
+        self.max_concurrency = max(self.concurrency, int(self.max_concurrency))
+        self.max_bulk_bytes = max(self.bulk_bytes, int(self.max_bulk_bytes))
+        self.min_bulk_bytes = max(1, min(self.bulk_bytes, int(self.min_bulk_bytes)))
+        self.base_bulk_size = self.bulk_size
+        self.base_bulk_bytes = self.bulk_bytes
+
+    @property
+    def pool_workers(self) -> int:
+        return self.max_concurrency if self.adaptive else self.concurrency
+
+    def observe(self, seconds: float, *, rejected: int = 0) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            self._observe(seconds, rejected)
+
+    def add_failed(self, count: int) -> int:
+        with self._lock:
+            self.failed_documents += max(0, int(count))
+            return self.failed_documents
+
+    def _observe(self, seconds: float, rejected: int) -> None:
+        if rejected > 0:
+            self.fast_streak = 0
+            self._scale_bytes(0.5)
+            self.concurrency = max(1, self.concurrency - 1)
+        elif seconds > self.target_seconds:
+            self.fast_streak = 0
+            self._scale_bytes(0.75)
+            if seconds > self.target_seconds * 2:
+                self.concurrency = max(1, self.concurrency - 1)
+        elif seconds < self.target_seconds / 2:
+            self.fast_streak += 1
+            self._scale_bytes(1.25)
+            if self.fast_streak >= 3 and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self.fast_streak = 0
+        else:
+            self.fast_streak = 0
+
+    def _scale_bytes(self, factor: float) -> None:
+        self.bulk_bytes = min(self.max_bulk_bytes, max(self.min_bulk_bytes, int(self.bulk_bytes * factor)))
+        # 件数上限もバイト数と同じ比率で動かし、小さい文書ばかりの自治体で件数が先に詰まらないようにする。
+        self.bulk_size = max(1, int(self.base_bulk_size * self.bulk_bytes / self.base_bulk_bytes))
+
+    def describe(self) -> str:
+        return f"bulk_size={self.bulk_size} bulk_bytes={self.bulk_bytes} concurrency={self.concurrency}"
+
+
+@dataclass(frozen=True)
+class MinutesPrepareContext:
+    """会議録 1 自治体分の文書化に必要な値。process pool へ渡すので小さく保つ。"""
+
+    meta: dict[str, str]
+    downloads_dir: Path
+    index_json_path: Path
+    assembly_name: str
+    source_system: str
+    indexed_at: str
+
+
+@dataclass(frozen=True)
+class ReikiPrepareContext:
+    """例規集 1 自治体分の文書化に必要な値。sidecar の解決は親プロセスで済ませる。"""
+
+    meta: dict[str, str]
+    target: dict[str, Any]
+    prefixes: list[str]
+    source_system: str
+    has_local_detail: bool
+    indexed_at: str
+
+    def pool_ref(self) -> "ReikiPrepareContextRef":
+        return ReikiPrepareContextRef(
+            slug=self.meta["slug"], has_local_detail=self.has_local_detail, indexed_at=self.indexed_at
+        )
+
+
+@dataclass(frozen=True)
+class ReikiPrepareContextRef:
+    """process pool へ渡す ReikiPrepareContext の代わり。
+
+    target 全体を抱えた context を task ごとに pickle しないよう、target は pool の
+    initializer で worker へ一度だけ渡し（_PREPARE_REIKI_TARGETS）、worker 側で組み立て直す。"""
+
+    slug: str
+    has_local_detail: bool
+    indexed_at: str
+
+
+def build_reiki_prepare_context(target: dict[str, Any], *, has_local_detail: bool, indexed_at: str) -> ReikiPrepareContext:
+    return ReikiPrepareContext(
+        meta=target_metadata(target),
+        target=target,
+        prefixes=reiki_sortable_prefixes(target),
+        source_system=str(target.get("system_type") or "").strip(),
+        has_local_detail=has_local_detail,
+        indexed_at=indexed_at,
+    )
+
+
+# prepare worker 側の状態。init_prepare_worker が設定する。
+_PREPARE_REIKI_TARGETS: dict[str, dict[str, Any]] = {}
+_REIKI_CONTEXT_CACHE: dict[ReikiPrepareContextRef, ReikiPrepareContext] = {}
+
+
+def resolve_reiki_context(context: ReikiPrepareContext | ReikiPrepareContextRef) -> ReikiPrepareContext:
+    if isinstance(context, ReikiPrepareContext):
+        return context
+    resolved = _REIKI_CONTEXT_CACHE.get(context)
+    if resolved is None:
+        target = _PREPARE_REIKI_TARGETS.get(context.slug)
+        if target is None:
+            raise RuntimeError(f"reiki target is not registered in the prepare worker: slug={context.slug}")
+        resolved = build_reiki_prepare_context(
+            target, has_local_detail=context.has_local_detail, indexed_at=context.indexed_at
+        )
+        if len(_REIKI_CONTEXT_CACHE) >= 64:
+            _REIKI_CONTEXT_CACHE.clear()
+        _REIKI_CONTEXT_CACHE[context] = resolved
+    return resolved
+
+
+_MINUTES_META_CACHE: dict[str, tuple[int, dict[Any, Any]]] = {}
+
+
+def load_minutes_meta_map(index_json_path: Path) -> dict[Any, Any]:
+    # index.json は自治体ごとに 1 回だけ読めばよい。pool の各 worker も同じ関数で
+    # 自前にキャッシュするので、巨大な meta map を task ごとに pickle しなくて済む。
+    key = str(index_json_path)
+    try:
+        mtime_ns = index_json_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = -1
+    cached = _MINUTES_META_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    meta_map = parse_minutes_source_meta(index_json_path)
+    if len(_MINUTES_META_CACHE) >= 8:
+        _MINUTES_META_CACHE.clear()
+    _MINUTES_META_CACHE[key] = (mtime_ns, meta_map)
+    return meta_map
+
+
+def prepare_minutes_document(
+    file_path: Path,
+    context: MinutesPrepareContext,
+    strict: bool,
+) -> tuple[str, dict[str, Any]] | None:
+    meta = context.meta
+    try:
+        record = build_minutes_record(
+            file_path, context.downloads_dir, load_minutes_meta_map(context.index_json_path), context.indexed_at
+        )
+    except Exception as exc:
+        if strict:
+            raise RuntimeError(f"failed to parse minutes file={file_path}: {exc}") from exc
+        print(f"[WARN] failed to parse minutes file={file_path}: {exc}", file=sys.stderr)
+        return None
+    if record is None or record.doc_type != "minutes":
+        if strict and record is None:
+            raise RuntimeError(f"minutes file did not produce an indexable record: {file_path}")
+        return None
+
+    local_id = stable_local_id(meta["slug"], record.rel_path)
+    title = clean_text(record.title)
+    meeting_name = clean_text(record.meeting_name)
+    body = str(record.content or "")
+    title_terms = " ".join(part for part in [record.title_terms, record.meeting_name_terms] if clean_text(part))
+    source_url = clean_text(record.source_url)
+    held_on = normalize_date(record.held_on)
+    document = {
+        **meta,
+        "doc_type": "minutes",
+        "title": title,
+        "title_terms": title_terms or terms_text(" ".join([title, meeting_name])),
+        "body": body,
+        "body_terms": clean_text(record.content_terms) or terms_text(body),
+        "body_length": len(body),
+        "source_url": source_url,
+        "detail_url": source_url,
+        "source_file": record.rel_path,
+        "source_system": context.source_system,
+        "indexed_at": context.indexed_at,
+        "updated_at": normalize_datetime(record.indexed_at) or context.indexed_at,
+        "sort_date": held_on,
+        "assembly_name": context.assembly_name,
+        "meeting_name": meeting_name,
+        "year_label": clean_text(record.year_label),
+        "held_on": held_on,
+        "speaker": "",
+        "speaker_role": "",
+        "local_id": local_id,
+    }
+    return f"minutes:{meta['slug']}:{local_id}", compact_document(document)
+
+
+def prepare_reiki_document(
+    item: tuple[str, Path, Path | None, Path | None, dict[str, Any] | None],
+    context: ReikiPrepareContext | ReikiPrepareContextRef,
+    strict: bool,
+) -> tuple[str, dict[str, Any]] | None:
+    key, html_path, markdown_path, classification_path, manifest = item
+    context = resolve_reiki_context(context)
+    meta = context.meta
+    indexed_at = context.indexed_at
+    try:
+        record = build_reiki_record(
+            key,
+            html_path,
+            markdown_path,
+            classification_path,
+            manifest,
+            context.prefixes,
+            context.target,
+        )
+    except Exception as exc:
+        if strict:
+            raise RuntimeError(f"failed to parse reiki file={html_path}: {exc}") from exc
+        print(f"[WARN] failed to parse reiki file={html_path}: {exc}", file=sys.stderr)
+        return None
+    if not isinstance(record, dict):
+        if strict:
+            raise RuntimeError(f"reiki file did not produce an indexable record: {html_path}")
+        return None
+
+    filename = clean_text(record.get("filename")) or key
+    local_id = stable_local_id(meta["slug"], filename)
+    title = clean_text(record.get("title")) or Path(filename).name
+    body_parts = [
+        clean_text(record.get("document_type")),
+        clean_text(record.get("responsible_department")),
+        clean_text(record.get("combined_stance")),
+        clean_text(record.get("combined_reason")),
+        clean_text(record.get("reason")),
+        clean_text(record.get("taxonomy_path")),
+        str(record.get("content_text") or ""),
+    ]
+    body = "\n".join(part for part in body_parts if part)
+    title_terms = " ".join(
+        part
+        for part in [
+            clean_text(record.get("title_terms")),
+            clean_text(record.get("reading_terms")),
+        ]
+        if part
+    ) or terms_text(title)
+    body_terms = " ".join(
+        part
+        for part in [
+            clean_text(record.get("content_terms")),
+            clean_text(record.get("department_terms")),
+            clean_text(record.get("combined_reason_terms")),
+            clean_text(record.get("reason_terms")),
+            clean_text(record.get("secondary_terms")),
+            clean_text(record.get("lens_terms")),
+            clean_text(record.get("taxonomy_terms")),
+        ]
+        if part
+    ) or terms_text(body)
+    promulgated_on = normalize_date(record.get("enactment_date"))
+    updated_at = normalize_datetime(record.get("updated_at")) or indexed_at
+    detail_file = filename if filename.lower().endswith((".html", ".htm")) else filename + ".html"
+    source_url = clean_text(record.get("source_url"))
+    detail_url = (
+        "/reiki/?" + urlencode({"slug": meta["slug"], "file": detail_file})
+        if context.has_local_detail
+        else source_url
+    )
+    document = {
+        **meta,
+        "doc_type": "reiki",
+        "title": title,
+        "title_terms": title_terms,
+        "body": body,
+        "body_terms": body_terms,
+        "body_length": len(body),
+        "source_url": source_url,
+        "detail_url": detail_url,
+        "source_file": clean_text(record.get("source_file")) or detail_file,
+        "source_system": context.source_system,
+        "indexed_at": indexed_at,
+        "updated_at": updated_at,
+        "sort_date": promulgated_on or first_date(updated_at),
+        "filename": filename,
+        "ordinance_no": clean_text(record.get("number") or record.get("ordinance_no")),
+        "category": clean_text(record.get("primary_class")) or clean_text(record.get("document_type")),
+        "promulgated_on": promulgated_on,
+        "enforced_on": None,
+        "amended_on": first_date(updated_at),
+        "local_id": local_id,
+    }
+    return f"reiki:{meta['slug']}:{local_id}", compact_document(document)
+
+
+def configure_terms_cache(path: str, max_bytes: int) -> bool:
+    if path == "" or japanese_search_tokenizer is None:
+        return False
+    try:
+        fingerprint = japanese_search_tokenizer.tokenizer_fingerprint()
+    except Exception as exc:
+        print(f"[WARN] terms cache disabled: tokenizer fingerprint unavailable: {exc}", file=sys.stderr, flush=True)
+        return False
+    return terms_cache.configure(path, fingerprint=fingerprint, max_bytes=max_bytes) is not None
+
+
+def init_prepare_worker(
+    terms_cache_path: str = "",
+    terms_cache_max_bytes: int = 0,
+    reiki_targets_by_slug: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    _PREPARE_REIKI_TARGETS.clear()
+    _PREPARE_REIKI_TARGETS.update(reiki_targets_by_slug or {})
+    # 各 worker が自前の Sudachi 辞書を最初に読み込み、初回文書の遅延を揃える。
+    if japanese_search_tokenizer is not None:
+        try:
+            japanese_search_tokenizer.sudachi_tokenizer()
+        except Exception:
+            pass
+    if configure_terms_cache(terms_cache_path, terms_cache_max_bytes):
+        # pool の worker は atexit を経ずに終了するので、multiprocessing の終了処理で
+        # 未 commit の terms を書き出す。
+        multiprocessing.util.Finalize(None, terms_cache.close, exitpriority=10)
+
+
+class PreparePool:
+    """文書準備（読み込み・HTML 除去・SudachiPy tokenize）を fan-out する process pool。
+
+    worker はそれぞれ自前の sudachi_tokenizer() を持つ。fork だと bulk 送信スレッドや
+    Sudachi の内部状態を抱えたまま複製されるため、spawn で起動する。"""
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        terms_cache_path: str = "",
+        terms_cache_max_bytes: int = 0,
+        reiki_targets_by_slug: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        # 例規集の target は worker 起動時に一度だけ渡し、task には ReikiPrepareContextRef だけを載せる。
+        self.reiki_slugs = frozenset(reiki_targets_by_slug or {})
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_prepare_worker,
+            initargs=(terms_cache_path, terms_cache_max_bytes, reiki_targets_by_slug or {}),
+        )
+
+    @property
+    def window(self) -> int:
+        # 先読み数は worker 数の数倍に抑え、本文を抱えた結果がメモリに溜まりすぎないようにする。
+        return self.workers * 4
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        return self.executor.submit(fn, *args)
+
+    def task_context(self, context: Any) -> Any:
+        if isinstance(context, ReikiPrepareContext) and context.meta["slug"] in self.reiki_slugs:
+            return context.pool_ref()
+        return context
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def create_prepare_pool(
+    workers: int,
+    *,
+    terms_cache_path: str = "",
+    terms_cache_max_bytes: int = 0,
+    reiki_targets_by_slug: dict[str, dict[str, Any]] | None = None,
+) -> PreparePool | None:
+    if workers <= 1:
+        return None
+    return PreparePool(
+        workers,
+        terms_cache_path=terms_cache_path,
+        terms_cache_max_bytes=terms_cache_max_bytes,
+        reiki_targets_by_slug=reiki_targets_by_slug,
+    )
+
+
+def timed_prepare(
+    prepare: Callable[[Any, Any, bool], tuple[str, dict[str, Any]] | None],
+    item: Any,
+    context: Any,
+    strict: bool,
+) -> tuple[float, tuple[str, dict[str, Any]] | None, int, int]:
+    hits_before, misses_before = terms_cache.counters()
+    started = time.perf_counter()
+    result = prepare(item, context, strict)
+    seconds = time.perf_counter() - started
+    hits_after, misses_after = terms_cache.counters()
+    return seconds, result, hits_after - hits_before, misses_after - misses_before
+
+
+def run_prepare_tasks(
+    prepare: Callable[[Any, Any, bool], tuple[str, dict[str, Any]] | None],
+    tasks: Iterable[tuple[Any, Any]],
+    *,
+    strict: bool,
     limit: int = 0,
+    pool: PreparePool | None = None,
+    stats: IndexStageStats | None = None,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    # pool 指定時は task を先読みで投入し、投入順に結果を取り出す。
+    # 出力順が入力順（= slug 順）のまま保たれるので、index_documents の
+    # slug 境界検出と slug_complete_callback による部分公開はそのまま働く。
+    emitted = 0
+
+    def accept(result: tuple[float, tuple[str, dict[str, Any]] | None, int, int]) -> tuple[str, dict[str, Any]] | None:
+        seconds, document, cache_hits, cache_misses = result
+        if stats is not None:
+            stats.record_prepare(
+                seconds, produced=document is not None, cache_hits=cache_hits, cache_misses=cache_misses
+            )
+        return document
+
+    if pool is None:
+        for item, context in tasks:
+            document = accept(timed_prepare(prepare, item, context, strict))
+            if document is None:
+                continue
+            yield document
+            emitted += 1
+            if limit > 0 and emitted >= limit:
+                return
+        return
+
+    pending: deque[Future] = deque()
+    task_iter = iter(tasks)
+    try:
+        while True:
+            while len(pending) < pool.window:
+                next_task = next(task_iter, None)
+                if next_task is None:
+                    break
+                item, context = next_task
+                pending.append(pool.submit(timed_prepare, prepare, item, pool.task_context(context), strict))
+            if not pending:
+                return
+            document = accept(pending.popleft().result())
+            if document is None:
+                continue
+            yield document
+            emitted += 1
+            if limit > 0 and emitted >= limit:
+                return
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_minutes_prepare_tasks(
     slugs: set[str] | None = None,
     *,
     strict: bool = False,
     exclude_slugs: set[str] | None = None,
-) -> Iterator[tuple[str, dict[str, Any]]]:
-    indexed_at = utc_now_iso()
-    emitted = 0
+    indexed_at: str,
+) -> Iterator[tuple[Path, MinutesPrepareContext]]:
     slug_filter = slugs or set()
     skip_slugs = exclude_slugs or set()
     for target in gijiroku_targets.iter_gijiroku_targets():
@@ -286,73 +926,48 @@ def iter_minutes_documents(
         meta = target_metadata(target)
         assembly_name = str(target.get("assembly_name") or (meta["municipality_name"] + "議会")).strip()
         source_system = str(target.get("system_family") or target.get("system_type") or "").strip()
+        index_json_path = Path(target["index_json_path"])
         try:
             source_files = choose_minutes_source_files(downloads_dir)
-            meta_map = parse_minutes_source_meta(Path(target["index_json_path"]))
+            load_minutes_meta_map(index_json_path)
         except Exception as exc:
             if strict:
                 raise RuntimeError(f"failed to enumerate minutes files dir={downloads_dir}: {exc}") from exc
             print(f"[WARN] failed to enumerate minutes files dir={downloads_dir}: {exc}", file=sys.stderr)
             continue
 
+        context = MinutesPrepareContext(
+            meta=meta,
+            downloads_dir=downloads_dir,
+            index_json_path=index_json_path,
+            assembly_name=assembly_name,
+            source_system=source_system,
+            indexed_at=indexed_at,
+        )
         for file_path in source_files:
-            try:
-                record = build_minutes_record(file_path, downloads_dir, meta_map, indexed_at)
-            except Exception as exc:
-                if strict:
-                    raise RuntimeError(f"failed to parse minutes file={file_path}: {exc}") from exc
-                print(f"[WARN] failed to parse minutes file={file_path}: {exc}", file=sys.stderr)
-                continue
-            if record is None or record.doc_type != "minutes":
-                if strict and record is None:
-                    raise RuntimeError(f"minutes file did not produce an indexable record: {file_path}")
-                continue
-
-            local_id = stable_local_id(meta["slug"], record.rel_path)
-            title = clean_text(record.title)
-            meeting_name = clean_text(record.meeting_name)
-            body = str(record.content or "")
-            title_terms = " ".join(part for part in [record.title_terms, record.meeting_name_terms] if clean_text(part))
-            source_url = clean_text(record.source_url)
-            held_on = normalize_date(record.held_on)
-            document = {
-                **meta,
-                "doc_type": "minutes",
-                "title": title,
-                "title_terms": title_terms or terms_text(" ".join([title, meeting_name])),
-                "body": body,
-                "body_terms": clean_text(record.content_terms) or terms_text(body),
-                "body_length": len(body),
-                "source_url": source_url,
-                "detail_url": source_url,
-                "source_file": record.rel_path,
-                "source_system": source_system,
-                "indexed_at": indexed_at,
-                "updated_at": normalize_datetime(record.indexed_at) or indexed_at,
-                "sort_date": held_on,
-                "assembly_name": assembly_name,
-                "meeting_name": meeting_name,
-                "year_label": clean_text(record.year_label),
-                "held_on": held_on,
-                "speaker": "",
-                "speaker_role": "",
-                "local_id": local_id,
-            }
-            yield f"minutes:{meta['slug']}:{local_id}", compact_document(document)
-            emitted += 1
-            if limit > 0 and emitted >= limit:
-                return
+            yield file_path, context
 
 
-def iter_reiki_documents(
+def iter_minutes_documents(
     limit: int = 0,
     slugs: set[str] | None = None,
     *,
     strict: bool = False,
     exclude_slugs: set[str] | None = None,
+    pool: PreparePool | None = None,
+    stats: IndexStageStats | None = None,
 ) -> Iterator[tuple[str, dict[str, Any]]]:
-    indexed_at = utc_now_iso()
-    emitted = 0
+    tasks = iter_minutes_prepare_tasks(slugs, strict=strict, exclude_slugs=exclude_slugs, indexed_at=utc_now_iso())
+    yield from run_prepare_tasks(prepare_minutes_document, tasks, strict=strict, limit=limit, pool=pool, stats=stats)
+
+
+def iter_reiki_prepare_tasks(
+    slugs: set[str] | None = None,
+    *,
+    strict: bool = False,
+    exclude_slugs: set[str] | None = None,
+    indexed_at: str,
+) -> Iterator[tuple[tuple[str, Path, Path | None, Path | None, dict[str, Any] | None], ReikiPrepareContext]]:
     slug_filter = slugs or set()
     skip_slugs = exclude_slugs or set()
     for target in reiki_targets.iter_reiki_targets():
@@ -367,8 +982,6 @@ def iter_reiki_documents(
         has_local_detail = clean_html_dir.is_dir()
         if not html_root.is_dir():
             continue
-        meta = target_metadata(target)
-        source_system = str(target.get("system_type") or "").strip()
         try:
             html_files = collect_reiki_preferred_files(html_root, {".html", ".htm"})
             markdown_files = build_alias_map(
@@ -378,104 +991,35 @@ def iter_reiki_documents(
                 collect_reiki_preferred_files(Path(target["classification_dir"]), {".json"})
             )
             manifest_index = load_reiki_manifest_index(Path(target["work_root"]) / "source_manifest.json.gz")
-            prefixes = reiki_sortable_prefixes(target)
         except Exception as exc:
             if strict:
                 raise RuntimeError(f"failed to enumerate reiki files dir={html_root}: {exc}") from exc
             print(f"[WARN] failed to enumerate reiki files dir={html_root}: {exc}", file=sys.stderr)
             continue
 
+        context = build_reiki_prepare_context(target, has_local_detail=has_local_detail, indexed_at=indexed_at)
         for key, html_path in sorted(html_files.items()):
-            try:
-                record = build_reiki_record(
-                    key,
-                    html_path,
-                    preferred_reiki_sidecar(markdown_files, key),
-                    preferred_reiki_sidecar(classification_files, key),
-                    manifest_index.get(key) or manifest_index.get(Path(key).name),
-                    prefixes,
-                    target,
-                )
-            except Exception as exc:
-                if strict:
-                    raise RuntimeError(f"failed to parse reiki file={html_path}: {exc}") from exc
-                print(f"[WARN] failed to parse reiki file={html_path}: {exc}", file=sys.stderr)
-                continue
-            if not isinstance(record, dict):
-                if strict:
-                    raise RuntimeError(f"reiki file did not produce an indexable record: {html_path}")
-                continue
-
-            filename = clean_text(record.get("filename")) or key
-            local_id = stable_local_id(meta["slug"], filename)
-            title = clean_text(record.get("title")) or Path(filename).name
-            body_parts = [
-                clean_text(record.get("document_type")),
-                clean_text(record.get("responsible_department")),
-                clean_text(record.get("combined_stance")),
-                clean_text(record.get("combined_reason")),
-                clean_text(record.get("reason")),
-                clean_text(record.get("taxonomy_path")),
-                str(record.get("content_text") or ""),
-            ]
-            body = "\n".join(part for part in body_parts if part)
-            title_terms = " ".join(
-                part
-                for part in [
-                    clean_text(record.get("title_terms")),
-                    clean_text(record.get("reading_terms")),
-                ]
-                if part
-            ) or terms_text(title)
-            body_terms = " ".join(
-                part
-                for part in [
-                    clean_text(record.get("content_terms")),
-                    clean_text(record.get("department_terms")),
-                    clean_text(record.get("combined_reason_terms")),
-                    clean_text(record.get("reason_terms")),
-                    clean_text(record.get("secondary_terms")),
-                    clean_text(record.get("lens_terms")),
-                    clean_text(record.get("taxonomy_terms")),
-                ]
-                if part
-            ) or terms_text(body)
-            promulgated_on = normalize_date(record.get("enactment_date"))
-            updated_at = normalize_datetime(record.get("updated_at")) or indexed_at
-            detail_file = filename if filename.lower().endswith((".html", ".htm")) else filename + ".html"
-            source_url = clean_text(record.get("source_url"))
-            detail_url = (
-                "/reiki/?" + urlencode({"slug": meta["slug"], "file": detail_file})
-                if has_local_detail
-                else source_url
+            item = (
+                key,
+                html_path,
+                preferred_reiki_sidecar(markdown_files, key),
+                preferred_reiki_sidecar(classification_files, key),
+                manifest_index.get(key) or manifest_index.get(Path(key).name),
             )
-            document = {
-                **meta,
-                "doc_type": "reiki",
-                "title": title,
-                "title_terms": title_terms,
-                "body": body,
-                "body_terms": body_terms,
-                "body_length": len(body),
-                "source_url": source_url,
-                "detail_url": detail_url,
-                "source_file": clean_text(record.get("source_file")) or detail_file,
-                "source_system": source_system,
-                "indexed_at": indexed_at,
-                "updated_at": updated_at,
-                "sort_date": promulgated_on or first_date(updated_at),
-                "filename": filename,
-                "ordinance_no": clean_text(record.get("number") or record.get("ordinance_no")),
-                "category": clean_text(record.get("primary_class")) or clean_text(record.get("document_type")),
-                "promulgated_on": promulgated_on,
-                "enforced_on": None,
-                "amended_on": first_date(updated_at),
-                "local_id": local_id,
-            }
-            yield f"reiki:{meta['slug']}:{local_id}", compact_document(document)
-            emitted += 1
-            if limit > 0 and emitted >= limit:
-                return
+            yield item, context
+
+
+def iter_reiki_documents(
+    limit: int = 0,
+    slugs: set[str] | None = None,
+    *,
+    strict: bool = False,
+    exclude_slugs: set[str] | None = None,
+    pool: PreparePool | None = None,
+    stats: IndexStageStats | None = None,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    tasks = iter_reiki_prepare_tasks(slugs, strict=strict, exclude_slugs=exclude_slugs, indexed_at=utc_now_iso())
+    yield from run_prepare_tasks(prepare_reiki_document, tasks, strict=strict, limit=limit, pool=pool, stats=stats)
 
 
 def _count_documents_by_slug(
@@ -584,6 +1128,9 @@ def index_documents(
     bulk_concurrency: int = 2,
     progress_callback: Callable[[int, dict[str, Any], int], None] | None = None,
     slug_complete_callback: Callable[[str, dict[str, Any], int], None] | None = None,
+    stats: IndexStageStats | None = None,
+    controller: BulkController | None = None,
+    shared_total: SharedBulkTotal | None = None,
 ) -> int:
     # NDJSON 行はここで一度だけ bytes 化し、件数とペイロードサイズの両方で flush する。
     # 会議録の本文は 1 件で数百 KB になることがあるため、件数だけだと過大 bulk になりうる。
@@ -592,6 +1139,11 @@ def index_documents(
     # OpenSearch 側の索引付けが交互待ちで直列化すると、双方が半分遊んだまま
     # スループットが頭打ちになる（全量 rebuild の実測でどちらも 50% 未満だった）。
     # slug 境界では全 bulk の完了を待ってから slug_complete_callback（部分公開）を呼ぶ。
+    #
+    # 件数・バイト数・同時数は controller から毎回読む（adaptive なら送信結果で変わる）。
+    # controller を渡さない呼び出しは従来どおり引数の固定値で動く。
+    if controller is None:
+        controller = BulkController(bulk_size=bulk_size, bulk_bytes=bulk_bytes, concurrency=bulk_concurrency)
     pending_lines: list[bytes] = []
     pending_count = 0
     pending_bytes = 0
@@ -600,18 +1152,55 @@ def index_documents(
     current_slug_start_total = 0
     current_slug_last_source: dict[str, Any] = {}
     in_flight: deque[tuple[Future, int, dict[str, Any]]] = deque()
-    max_in_flight = max(1, int(bulk_concurrency))
 
-    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+    def send_bulk(lines: list[bytes], count: int) -> BulkOutcome:
+        return client.bulk_send(lines, count, allow_item_failures=True)
+
+    def divert_failures(outcome: BulkOutcome) -> None:
+        # 再送しても通らない文書は dead-letter へ退避して続行する。件数が上限を超えたら
+        # 文書ではなく index 側（mapping 変更漏れなど）の問題なので rebuild を止める。
+        path = dead_letter.append_failures(index_name, outcome.failed)
+        doc_ids = [bulk_action_doc_id(action_lines) for action_lines, _result in outcome.failed]
+        if stats is not None:
+            stats.record_failures(doc_ids, path)
+        failed_documents = controller.add_failed(len(doc_ids))
+        first_error = outcome.failed[0][1].get("error")
+        print(
+            f"[WARN] index={index_name} dead_letter={path} docs={len(doc_ids)} first_error={first_error!r:.300}",
+            file=sys.stderr,
+            flush=True,
+        )
+        if failed_documents > controller.max_failed_documents:
+            raise RuntimeError(
+                f"Too many documents failed to index ({failed_documents} > "
+                f"{controller.max_failed_documents}); see {path}"
+            )
+
+    with ThreadPoolExecutor(max_workers=controller.pool_workers) as pool:
 
         def reap_oldest() -> None:
             nonlocal total
             future, count, batch_last_source = in_flight.popleft()
-            future.result()  # bulk 失敗はここで送出され、rebuild/update 全体を失敗させる
-            total += count
-            print(f"[BULK] index={index_name} total={total}", flush=True)
+            outcome = future.result()  # bulk 失敗はここで送出され、rebuild/update 全体を失敗させる
+            controller.observe(outcome.seconds, rejected=outcome.rejected)
+            if stats is not None:
+                stats.record_bulk(count, outcome.seconds, retried=outcome.retried)
+                stats.bulk_concurrency = controller.concurrency
+            if outcome.failed:
+                divert_failures(outcome)
+            # dead-letter へ回した文書は index に入っていないので、投入件数には数えない。
+            indexed = count - len(outcome.failed)
+            total += indexed
+            # --slug-parallel では [BULK] の total と進捗は index 全体の合計で出す（batch.py が読む）。
+            index_total = shared_total.add(indexed) if shared_total is not None else total
+            print(
+                f"[BULK] index={index_name} total={index_total} took_ms={outcome.took_ms} "
+                f"latency_ms={int(outcome.seconds * 1000)} rejected={outcome.rejected} retried={outcome.retried} "
+                f"failed={len(outcome.failed)} {controller.describe()}",
+                flush=True,
+            )
             if progress_callback is not None:
-                progress_callback(total, batch_last_source, max(0, total - current_slug_start_total))
+                progress_callback(index_total, batch_last_source, max(0, total - current_slug_start_total))
 
         def reap_all() -> None:
             while in_flight:
@@ -621,11 +1210,11 @@ def index_documents(
             nonlocal pending_lines, pending_count, pending_bytes
             if not pending_lines:
                 return
-            while len(in_flight) >= max_in_flight:
+            while len(in_flight) >= controller.concurrency:
                 reap_oldest()
             in_flight.append(
                 (
-                    pool.submit(client.bulk_lines, pending_lines, pending_count),
+                    pool.submit(send_bulk, pending_lines, pending_count),
                     pending_count,
                     current_slug_last_source,
                 )
@@ -656,7 +1245,7 @@ def index_documents(
                 pending_lines.append(source_line)
                 pending_count += 1
                 pending_bytes += len(meta_line) + len(source_line) + 2
-                if pending_count >= bulk_size or pending_bytes >= max(1, bulk_bytes):
+                if pending_count >= controller.bulk_size or pending_bytes >= controller.bulk_bytes:
                     flush_actions()
             flush_actions()
             reap_all()
@@ -670,6 +1259,15 @@ def index_documents(
     return total
 
 
+def bulk_action_doc_id(action_lines: list[bytes]) -> str:
+    try:
+        meta = json.loads(action_lines[0]) if action_lines else {}
+    except ValueError:
+        return ""
+    action = next(iter(meta.values()), {}) if isinstance(meta, dict) else {}
+    return str(action.get("_id") or "") if isinstance(action, dict) else ""
+
+
 def indices_for_alias(client: OpenSearchClient, alias: str) -> list[str]:
     try:
         response = client.request("GET", f"/_alias/{quote(alias)}")
@@ -919,6 +1517,97 @@ def publish_completed_slug(
     print(f"[PUBLISH] doc_type={doc_type} slug={slug} index={index_name}", flush=True)
 
 
+class SharedBulkTotal:
+    """--slug-parallel で複数の index_documents が同じ index へ書くときの投入済み合計。"""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def add(self, count: int) -> int:
+        with self._lock:
+            self.total += max(0, int(count))
+            return self.total
+
+
+def index_slugs_in_parallel(
+    client: OpenSearchClient,
+    index_name: str,
+    slugs: list[str],
+    slug_documents: Callable[[str], Iterable[tuple[str, dict[str, Any]]]],
+    *,
+    slug_parallel: int,
+    bulk_size: int,
+    bulk_bytes: int = 8 * 1024 * 1024,
+    bulk_concurrency: int = 2,
+    progress_callback: Callable[[int, dict[str, Any], int], None] | None = None,
+    slug_complete_callback: Callable[[str, dict[str, Any], int], None] | None = None,
+    stats: IndexStageStats | None = None,
+    controller: BulkController | None = None,
+) -> int:
+    """自治体ごとに producer と bulk pipeline を持たせ、slug_parallel 件ずつ同じ index へ投入する。
+
+    直列版は 1 本の文書 iterator が全自治体を順に読むので、準備側が 1 producer で律速する。
+    ここでは自治体単位で index_documents を別 thread に分け、完了した自治体から
+    slug_complete_callback（部分公開・resume 用の完了記録）を 1 件ずつ直列に呼ぶ。
+    途中の自治体は完了記録に載らないので、中断後の resume はそれらを最初から入れ直す
+    （document ID が安定しているので上書きになる）。"""
+    if controller is None:
+        controller = BulkController(bulk_size=bulk_size, bulk_bytes=bulk_bytes, concurrency=bulk_concurrency)
+    shared_total = SharedBulkTotal()
+    callback_lock = threading.Lock()
+    stop = threading.Event()
+
+    def guarded(documents: Iterable[tuple[str, dict[str, Any]]]) -> Iterator[tuple[str, dict[str, Any]]]:
+        # 他の自治体が失敗したら、読み込み途中の自治体も次の文書で打ち切る。
+        for document in documents:
+            if stop.is_set():
+                raise RuntimeError("aborted because another municipality failed")
+            yield document
+
+    def locked_progress(total: int, source: dict[str, Any], slug_current: int) -> None:
+        if progress_callback is not None:
+            with callback_lock:
+                progress_callback(total, source, slug_current)
+
+    def locked_complete(slug: str, source: dict[str, Any], _total: int) -> None:
+        if slug_complete_callback is not None:
+            with callback_lock:
+                slug_complete_callback(slug, source, shared_total.total)
+
+    def index_slug(slug: str) -> int:
+        try:
+            return index_documents(
+                client,
+                index_name,
+                guarded(slug_documents(slug)),
+                bulk_size=bulk_size,
+                bulk_bytes=bulk_bytes,
+                bulk_concurrency=bulk_concurrency,
+                progress_callback=locked_progress,
+                slug_complete_callback=locked_complete,
+                stats=stats,
+                controller=controller,
+                shared_total=shared_total,
+            )
+        except BaseException:
+            stop.set()
+            raise
+
+    total = 0
+    with ThreadPoolExecutor(max_workers=max(1, slug_parallel), thread_name_prefix="slug") as pool:
+        futures = [pool.submit(index_slug, slug) for slug in slugs]
+        try:
+            for future in futures:
+                total += future.result()
+        except BaseException:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            raise
+    return total
+
+
 def build_one(
     client: OpenSearchClient,
     *,
@@ -932,6 +1621,11 @@ def build_one(
     create_index: bool = True,
     progress_callback: Callable[[int, dict[str, Any], int], None] | None = None,
     slug_complete_callback: Callable[[str, dict[str, Any], int], None] | None = None,
+    stats: IndexStageStats | None = None,
+    controller: BulkController | None = None,
+    slug_parallel: int = 1,
+    parallel_slugs: list[str] | None = None,
+    slug_documents: Callable[[str], Iterable[tuple[str, dict[str, Any]]]] | None = None,
 ) -> int:
     if create_index:
         print(f"[CREATE] {index_name}", flush=True)
@@ -944,18 +1638,39 @@ def build_one(
             f"/{quote(index_name)}/_settings",
             body={"index": {"refresh_interval": "-1", "number_of_replicas": 0}},
         )
-    count = index_documents(
-        client,
-        index_name,
-        documents,
-        bulk_size=bulk_size,
-        bulk_bytes=bulk_bytes,
-        bulk_concurrency=bulk_concurrency,
-        progress_callback=progress_callback,
-        slug_complete_callback=slug_complete_callback,
-    )
+    if slug_parallel > 1 and parallel_slugs and slug_documents is not None:
+        print(f"[PARALLEL] index={index_name} slugs={len(parallel_slugs)} slug_parallel={slug_parallel}", flush=True)
+        count = index_slugs_in_parallel(
+            client,
+            index_name,
+            parallel_slugs,
+            slug_documents,
+            slug_parallel=slug_parallel,
+            bulk_size=bulk_size,
+            bulk_bytes=bulk_bytes,
+            bulk_concurrency=bulk_concurrency,
+            progress_callback=progress_callback,
+            slug_complete_callback=slug_complete_callback,
+            stats=stats,
+            controller=controller,
+        )
+    else:
+        count = index_documents(
+            client,
+            index_name,
+            documents,
+            bulk_size=bulk_size,
+            bulk_bytes=bulk_bytes,
+            bulk_concurrency=bulk_concurrency,
+            progress_callback=progress_callback,
+            slug_complete_callback=slug_complete_callback,
+            stats=stats,
+            controller=controller,
+        )
     update_index_after_bulk(client, index_name, replicas=replicas)
-    print(f"[DONE] index={index_name} count={count}", flush=True)
+    if stats is not None:
+        print(f"[RATE] index={index_name} {stats.summary()}", flush=True)
+    print(f"[DONE] index={index_name} count={count}{stats.done_suffix() if stats is not None else ''}", flush=True)
     return count
 
 
@@ -977,6 +1692,8 @@ def update_one(
     bulk_bytes: int,
     bulk_concurrency: int,
     switch_alias: bool,
+    stats: IndexStageStats | None = None,
+    controller: BulkController | None = None,
 ) -> int:
     if not slugs:
         raise ValueError("Incremental update requires --slug.")
@@ -1013,6 +1730,8 @@ def update_one(
                     bulk_size=bulk_size,
                     bulk_bytes=bulk_bytes,
                     bulk_concurrency=bulk_concurrency,
+                    stats=stats,
+                    controller=controller,
                 )
                 if switch_alias:
                     switch_aliases(
@@ -1035,7 +1754,14 @@ def update_one(
     # そのあとで前回世代（indexed_at が cutoff より古い文書）だけを削除する。
     # 削除を先にすると、途中で落ちた場合にその自治体が次の成功まで検索から消えてしまう。
     count = index_documents(
-        client, alias, documents_list, bulk_size=bulk_size, bulk_bytes=bulk_bytes, bulk_concurrency=bulk_concurrency
+        client,
+        alias,
+        documents_list,
+        bulk_size=bulk_size,
+        bulk_bytes=bulk_bytes,
+        bulk_concurrency=bulk_concurrency,
+        stats=stats,
+        controller=controller,
     )
     refresh_search_target(client, alias)
     delete_documents_for_slugs(
@@ -1046,10 +1772,237 @@ def update_one(
         indexed_before=update_cutoff,
     )
     refresh_search_target(client, alias)
-    print(f"[DONE] alias={alias} doc_type={doc_type} count={count}", flush=True)
+    if stats is not None:
+        print(f"[RATE] alias={alias} {stats.summary()}", flush=True)
+    print(
+        f"[DONE] alias={alias} doc_type={doc_type} count={count}{stats.done_suffix() if stats is not None else ''}",
+        flush=True,
+    )
     return count
 
 
+def delete_document_ids(client: OpenSearchClient, index_or_alias: str, doc_ids: Iterable[str], *, bulk_size: int) -> int:
+    lines: list[bytes] = []
+    deleted = 0
+    for doc_id in doc_ids:
+        lines.append(
+            json.dumps({"delete": {"_index": index_or_alias, "_id": doc_id}}, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            )
+        )
+        if len(lines) >= bulk_size:
+            deleted += client.bulk_lines(lines, len(lines))
+            lines = []
+    if lines:
+        deleted += client.bulk_lines(lines, len(lines))
+    return deleted
+
+
+def minutes_meta_signatures(meta_map: dict[Any, Any]) -> dict[str, str]:
+    # 会議録のメタ情報は本文を読まないとどの行が使われるか決まらない。
+    # タイトル単位で候補行をまとめて署名し、その署名が変わったファイルだけを再投入する。
+    rows_by_title: dict[str, list[str]] = {}
+    for key, meta in meta_map.items():
+        title = str(key[1]) if isinstance(key, tuple) and len(key) >= 2 else ""
+        rows_by_title.setdefault(title, []).append(delta_manifest.digest_value([list(key), vars(meta)]))
+    return {title: delta_manifest.digest_value(sorted(rows)) for title, rows in rows_by_title.items()}
+
+
+def tokenizer_signature() -> str:
+    if japanese_search_tokenizer is None:
+        return "whitespace"
+    try:
+        return str(japanese_search_tokenizer.tokenizer_fingerprint())
+    except Exception:
+        return "unknown"
+
+
+def delta_context_signature(doc_type: str, context: MinutesPrepareContext | ReikiPrepareContext) -> str:
+    if isinstance(context, MinutesPrepareContext):
+        material: dict[str, Any] = {
+            "meta": context.meta,
+            "assembly_name": context.assembly_name,
+            "source_system": context.source_system,
+        }
+    else:
+        material = {
+            "meta": context.meta,
+            "target": context.target,
+            "prefixes": context.prefixes,
+            "source_system": context.source_system,
+            "has_local_detail": context.has_local_detail,
+        }
+    return delta_manifest.digest_value([doc_type, tokenizer_signature(), material])
+
+
+def delta_source_entries(
+    doc_type: str,
+    slug: str,
+    tasks: list[tuple[Any, Any]],
+    previous_entries: dict[str, Any],
+) -> list[tuple[str, dict[str, Any]]]:
+    """task ごとに manifest entry（_id・入力ファイル fingerprint・付随署名）を作る。"""
+    entries: list[tuple[str, dict[str, Any]]] = []
+    title_signatures: dict[str, str] | None = None
+    for item, context in tasks:
+        if doc_type == "minutes":
+            file_path = Path(item)
+            key = file_path.relative_to(context.downloads_dir).as_posix()
+            if title_signatures is None:
+                title_signatures = minutes_meta_signatures(load_minutes_meta_map(context.index_json_path))
+            previous_files = delta_manifest.entry_files_by_rel(previous_entries.get(key))
+            files = [delta_manifest.file_fingerprint(file_path, context.downloads_dir, previous_files)]
+            extra = title_signatures.get(normalize_title(file_path), "")
+            doc_id = f"minutes:{slug}:{stable_local_id(slug, key)}"
+        else:
+            key, html_path, markdown_path, classification_path, manifest_row = item
+            previous_files = delta_manifest.entry_files_by_rel(previous_entries.get(key))
+            files = [
+                delta_manifest.file_fingerprint(path, None, previous_files)
+                for path in [html_path, markdown_path, classification_path]
+                if path is not None and path.exists()
+            ]
+            extra = delta_manifest.digest_value(manifest_row or {})
+            doc_id = f"reiki:{slug}:{stable_local_id(slug, clean_text(key))}"
+        entries.append((key, {"id": doc_id, "files": files, "extra": extra}))
+    return entries
+
+
+def delta_one(
+    client: OpenSearchClient,
+    *,
+    doc_type: str,
+    alias: str,
+    slug: str,
+    bulk_size: int,
+    bulk_bytes: int,
+    bulk_concurrency: int,
+    pool: PreparePool | None = None,
+    stats: IndexStageStats | None = None,
+    controller: BulkController | None = None,
+    fallback_update: Callable[[Iterable[tuple[str, dict[str, Any]]]], int],
+    require_documents: bool = True,
+) -> int:
+    """1 自治体分を前回 manifest との差分だけ投入する。投入・削除した件数を返す。"""
+    prepare = prepare_minutes_document if doc_type == "minutes" else prepare_reiki_document
+    iter_tasks = iter_minutes_prepare_tasks if doc_type == "minutes" else iter_reiki_prepare_tasks
+    # 判定用の task 一覧。実際に投入する文書の indexed_at は投入直前に採番し直す。
+    probe_tasks = list(iter_tasks({slug}, strict=True, indexed_at=utc_now_iso()))
+    if not probe_tasks:
+        if require_documents:
+            raise RuntimeError(f"Delta update for {doc_type} has no source documents: {slug}")
+        # 成果物が消えた自治体の旧文書と manifest を残すと、検索に古い文書が出続ける。
+        deleted = 0
+        if single_index_for_alias(client, alias) is not None:
+            deleted = delete_documents_for_slugs(client, index_or_alias=alias, doc_type=doc_type, slugs={slug})
+            if deleted:
+                refresh_search_target(client, alias)
+        delta_manifest.delete_manifest(doc_type, slug)
+        return deleted
+    context_signature = delta_context_signature(doc_type, probe_tasks[0][1])
+
+    current_index = single_index_for_alias(client, alias)
+    manifest = delta_manifest.load_manifest(doc_type, slug)
+    reusable = current_index is not None and delta_manifest.manifest_matches(
+        manifest, index_name=current_index, context=context_signature
+    )
+    previous_entries: dict[str, Any] = dict(manifest["entries"]) if manifest is not None else {}
+    current_entries = delta_source_entries(doc_type, slug, probe_tasks, previous_entries)
+
+    if not reusable:
+        # manifest がない・投入先 index が変わった・tokenizer や自治体メタが変わった場合は、
+        # update と同じ全件差し替えで基準を作り直す。
+        reason = "no-index" if current_index is None else ("no-manifest" if manifest is None else "stale-manifest")
+        print(f"[DELTA] doc_type={doc_type} slug={slug} full reason={reason} files={len(current_entries)}", flush=True)
+        failed_mark = len(stats.failed_doc_ids) if stats is not None else 0
+
+        def fallback_documents() -> Iterator[tuple[str, dict[str, Any]]]:
+            # indexed_at は generator の初回評価時（update_one が cutoff を取った後）に採番する。
+            # 引数の組み立て時に採ると、秒の境目をまたいだ場合に今回投入分が cutoff より古くなり、
+            # 前回世代の削除で一緒に消えてしまう。
+            tasks = iter_tasks({slug}, strict=True, indexed_at=utc_now_iso())
+            yield from run_prepare_tasks(prepare, tasks, strict=True, pool=pool, stats=stats)
+
+        count = fallback_update(fallback_documents())
+        index_name = single_index_for_alias(client, alias) or ""
+        delta_manifest.save_manifest(
+            doc_type,
+            slug,
+            index_name=index_name,
+            context=context_signature,
+            entries=entries_without_failed(current_entries, stats, failed_mark),
+        )
+        return count
+
+    current_keys = {key for key, _entry in current_entries}
+    changed_keys = {
+        key
+        for key, entry in current_entries
+        if delta_manifest.entry_content_changed(previous_entries.get(key), entry)
+    }
+    removed_ids = sorted(
+        str(entry.get("id") or "")
+        for key, entry in previous_entries.items()
+        if key not in current_keys and isinstance(entry, dict) and entry.get("id")
+    )
+    if not changed_keys and not removed_ids:
+        print(f"[SKIP] delta doc_type={doc_type} slug={slug} unchanged files={len(current_entries)}", flush=True)
+        # mtime だけ変わったファイルの stat を覚え直し、次回の sha1 計算を省く。
+        delta_manifest.save_manifest(
+            doc_type, slug, index_name=current_index or "", context=context_signature, entries=dict(current_entries)
+        )
+        return 0
+
+    print(
+        f"[DELTA] doc_type={doc_type} slug={slug} index={current_index} "
+        f"changed={len(changed_keys)} removed={len(removed_ids)} unchanged={len(current_entries) - len(changed_keys)}",
+        flush=True,
+    )
+    changed_ids = {entry["id"] for key, entry in current_entries if key in changed_keys}
+    emitted_ids: set[str] = set()
+    failed_mark = len(stats.failed_doc_ids) if stats is not None else 0
+
+    def changed_documents() -> Iterator[tuple[str, dict[str, Any]]]:
+        # delta は世代 cutoff で消さないので、判定に使った task をそのまま投入に使える。
+        tasks = (task for task, (key, _entry) in zip(probe_tasks, current_entries) if key in changed_keys)
+        for doc_id, document in run_prepare_tasks(prepare, tasks, strict=True, pool=pool, stats=stats):
+            emitted_ids.add(doc_id)
+            yield doc_id, document
+
+    count = index_documents(
+        client,
+        alias,
+        changed_documents(),
+        bulk_size=bulk_size,
+        bulk_bytes=bulk_bytes,
+        bulk_concurrency=bulk_concurrency,
+        stats=stats,
+        controller=controller,
+    )
+    # 変更後に文書を生まなくなったファイル（目次化など）の旧文書も消す。
+    stale_ids = sorted(set(removed_ids) | (changed_ids - emitted_ids))
+    if stale_ids:
+        delete_document_ids(client, alias, stale_ids, bulk_size=bulk_size)
+        print(f"[DELETE] target={alias} doc_type={doc_type} slug={slug} ids={len(stale_ids)}", flush=True)
+    refresh_search_target(client, alias)
+    delta_manifest.save_manifest(
+        doc_type,
+        slug,
+        index_name=current_index or "",
+        context=context_signature,
+        entries=entries_without_failed(current_entries, stats, failed_mark),
+    )
+    return count + len(stale_ids)
+
+
+def entries_without_failed(
+    entries: list[tuple[str, dict[str, Any]]], stats: IndexStageStats | None, failed_mark: int
+) -> dict[str, Any]:
+    # dead-letter へ回った文書は manifest に載せず、次回の delta で新規扱いにして再投入させる。
+    failed_ids = set(stats.failed_doc_ids[failed_mark:]) if stats is not None else set()
+    return {key: entry for key, entry in entries if entry.get("id") not in failed_ids}
+
+
 def main() -> int:
     args = parse_args()
     build_id = args.build_id.strip() or default_build_id()
@@ -1069,18 +2022,152 @@ def main() -> int:
             print("[ERROR] --mode resume requires --doc-type minutes or reiki.", file=sys.stderr, flush=True)
             return 2
 
+    source_listing.configure_persistent_cache(source_listing.default_cache_root() if args.listing_cache else None)
+    cache_path = "" if args.no_terms_cache else str(args.terms_cache or "").strip()
+    cache_max_bytes = max(0, int(args.terms_cache_max_mb)) * 1024 * 1024
+    cache_enabled = configure_terms_cache(cache_path, cache_max_bytes)
+    prepare_workers = max(1, int(args.prepare_workers))
+    if max(1, int(args.slug_parallel)) > 1 and prepare_workers <= 1:
+        # SudachiPy の tokenizer と terms キャッシュの SQLite 接続は thread 間で共有できない。
+        # 自治体 thread から直接 prepare させず、自治体数ぶんの worker process に任せる。
+        prepare_workers = max(1, int(args.slug_parallel))
+        print(f"[INFO] --slug-parallel uses prepare_workers={prepare_workers}", flush=True)
+    reiki_targets_by_slug: dict[str, dict[str, Any]] = {}
+    if prepare_workers > 1 and args.doc_type in {"all", "reiki"}:
+        reiki_targets_by_slug = {
+            str(target.get("slug") or "").strip(): target for target in reiki_targets.iter_reiki_targets()
+        }
+    prepare_pool = create_prepare_pool(
+        prepare_workers,
+        terms_cache_path=cache_path if cache_enabled else "",
+        terms_cache_max_bytes=cache_max_bytes,
+        reiki_targets_by_slug=reiki_targets_by_slug,
+    )
     client = OpenSearchClient(
         args.opensearch_url,
         user=args.opensearch_user,
         password=args.opensearch_password,
         insecure_dev=bool(args.insecure_dev),
+        compress=bool(args.bulk_gzip),
     )
+    try:
+        return run_index_build(
+            args,
+            client,
+            build_id=build_id,
+            slugs=slugs,
+            mode=mode,
+            resume_index=resume_index,
+            prepare_pool=prepare_pool,
+            terms_cache_enabled=cache_enabled,
+        )
+    finally:
+        client.close()
+        if prepare_pool is not None:
+            prepare_pool.shutdown()
+        terms_cache.close()
+
+
+def largest_first(counts_by_slug: dict[str, int]) -> list[str]:
+    # 大きい自治体から着手すると、最後に大きい自治体 1 件だけが走り続ける待ちが減る。
+    return sorted(counts_by_slug, key=lambda slug: (-counts_by_slug[slug], slug))
+
+
+def run_index_build(
+    args: argparse.Namespace,
+    client: OpenSearchClient,
+    *,
+    build_id: str,
+    slugs: set[str],
+    mode: str,
+    resume_index: str,
+    prepare_pool: PreparePool | None,
+    terms_cache_enabled: bool = False,
+) -> int:
     bulk_size = max(1, args.bulk_size)
     bulk_bytes = max(1, args.bulk_bytes)
     bulk_concurrency = max(1, args.bulk_concurrency)
+    prepare_workers = prepare_pool.workers if prepare_pool is not None else 1
+
+    # 学習した bulk 設定は doc_type・自治体をまたいで引き継ぐ。
+    bulk_controller = BulkController(
+        bulk_size=bulk_size,
+        bulk_bytes=bulk_bytes,
+        concurrency=bulk_concurrency,
+        adaptive=bool(args.bulk_adaptive),
+        target_seconds=max(0.05, args.bulk_target_ms / 1000.0),
+        max_concurrency=max(1, args.bulk_max_concurrency),
+        max_bulk_bytes=max(1, args.bulk_max_bytes),
+        max_failed_documents=max(0, args.max_failed_documents),
+    )
+
+    def new_stats() -> IndexStageStats:
+        return IndexStageStats(
+            prepare_workers=prepare_workers,
+            bulk_concurrency=bulk_concurrency,
+            terms_cache_enabled=terms_cache_enabled,
+        )
+
+    if mode == "delta":
+        for doc_type, alias, index_prefix, iter_targets in [
+            ("minutes", args.minutes_alias, "miyabe-minutes", gijiroku_targets.iter_gijiroku_targets),
+            ("reiki", args.reiki_alias, "miyabe-reiki", reiki_targets.iter_reiki_targets),
+        ]:
+            if args.doc_type not in {"all", doc_type}:
+                continue
+            # --slug 未指定なら登録済みの全自治体を対象にし、成果物のない自治体は黙って飛ばす。
+            target_slugs = sorted(slugs) or [
+                str(target.get("slug") or "").strip()
+                for target in iter_targets()
+                if str(target.get("slug") or "").strip()
+            ]
+            delta_stats = new_stats()
+            delta_total = 0
+            for slug in target_slugs:
+                delta_total += delta_one(
+                    client,
+                    doc_type=doc_type,
+                    alias=alias,
+                    slug=slug,
+                    bulk_size=bulk_size,
+                    bulk_bytes=bulk_bytes,
+                    bulk_concurrency=bulk_concurrency,
+                    pool=prepare_pool,
+                    stats=delta_stats,
+                    controller=bulk_controller,
+                    require_documents=bool(slugs),
+                    fallback_update=lambda documents, doc_type=doc_type, alias=alias, index_prefix=index_prefix, slug=slug: update_one(
+                        client,
+                        doc_type=doc_type,
+                        index_prefix=index_prefix,
+                        alias=alias,
+                        documents_alias=args.documents_alias,
+                        minutes_alias=args.minutes_alias,
+                        reiki_alias=args.reiki_alias,
+                        build_id=build_id,
+                        documents=documents,
+                        slugs={slug},
+                        shards=args.shards,
+                        replicas=args.replicas,
+                        bulk_size=bulk_size,
+                        bulk_bytes=bulk_bytes,
+                        bulk_concurrency=bulk_concurrency,
+                        switch_alias=not args.no_switch_alias,
+                        stats=delta_stats,
+                        controller=bulk_controller,
+                    ),
+                )
+            print(f"[RATE] alias={alias} {delta_stats.summary()}", flush=True)
+            print(
+                f"[DONE] alias={alias} doc_type={doc_type} slugs={len(target_slugs)} count={delta_total}"
+                f"{delta_stats.done_suffix()}",
+                flush=True,
+            )
+        return 0
 
     if mode == "update":
         if args.doc_type in {"all", "minutes"}:
+            minutes_stats = new_stats()
             update_one(
                 client,
                 doc_type="minutes",
@@ -1090,7 +2177,9 @@ def main() -> int:
                 minutes_alias=args.minutes_alias,
                 reiki_alias=args.reiki_alias,
                 build_id=build_id,
-                documents=iter_minutes_documents(limit=args.limit, slugs=slugs, strict=True),
+                documents=iter_minutes_documents(
+                    limit=args.limit, slugs=slugs, strict=True, pool=prepare_pool, stats=minutes_stats
+                ),
                 slugs=slugs,
                 shards=args.shards,
                 replicas=args.replicas,
@@ -1098,8 +2187,11 @@ def main() -> int:
                 bulk_bytes=bulk_bytes,
                 bulk_concurrency=bulk_concurrency,
                 switch_alias=not args.no_switch_alias,
+                stats=minutes_stats,
+                controller=bulk_controller,
             )
         if args.doc_type in {"all", "reiki"}:
+            reiki_stats = new_stats()
             update_one(
                 client,
                 doc_type="reiki",
@@ -1109,7 +2201,9 @@ def main() -> int:
                 minutes_alias=args.minutes_alias,
                 reiki_alias=args.reiki_alias,
                 build_id=build_id,
-                documents=iter_reiki_documents(limit=args.limit, slugs=slugs, strict=True),
+                documents=iter_reiki_documents(
+                    limit=args.limit, slugs=slugs, strict=True, pool=prepare_pool, stats=reiki_stats
+                ),
                 slugs=slugs,
                 shards=args.shards,
                 replicas=args.replicas,
@@ -1117,6 +2211,8 @@ def main() -> int:
                 bulk_bytes=bulk_bytes,
                 bulk_concurrency=bulk_concurrency,
                 switch_alias=not args.no_switch_alias,
+                stats=reiki_stats,
+                controller=bulk_controller,
             )
         return 0
 
@@ -1154,6 +2250,8 @@ def main() -> int:
         if args.doc_type in {"all", "reiki"}
         else {}
     )
+    # --limit は全自治体を通した件数上限なので、自治体並列では守れない。開発用途なので直列に戻す。
+    slug_parallel = max(1, args.slug_parallel) if args.limit <= 0 else 1
     # 進捗表示用の総数は、上の slug 別集計をそのまま合算する（全ファイル走査を二度しない）。
     total_document_count = sum(minutes_counts_by_slug.values()) + sum(reiki_counts_by_slug.values())
     print(f"[COUNT] doc_type={args.doc_type} total={total_document_count}", flush=True)
@@ -1166,16 +2264,30 @@ def main() -> int:
     try:
         if args.doc_type in {"all", "minutes"}:
             built_minutes_index = resume_index if mode == "resume" else f"miyabe-minutes-v{build_id}"
+            minutes_stats = new_stats()
             minutes_count = build_one(
                 client,
                 index_name=built_minutes_index,
-                documents=iter_minutes_documents(limit=args.limit, slugs=slugs, exclude_slugs=resume_done_slugs),
+                documents=iter_minutes_documents(
+                    limit=args.limit,
+                    slugs=slugs,
+                    exclude_slugs=resume_done_slugs,
+                    pool=prepare_pool,
+                    stats=minutes_stats,
+                ),
                 shards=args.shards,
                 replicas=args.replicas,
                 bulk_size=bulk_size,
                 bulk_bytes=bulk_bytes,
                 bulk_concurrency=bulk_concurrency,
                 create_index=mode != "resume",
+                stats=minutes_stats,
+                controller=bulk_controller,
+                slug_parallel=slug_parallel,
+                parallel_slugs=largest_first(minutes_counts_by_slug),
+                slug_documents=lambda slug: iter_minutes_documents(
+                    slugs={slug}, pool=prepare_pool, stats=minutes_stats
+                ),
                 progress_callback=lambda total, source, slug_current: search_rebuild_status_progress(
                     status_state,
                     stage="minutes",
@@ -1184,6 +2296,9 @@ def main() -> int:
                     source=source,
                     current_slug_processed_count=slug_current,
                     current_slug_total_count=minutes_counts_by_slug.get(str(source.get("slug") or "").strip(), 0),
+                    retried_count=minutes_stats.bulk_retried,
+                    failed_count=minutes_stats.bulk_failed,
+                    dead_letter_path=minutes_stats.dead_letter_path,
                 ),
                 slug_complete_callback=(
                     None
@@ -1216,16 +2331,30 @@ def main() -> int:
             processed_offset += minutes_count
         if args.doc_type in {"all", "reiki"}:
             built_reiki_index = resume_index if mode == "resume" else f"miyabe-reiki-v{build_id}"
+            reiki_stats = new_stats()
             reiki_count = build_one(
                 client,
                 index_name=built_reiki_index,
-                documents=iter_reiki_documents(limit=args.limit, slugs=slugs, exclude_slugs=resume_done_slugs),
+                documents=iter_reiki_documents(
+                    limit=args.limit,
+                    slugs=slugs,
+                    exclude_slugs=resume_done_slugs,
+                    pool=prepare_pool,
+                    stats=reiki_stats,
+                ),
                 shards=args.shards,
                 replicas=args.replicas,
                 bulk_size=bulk_size,
                 bulk_bytes=bulk_bytes,
                 bulk_concurrency=bulk_concurrency,
                 create_index=mode != "resume",
+                stats=reiki_stats,
+                controller=bulk_controller,
+                slug_parallel=slug_parallel,
+                parallel_slugs=largest_first(reiki_counts_by_slug),
+                slug_documents=lambda slug: iter_reiki_documents(
+                    slugs={slug}, pool=prepare_pool, stats=reiki_stats
+                ),
                 progress_callback=lambda total, source, slug_current: search_rebuild_status_progress(
                     status_state,
                     stage="reiki",
@@ -1234,6 +2363,9 @@ def main() -> int:
                     source=source,
                     current_slug_processed_count=slug_current,
                     current_slug_total_count=reiki_counts_by_slug.get(str(source.get("slug") or "").strip(), 0),
+                    retried_count=reiki_stats.bulk_retried,
+                    failed_count=reiki_stats.bulk_failed,
+                    dead_letter_path=reiki_stats.dead_letter_path,
                 ),
                 slug_complete_callback=(
                     None
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""_bulk で投入できなかった文書の dead-letter NDJSON。
+
+build_opensearch_index.py が再送しても通らなかった action（mapping 不一致・巨大すぎる
+field など）をここへ退避し、rebuild 自体は続行する。保存先は
+work/search/dead_letter/<index>.ndjson で、1 行 1 文書:
+
+    {"failed_at": "...", "index": "<投入先>", "status": 400, "error": {...},
+     "action": {"index": {"_index": ..., "_id": ...}}, "source": {...}}
+
+action と source をそのまま残すので、原因を直したあと `_bulk` へ流し直せる。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_DEAD_LETTER_ROOT = Path(__file__).resolve().parents[2] / "work" / "search" / "dead_letter"
+
+
+def dead_letter_root() -> Path:
+    override = os.environ.get("MIYABE_DEAD_LETTER_ROOT", "").strip()
+    return Path(override) if override else DEFAULT_DEAD_LETTER_ROOT
+
+
+def dead_letter_path(index_name: str) -> Path:
+    safe_name = "".join(char if char.isalnum() or char in "-_." else "_" for char in index_name) or "unknown"
+    return dead_letter_root() / f"{safe_name}.ndjson"
+
+
+def decode_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return line.decode("utf-8", errors="replace")
+
+
+def append_failures(index_name: str, failures: list[tuple[list[bytes], dict[str, Any]]]) -> Path:
+    """(action 行 + source 行, item 応答) の組を追記し、書き込んだファイルを返す。"""
+    path = dead_letter_path(index_name)
+    if not failures:
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    failed_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    with open(path, "a", encoding="utf-8") as handle:
+        for action_lines, result in failures:
+            record = {
+                "failed_at": failed_at,
+                "index": index_name,
+                "status": int(result.get("status") or 0),
+                "error": result.get("error"),
+                "action": decode_line(action_lines[0]) if action_lines else None,
+                "source": decode_line(action_lines[1]) if len(action_lines) > 1 else None,
+            }
+            handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return path
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""`--mode delta` 用の自治体別 source fingerprint manifest。
+
+build_opensearch_index.py が前回 delta 投入時の入力ファイル状態を覚えておき、
+次回は追加・変更されたファイルだけを再投入し、消えたファイルの文書だけを削除するための層。
+保存先は work/search/delta_manifests/<doc_type>/<slug>.json。
+
+manifest の形:
+    {
+      "version": 1,
+      "index": "<投入先の実 index 名>",
+      "context": "<tokenizer の版・自治体メタ情報などの署名>",
+      "entries": {
+        "<source key>": {"id": "<_id>", "files": [[rel, size, mtime_ns, sha1], ...], "extra": "<署名>"}
+      }
+    }
+
+注意:
+- manifest は index の正しさを保証するものではなく「再投入を省いてよいか」の判断材料。
+  version / index / context のどれかが合わなければ、その自治体は全件差し替えに戻す。
+- size と mtime が前回と同じファイルは読まずに前回の sha1 を使う。変わっていれば読み直し、
+  sha1 が同じなら（touch されただけなら）再投入しない。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST_ROOT = Path(__file__).resolve().parents[2] / "work" / "search" / "delta_manifests"
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def manifest_root() -> Path:
+    override = os.environ.get("MIYABE_DELTA_MANIFEST_ROOT", "").strip()
+    return Path(override) if override else DEFAULT_MANIFEST_ROOT
+
+
+def manifest_path(doc_type: str, slug: str) -> Path:
+    return manifest_root() / doc_type / f"{slug}.json"
+
+
+def load_manifest(doc_type: str, slug: str) -> dict[str, Any] | None:
+    path = manifest_path(doc_type, slug)
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            loaded = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(loaded, dict) or not isinstance(loaded.get("entries"), dict):
+        return None
+    return loaded
+
+
+def save_manifest(doc_type: str, slug: str, *, index_name: str, context: str, entries: dict[str, Any]) -> Path:
+    path = manifest_path(doc_type, slug)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": MANIFEST_VERSION,
+        "index": index_name,
+        "context": context,
+        "entries": entries,
+    }
+    # 途中で落ちても壊れた manifest を残さないよう、一時ファイル経由で置き換える。
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+    return path
+
+
+def delete_manifest(doc_type: str, slug: str) -> bool:
+    try:
+        manifest_path(doc_type, slug).unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def manifest_matches(manifest: dict[str, Any] | None, *, index_name: str, context: str) -> bool:
+    if manifest is None:
+        return False
+    return (
+        manifest.get("version") == MANIFEST_VERSION
+        and manifest.get("index") == index_name
+        and manifest.get("context") == context
+    )
+
+
+def digest_value(value: Any) -> str:
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def sha1_file(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(HASH_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path, root: Path | None, previous: dict[str, list[Any]] | None = None) -> list[Any]:
+    """[rel, size, mtime_ns, sha1] を返す。size と mtime が前回と同じなら sha1 は読み直さない。"""
+    rel = path.as_posix()
+    if root is not None:
+        try:
+            rel = path.relative_to(root).as_posix()
+        except ValueError:
+            pass
+    stat = path.stat()
+    prior = (previous or {}).get(rel)
+    if prior is not None and len(prior) == 4 and prior[1] == stat.st_size and prior[2] == stat.st_mtime_ns:
+        return [rel, stat.st_size, stat.st_mtime_ns, prior[3]]
+    return [rel, stat.st_size, stat.st_mtime_ns, sha1_file(path)]
+
+
+def entry_files_by_rel(entry: dict[str, Any] | None) -> dict[str, list[Any]]:
+    if not isinstance(entry, dict):
+        return {}
+    files = entry.get("files")
+    if not isinstance(files, list):
+        return {}
+    return {str(item[0]): item for item in files if isinstance(item, list) and item}
+
+
+def entry_content_changed(previous: dict[str, Any] | None, current: dict[str, Any]) -> bool:
+    # mtime だけの変化（touch・再保存）は再投入しない。比較は内容 hash と付随署名だけで行う。
+    if not isinstance(previous, dict):
+        return True
+
+    def content_key(entry: dict[str, Any]) -> tuple[Any, ...]:
+        files = tuple(sorted((str(item[0]), str(item[3])) for item in entry.get("files") or [] if len(item) == 4))
+        return files, str(entry.get("extra") or ""), str(entry.get("id") or "")
+
+    return content_key(previous) != content_key(current)
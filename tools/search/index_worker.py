@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""自治体別 index 更新を受け付ける常駐 worker。
+
+スクレイプが終わるたびに `build_opensearch_index.py --mode update --slug X` を新しく起動すると、
+import・Sudachi 辞書の読み込みだけで 1 件あたり数秒かかり、小さな町を数百件回す周回では
+それが所要時間の大半になる。`serve` はそれらを読み込み済みの親プロセスを常駐させ、
+ジョブごとに fork した子で build_opensearch_index.main() を実行する（辞書は copy-on-write で共有）。
+
+    python3 tools/search/index_worker.py serve [--socket PATH] [--max-jobs N]
+    python3 tools/search/index_worker.py run [--socket PATH] -- --mode update --doc-type minutes --slug X
+
+`run` は Unix socket 経由でジョブを渡し、自分の stdout/stderr の fd を SCM_RIGHTS で送る。
+子はその fd へ直接書くので、ログファイル・pipe・[BULK]/[DONE] の読み取りは
+サブプロセス起動のときと変わらない。終了コードも子のものをそのまま返す。
+socket に繋がらなければ build_opensearch_index.py を exec して従来どおり実行する。
+
+注意:
+- 親は単一スレッドのまま fork する。bulk 送信スレッド・terms キャッシュの SQLite 接続・
+  OpenSearch への接続は fork をまたいで共有できないので、親では作らずジョブごとに作る。
+- `run` 側が SIGTERM 等で終了すると socket が閉じ、serve はそのジョブのプロセスグループを止める。
+- socket は所有者だけが読み書きできる（0600）。受け付ける引数は増分更新に要るもの
+  （JOB_VALUE_FLAGS / JOB_SWITCH_FLAGS、--mode は update / delta）だけで、それ以外は拒否する。
+- 環境変数は `run` 側の MIYABE_* / OPENSEARCH_* など（job_env_key_allowed）だけをジョブへ引き継ぎ
+  （MIYABE_* の既定値などが呼び出し元と揃う）、PATH・LD_PRELOAD・PYTHONPATH などは worker 側のものを使う。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+
+SEARCH_DIR = Path(__file__).resolve().parent
+BUILD_SCRIPT = SEARCH_DIR / "build_opensearch_index.py"
+DEFAULT_SOCKET_PATH = Path(__file__).resolve().parents[2] / "work" / "run" / "index_worker.sock"
+REQUEST_MAX_BYTES = 1024 * 1024
+# run 側は接続直後に要求をまとめて送る。受信で serve のループを長く止めないよう短く切る。
+REQUEST_TIMEOUT_SECONDS = 0.5
+# run 側が切断したジョブへ SIGTERM を送ってから SIGKILL するまでの猶予。
+CANCEL_GRACE_SECONDS = 20.0
+STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+JOB_MODES = {"update", "delta"}
+JOB_VALUE_FLAGS = {
+    "--mode",
+    "--doc-type",
+    "--slug",
+    "--bulk-size",
+    "--bulk-bytes",
+    "--bulk-concurrency",
+    "--bulk-target-ms",
+    "--bulk-max-concurrency",
+    "--bulk-max-bytes",
+    "--max-failed-documents",
+    "--prepare-workers",
+    "--terms-cache-max-mb",
+    "--limit",
+}
+JOB_SWITCH_FLAGS = {
+    "--bulk-adaptive",
+    "--no-bulk-adaptive",
+    "--bulk-gzip",
+    "--no-bulk-gzip",
+    "--listing-cache",
+    "--no-listing-cache",
+    "--no-terms-cache",
+}
+JOB_ENV_PREFIXES = ("MIYABE_", "OPENSEARCH_")
+JOB_ENV_KEYS = {"DATABASE_URL", "MANAGEMENT_DATABASE_URL", "TZ", "LANG", "LC_ALL", "LC_CTYPE"}
+
+
+def socket_path() -> Path:
+    override = os.environ.get("MIYABE_INDEX_WORKER_SOCKET", "").strip()
+    return Path(override) if override else DEFAULT_SOCKET_PATH
+
+
+def configured_socket() -> str:
+    """呼び出し側が常駐 worker を使う設定か。MIYABE_INDEX_WORKER_SOCKET が空なら使わない。"""
+    return os.environ.get("MIYABE_INDEX_WORKER_SOCKET", "").strip()
+
+
+def warm_up() -> Any:
+    """ジョブ間で使い回す import と Sudachi 辞書を読み込み、build_opensearch_index モジュールを返す。"""
+    if str(SEARCH_DIR) not in sys.path:
+        sys.path.insert(0, str(SEARCH_DIR))
+    import build_opensearch_index  # type: ignore
+
+    tokenizer = build_opensearch_index.japanese_search_tokenizer
+    if tokenizer is not None:
+        tokenizer.sudachi_tokenizer()
+        tokenizer.tokenizer_fingerprint()
+    return build_opensearch_index
+
+
+def exit_status_code(status: int) -> int:
+    # subprocess.Popen.returncode と同じく、シグナル終了は負の番号にする。
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def send_line(conn: socket.socket, payload: dict[str, Any]) -> None:
+    try:
+        conn.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+    except OSError:
+        pass
+
+
+class IndexJob:
+    def __init__(self, conn: socket.socket, request: dict[str, Any], fds: list[int]) -> None:
+        self.conn = conn
+        self.request = request
+        self.fds = fds
+        self.pid = 0
+        self.pidfd = -1
+        self.cancelled_at = 0.0
+        self.killed = False
+
+    def close_fds(self) -> None:
+        for fd in self.fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.fds = []
+
+
+def validate_job_argv(argv: list[Any]) -> list[str]:
+    """build_opensearch_index.py へ渡す引数を許可リストで検査する。許可外があれば ValueError。"""
+    values = [str(value) for value in argv]
+    index = 0
+    while index < len(values):
+        name, has_value, value = values[index].partition("=")
+        if name in JOB_SWITCH_FLAGS and not has_value:
+            index += 1
+            continue
+        if name not in JOB_VALUE_FLAGS:
+            raise ValueError(f"argument not allowed: {name}")
+        if not has_value:
+            if index + 1 >= len(values):
+                raise ValueError(f"argument needs a value: {name}")
+            value = values[index + 1]
+            index += 1
+        if name == "--mode" and value not in JOB_MODES:
+            raise ValueError(f"mode not allowed: {value}")
+        index += 1
+    return values
+
+
+def job_env_key_allowed(key: str) -> bool:
+    return key in JOB_ENV_KEYS or key.startswith(JOB_ENV_PREFIXES)
+
+
+def job_environ(base: dict[str, str], requested: dict[str, Any]) -> dict[str, str]:
+    """worker 自身の環境に、run 側の許可された変数だけを重ねる（許可対象は run 側に無ければ消す）。"""
+    env = {key: value for key, value in base.items() if not job_env_key_allowed(key)}
+    env.update({str(key): str(value) for key, value in requested.items() if job_env_key_allowed(str(key))})
+    return env
+
+
+def receive_request(conn: socket.socket) -> tuple[dict[str, Any], list[int]]:
+    conn.settimeout(REQUEST_TIMEOUT_SECONDS)
+    data, fds, _flags, _address = socket.recv_fds(conn, REQUEST_MAX_BYTES, 2)
+    buffer = bytearray(data)
+    try:
+        while not buffer.endswith(b"\n"):
+            chunk = conn.recv(REQUEST_MAX_BYTES)
+            if not chunk or len(buffer) + len(chunk) > REQUEST_MAX_BYTES:
+                raise ValueError("incomplete request")
+            buffer.extend(chunk)
+        request = json.loads(buffer)
+        if not isinstance(request, dict) or not isinstance(request.get("argv"), list) or len(fds) != 2:
+            raise ValueError("malformed request")
+        request["argv"] = validate_job_argv(request["argv"])
+        if not isinstance(request.get("env", {}), dict):
+            raise ValueError("malformed request")
+    except BaseException:
+        for fd in fds:
+            os.close(fd)
+        raise
+    return request, fds
+
+
+def run_job_in_child(module: Any, job: IndexJob, inherited: list[Any]) -> None:
+    """fork 後の子で呼ぶ。戻らずに os._exit する。
+
+    fork 前に SIGTERM/SIGINT を block しておき、ここで既定動作へ戻してから解除する。
+    親の handler（KeyboardInterrupt を投げる）が子で動くと、子が serve のループへ戻ってしまう。"""
+    code = 1
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+        os.setsid()
+        for resource in inherited:
+            resource.close()
+        os.dup2(job.fds[0], 1)
+        os.dup2(job.fds[1], 2)
+        job.close_fds()
+        # print は sys.stdout 経由なので、差し替えた fd 1/2 を指す stream に付け直す。
+        sys.stdout = sys.__stdout__ = open(1, "w", encoding="utf-8", errors="replace", closefd=False)
+        sys.stderr = sys.__stderr__ = open(2, "w", encoding="utf-8", errors="backslashreplace", closefd=False)
+        env = job_environ(dict(os.environ), job.request.get("env") or {})
+        os.environ.clear()
+        os.environ.update(env)
+        sys.argv = [str(BUILD_SCRIPT), *[str(value) for value in job.request["argv"]]]
+        code = int(module.main() or 0)
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def signal_job(pid: int, signum: int) -> None:
+    # 子が setsid する前だとプロセスグループがまだ無いので、その場合は子本人へ送る。
+    try:
+        os.killpg(pid, signum)
+    except ProcessLookupError:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def serve(path: Path, *, max_jobs: int, module: Any = None) -> int:
+    """module は main() を持つもの（既定は warm_up() で読み込んだ build_opensearch_index）。"""
+    module = module if module is not None else warm_up()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # ジョブは worker の権限で任意の自治体を更新できるので、他のユーザーからは繋がせない。
+    # bind で作られた瞬間から 0600 になるよう umask を絞る（serve は単一スレッド）。
+    previous_umask = os.umask(0o177)
+    try:
+        listener.bind(str(path))
+    finally:
+        os.umask(previous_umask)
+    os.chmod(path, 0o600)
+    listener.listen(64)
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ, None)
+    pidfd_supported = hasattr(os, "pidfd_open")
+    waiting: deque[IndexJob] = deque()
+    running: dict[int, IndexJob] = {}
+
+    def stop(_signum, _frame) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"[INFO] index worker listening socket={path} max_jobs={max_jobs}", flush=True)
+
+    def start(job: IndexJob) -> None:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        inherited = [selector, listener, job.conn]
+        inherited.extend(other.conn for other in running.values())
+        inherited.extend(other.conn for other in waiting)
+        signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                run_job_in_child(module, job, inherited)
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+        job.pid = pid
+        job.close_fds()
+        running[pid] = job
+        send_line(job.conn, {"pid": pid})
+        if pidfd_supported:
+            try:
+                job.pidfd = os.pidfd_open(pid)
+                selector.register(job.pidfd, selectors.EVENT_READ, ("exit", job))
+            except OSError:
+                job.pidfd = -1
+        selector.register(job.conn, selectors.EVENT_READ, ("conn", job))
+        described = " ".join(str(value) for value in job.request["argv"])
+        print(f"[INFO] index job start pid={pid} args={described}", flush=True)
+
+    def finish(job: IndexJob, status: int) -> None:
+        running.pop(job.pid, None)
+        for fd_or_sock in (job.conn, job.pidfd):
+            if fd_or_sock == -1:
+                continue
+            try:
+                selector.unregister(fd_or_sock)
+            except (KeyError, ValueError):
+                pass
+        if job.pidfd >= 0:
+            os.close(job.pidfd)
+        returncode = exit_status_code(status)
+        send_line(job.conn, {"returncode": returncode})
+        job.conn.close()
+        print(f"[INFO] index job done pid={job.pid} returncode={returncode}", flush=True)
+
+    def cancel(job: IndexJob) -> None:
+        # run 側が先に終了した。ジョブのプロセスグループを止め、終了は通常どおり回収する。
+        if job.cancelled_at:
+            return
+        job.cancelled_at = time.monotonic()
+        try:
+            selector.unregister(job.conn)
+        except (KeyError, ValueError):
+            pass
+        signal_job(job.pid, signal.SIGTERM)
+
+    def reap() -> None:
+        for pid, job in list(running.items()):
+            try:
+                waited_pid, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                # 誰かに先に回収された。成否が分からないので exit 1 として返す。
+                finish(job, 1 << 8)
+                continue
+            if waited_pid:
+                finish(job, status)
+            elif job.cancelled_at and not job.killed and time.monotonic() - job.cancelled_at >= CANCEL_GRACE_SECONDS:
+                job.killed = True
+                signal_job(pid, signal.SIGKILL)
+
+    try:
+        while True:
+            timeout: float | None = None
+            if running and (not pidfd_supported or any(job.cancelled_at for job in running.values())):
+                timeout = 0.5
+            for key, _mask in selector.select(timeout):
+                if key.data is None:
+                    conn, _address = listener.accept()
+                    try:
+                        request, fds = receive_request(conn)
+                    except (OSError, ValueError) as exc:
+                        print(f"[WARN] index worker rejected request: {exc}", file=sys.stderr, flush=True)
+                        send_line(conn, {"error": str(exc), "returncode": 2})
+                        conn.close()
+                        continue
+                    waiting.append(IndexJob(conn, request, fds))
+                    continue
+                kind, job = key.data
+                if kind == "conn":
+                    try:
+                        data = job.conn.recv(1)
+                    except OSError:
+                        data = b""
+                    if not data:
+                        cancel(job)
+            reap()
+            while waiting and len(running) < max_jobs:
+                start(waiting.popleft())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for job in list(running.values()):
+            cancel(job)
+        deadline = time.monotonic() + CANCEL_GRACE_SECONDS
+        while running and time.monotonic() < deadline:
+            reap()
+            time.sleep(0.2)
+        for job in waiting:
+            job.close_fds()
+            job.conn.close()
+        selector.close()
+        listener.close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def submit(path: Path, argv: list[str], *, stdout_fd: int | None = None, stderr_fd: int | None = None) -> int | None:
+    """常駐 worker にジョブを渡して終了を待つ。worker に繋がらなければ None を返す。
+
+    ジョブの出力先は既定でこのプロセスの stdout/stderr。"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    with sock:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        payload = json.dumps({"argv": argv, "env": dict(os.environ)}, ensure_ascii=False).encode("utf-8") + b"\n"
+        try:
+            fds = [
+                sys.stdout.fileno() if stdout_fd is None else stdout_fd,
+                sys.stderr.fileno() if stderr_fd is None else stderr_fd,
+            ]
+            socket.send_fds(sock, [payload], fds)
+        except OSError:
+            return None
+        reader = sock.makefile("rb")
+        for raw_line in reader:
+            try:
+                message = json.loads(raw_line)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("error"):
+                print(f"[ERROR] index worker rejected the job: {message['error']}", file=sys.stderr, flush=True)
+            if isinstance(message, dict) and "returncode" in message:
+                return int(message["returncode"])
+        # 結果を受け取る前に worker が止まった。ジョブの成否は分からないので失敗扱い。
+        print("[ERROR] index worker closed the connection before the job finished", file=sys.stderr, flush=True)
+        return 1
+
+
+def run(path: Path, argv: list[str]) -> int:
+    returncode = submit(path, argv)
+    if returncode is not None:
+        return returncode
+    # 常駐 worker が無い環境では、従来どおり build_opensearch_index.py をこのプロセスで実行する。
+    print(f"[INFO] index worker unavailable socket={path}; running build_opensearch_index.py directly", flush=True)
+    os.execv(sys.executable, [sys.executable, str(BUILD_SCRIPT), *argv])
+    return 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Persistent worker for per-slug OpenSearch index updates.")
+    parser.add_argument("command", choices=["serve", "run"])
+    parser.add_argument("--socket", default=str(socket_path()), help="待ち受け / 接続先の Unix socket。")
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=int(os.environ.get("MIYABE_INDEX_WORKER_MAX_JOBS", "2")),
+        help="serve で同時に実行するジョブ数。超えた分は接続順に待たせる。",
+    )
+    # run では `--` より後ろを build_opensearch_index.py の引数としてそのまま渡す。
+    argv = sys.argv[1:]
+    forwarded: list[str] = []
+    if "--" in argv:
+        split_at = argv.index("--")
+        argv, forwarded = argv[:split_at], argv[split_at + 1 :]
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        return serve(Path(args.socket), max_jobs=max(1, int(args.max_jobs)))
+    return run(Path(args.socket), forwarded)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
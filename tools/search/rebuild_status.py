@@ -58,6 +58,9 @@ def search_rebuild_status_start(*, build_id: str, doc_type: str, total_count: in
         "published_current_slug": "",
         "published_current_municipality_name": "",
         "processed_count": 0,
+        "bulk_retried_count": 0,
+        "bulk_failed_count": 0,
+        "dead_letter_path": "",
         "total_count": total_count,
         "completed_count": 0,
         "active_count": 1,
@@ -85,13 +88,19 @@ def search_rebuild_status_progress(
     source: dict[str, Any],
     current_slug_processed_count: int,
     current_slug_total_count: int,
+    retried_count: int = 0,
+    failed_count: int = 0,
+    dead_letter_path: str = "",
 ) -> None:
     if batch_status is None or state is None:
         return
     # 進捗 state は UI 補助なので、bulk flush のたびではなく一定間隔でだけ書く。
+    # ただし dead-letter 件数が増えたときは間引かずに書く（運用者がすぐ気付けるように）。
     global _LAST_PROGRESS_WRITE_MONOTONIC
     now = time.monotonic()
-    if now - _LAST_PROGRESS_WRITE_MONOTONIC < PROGRESS_WRITE_INTERVAL_SECONDS:
+    failed_count = max(0, int(failed_count))
+    failures_grew = failed_count > int(state.get("bulk_failed_count") or 0)
+    if now - _LAST_PROGRESS_WRITE_MONOTONIC < PROGRESS_WRITE_INTERVAL_SECONDS and not failures_grew:
         return
     _LAST_PROGRESS_WRITE_MONOTONIC = now
     next_processed = max(0, int(processed_count))
@@ -106,6 +115,9 @@ def search_rebuild_status_progress(
     state["current_slug_total_count"] = max(0, int(current_slug_total_count))
     state["processed_count"] = next_processed
     state["completed_count"] = next_processed
+    state["bulk_retried_count"] = max(0, int(retried_count))
+    state["bulk_failed_count"] = failed_count
+    state["dead_letter_path"] = str(dead_letter_path or "")
     state["updated_at"] = batch_status.now_text()
     batch_status.write_state("search_rebuild", state)
     if next_processed // 1000 != previous_processed // 1000:
@@ -23,6 +23,21 @@ try:
 except Exception:  # pragma: no cover
     japanese_search_tokenizer = None
 
+try:
+    import terms_cache  # type: ignore
+except Exception:  # pragma: no cover - パッケージとして import された場合
+    from tools.search import terms_cache  # type: ignore
+
+try:
+    import source_listing  # type: ignore
+except Exception:  # pragma: no cover - パッケージとして import された場合
+    from tools.search import source_listing  # type: ignore
+
+try:
+    import reiki_io  # type: ignore
+except Exception:  # pragma: no cover - パッケージとして import された場合
+    from tools.reiki import reiki_io  # type: ignore
+
 
 TEXT_ENCODINGS = ("utf-8", "utf-8-sig", "cp932", "shift_jis", "euc_jp")
 FULLWIDTH_DIGITS = str.maketrans("０１２３４５６７８９", "0123456789")
@@ -157,13 +172,47 @@ def terms_text(value: str) -> str:
     if value == "":
         return ""
     if japanese_search_tokenizer is not None:
+        # 未変更の本文を毎回 tokenize し直さないよう、設定済みなら terms キャッシュを先に見る。
+        cached = terms_cache.lookup(value)
+        if cached is not None:
+            return cached
         try:
-            return str(japanese_search_tokenizer.document_terms_text(value)).strip()
+            terms = str(japanese_search_tokenizer.document_terms_text(value)).strip()
         except Exception:
-            pass
+            terms = None
+        if terms is not None:
+            terms_cache.store(value, terms)
+            return terms
     return " ".join(part for part in re.split(r"[\s\u3000]+", value) if part)
 
 
+def terms_many(values: list[str]) -> list[str]:
+    """1 文書分の複数フィールドの terms をまとめて作る。
+
+    長い本文は terms_text（terms キャッシュ経由）で 1 件ずつ、短いフィールドは
+    document_terms_many でまとめて作る（部署名・タグ等はプロセス内で覚えておく）。"""
+    if japanese_search_tokenizer is None or not hasattr(japanese_search_tokenizer, "document_terms_many"):
+        return [terms_text(value) for value in values]
+    short_limit = int(getattr(japanese_search_tokenizer, "SHORT_FIELD_MAX_CHARS", 0))
+    results = ["" for _ in values]
+    short_positions: list[int] = []
+    for position, value in enumerate(values):
+        if value == "":
+            continue
+        if len(value) > short_limit:
+            results[position] = terms_text(value)
+        else:
+            short_positions.append(position)
+    if short_positions:
+        try:
+            short_terms = japanese_search_tokenizer.document_terms_many([values[position] for position in short_positions])
+        except Exception:
+            short_terms = [terms_text(values[position]) for position in short_positions]
+        for position, terms in zip(short_positions, short_terms):
+            results[position] = str(terms).strip()
+    return results
+
+
 def html_to_text(value: str) -> str:
     text = re.sub(r"<script[\s\S]*?</script>", "", value, flags=re.IGNORECASE)
     text = re.sub(r"<style[\s\S]*?</style>", "", text, flags=re.IGNORECASE)
@@ -196,9 +245,8 @@ def minutes_source_key(path: Path, root: Path) -> str:
 
 def choose_minutes_source_files(downloads_dir: Path) -> list[Path]:
     preferred: dict[str, Path] = {}
-    for file_path in sorted(downloads_dir.rglob("*")):
-        if not file_path.is_file():
-            continue
+    # 件数集計と文書化の両方から呼ばれるので、ツリー走査は source_listing で 1 回に抑える。
+    for file_path in source_listing.list_files(downloads_dir):
         ext = logical_suffix(file_path)
         if ext not in {".txt", ".html", ".htm"}:
             continue
@@ -518,6 +566,7 @@ def build_minutes_record(
         source_year,
         source_hint=file_path.relative_to(downloads_dir).as_posix(),
     )
+    title_terms, meeting_name_terms, content_terms = terms_many([title, meeting_name or "", content])
     return MinuteRecord(
         rel_path=file_path.relative_to(downloads_dir).as_posix(),
         title=title,
@@ -533,9 +582,9 @@ def build_minutes_record(
         source_year=source_year if source_year is not None else gregorian_year,
         source_url=source_url or None,
         content=content,
-        title_terms=terms_text(title),
-        meeting_name_terms=terms_text(meeting_name or ""),
-        content_terms=terms_text(content),
+        title_terms=title_terms,
+        meeting_name_terms=meeting_name_terms,
+        content_terms=content_terms,
         indexed_at=indexed_at,
     )
 
@@ -552,9 +601,7 @@ def collect_reiki_preferred_files(root: Path, suffixes: set[str]) -> dict[str, P
     preferred: dict[str, Path] = {}
     if not root.exists():
         return preferred
-    for path in sorted(root.rglob("*")):
-        if not path.is_file():
-            continue
+    for path in source_listing.list_files(root):
         logical = logical_path(path)
         if logical.suffix.lower() not in suffixes:
             continue
@@ -566,9 +613,8 @@ def collect_reiki_preferred_files(root: Path, suffixes: set[str]) -> dict[str, P
 
 
 def load_reiki_manifest_index(path: Path) -> dict[str, dict[str, Any]]:
-    rows = load_json(path, [])
-    if not isinstance(rows, list):
-        return {}
+    # 従来の JSON 配列に、途中で止まった実行の segment を重ねて読む。
+    rows = reiki_io.load_manifest_rows(path)
     index: dict[str, dict[str, Any]] = {}
     for row in rows:
         if not isinstance(row, dict):
@@ -824,6 +870,18 @@ def build_reiki_record(
         or clean_source_url(manifest.get("source_url"))
         or derive_reiki_source_url(target, source_file)
     )
+    terms_fields = {
+        "title_terms": title,
+        "reading_terms": reading_kana,
+        "content_terms": content_text,
+        "department_terms": responsible_department,
+        "combined_reason_terms": combined_reason,
+        "reason_terms": reason,
+        "secondary_terms": join_strings(classification.get("secondaryTags", [])),
+        "lens_terms": join_strings(classification.get("lensTags", [])),
+        "taxonomy_terms": taxonomy_path,
+    }
+    terms = dict(zip(terms_fields, terms_many(list(terms_fields.values()))))
     return {
         "filename": key,
         "title": title,
@@ -853,14 +911,6 @@ def build_reiki_record(
         "taxonomy_paths": join_strings(manifest.get("taxonomy_paths", [])),
         "content_text": content_text,
         "content_length": len(content_text),
-        "title_terms": terms_text(title),
-        "reading_terms": terms_text(reading_kana),
-        "content_terms": terms_text(content_text),
-        "department_terms": terms_text(responsible_department),
-        "combined_reason_terms": terms_text(combined_reason),
-        "reason_terms": terms_text(reason),
-        "secondary_terms": terms_text(join_strings(classification.get("secondaryTags", []))),
-        "lens_terms": terms_text(join_strings(classification.get("lensTags", []))),
-        "taxonomy_terms": terms_text(taxonomy_path),
+        **terms,
         "has_classification": bool(classification_path is not None and classification_path.exists()),
     }
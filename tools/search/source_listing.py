@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""会議録・例規集の成果物ディレクトリのファイル一覧。
+
+index 構築では同じ自治体のツリーを「進捗用の件数集計」と「文書 iterator」の 2 回なめていた。
+NFS 上ではこの `sorted(rglob("*"))` だけで数分かかるため、os.scandir で 1 回だけ走査し、
+結果をプロセス内で使い回す層。
+
+一覧はディレクトリ単位で持ち、各ディレクトリの mtime を覚えておく。
+ファイルの追加・削除・改名はそのディレクトリの mtime を変えるので、次の呼び出しでは
+全ディレクトリを stat して mtime が変わったディレクトリだけを読み直す（中身の変更は
+一覧に影響しないので見ない）。`configure_persistent_cache()` で保存先を指定すると、
+この一覧を work/search/listing_cache/ に保存し、次回のプロセスでも同じ方法で検証して使う。
+
+注意:
+- mtime の粒度が粗いファイルシステムでは、走査直後に同じ秒の中で変更されても mtime が
+  変わらないことがある。走査時刻から RACY_WINDOW_NS 以内の mtime を持つディレクトリは
+  次回も必ず読み直す（git の racy-clean 対策と同じ考え方）。
+- rglob と同じく、symlink のディレクトリには降りない。symlink のファイルは一覧に含める。
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_ROOT = Path(__file__).resolve().parents[2] / "work" / "search" / "listing_cache"
+RACY_WINDOW_NS = 2_000_000_000
+
+# root -> {"scanned_at_ns": int, "dirs": {rel: {"mtime_ns": int, "files": [...], "subdirs": [...]}}}
+_LISTINGS: dict[str, dict[str, Any]] = {}
+_LOCK = threading.Lock()
+_CACHE_ROOT: Path | None = None
+
+
+def configure_persistent_cache(path: Path | str | None) -> None:
+    """一覧の永続キャッシュ先を設定する。None や空文字なら保存しない（プロセス内だけで使い回す）。"""
+    global _CACHE_ROOT
+    _CACHE_ROOT = Path(path) if path is not None and str(path).strip() != "" else None
+
+
+def default_cache_root() -> Path:
+    override = os.environ.get("MIYABE_LISTING_CACHE_ROOT", "").strip()
+    return Path(override) if override else DEFAULT_CACHE_ROOT
+
+
+def cache_path_for(root: Path) -> Path | None:
+    if _CACHE_ROOT is None:
+        return None
+    digest = hashlib.sha1(str(root).encode("utf-8", errors="surrogatepass")).hexdigest()
+    return _CACHE_ROOT / f"{digest}.json.gz"
+
+
+def scan_directory(path: Path) -> dict[str, Any] | None:
+    """1 ディレクトリ分の直下のファイル名・サブディレクトリ名と mtime。読めなければ None。"""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+        files: list[str] = []
+        subdirs: list[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return {"mtime_ns": mtime_ns, "files": sorted(files), "subdirs": sorted(subdirs)}
+
+
+def refresh_listing(root: Path, listing: dict[str, Any] | None) -> tuple[dict[str, Any], int]:
+    """前回の一覧を検証し、mtime が変わったディレクトリだけ読み直す。(一覧, 読み直した数) を返す。"""
+    previous_dirs: dict[str, Any] = dict(listing["dirs"]) if listing else {}
+    racy_before = int(listing["scanned_at_ns"]) - RACY_WINDOW_NS if listing else 0
+    scanned_at_ns = time.time_ns()
+    dirs: dict[str, Any] = {}
+    rescanned = 0
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        path = root / rel if rel else root
+        previous = previous_dirs.get(rel)
+        entry: dict[str, Any] | None = None
+        if previous is not None:
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            if mtime_ns == previous["mtime_ns"] and mtime_ns < racy_before:
+                entry = previous
+        if entry is None:
+            entry = scan_directory(path)
+            rescanned += 1
+            if entry is None:
+                continue
+        dirs[rel] = entry
+        for name in entry["subdirs"]:
+            stack.append(f"{rel}/{name}" if rel else name)
+    return {"scanned_at_ns": scanned_at_ns, "dirs": dirs}, rescanned
+
+
+def load_persisted(root: Path) -> dict[str, Any] | None:
+    path = cache_path_for(root)
+    if path is None:
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            loaded = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(loaded, dict) or loaded.get("version") != CACHE_VERSION or loaded.get("root") != str(root):
+        return None
+    if not isinstance(loaded.get("dirs"), dict):
+        return None
+    return {"scanned_at_ns": int(loaded.get("scanned_at_ns") or 0), "dirs": loaded["dirs"]}
+
+
+def save_persisted(root: Path, listing: dict[str, Any]) -> None:
+    path = cache_path_for(root)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        payload = {"version": CACHE_VERSION, "root": str(root), **listing}
+        with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=1) as handle:
+            json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError as exc:
+        print(f"[WARN] listing cache write failed root={root}: {exc}", file=sys.stderr, flush=True)
+
+
+def list_files(root: Path) -> list[Path]:
+    """root 配下の全ファイルを `sorted(root.rglob("*"))` と同じ順で返す（ディレクトリは含めない）。"""
+    root = Path(root)
+    key = str(root)
+    with _LOCK:
+        listing = _LISTINGS.get(key)
+    if listing is None:
+        listing = load_persisted(root)
+    refreshed, rescanned = refresh_listing(root, listing)
+    with _LOCK:
+        _LISTINGS[key] = refreshed
+    if rescanned:
+        save_persisted(root, refreshed)
+
+    rel_files: list[tuple[str, ...]] = []
+    for rel, entry in refreshed["dirs"].items():
+        parts = tuple(rel.split("/")) if rel else ()
+        rel_files.extend(parts + (name,) for name in entry["files"])
+    # Path 同士の比較は要素ごとの比較なので、要素の tuple で並べれば rglob 版と同じ順になる。
+    rel_files.sort()
+    return [root.joinpath(*parts) for parts in rel_files]
+
+
+def clear() -> None:
+    """プロセス内に持っている一覧を捨てる（テスト用）。"""
+    with _LOCK:
+        _LISTINGS.clear()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""tokenize 済み `*_terms` 文字列の永続キャッシュ。
+
+index 再構築のたびに変わっていない会議録・例規本文を SudachiPy にかけ直さないための層。
+キーは「入力テキストの SHA-256 + tokenizer fingerprint（SudachiPy / 辞書の版と SplitMode）」で、
+辞書や分割設定が変われば自然に全件 miss になる。保存先は work/search/terms_cache.sqlite。
+
+注意:
+- キャッシュは高速化の補助であり、index の正しさには影響しない。SQLite が壊れている・
+  ロックが取れない等の失敗時は警告を出してキャッシュなしで続行する。
+- process pool の各 worker が同じ DB を開くので WAL + busy_timeout で同時書き込みに耐える。
+  書き込みは WRITE_BATCH_SIZE 件または COMMIT_INTERVAL_SECONDS ごとにまとめて commit する。
+- 容量上限を超えた分は last_used の古い順に削る（close 時と一定件数の書き込みごと）。
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "work" / "search" / "terms_cache.sqlite"
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+WRITE_BATCH_SIZE = 256
+COMMIT_INTERVAL_SECONDS = 5.0
+EVICT_CHECK_WRITES = 20_000
+# 上限超過時はここまで削って、eviction が毎回走らないようにする。
+EVICT_TARGET_RATIO = 0.9
+
+
+class TermsCache:
+    def __init__(self, path: Path, *, fingerprint: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self._pending_writes: list[tuple[str, str, int, int]] = []
+        self._pending_touches: list[tuple[int, str]] = []
+        self._last_commit = time.monotonic()
+        self._writes_since_evict = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: sqlite3.Connection | None = sqlite3.connect(str(self.path), timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS terms ("
+            " key TEXT PRIMARY KEY,"
+            " terms TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used INTEGER NOT NULL"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS terms_last_used ON terms(last_used)")
+        self._conn.commit()
+
+    def key_for(self, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, text: str) -> str | None:
+        if self._conn is None:
+            return None
+        key = self.key_for(text)
+        row = self._conn.execute("SELECT terms FROM terms WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._pending_touches.append((int(time.time()), key))
+        self._maybe_commit()
+        return str(row[0])
+
+    def put(self, text: str, terms: str) -> None:
+        if self._conn is None:
+            return
+        size = len(terms.encode("utf-8")) + 64
+        self._pending_writes.append((self.key_for(text), terms, size, int(time.time())))
+        self._writes_since_evict += 1
+        self._maybe_commit()
+
+    def _maybe_commit(self) -> None:
+        pending = len(self._pending_writes) + len(self._pending_touches)
+        if pending >= WRITE_BATCH_SIZE or time.monotonic() - self._last_commit >= COMMIT_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._conn is None:
+            return
+        writes, self._pending_writes = self._pending_writes, []
+        touches, self._pending_touches = self._pending_touches, []
+        self._last_commit = time.monotonic()
+        if not writes and not touches:
+            return
+        with self._conn:
+            if writes:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO terms(key, terms, size, last_used) VALUES (?, ?, ?, ?)",
+                    writes,
+                )
+            if touches:
+                self._conn.executemany("UPDATE terms SET last_used = ? WHERE key = ?", touches)
+        if self._writes_since_evict >= EVICT_CHECK_WRITES:
+            self.evict()
+
+    def evict(self) -> int:
+        if self._conn is None or self.max_bytes <= 0:
+            return 0
+        self._writes_since_evict = 0
+        total = int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM terms").fetchone()[0])
+        if total <= self.max_bytes:
+            return 0
+        excess = total - int(self.max_bytes * EVICT_TARGET_RATIO)
+        removed = 0
+        freed = 0
+        with self._conn:
+            cursor = self._conn.execute("SELECT key, size FROM terms ORDER BY last_used ASC")
+            doomed: list[tuple[str]] = []
+            for key, size in cursor:
+                doomed.append((key,))
+                freed += int(size)
+                if freed >= excess:
+                    break
+            self._conn.executemany("DELETE FROM terms WHERE key = ?", doomed)
+            removed = len(doomed)
+        return removed
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self.flush()
+            self.evict()
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+_CACHE: TermsCache | None = None
+
+
+def configure(path: Path | str | None, *, fingerprint: str, max_bytes: int = DEFAULT_MAX_BYTES) -> TermsCache | None:
+    """このプロセスの terms キャッシュを開く。path が空ならキャッシュを無効化する。"""
+    global _CACHE
+    close()
+    if path is None or str(path).strip() == "" or fingerprint == "":
+        return None
+    try:
+        _CACHE = TermsCache(Path(path), fingerprint=fingerprint, max_bytes=max_bytes)
+    except Exception as exc:
+        print(f"[WARN] terms cache disabled path={path}: {exc}", file=sys.stderr, flush=True)
+        _CACHE = None
+    return _CACHE
+
+
+def lookup(text: str) -> str | None:
+    if _CACHE is None:
+        return None
+    try:
+        return _CACHE.get(text)
+    except Exception as exc:
+        print(f"[WARN] terms cache read failed; disabling: {exc}", file=sys.stderr, flush=True)
+        _disable()
+        return None
+
+
+def store(text: str, terms: str) -> None:
+    if _CACHE is None:
+        return
+    try:
+        _CACHE.put(text, terms)
+    except Exception as exc:
+        print(f"[WARN] terms cache write failed; disabling: {exc}", file=sys.stderr, flush=True)
+        _disable()
+
+
+def counters() -> tuple[int, int]:
+    """(hits, misses) を返す。キャッシュ無効時は (0, 0)。"""
+    if _CACHE is None:
+        return 0, 0
+    return _CACHE.hits, _CACHE.misses
+
+
+def close() -> None:
+    global _CACHE
+    cache, _CACHE = _CACHE, None
+    if cache is None:
+        return
+    try:
+        cache.close()
+    except Exception as exc:
+        print(f"[WARN] terms cache close failed: {exc}", file=sys.stderr, flush=True)
+
+
+def _disable() -> None:
+    global _CACHE
+    cache, _CACHE = _CACHE, None
+    if cache is not None and cache._conn is not None:
+        try:
+            cache._conn.close()
+        except Exception:
+            pass
+        cache._conn = None
+
+
+def default_path() -> Path:
+    override = os.environ.get("MIYABE_TERMS_CACHE_PATH", "").strip()
+    return Path(override) if override else DEFAULT_CACHE_PATH
+
+
+atexit.register(close)
@@ -0,0 +1,249 @@
+import itertools
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from tools.search import build_opensearch_index, delta_manifest
+from tools.search.build_opensearch_index import BulkController, index_slugs_in_parallel
+from tools.search.opensearch_client import BulkOutcome
+
+
+class _FakeBulkClient:
+    def __init__(self, fail_slug: str = "", rejected_ids: frozenset[str] = frozenset()) -> None:
+        self.fail_slug = fail_slug
+        self.rejected_ids = rejected_ids
+        self.lock = threading.Lock()
+        self.ids: list[str] = []
+
+    def bulk_send(self, lines: list[bytes], count: int, *, allow_item_failures: bool = False) -> BulkOutcome:
+        if self.fail_slug and any(self.fail_slug.encode("utf-8") in line for line in lines):
+            raise RuntimeError("bulk failed")
+        failed = []
+        with self.lock:
+            for meta_line, source_line in zip(lines[0::2], lines[1::2]):
+                if build_opensearch_index.bulk_action_doc_id([meta_line]) in self.rejected_ids:
+                    failed.append(([meta_line, source_line], {"status": 400, "error": {"type": "mapper_parsing_exception"}}))
+                else:
+                    self.ids.append(meta_line.decode("utf-8"))
+        return BulkOutcome(count=count, failed=failed)
+
+
+def slug_documents(slug: str) -> list[tuple[str, dict]]:
+    return [(f"{slug}:{number}", {"slug": slug, "number": number}) for number in range(5)]
+
+
+class BulkControllerTest(unittest.TestCase):
+    def test_fixed_mode_ignores_latency(self) -> None:
+        controller = BulkController(bulk_size=200, bulk_bytes=8_000_000, concurrency=2)
+        controller.observe(30.0, rejected=10)
+        self.assertEqual(controller.describe(), "bulk_size=200 bulk_bytes=8000000 concurrency=2")
+
+    def test_adaptive_grows_while_fast_and_backs_off_on_rejection(self) -> None:
+        controller = BulkController(
+            bulk_size=200, bulk_bytes=8_000_000, concurrency=2, adaptive=True, target_seconds=2.0, max_concurrency=4
+        )
+        for _ in range(3):
+            controller.observe(0.2)
+        self.assertEqual(controller.concurrency, 3)
+        self.assertGreater(controller.bulk_bytes, 8_000_000)
+        self.assertGreater(controller.bulk_size, 200)
+
+        grown = controller.bulk_bytes
+        controller.observe(0.2, rejected=1)
+        self.assertEqual(controller.concurrency, 2)
+        self.assertEqual(controller.bulk_bytes, grown // 2)
+
+        for _ in range(50):
+            controller.observe(10.0)
+        self.assertEqual(controller.concurrency, 1)
+        self.assertEqual(controller.bulk_bytes, controller.min_bulk_bytes)
+        self.assertEqual(controller.pool_workers, 4)
+
+
+class IndexSlugsInParallelTest(unittest.TestCase):
+    def test_each_slug_is_indexed_and_published_once(self) -> None:
+        client = _FakeBulkClient()
+        completed: list[tuple[str, int]] = []
+        progress: list[int] = []
+        count = index_slugs_in_parallel(
+            client,  # type: ignore[arg-type]
+            "miyabe-minutes-vtest",
+            ["a", "b", "c"],
+            slug_documents,
+            slug_parallel=3,
+            bulk_size=2,
+            progress_callback=lambda total, _source, _slug_current: progress.append(total),
+            slug_complete_callback=lambda slug, _source, total: completed.append((slug, total)),
+        )
+        self.assertEqual(count, 15)
+        self.assertEqual(len(client.ids), 15)
+        self.assertEqual(sorted(slug for slug, _total in completed), ["a", "b", "c"])
+        self.assertEqual(max(progress), 15)
+
+    def test_failure_in_one_slug_fails_the_build_without_publishing_it(self) -> None:
+        client = _FakeBulkClient(fail_slug="b:")
+        completed: list[str] = []
+        with self.assertRaises(RuntimeError):
+            index_slugs_in_parallel(
+                client,  # type: ignore[arg-type]
+                "miyabe-minutes-vtest",
+                ["a", "b"],
+                slug_documents,
+                slug_parallel=2,
+                bulk_size=2,
+                slug_complete_callback=lambda slug, _source, _total: completed.append(slug),
+            )
+        self.assertNotIn("b", completed)
+
+
+def _prepare_even(item: int, _context: object, _strict: bool) -> tuple[str, dict] | None:
+    return (f"doc:{item}", {"number": item}) if item % 2 == 0 else None
+
+
+class PrepareTasksTest(unittest.TestCase):
+    def test_prepared_count_skips_tasks_without_documents(self) -> None:
+        stats = build_opensearch_index.IndexStageStats()
+        documents = list(
+            build_opensearch_index.run_prepare_tasks(
+                _prepare_even, [(number, None) for number in range(5)], strict=False, stats=stats
+            )
+        )
+        self.assertEqual([doc_id for doc_id, _source in documents], ["doc:0", "doc:2", "doc:4"])
+        self.assertEqual(stats.prepared_count, 3)
+
+    def test_reiki_tasks_carry_a_ref_and_workers_rebuild_the_context(self) -> None:
+        target = {"slug": "sample-town", "code": "012345", "name": "サンプル町", "name_kana": "さんぷるちょう"}
+        target.update({f"path_{number}": f"/data/reiki/sample-town/{number}" * 8 for number in range(40)})
+        context = build_opensearch_index.build_reiki_prepare_context(
+            target, has_local_detail=True, indexed_at="2026-01-01T00:00:00Z"
+        )
+        pool = build_opensearch_index.PreparePool(2, reiki_targets_by_slug={"sample-town": target})
+        self.addCleanup(pool.shutdown)
+
+        ref = pool.task_context(context)
+        self.assertIsInstance(ref, build_opensearch_index.ReikiPrepareContextRef)
+        self.assertLess(len(pickle.dumps(ref)), len(pickle.dumps(context)) // 10)
+        other = build_opensearch_index.build_reiki_prepare_context(
+            {**target, "slug": "unregistered"}, has_local_detail=True, indexed_at="2026-01-01T00:00:00Z"
+        )
+        self.assertIs(pool.task_context(other), other)
+
+        # worker 側: initializer で受け取った target から同じ context を組み立てる。
+        self.addCleanup(build_opensearch_index._REIKI_CONTEXT_CACHE.clear)
+        self.addCleanup(build_opensearch_index._PREPARE_REIKI_TARGETS.clear)
+        build_opensearch_index._PREPARE_REIKI_TARGETS.update({"sample-town": target})
+        self.assertEqual(build_opensearch_index.resolve_reiki_context(ref), context)
+        with self.assertRaises(RuntimeError):
+            build_opensearch_index.resolve_reiki_context(other.pool_ref())
+
+
+class IndexDocumentsTest(unittest.TestCase):
+    def test_dead_lettered_documents_are_not_counted_as_indexed(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"MIYABE_DEAD_LETTER_ROOT": temp_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        client = _FakeBulkClient(rejected_ids=frozenset({"a:1", "a:4", "b:2"}))
+        completed: list[tuple[str, int]] = []
+        progress: list[int] = []
+        stats = build_opensearch_index.IndexStageStats()
+
+        with mock.patch("builtins.print"):
+            count = build_opensearch_index.index_documents(
+                client,  # type: ignore[arg-type]
+                "miyabe-minutes-vtest",
+                [*slug_documents("a"), *slug_documents("b")],
+                bulk_size=2,
+                progress_callback=lambda total, _source, _slug_current: progress.append(total),
+                slug_complete_callback=lambda slug, _source, total: completed.append((slug, total)),
+                stats=stats,
+            )
+
+        self.assertEqual(count, 7)
+        self.assertEqual(len(client.ids), 7)
+        self.assertEqual(completed, [("a", 3), ("b", 7)])
+        self.assertEqual(max(progress), 7)
+        self.assertEqual(stats.bulk_failed, 3)
+
+
+class DeltaOneTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"MIYABE_DELTA_MANIFEST_ROOT": temp_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # 呼ぶたびに 1 秒進む時計。秒の境目をまたぐ状況を毎回起こす。
+        clock = (f"2026-01-01T00:00:{second:02d}Z" for second in itertools.count())
+        patcher = mock.patch.object(build_opensearch_index, "utc_now_iso", side_effect=lambda: next(clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(build_opensearch_index, "single_index_for_alias", return_value="idx-1")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def delta(self, tasks_for_slug, fallback_update, *, require_documents: bool = True) -> int:
+        def iter_tasks(slugs, *, strict, indexed_at):
+            context = SimpleNamespace(indexed_at=indexed_at)
+            return [(item, context) for item in tasks_for_slug]
+
+        def run_prepare_tasks(prepare, tasks, **kwargs):
+            for item, context in tasks:
+                yield item, {"indexed_at": context.indexed_at}
+
+        with (
+            mock.patch.object(build_opensearch_index, "iter_minutes_prepare_tasks", side_effect=iter_tasks),
+            mock.patch.object(build_opensearch_index, "run_prepare_tasks", side_effect=run_prepare_tasks),
+            mock.patch.object(build_opensearch_index, "delta_context_signature", return_value="ctx"),
+            mock.patch.object(
+                build_opensearch_index,
+                "delta_source_entries",
+                side_effect=lambda doc_type, slug, tasks, previous: [(item, {"id": item}) for item, _ in tasks],
+            ),
+        ):
+            return build_opensearch_index.delta_one(
+                mock.Mock(),
+                doc_type="minutes",
+                alias="miyabe-minutes",
+                slug="x",
+                bulk_size=10,
+                bulk_bytes=1_000_000,
+                bulk_concurrency=1,
+                fallback_update=fallback_update,
+                require_documents=require_documents,
+            )
+
+    def test_full_fallback_stamps_documents_after_update_cutoff(self) -> None:
+        seen: dict[str, object] = {}
+
+        def fallback_update(documents) -> int:
+            # update_one と同じく cutoff を取ってから文書を評価する。
+            seen["cutoff"] = build_opensearch_index.utc_now_iso()
+            seen["documents"] = list(documents)
+            return len(seen["documents"])
+
+        self.assertEqual(self.delta(["a", "b"], fallback_update), 2)
+        stamps = {document["indexed_at"] for _doc_id, document in seen["documents"]}
+        self.assertTrue(all(stamp >= seen["cutoff"] for stamp in stamps), (stamps, seen["cutoff"]))
+
+    def test_slug_without_sources_drops_old_documents_and_manifest(self) -> None:
+        delta_manifest.save_manifest("minutes", "x", index_name="idx-1", context="ctx", entries={"a": {"id": "a"}})
+        with (
+            mock.patch.object(build_opensearch_index, "delete_documents_for_slugs", return_value=3) as delete,
+            mock.patch.object(build_opensearch_index, "refresh_search_target") as refresh,
+        ):
+            count = self.delta([], mock.Mock(side_effect=AssertionError("no fallback")), require_documents=False)
+        self.assertEqual(count, 3)
+        self.assertEqual(delete.call_args.kwargs["slugs"], {"x"})
+        self.assertNotIn("indexed_before", delete.call_args.kwargs)
+        refresh.assert_called_once()
+        self.assertIsNone(delta_manifest.load_manifest("minutes", "x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
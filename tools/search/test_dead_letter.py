@@ -0,0 +1,28 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tools.search import dead_letter
+
+
+class DeadLetterTest(unittest.TestCase):
+    def test_append_failures_keeps_action_and_source_for_replay(self) -> None:
+        failure = ([b'{"index":{"_index":"miyabe-minutes-v1","_id":"m:1"}}', '{"title":"議事録"}'.encode("utf-8")], {
+            "status": 400,
+            "error": {"type": "mapper_parsing_exception"},
+        })
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {"MIYABE_DEAD_LETTER_ROOT": tmp}):
+            path = dead_letter.append_failures("miyabe-minutes-v1", [failure])
+            dead_letter.append_failures("miyabe-minutes-v1", [failure])
+            records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(path.name, "miyabe-minutes-v1.ndjson")
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["action"]["index"]["_id"], "m:1")
+        self.assertEqual(records[0]["source"], {"title": "議事録"})
+        self.assertEqual(records[0]["status"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
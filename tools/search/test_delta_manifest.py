@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.search import delta_manifest
+
+
+class DeltaManifestTest(unittest.TestCase):
+    def test_touch_without_content_change_is_not_a_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            source = root / "2024" / "01.txt"
+            source.parent.mkdir()
+            source.write_text("会議録", encoding="utf-8")
+            first = {"id": "minutes:x:1", "files": [delta_manifest.file_fingerprint(source, root)], "extra": ""}
+
+            stat = source.stat()
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+            touched = {
+                "id": "minutes:x:1",
+                "files": [delta_manifest.file_fingerprint(source, root, delta_manifest.entry_files_by_rel(first))],
+                "extra": "",
+            }
+            self.assertNotEqual(first["files"][0][2], touched["files"][0][2])
+            self.assertFalse(delta_manifest.entry_content_changed(first, touched))
+
+            source.write_text("会議録（訂正）", encoding="utf-8")
+            edited = {"id": "minutes:x:1", "files": [delta_manifest.file_fingerprint(source, root)], "extra": ""}
+            self.assertTrue(delta_manifest.entry_content_changed(first, edited))
+            self.assertTrue(delta_manifest.entry_content_changed(first, {**first, "extra": "meta-changed"}))
+
+    def test_unchanged_stat_reuses_previous_hash_without_reading(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            source = root / "a.txt"
+            source.write_text("本文", encoding="utf-8")
+            fingerprint = delta_manifest.file_fingerprint(source, root)
+            with mock.patch.object(delta_manifest, "sha1_file", side_effect=AssertionError("re-read")):
+                again = delta_manifest.file_fingerprint(source, root, {"a.txt": fingerprint})
+            self.assertEqual(again, fingerprint)
+
+    def test_manifest_round_trip_and_match(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {"MIYABE_DELTA_MANIFEST_ROOT": tmp}):
+            delta_manifest.save_manifest("minutes", "x", index_name="idx-1", context="ctx", entries={"a": {"id": "1"}})
+            loaded = delta_manifest.load_manifest("minutes", "x")
+            self.assertTrue(delta_manifest.manifest_matches(loaded, index_name="idx-1", context="ctx"))
+            self.assertFalse(delta_manifest.manifest_matches(loaded, index_name="idx-2", context="ctx"))
+            self.assertIsNone(delta_manifest.load_manifest("minutes", "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
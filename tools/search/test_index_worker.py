@@ -0,0 +1,138 @@
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from tools.search import index_worker
+
+
+class _FakeBuildModule:
+    """build_opensearch_index の代わりに、受け取った引数と環境変数を出力する。"""
+
+    @staticmethod
+    def main() -> int:
+        args = sys.argv[1:]
+        if "sleep" in args:
+            time.sleep(60)
+        print(f"[DONE] args={' '.join(args)} env={os.environ.get('MIYABE_TEST_VALUE', '')} count=3", flush=True)
+        print("[WARN] something", file=sys.stderr, flush=True)
+        return int(args[args.index("--limit") + 1]) if "--limit" in args else 0
+
+
+def _serve(path: str) -> None:
+    sys.stdout = open(os.devnull, "w")
+    index_worker.serve(Path(path), max_jobs=1, module=_FakeBuildModule)
+
+
+@unittest.skipUnless(hasattr(socket, "send_fds") and hasattr(os, "fork"), "requires SCM_RIGHTS and fork")
+class IndexWorkerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.socket_path = self.root / "index_worker.sock"
+        self.server = multiprocessing.get_context("fork").Process(target=_serve, args=(str(self.socket_path),))
+        self.server.start()
+        deadline = time.monotonic() + 10.0
+        while not self.socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def tearDown(self) -> None:
+        self.server.terminate()
+        self.server.join(30)
+        self.temp_dir.cleanup()
+
+    def submit(self, argv: list[str]) -> tuple[int | None, str, str]:
+        stdout_path = self.root / "job.log"
+        stderr_path = self.root / "job.err.log"
+        with stdout_path.open("w") as stdout, stderr_path.open("w") as stderr:
+            returncode = index_worker.submit(
+                self.socket_path, argv, stdout_fd=stdout.fileno(), stderr_fd=stderr.fileno()
+            )
+        return returncode, stdout_path.read_text(), stderr_path.read_text()
+
+    def test_job_writes_to_caller_fds_and_returns_exit_code(self) -> None:
+        os.environ["MIYABE_TEST_VALUE"] = "caller"
+        try:
+            returncode, stdout, stderr = self.submit(["--mode", "update", "--slug", "town", "--limit", "3"])
+        finally:
+            del os.environ["MIYABE_TEST_VALUE"]
+        self.assertEqual(returncode, 3)
+        self.assertEqual(stdout, "[DONE] args=--mode update --slug town --limit 3 env=caller count=3\n")
+        self.assertEqual(stderr, "[WARN] something\n")
+        self.assertEqual(self.submit(["--slug", "next"])[0], 0)
+
+    def test_caller_disconnect_stops_job(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(self.socket_path))
+        with open(os.devnull, "w") as sink:
+            socket.send_fds(sock, [b'{"argv": ["--slug", "sleep"]}\n'], [sink.fileno(), sink.fileno()])
+        reader = sock.makefile("rb")
+        job_pid = int(json.loads(reader.readline())["pid"])
+        reader.close()
+        sock.close()
+        deadline = time.monotonic() + 10.0
+        while Path(f"/proc/{job_pid}").exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(Path(f"/proc/{job_pid}").exists())
+        # worker は次のジョブを受け付け続ける。
+        self.assertEqual(self.submit(["--slug", "after"])[0], 0)
+
+    def test_socket_is_private_to_owner(self) -> None:
+        self.assertEqual(self.socket_path.stat().st_mode & 0o777, 0o600)
+
+    def test_arguments_outside_allowlist_are_rejected(self) -> None:
+        for argv in (
+            ["--mode", "rebuild"],
+            ["--slug", "town", "--opensearch-url", "http://attacker.example"],
+            ["--terms-cache=/tmp/elsewhere.sqlite"],
+            ["--slug"],
+            ["positional"],
+        ):
+            with self.subTest(argv=argv):
+                returncode, stdout, _stderr = self.submit(argv)
+                self.assertEqual(returncode, 2)
+                self.assertEqual(stdout, "")
+        self.assertEqual(self.submit(["--mode=delta", "--no-bulk-gzip", "--slug", "town"])[0], 0)
+
+    def test_silent_client_does_not_hold_up_other_jobs(self) -> None:
+        silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        silent.connect(str(self.socket_path))
+        self.addCleanup(silent.close)
+        started = time.monotonic()
+        self.assertEqual(self.submit(["--slug", "next"])[0], 0)
+        self.assertLess(time.monotonic() - started, 5.0)
+
+    def test_submit_without_worker_returns_none(self) -> None:
+        self.assertIsNone(index_worker.submit(self.root / "missing.sock", ["--slug", "x"]))
+
+
+class JobEnvironTest(unittest.TestCase):
+    def test_only_allowed_caller_variables_reach_the_job(self) -> None:
+        base = {"PATH": "/usr/bin", "PYTHONPATH": "/srv/app", "MIYABE_STALE": "1", "LANG": "C"}
+        requested = {
+            "PATH": "/tmp/evil",
+            "LD_PRELOAD": "/tmp/evil.so",
+            "PYTHONPATH": "/tmp/evil",
+            "MIYABE_SEARCH_ALIAS": "alias",
+            "OPENSEARCH_URL": "http://opensearch:9200",
+            "LANG": "C.UTF-8",
+        }
+        self.assertEqual(
+            index_worker.job_environ(base, requested),
+            {
+                "PATH": "/usr/bin",
+                "PYTHONPATH": "/srv/app",
+                "MIYABE_SEARCH_ALIAS": "alias",
+                "OPENSEARCH_URL": "http://opensearch:9200",
+                "LANG": "C.UTF-8",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
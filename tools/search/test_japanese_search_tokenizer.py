@@ -0,0 +1,191 @@
+import csv
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+TOKENIZER_SCRIPT = REPO_ROOT / "lib" / "python" / "japanese_search_tokenizer.py"
+sys.path.append(str(REPO_ROOT / "lib" / "python"))
+
+try:
+    import japanese_search_tokenizer
+    japanese_search_tokenizer.sudachi_tokenizer()
+except Exception:  # sudachipy / 辞書が無い環境では比較できない
+    japanese_search_tokenizer = None
+
+
+def corpus_fields() -> list[str]:
+    """自治体マスタと例規 testdata から、文書の短いフィールドに近い実データを集める。"""
+    texts: list[str] = []
+    with (REPO_ROOT / "data" / "municipalities" / "municipality_master.tsv").open(encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle, delimiter="\t"):
+            texts.extend([row["full_name"], row["district_name"], row["name_kana"], row["name_romaji"]])
+    testdata_dir = REPO_ROOT / "tools" / "reiki" / "scrapers" / "testdata" / "d1_parser"
+    for path in sorted(testdata_dir.glob("*.expected.md")):
+        body = path.read_text(encoding="utf-8")
+        texts.append(body)
+        for line in body.splitlines():
+            line = line.strip().lstrip("#>*- ").strip()
+            if line:
+                texts.append(line)
+    return texts
+
+
+@unittest.skipIf(japanese_search_tokenizer is None, "sudachipy is not available")
+class DocumentTermsManyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clear_memo()
+        self.addCleanup(self.clear_memo)
+
+    @staticmethod
+    def clear_memo() -> None:
+        with japanese_search_tokenizer._SHORT_TERMS_LOCK:
+            japanese_search_tokenizer._SHORT_TERMS_MEMO.clear()
+
+    def test_matches_document_terms_text_on_corpus_sample(self) -> None:
+        texts = corpus_fields()
+        self.assertGreater(len(texts), 1000)
+        self.assertTrue(any(len(text) > japanese_search_tokenizer.SHORT_FIELD_MAX_CHARS for text in texts))
+
+        expected = [japanese_search_tokenizer.document_terms_text(text) for text in texts]
+        self.assertEqual(japanese_search_tokenizer.document_terms_many(texts), expected)
+
+    def test_terms_do_not_depend_on_neighbouring_fields(self) -> None:
+        texts = corpus_fields()
+        forward = japanese_search_tokenizer.document_terms_many(texts)
+        self.clear_memo()
+        backward = japanese_search_tokenizer.document_terms_many(list(reversed(texts)))
+        self.assertEqual(list(reversed(backward)), forward)
+        self.clear_memo()
+        for text, terms in list(zip(texts, forward))[::97]:
+            self.assertEqual(japanese_search_tokenizer.document_terms_many([text]), [terms])
+
+
+@unittest.skipIf(japanese_search_tokenizer is None, "sudachipy is not available")
+class TokenizerServerDispatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.server = japanese_search_tokenizer.create_server(socket_path=str(Path(temp_dir.name) / "t.sock"), cache_size=8)
+        self.addCleanup(self.server.server_close)
+
+    def dispatch(self, request: object) -> dict:
+        return self.server.dispatch(json.dumps(request, ensure_ascii=False).encode("utf-8"))
+
+    def test_ops_match_cli_payloads(self) -> None:
+        text = "公共施設の使用料に関する条例"
+        self.assertEqual(
+            self.dispatch({"op": "document", "text": text}),
+            {"ok": True, "result": japanese_search_tokenizer.tokenize_payload("document", text)},
+        )
+        self.assertEqual(
+            self.dispatch({"op": "query", "text": text}),
+            {"ok": True, "result": japanese_search_tokenizer.build_query_payload(text)},
+        )
+        self.assertEqual(
+            self.dispatch({"op": "fields", "fields": {"title": text}}),
+            {"ok": True, "result": {"title": japanese_search_tokenizer.document_terms_text(text)}},
+        )
+        self.dispatch({"op": "query", "text": text})
+        stats = self.dispatch({"op": "stats"})["result"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["max_size"]), (1, 1, 8))
+        self.assertEqual(
+            self.dispatch({"op": "ping"})["result"]["tokenizer"],
+            japanese_search_tokenizer.tokenizer_fingerprint(),
+        )
+
+    def test_bad_requests_are_answered_with_errors(self) -> None:
+        self.assertFalse(self.dispatch({"op": "unknown", "text": "x"})["ok"])
+        self.assertFalse(self.dispatch(["query"])["ok"])
+        response = self.server.dispatch(b"{not json")
+        self.assertFalse(response["ok"])
+        self.assertIn("JSONDecodeError", response["error"])
+
+
+@unittest.skipIf(japanese_search_tokenizer is None, "sudachipy is not available")
+class TokenizerServeTest(unittest.TestCase):
+    """--mode serve を別プロセスで起動し、Unix socket 越しに問い合わせる。"""
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.socket_path = Path(temp_dir.name) / "tokenizer.sock"
+        self.process = subprocess.Popen(
+            [sys.executable, str(TOKENIZER_SCRIPT), "--mode", "serve", "--socket", str(self.socket_path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        self.addCleanup(self.stop_server)
+        deadline = time.monotonic() + 30
+        while not self.socket_path.exists():
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.fail(f"server did not start: {self.process.stderr.read().decode(errors='replace')}")
+            time.sleep(0.05)
+
+    def stop_server(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait(timeout=10)
+        self.process.stderr.close()
+
+    def connect(self) -> socket.socket:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(5)
+        client.connect(str(self.socket_path))
+        self.addCleanup(client.close)
+        return client
+
+    @staticmethod
+    def request(client: socket.socket, payload: dict) -> dict:
+        client.sendall(json.dumps(payload).encode("ascii") + b"\n")
+        return json.loads(client.makefile("rb").readline())
+
+    def test_answers_several_requests_on_one_connection(self) -> None:
+        client = self.connect()
+        self.assertTrue(self.request(client, {"op": "ping"})["ok"])
+        response = self.request(client, {"op": "document", "text": "議会運営委員会"})
+        self.assertEqual(response["result"]["terms_text"], japanese_search_tokenizer.document_terms_text("議会運営委員会"))
+
+    def test_idle_client_does_not_block_other_queries(self) -> None:
+        idle = self.connect()
+        idle.sendall(b'{"op": "qu')  # 改行を送らないまま居座る
+        started = time.monotonic()
+        response = self.request(self.connect(), {"op": "query", "text": "議会"})
+        self.assertTrue(response["ok"])
+        self.assertLess(time.monotonic() - started, 2.0)
+
+    def test_sigterm_removes_socket_file(self) -> None:
+        self.process.send_signal(signal.SIGTERM)
+        self.assertEqual(self.process.wait(timeout=10), 0)
+        self.assertFalse(self.socket_path.exists())
+
+
+@unittest.skipIf(shutil.which("php") is None, "php is not available")
+@unittest.skipIf(japanese_search_tokenizer is None, "sudachipy is not available")
+class PhpTokenizerFallbackTest(unittest.TestCase):
+    def run_php(self, socket_path: str) -> dict:
+        code = (
+            "require " + json.dumps(str(REPO_ROOT / "lib" / "japanese_search.php")) + ";"
+            " echo json_encode(japanese_search_run_tokenizer('document', '議会運営委員会'));"
+        )
+        env = {**os.environ, "MIYABE_TOKENIZER_SOCKET": socket_path, "MIYABE_PYTHON_BIN": sys.executable}
+        completed = subprocess.run(["php", "-r", code], env=env, capture_output=True, text=True, timeout=60, check=True)
+        return json.loads(completed.stdout)
+
+    def test_missing_socket_falls_back_to_cli(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            payload = self.run_php(str(Path(temp_dir) / "missing.sock"))
+        self.assertEqual(payload, japanese_search_tokenizer.tokenize_payload("document", "議会運営委員会"))
+
+
+if __name__ == "__main__":
+    unittest.main()
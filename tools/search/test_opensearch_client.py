@@ -0,0 +1,111 @@
+import gzip
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from tools.search.opensearch_client import OpenSearchClient, OpenSearchRequestError
+
+LINES = [b'{"index":{"_id":"1"}}', b'{"n":1}', b'{"index":{"_id":"2"}}', b'{"n":2}']
+REJECTED = {"status": 429, "error": {"type": "es_rejected_execution_exception"}}
+UNAVAILABLE = {"status": 503, "error": {"type": "unavailable_shards_exception"}}
+MAPPING_ERROR = {"status": 400, "error": {"type": "mapper_parsing_exception"}}
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or "0")
+        body = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.server.records.append((self.path, self.client_address[1], body))  # type: ignore[attr-defined]
+        if self.path.startswith("/missing"):
+            self._reply(404, {"error": "no such index"})
+            return
+        item_errors = self.server.item_errors  # type: ignore[attr-defined]
+        if item_errors:
+            # 用意したエラーを 1 回に 1 つずつ最後の action の応答として返す。
+            items = [{"index": {"status": 201}} for _line in body.splitlines()[2::2]] + [{"index": item_errors.pop(0)}]
+            self._reply(200, {"took": 3, "errors": True, "items": items})
+            return
+        self._reply(200, {"took": 2, "errors": False, "items": []})
+
+    def _reply(self, status: int, payload: dict) -> None:
+        raw = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class OpenSearchClientTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RecordingHandler)
+        self.server.records = []  # type: ignore[attr-defined]
+        self.server.item_errors = []  # type: ignore[attr-defined]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_bulk_lines_reuse_connection_and_gzip_body(self) -> None:
+        client = OpenSearchClient(self.url, compress=True)
+        lines = [b'{"index":{"_id":"1"}}', '{"content":"会議録"}'.encode("utf-8")]
+        try:
+            self.assertEqual(client.bulk_lines(lines, 1), 1)
+            self.assertEqual(client.bulk_lines(lines, 1), 1)
+        finally:
+            client.close()
+        records = self.server.records  # type: ignore[attr-defined]
+        self.assertEqual([record[2] for record in records], [b"\n".join(lines) + b"\n"] * 2)
+        self.assertEqual(records[0][1], records[1][1])
+
+    def test_plain_body_and_http_error(self) -> None:
+        client = OpenSearchClient(self.url)
+        try:
+            client.bulk_lines([b"{}", b"{}"], 1)
+            with self.assertRaises(OpenSearchRequestError) as raised:
+                client.request("POST", "/missing/_search", body={"query": {"match_all": {}}})
+            self.assertEqual(raised.exception.status, 404)
+        finally:
+            client.close()
+        self.assertEqual(self.server.records[0][2], b"{}\n{}\n")  # type: ignore[attr-defined]
+
+    def test_bulk_send_retries_only_rejected_actions(self) -> None:
+        self.server.item_errors = [REJECTED]  # type: ignore[attr-defined]
+        client = OpenSearchClient(self.url)
+        with mock.patch("tools.search.opensearch_client.time.sleep") as sleep:
+            outcome = client.bulk_send(LINES, 2)
+        client.close()
+        self.assertEqual((outcome.count, outcome.rejected, outcome.attempts, outcome.took_ms), (2, 1, 2, 5))
+        sleep.assert_called_once()
+        retried = self.server.records[1][2]  # type: ignore[attr-defined]
+        self.assertEqual(retried, b'{"index":{"_id":"2"}}\n{"n":2}\n')
+
+    def test_permanent_item_failure_is_returned_or_raised(self) -> None:
+        self.server.item_errors = [UNAVAILABLE, MAPPING_ERROR, MAPPING_ERROR]  # type: ignore[attr-defined]
+        client = OpenSearchClient(self.url)
+        try:
+            with mock.patch("tools.search.opensearch_client.time.sleep"):
+                outcome = client.bulk_send(LINES, 2, allow_item_failures=True)
+                self.assertEqual((outcome.retried, outcome.rejected), (1, 0))
+                self.assertEqual([action for action, _result in outcome.failed], [LINES[2:]])
+                self.assertEqual(outcome.failed[0][1]["status"], 400)
+                with self.assertRaises(RuntimeError):
+                    client.bulk_send(LINES, 2)
+        finally:
+            client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,11 @@
+import gzip
+import tempfile
+import types
 import unittest
+from pathlib import Path
+from unittest import mock
 
+from tools.reiki import reiki_io
 from tools.search import scraped_source_records
 
 
@@ -14,5 +20,64 @@ class ExtractHeldOnTest(unittest.TestCase):
         self.assertEqual((held_on, year, month, day), ("2026-02-24", 2026, 2, 24))
 
 
+class TermsManyTest(unittest.TestCase):
+    def test_short_fields_are_batched_and_long_fields_go_one_by_one(self) -> None:
+        batches: list[list[str]] = []
+        singles: list[str] = []
+
+        def document_terms_many(texts: list[str]) -> list[str]:
+            batches.append(list(texts))
+            return [f"short:{text}" for text in texts]
+
+        def document_terms_text(text: str) -> str:
+            singles.append(text)
+            return f"long:{len(text)}"
+
+        tokenizer = types.SimpleNamespace(
+            SHORT_FIELD_MAX_CHARS=10,
+            document_terms_many=document_terms_many,
+            document_terms_text=document_terms_text,
+        )
+        long_text = "本文" * 20
+        with mock.patch.object(scraped_source_records, "japanese_search_tokenizer", tokenizer):
+            terms = scraped_source_records.terms_many(["総務課", "", long_text, "防災"])
+
+        self.assertEqual(terms, ["short:総務課", "", "long:40", "short:防災"])
+        self.assertEqual(batches, [["総務課", "防災"]])
+        self.assertEqual(singles, [long_text])
+
+
+class ReikiManifestIndexTest(unittest.TestCase):
+    def test_segment_rows_override_legacy_array_and_finish_merges(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = Path(temp_dir) / "source_manifest.json.gz"
+            reiki_io.write_json(
+                manifest_path,
+                [{"source_file": "a.html", "title": "旧A"}, {"source_file": "b.html", "title": "旧B"}],
+                compress=True,
+            )
+            writer = reiki_io.ManifestWriter(manifest_path, flush_every=2)
+            for row in ({"source_file": "b.html", "title": "新B"}, {"source_file": "c.html", "title": "C"}):
+                writer.append(row)
+            writer.append({"source_file": "d.html", "title": "未 flush"})
+            # 途中停止で書きかけになった末尾 member は読み飛ばす。
+            torn = gzip.compress(b'{"source_file": "e.html"}\n')
+            with writer.segment_path.open("ab") as handle:
+                handle.write(torn[: len(torn) // 2])
+
+            index = scraped_source_records.load_reiki_manifest_index(manifest_path)
+            self.assertEqual(
+                {key: row["title"] for key, row in index.items()},
+                {"a": "旧A", "b": "新B", "c": "C"},
+            )
+
+            writer.finish()
+            self.assertFalse(writer.segment_path.exists())
+            self.assertEqual(
+                [row["source_file"] for row in reiki_io.load_manifest_rows(manifest_path)],
+                ["b.html", "c.html", "d.html"],
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.search import source_listing
+
+
+def age_tree(root: Path) -> None:
+    # racy window に掛からないよう、ディレクトリの mtime を過去へずらす。
+    old = 1_600_000_000_000_000_000
+    for directory in [root, *[path for path in root.rglob("*") if path.is_dir()]]:
+        os.utime(directory, ns=(old, old))
+
+
+class SourceListingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        source_listing.clear()
+        self.addCleanup(source_listing.clear)
+        self.addCleanup(source_listing.configure_persistent_cache, None)
+
+    def test_matches_sorted_rglob_and_sees_new_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in ["b/2.txt", "a/10.txt", "a/9.html", "a-b/1.txt", "top.txt.gz"]:
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text("x", encoding="utf-8")
+            expected = [path for path in sorted(root.rglob("*")) if path.is_file()]
+            self.assertEqual(source_listing.list_files(root), expected)
+
+            (root / "b" / "3.txt").write_text("x", encoding="utf-8")
+            self.assertIn(root / "b" / "3.txt", source_listing.list_files(root))
+            self.assertEqual(source_listing.list_files(root / "missing"), [])
+
+    def test_persisted_listing_rescans_only_changed_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as cache_dir:
+            root = Path(tmp)
+            for rel in ["2023/a.txt", "2024/b.txt"]:
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text("x", encoding="utf-8")
+            age_tree(root)
+            source_listing.configure_persistent_cache(cache_dir)
+            first = source_listing.list_files(root)
+
+            source_listing.clear()
+            with mock.patch.object(source_listing, "scan_directory", side_effect=AssertionError("rescanned")):
+                self.assertEqual(source_listing.list_files(root), first)
+
+            source_listing.clear()
+            (root / "2024" / "c.txt").write_text("x", encoding="utf-8")
+            scanned: list[Path] = []
+            original = source_listing.scan_directory
+
+            def record(path: Path):
+                scanned.append(path)
+                return original(path)
+
+            with mock.patch.object(source_listing, "scan_directory", side_effect=record):
+                listed = source_listing.list_files(root)
+            self.assertEqual(scanned, [root / "2024"])
+            self.assertIn(root / "2024" / "c.txt", listed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from tools.search import terms_cache
+
+
+class TermsCacheTest(unittest.TestCase):
+    def test_hit_requires_same_text_and_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "terms.sqlite"
+            cache = terms_cache.TermsCache(path, fingerprint="sudachi=1;mode=B")
+            cache.put("議会だより", "議会 だより")
+            cache.close()
+
+            reopened = terms_cache.TermsCache(path, fingerprint="sudachi=1;mode=B")
+            self.assertEqual(reopened.get("議会だより"), "議会 だより")
+            self.assertIsNone(reopened.get("議会"))
+            self.assertEqual((reopened.hits, reopened.misses), (1, 1))
+            reopened.close()
+
+            other_mode = terms_cache.TermsCache(path, fingerprint="sudachi=1;mode=C")
+            self.assertIsNone(other_mode.get("議会だより"))
+            other_mode.close()
+
+    def test_evict_drops_least_recently_used_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = terms_cache.TermsCache(Path(tmp) / "terms.sqlite", fingerprint="fp", max_bytes=400)
+            for index in range(6):
+                cache._pending_writes.append((cache.key_for(f"text{index}"), "x" * 36, 100, index))
+            cache.flush()
+
+            self.assertGreater(cache.evict(), 0)
+            self.assertIsNone(cache.get("text0"))
+            self.assertEqual(cache.get("text5"), "x" * 36)
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
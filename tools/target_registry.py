@@ -0,0 +1,150 @@
+"""会議録・例規集のスクレイピング対象一覧をプロセス内で使い回すレジストリ。
+
+iter_gijiroku_targets() / iter_reiki_targets() は、index 構築・backfill・優先度計算・
+Celery の slug 解決から 1 サイクルに何度も呼ばれる。毎回 TSV / CSV を読み直して slug を
+導出すると 1 回 0.2 秒前後かかるため、組み立てた全件をここで保持し、元ファイルの
+mtime とサイズが変わったときだけ作り直す。slug・自治体コード・ローマ字名での引き当ては
+別名の索引で O(1) にする。
+
+`MIYABE_TARGET_REGISTRY_CACHE=1` を指定すると、組み立て結果を
+work/cache/target_registry/ に pickle で保存し、次のプロセスでは元ファイルの
+mtime とサイズが一致する限りそれを読む（子スクレイパの起動ごとの読み込みを省く）。
+
+注意:
+- 返す target は呼び出しごとの浅いコピー。値は str / Path / bool だけなので、
+  呼び出し側が書き換えてもキャッシュは汚れない。
+- 元ファイルには target を組み立てるコード自体も含める。コードを更新したら保存済みの
+  snapshot は使われない。
+- pickle は読み込み時に任意のコードを実行できる。保存先には他人が書き込めない場所だけを指定する。
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+SNAPSHOT_VERSION = 1
+DEFAULT_CACHE_ROOT = Path(__file__).resolve().parents[1] / "work" / "cache" / "target_registry"
+
+_LOCK = threading.Lock()
+# kind -> (元ファイルの fingerprint, registry)
+_REGISTRIES: dict[str, tuple[tuple[Any, ...], "TargetRegistry"]] = {}
+
+
+def persistent_cache_enabled() -> bool:
+    return os.environ.get("MIYABE_TARGET_REGISTRY_CACHE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def cache_root() -> Path:
+    override = os.environ.get("MIYABE_TARGET_REGISTRY_CACHE_ROOT", "").strip()
+    return Path(override) if override else DEFAULT_CACHE_ROOT
+
+
+class TargetRegistry:
+    """組み立て済みの target 全件と、slug / 別名からの索引。"""
+
+    def __init__(self, targets: list[dict], aliases: Callable[[dict], Iterable[str]]) -> None:
+        self.targets = targets
+        self._by_slug: dict[str, int] = {}
+        self._by_alias: dict[str, list[int]] = {}
+        for position, target in enumerate(targets):
+            self._by_slug.setdefault(str(target.get("slug", "")).strip(), position)
+            for alias in aliases(target):
+                if alias:
+                    self._by_alias.setdefault(alias, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def all(self) -> list[dict]:
+        return [dict(target) for target in self.targets]
+
+    def get(self, slug: str) -> dict | None:
+        """canonical slug が完全一致する target。"""
+        position = self._by_slug.get(str(slug).strip())
+        return dict(self.targets[position]) if position is not None else None
+
+    def lookup(self, name: str) -> list[dict]:
+        """aliases が返す名前（slug・自治体コード・ローマ字名など）が一致する target を、一覧と同じ順で返す。"""
+        return [dict(self.targets[position]) for position in self._by_alias.get(str(name).strip(), [])]
+
+
+def source_fingerprint(sources: Iterable[Path], extra: tuple[Any, ...] = ()) -> tuple[Any, ...]:
+    entries: list[Any] = []
+    for path in sources:
+        try:
+            stat = Path(path).stat()
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            entries.append((str(path), None, None))
+    return (SNAPSHOT_VERSION, tuple(entries), tuple(extra))
+
+
+def snapshot_path(kind: str) -> Path:
+    return cache_root() / f"{kind}.pickle"
+
+
+def load_snapshot(kind: str, fingerprint: tuple[Any, ...]) -> list[dict] | None:
+    try:
+        with snapshot_path(kind).open("rb") as handle:
+            loaded = pickle.load(handle)
+    except Exception:
+        return None
+    if not isinstance(loaded, dict) or loaded.get("fingerprint") != fingerprint:
+        return None
+    targets = loaded.get("targets")
+    return targets if isinstance(targets, list) else None
+
+
+def save_snapshot(kind: str, fingerprint: tuple[Any, ...], targets: list[dict]) -> None:
+    path = snapshot_path(kind)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with temp_path.open("wb") as handle:
+            pickle.dump({"fingerprint": fingerprint, "targets": targets}, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError as exc:
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        print(f"[WARN] target registry snapshot write failed kind={kind}: {exc}", file=sys.stderr, flush=True)
+
+
+def load_registry(
+    kind: str,
+    sources: Iterable[Path],
+    build: Callable[[], list[dict]],
+    aliases: Callable[[dict], Iterable[str]],
+    *,
+    extra: tuple[Any, ...] = (),
+) -> TargetRegistry:
+    """元ファイルが前回から変わっていなければ、組み立て済みの registry をそのまま返す。"""
+    fingerprint = source_fingerprint(sources, extra)
+    with _LOCK:
+        cached = _REGISTRIES.get(kind)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    persist = persistent_cache_enabled()
+    targets = load_snapshot(kind, fingerprint) if persist else None
+    if targets is None:
+        targets = build()
+        if persist:
+            save_snapshot(kind, fingerprint, targets)
+    registry = TargetRegistry(targets, aliases)
+    with _LOCK:
+        _REGISTRIES[kind] = (fingerprint, registry)
+    return registry
+
+
+def clear() -> None:
+    """プロセス内の registry を捨てる（テスト用）。"""
+    with _LOCK:
+        _REGISTRIES.clear()
@@ -4,11 +4,12 @@ from __future__ import annotations
 # 既存の data/work を走査し、スクレイピング進捗用の background_tasks JSON を後追い生成する。
 
 import argparse
-import gzip
-import json
+import multiprocessing
+import os
 import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -25,8 +26,7 @@ sys.path.append(str(TOOLS_DIR / "reiki"))
 
 from tools.tasks import status as batch_status
 import freshness_metadata
-import gijiroku_planning
-import gijiroku_storage
+import gijiroku_index_summary
 import gijiroku_targets
 import reiki_io
 import reiki_targets
@@ -56,7 +56,6 @@ def configure_roots(
 
 JSON_TASKS = {"gijiroku", "reiki"}
 HTML_SUFFIXES = {".html", ".htm"}
-MINUTES_SUFFIXES = {".txt", ".html", ".htm"}
 STOP_RETURN_CODES = {-15, -2, 130, 143}
 
 
@@ -88,44 +87,11 @@ def load_json_array_count(path: Path) -> int:
     candidate = file_or_gzip_path(path)
     if candidate is None:
         return 0
+    # 数千件の manifest を list に展開せず、要素を 1 つずつ数える。
     try:
-        raw = candidate.read_bytes()
-        if candidate.suffix.lower() == ".gz":
-            raw = gzip.decompress(raw)
-        loaded = json.loads(raw.decode("utf-8"))
+        return sum(1 for _ in gijiroku_index_summary.iter_json_array(candidate))
     except Exception:
         return 0
-    return len(loaded) if isinstance(loaded, list) else 0
-
-
-def load_gijiroku_index_unique_count(path: Path) -> int:
-    loaded = load_gijiroku_index_rows(path)
-    if not loaded:
-        return 0
-    seen: set[str] = set()
-    for row in loaded:
-        url = str(row.get("url") or "").strip()
-        if url:
-            seen.add("url:" + url)
-        else:
-            seen.add("row:" + gijiroku_storage.item_signature(row))
-    return len(seen)
-
-
-def load_gijiroku_index_rows(path: Path) -> list[dict[str, Any]]:
-    candidate = file_or_gzip_path(path)
-    if candidate is None:
-        return []
-    try:
-        raw = candidate.read_bytes()
-        if candidate.suffix.lower() == ".gz":
-            raw = gzip.decompress(raw)
-        loaded = json.loads(raw.decode("utf-8"))
-    except Exception:
-        return []
-    if not isinstance(loaded, list):
-        return []
-    return [row for row in loaded if isinstance(row, dict)]
 
 
 def latest_mtime(paths: list[Path]) -> float | None:
@@ -139,67 +105,6 @@ def latest_mtime(paths: list[Path]) -> float | None:
     return max(mtimes) if mtimes else None
 
 
-def gijiroku_download_stems(downloads_dir: Path) -> set[str]:
-    stems: set[str] = set()
-    if not downloads_dir.exists():
-        return stems
-    for file_path in downloads_dir.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if gijiroku_storage.logical_suffix(file_path) not in MINUTES_SUFFIXES:
-            continue
-        stems.add(gijiroku_storage.source_key(file_path, downloads_dir))
-    return stems
-
-
-def count_gijiroku_downloads(downloads_dir: Path) -> int:
-    return len(gijiroku_download_stems(downloads_dir))
-
-
-def sanitize_gijiroku_filename(text: str, fallback: str) -> str:
-    return gijiroku_planning.sanitize_filename(text, fallback)
-
-
-def gijiroku_index_output_stem(row: dict[str, Any]) -> str:
-    year_dir = sanitize_gijiroku_filename(str(row.get("year_label") or "unknown").strip(), "unknown")
-    group = str(row.get("meeting_group") or "").strip()
-    group_dir = sanitize_gijiroku_filename(group, "meeting") if group else ""
-    stem = sanitize_gijiroku_filename(str(row.get("title") or ""), "meeting")
-    return "/".join(part for part in [year_dir, group_dir, stem] if part)
-
-
-def indexed_gijiroku_item_key(row: dict[str, Any]) -> str:
-    url = str(row.get("url") or "").strip()
-    return "url:" + url if url else "row:" + gijiroku_storage.item_signature(row)
-
-
-def count_gijiroku_indexed_downloads(index_json_path: Path, downloads_dir: Path) -> int:
-    rows = load_gijiroku_index_rows(index_json_path)
-    if not rows or not downloads_dir.exists():
-        return 0
-    existing_stems = gijiroku_download_stems(downloads_dir)
-    seen_items: set[str] = set()
-    seen_output_stems: dict[str, int] = {}
-    downloaded = 0
-    for row in rows:
-        item_key = indexed_gijiroku_item_key(row)
-        if item_key in seen_items:
-            continue
-        seen_items.add(item_key)
-        rel_stem = gijiroku_index_output_stem(row)
-        occurrence_index = seen_output_stems.get(rel_stem, 0)
-        seen_output_stems[rel_stem] = occurrence_index + 1
-        if occurrence_index > 0:
-            rel_stem = gijiroku_storage.disambiguated_stem(
-                rel_stem,
-                gijiroku_storage.item_signature(row),
-                occurrence_index,
-            )
-        if rel_stem in existing_stems:
-            downloaded += 1
-    return downloaded
-
-
 def count_reiki_html_files(root: Path) -> int:
     if not root.exists():
         return 0
@@ -267,112 +172,164 @@ def previous_failed_items(task_name: str) -> dict[str, dict[str, Any]]:
 
 
 # 会議録は index JSON / ダウンロード済み本文から snapshot を復元する。
-def gijiroku_snapshot_items(*, fast: bool = False) -> dict[str, dict[str, Any]]:
-    items: dict[str, dict[str, Any]] = {}
-    for target in gijiroku_targets.iter_gijiroku_targets():
-        downloads_dir = Path(target["downloads_dir"])
-        index_json_path = Path(target["index_json_path"])
-
-        indexed_total_count = load_gijiroku_index_unique_count(index_json_path)
-        if fast:
-            downloaded_count = 0
-        elif indexed_total_count > 0:
-            downloaded_count = count_gijiroku_indexed_downloads(index_json_path, downloads_dir)
-        else:
-            downloaded_count = count_gijiroku_downloads(downloads_dir)
-        total_count = max(indexed_total_count, downloaded_count)
-        current_count = downloaded_count
-        if total_count <= 0:
-            continue
+def gijiroku_snapshot_item(target: dict[str, Any], *, fast: bool = False) -> dict[str, Any] | None:
+    downloads_dir = Path(target["downloads_dir"])
+    index_json_path = Path(target["index_json_path"])
+
+    summary = gijiroku_index_summary.summarize(index_json_path, downloads_dir, count_downloads=not fast)
+    indexed_total_count = summary.unique_count
+    if fast:
+        downloaded_count = 0
+    elif indexed_total_count > 0:
+        downloaded_count = summary.indexed_downloaded_count
+    else:
+        downloaded_count = summary.download_count
+    total_count = max(indexed_total_count, downloaded_count)
+    current_count = downloaded_count
+    if total_count <= 0:
+        return None
 
-        updated_at = format_timestamp(latest_mtime([downloads_dir, file_or_gzip_path(index_json_path) or index_json_path]))
-        source_url = str(target.get("source_url", "")).strip()
-        host = (urlsplit(source_url).hostname or "").strip().lower()
-        freshness = freshness_metadata.gijiroku_target_freshness(target)
-        freshness["last_checked_at"] = freshness_metadata.existing_last_checked_at("gijiroku", str(target["slug"]))
-        items[str(target["slug"])] = {
-            "slug": str(target["slug"]),
-            "code": str(target.get("code", "")).strip(),
-            "name": str(target.get("name", "")).strip(),
-            "full_name": str(target.get("full_name", "")).strip(),
-            "system_type": str(target.get("system_type", "")).strip(),
-            "host": host,
-            "source_url": source_url,
-            "status": "snapshot",
-            "message": "既存データから復元",
-            "started_at": "",
-            "finished_at": "",
-            "updated_at": updated_at,
-            "returncode": 0,
-            "pid": None,
-            "progress_current": current_count,
-            "progress_total": total_count,
-            "progress_unit": "meeting",
-            "freshness_date": freshness["freshness_date"],
-            "freshness_basis": freshness["freshness_basis"],
-            "last_checked_at": freshness["last_checked_at"],
-        }
-    return items
+    updated_at = format_timestamp(latest_mtime([downloads_dir, file_or_gzip_path(index_json_path) or index_json_path]))
+    source_url = str(target.get("source_url", "")).strip()
+    host = (urlsplit(source_url).hostname or "").strip().lower()
+    freshness = freshness_metadata.gijiroku_target_freshness(target)
+    freshness["last_checked_at"] = freshness_metadata.existing_last_checked_at("gijiroku", str(target["slug"]))
+    return {
+        "slug": str(target["slug"]),
+        "code": str(target.get("code", "")).strip(),
+        "name": str(target.get("name", "")).strip(),
+        "full_name": str(target.get("full_name", "")).strip(),
+        "system_type": str(target.get("system_type", "")).strip(),
+        "host": host,
+        "source_url": source_url,
+        "status": "snapshot",
+        "message": "既存データから復元",
+        "started_at": "",
+        "finished_at": "",
+        "updated_at": updated_at,
+        "returncode": 0,
+        "pid": None,
+        "progress_current": current_count,
+        "progress_total": total_count,
+        "progress_unit": "meeting",
+        "freshness_date": freshness["freshness_date"],
+        "freshness_basis": freshness["freshness_basis"],
+        "last_checked_at": freshness["last_checked_at"],
+    }
 
 
 # 例規集は manifest / source / clean HTML から snapshot を復元する。
-def reiki_snapshot_items(*, fast: bool = False) -> dict[str, dict[str, Any]]:
-    items: dict[str, dict[str, Any]] = {}
-    for target in reiki_targets.iter_reiki_targets():
-        work_root = Path(target["work_root"])
-        manifest_path = work_root / "source_manifest.json"
-        source_dir = Path(target["source_dir"])
-        html_dir = Path(target["html_dir"])
-
-        manifest_count = load_json_array_count(manifest_path)
-        source_count = 0 if fast else count_reiki_html_files(source_dir)
-        clean_html_count = 0 if fast else count_reiki_html_files(html_dir)
-        current_count = max(source_count, clean_html_count)
-        total_count = manifest_count if manifest_count > 0 else current_count
-        total_count = max(total_count, current_count)
-        if total_count <= 0:
-            continue
+def reiki_snapshot_item(target: dict[str, Any], *, fast: bool = False) -> dict[str, Any] | None:
+    work_root = Path(target["work_root"])
+    manifest_path = work_root / "source_manifest.json"
+    source_dir = Path(target["source_dir"])
+    html_dir = Path(target["html_dir"])
+
+    manifest_count = load_json_array_count(manifest_path)
+    source_count = 0 if fast else count_reiki_html_files(source_dir)
+    clean_html_count = 0 if fast else count_reiki_html_files(html_dir)
+    current_count = max(source_count, clean_html_count)
+    total_count = manifest_count if manifest_count > 0 else current_count
+    total_count = max(total_count, current_count)
+    if total_count <= 0:
+        return None
+
+    updated_at = format_timestamp(
+        latest_mtime([work_root, file_or_gzip_path(manifest_path) or manifest_path, source_dir, html_dir])
+    )
+    source_url = str(target.get("source_url", "")).strip()
+    host = (urlsplit(source_url).hostname or "").strip().lower()
+    freshness = freshness_metadata.reiki_target_freshness(target)
+    freshness["last_checked_at"] = freshness_metadata.existing_last_checked_at("reiki", str(target["slug"]))
+    return {
+        "slug": str(target["slug"]),
+        "code": str(target.get("code", "")).strip(),
+        "name": str(target.get("name", "")).strip(),
+        "full_name": str(target.get("full_name", "")).strip(),
+        "system_type": str(target.get("system_type", "")).strip(),
+        "host": host,
+        "source_url": source_url,
+        "status": "snapshot",
+        "message": "既存データから復元",
+        "started_at": "",
+        "finished_at": "",
+        "updated_at": updated_at,
+        "returncode": 0,
+        "pid": None,
+        "progress_current": current_count,
+        "progress_total": total_count,
+        "progress_unit": "ordinance",
+        "freshness_date": freshness["freshness_date"],
+        "freshness_basis": freshness["freshness_basis"],
+        "last_checked_at": freshness["last_checked_at"],
+    }
+
+
+def snapshot_item(task_name: str, target: dict[str, Any], fast: bool) -> dict[str, Any] | None:
+    if task_name == "gijiroku":
+        return gijiroku_snapshot_item(target, fast=fast)
+    if task_name == "reiki":
+        return reiki_snapshot_item(target, fast=fast)
+    raise ValueError(f"Unsupported task: {task_name}")
+
+
+def init_snapshot_worker(workspace_root: str, data_root: str, work_root: str) -> None:
+    configure_roots(workspace_root=Path(workspace_root), data_root=Path(data_root), work_root=Path(work_root))
+
 
-        updated_at = format_timestamp(
-            latest_mtime([work_root, file_or_gzip_path(manifest_path) or manifest_path, source_dir, html_dir])
-        )
-        source_url = str(target.get("source_url", "")).strip()
-        host = (urlsplit(source_url).hostname or "").strip().lower()
-        freshness = freshness_metadata.reiki_target_freshness(target)
-        freshness["last_checked_at"] = freshness_metadata.existing_last_checked_at("reiki", str(target["slug"]))
-        items[str(target["slug"])] = {
-            "slug": str(target["slug"]),
-            "code": str(target.get("code", "")).strip(),
-            "name": str(target.get("name", "")).strip(),
-            "full_name": str(target.get("full_name", "")).strip(),
-            "system_type": str(target.get("system_type", "")).strip(),
-            "host": host,
-            "source_url": source_url,
-            "status": "snapshot",
-            "message": "既存データから復元",
-            "started_at": "",
-            "finished_at": "",
-            "updated_at": updated_at,
-            "returncode": 0,
-            "pid": None,
-            "progress_current": current_count,
-            "progress_total": total_count,
-            "progress_unit": "ordinance",
-            "freshness_date": freshness["freshness_date"],
-            "freshness_basis": freshness["freshness_basis"],
-            "last_checked_at": freshness["last_checked_at"],
-        }
-    return items
-
-
-def write_snapshot(task_name: str, *, fast: bool = False) -> tuple[Path, Path, int, int]:
+def default_jobs() -> int:
+    configured = os.environ.get("MIYABE_BACKFILL_JOBS", "").strip()
+    if configured:
+        return max(1, int(configured))
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def snapshot_items(task_name: str, *, fast: bool = False, jobs: int = 1) -> dict[str, dict[str, Any]]:
+    """自治体ごとの集計を jobs 個の process に分ける。結果は対象一覧と同じ順に並べる。
+
+    集計は index の展開と downloads の走査が大半で、GIL を手放さない json のデコードも
+    含むため thread ではなく process に分ける。"""
     if task_name == "gijiroku":
-        items = gijiroku_snapshot_items(fast=fast)
+        targets = gijiroku_targets.iter_gijiroku_targets()
     elif task_name == "reiki":
-        items = reiki_snapshot_items(fast=fast)
+        targets = reiki_targets.iter_reiki_targets()
     else:
         raise ValueError(f"Unsupported task: {task_name}")
 
+    workers = min(max(1, int(jobs)), len(targets))
+    if workers <= 1:
+        results = [snapshot_item(task_name, target, fast) for target in targets]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_snapshot_worker,
+            initargs=(str(WORKSPACE_ROOT), str(DATA_ROOT), str(WORK_ROOT)),
+        ) as executor:
+            chunksize = max(1, len(targets) // (workers * 8))
+            results = list(
+                executor.map(
+                    snapshot_item,
+                    [task_name] * len(targets),
+                    targets,
+                    [fast] * len(targets),
+                    chunksize=chunksize,
+                )
+            )
+    return {str(item["slug"]): item for item in results if item is not None}
+
+
+def gijiroku_snapshot_items(*, fast: bool = False, jobs: int = 1) -> dict[str, dict[str, Any]]:
+    return snapshot_items("gijiroku", fast=fast, jobs=jobs)
+
+
+def reiki_snapshot_items(*, fast: bool = False, jobs: int = 1) -> dict[str, dict[str, Any]]:
+    return snapshot_items("reiki", fast=fast, jobs=jobs)
+
+
+def write_snapshot(task_name: str, *, fast: bool = False, jobs: int = 1) -> tuple[Path, Path, int, int]:
+    items = snapshot_items(task_name, fast=fast, jobs=jobs)
+
     snapshot_state = build_snapshot_state(task_name, items)
     main_items = dict(items)
     main_items.update(previous_failed_items(task_name))
@@ -420,6 +377,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="ダウンロード済み本文やHTMLの再帰走査を省き、manifest から高速に復元します。",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="自治体ごとの集計を並列化する process 数。既定は MIYABE_BACKFILL_JOBS、未指定なら CPU 数（最大 8）。",
+    )
     parser.add_argument(
         "--data-root",
         help="gijiroku/reiki の実データ root。既定は <workspace-root>/data です。",
@@ -469,6 +432,7 @@ def main() -> int:
         data_root=data_root,
         work_root=work_root,
     )
+    jobs = args.jobs if args.jobs is not None else default_jobs()
     try:
         tasks = parse_tasks(args.tasks)
     except ValueError as exc:
@@ -487,7 +451,7 @@ def main() -> int:
             )
             return 3
 
-        main_path, snapshot_path, main_count, snapshot_count = write_snapshot(task_name, fast=args.fast)
+        main_path, snapshot_path, main_count, snapshot_count = write_snapshot(task_name, fast=args.fast, jobs=jobs)
         print(f"[DONE] {task_name}: {main_count} items -> {main_path}", flush=True)
         print(f"[DONE] {task_name}_snapshot: {snapshot_count} items -> {snapshot_path}", flush=True)
     batch_status.invalidate_runtime_caches(include_homepage_payload=True)
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import argparse
 import csv
+import os
 import re
 import shlex
 import subprocess
@@ -24,6 +25,7 @@ from tools.tasks import backfill as task_backfill
 from tools.tasks import priority as scraping_priority
 from tools.tasks import status as batch_status
 from tools.tasks.runner import (
+    ChildEventWaiter,
     PriorityTargetQueue,
     close_worker_streams,
     count_active_by_host,
@@ -51,6 +53,13 @@ INDEX_DONE_RE = re.compile(r"^\[DONE\]\s+.*\bcount=(?P<count>\d+)\b")
 
 # index 更新の build lock をこの秒数まで待ち、取れなければスキップして次回に回す。
 INDEX_LOCK_WAIT_SECONDS = 600.0
+# build lock 待ちの index 更新を起動し直す間隔。
+INDEX_LOCK_RETRY_SECONDS = 1.0
+# scrape_state.json の書き込みごとに state を書き直すと、40 並列では書き込みが詰まるため、
+# 進捗だけの書き直しはこの間隔にまとめる。
+PROGRESS_WRITE_MIN_SECONDS = 0.5
+# 起こすべき期限が何も無いときでも、この秒数ごとにはループを一周させる保険。
+SUPERVISOR_MAX_WAIT_SECONDS = 60.0
 
 
 @dataclass(frozen=True)
@@ -142,6 +151,14 @@ def add_common_arguments(parser: argparse.ArgumentParser) -> None:
         default="inline",
         help="OpenSearch 増分更新の実行方法。remote では celery でスクレイピングと分離する。",
     )
+    parser.add_argument(
+        "--index-worker-socket",
+        default=os.environ.get("MIYABE_INDEX_WORKER_SOCKET", ""),
+        help=(
+            "inline の増分更新を tools/search/index_worker.py serve の常駐 worker へ渡す Unix socket。"
+            "空なら毎回 build_opensearch_index.py を起動する（worker に繋がらない場合も同じ）。"
+        ),
+    )
     parser.add_argument(
         "--list-targets",
         action="store_true",
@@ -178,10 +195,12 @@ def extract_worker_progress_for_display(spec: BatchSpec, worker: dict) -> dict[s
 
 def remove_stale_scrape_state(state_path: Path) -> None:
     """前回実行の scrape_state.json が今回の進捗として読まれないようにする。"""
-    try:
-        state_path.unlink(missing_ok=True)
-    except Exception:
-        pass
+    # 隣の journal（scrape_state.journal.ndjson）も消す。残っても journal_id が合わず読まれないが、溜めない。
+    for path in (state_path, state_path.with_name(state_path.stem + ".journal.ndjson")):
+        try:
+            path.unlink(missing_ok=True)
+        except Exception:
+            pass
 
 
 def preserve_previous_failed_items(status_state: dict, task_name: str) -> None:
@@ -321,17 +340,23 @@ def launch_worker(
 # 自治体 1 件分の OpenSearch index 更新コマンドを作る。
 def build_index_command(spec: BatchSpec, args: argparse.Namespace, target: dict) -> list[str]:
     cmd = shlex.split(str(args.python_command))
-    cmd.extend(
-        [
-            str(Path("tools") / "search" / "build_opensearch_index.py"),
-            "--mode",
-            "update",
-            "--doc-type",
-            spec.index_doc_type,
-            "--slug",
-            str(target["slug"]),
-        ]
-    )
+    index_args = [
+        "--mode",
+        "update",
+        "--doc-type",
+        spec.index_doc_type,
+        "--slug",
+        str(target["slug"]),
+    ]
+    worker_socket = str(getattr(args, "index_worker_socket", "") or "").strip()
+    if worker_socket:
+        # 常駐 worker が読み込み済みの辞書・import を使い回す。ログと終了コードは直接起動と同じ。
+        cmd.extend(
+            [str(Path("tools") / "search" / "index_worker.py"), "run", "--socket", worker_socket, "--", *index_args]
+        )
+        return cmd
+    cmd.append(str(Path("tools") / "search" / "build_opensearch_index.py"))
+    cmd.extend(index_args)
     return cmd
 
 
@@ -805,7 +830,9 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
         batch_status.register_target(status_state, target, target_host(target))
     preserve_previous_failed_items(status_state, spec.task_name)
 
-    with summary_path.open("w", encoding="utf-8", newline="") as handle:
+    with summary_path.open("w", encoding="utf-8", newline="") as handle, ChildEventWaiter() as waiter:
+        # 停止シグナルで待機中の waiter を起こし、子プロセスの終了処理へすぐ入る。
+        stop_controller.add_listener(waiter.wake)
         writer = csv.DictWriter(handle, fieldnames=SUMMARY_FIELDNAMES)
         writer.writeheader()
 
@@ -817,6 +844,9 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
         completed_count = 0
         launched_count = 0
         last_status_at = 0.0
+        last_progress_write_at = 0.0
+        progress_dirty = False
+        changed_state_paths: set[Path] = set()
         host_last_start_at: dict[str, float] = {}
         shutdown_started = False
 
@@ -1029,6 +1059,8 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
                 if returncode is None:
                     still_running.append(worker)
                     continue
+                waiter.unwatch_process(worker["process"])
+                waiter.unwatch_file(worker["state_path"])
                 close_worker_streams(worker)
                 completed_workers.append((worker, int(returncode)))
             active_workers = still_running
@@ -1040,6 +1072,7 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
                 if returncode is None:
                     still_index_running.append(worker)
                     continue
+                waiter.unwatch_process(worker["process"])
                 close_index_worker(worker)
                 completed_index_workers.append((worker, int(returncode)))
             active_index_workers = still_index_running
@@ -1109,6 +1142,8 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
                     continue
 
                 active_workers.append(worker)
+                waiter.watch_process(worker["process"])
+                waiter.watch_file(worker["state_path"])
                 host_active_counts[host] = host_active_counts.get(host, 0) + 1
                 host_last_start_at[host] = time.time()
                 made_progress = True
@@ -1197,6 +1232,7 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
                     break
 
                 active_index_workers.append(launched_worker)
+                waiter.watch_process(launched_worker["process"])
                 made_progress = True
                 status_state["index_started_at"] = batch_status.now_text()
                 batch_status.update_item(
@@ -1218,10 +1254,26 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
                     flush=True,
                 )
 
+            # scrape_state.json が書き換わった worker だけ、進捗を state へ反映する。
+            if changed_state_paths:
+                for worker in active_workers:
+                    if worker["state_path"] not in changed_state_paths:
+                        continue
+                    progress = extract_worker_progress_for_display(spec, worker)
+                    if progress is not None:
+                        batch_status.update_item(status_state, str(worker["target"]["slug"]), **progress)
+                        progress_dirty = True
+                changed_state_paths = set()
+
             now = time.time()
-            if (active_workers or active_index_workers) and (
+            heartbeat_due = (active_workers or active_index_workers) and (
                 last_status_at == 0.0 or now - last_status_at >= args.refresh_seconds
-            ):
+            )
+            if progress_dirty and not heartbeat_due and now - last_progress_write_at >= PROGRESS_WRITE_MIN_SECONDS:
+                write_status_state()
+                last_progress_write_at = now
+                progress_dirty = False
+            if heartbeat_due:
                 refresh_active_worker_heartbeats(
                     spec,
                     status_state,
@@ -1238,10 +1290,28 @@ def run_batch(spec: BatchSpec, args: argparse.Namespace, targets: list[dict]) ->
                     len(targets),
                 )
                 last_status_at = now
+                last_progress_write_at = now
+                progress_dirty = False
 
             if pending_targets or active_workers or pending_index_workers or active_index_workers:
                 if not made_progress:
-                    time.sleep(1.0)
+                    # 子プロセス終了・scrape_state.json 書き込み・停止シグナルのどれかで起きる。
+                    # 時間で起きる必要があるのは heartbeat・起動間隔・build lock 再試行だけ。
+                    deadlines: list[float] = []
+                    if active_workers or active_index_workers:
+                        deadlines.append(last_status_at + args.refresh_seconds)
+                    if progress_dirty:
+                        deadlines.append(last_progress_write_at + PROGRESS_WRITE_MIN_SECONDS)
+                    if pending_targets and len(active_workers) < args.parallel:
+                        deadlines.extend(
+                            started_at + args.per_host_start_interval
+                            for started_at in host_last_start_at.values()
+                            if started_at + args.per_host_start_interval > now
+                        )
+                    if pending_index_workers and len(active_index_workers) < args.index_parallel:
+                        deadlines.append(now + INDEX_LOCK_RETRY_SECONDS)
+                    wait_seconds = min([*deadlines, now + SUPERVISOR_MAX_WAIT_SECONDS]) - now
+                    _exited_pids, changed_state_paths = waiter.wait(max(0.0, wait_seconds))
 
         for worker in active_workers:
             close_worker_streams(worker)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""PriorityTargetQueue.pop_runnable のマイクロベンチマーク。
+
+1,800 自治体相当の合成 target（dbsr・kaigiroku.net のような大口ホストに偏らせたもの）を、
+--parallel / --per-host-parallel の制限つきで全件起動し終えるまでの pop_runnable の時間を測る。
+比較用に、全件を 1 つの heap に積んで詰まった先頭を掘り返す従来方式も同じ手順で流す。
+
+    python -m tools.tasks.bench_priority_queue [--targets 1800] [--parallel 40] [--per-host-parallel 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import time
+
+from tools.tasks.runner import PriorityTargetQueue, target_host
+
+
+# 比較用の従来実装: 1 つの heap から、起動できる target が出るまで全部取り出して戻す。
+class FlatPriorityTargetQueue:
+    def __init__(self, targets: list[dict], key_func) -> None:
+        self._heap = [(key_func(target), sequence, target) for sequence, target in enumerate(targets)]
+        heapq.heapify(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def pop_runnable(self, can_launch) -> dict | None:
+        blocked = []
+        try:
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                if can_launch(entry[2]):
+                    return entry[2]
+                blocked.append(entry)
+            return None
+        finally:
+            for entry in blocked:
+                heapq.heappush(self._heap, entry)
+
+
+# 大口ホスト数個と、自治体ごとの独自ホストが混ざった target 一覧を作る。
+def synthetic_targets(count: int, *, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    shared_hosts = [
+        ("ssp.kaigiroku.net", 0.22),
+        ("www.city.dbsr.jp", 0.12),
+        ("www.gijiroku.com", 0.10),
+        ("kensakusystem.jp", 0.08),
+        ("msearch.gijiroku.com", 0.05),
+    ]
+    targets: list[dict] = []
+    for index in range(count):
+        draw = rng.random()
+        host = f"www.city{index}.lg.jp"
+        for shared_host, share in shared_hosts:
+            if draw < share:
+                host = shared_host
+                break
+            draw -= share
+        targets.append(
+            {
+                "slug": f"m{index:04d}",
+                "source_url": f"https://{host}/tenant/{index}/",
+                "priority_score": rng.randint(1, 1_000_000),
+            }
+        )
+    return targets
+
+
+# 完了した worker の枠へ次の target を詰める、run_batch の起動ループと同じ手順で全件流す。
+def drain(queue, *, parallel: int, per_host_parallel: int, seed: int = 2) -> tuple[float, int]:
+    rng = random.Random(seed)
+    active: list[str] = []
+    active_by_host: dict[str, int] = {}
+    elapsed = 0.0
+    launched = 0
+
+    def can_launch(target: dict) -> bool:
+        return active_by_host.get(target_host(target), 0) < per_host_parallel
+
+    while queue or active:
+        started = time.perf_counter()
+        while len(active) < parallel:
+            target = queue.pop_runnable(can_launch)
+            if target is None:
+                break
+            host = target_host(target)
+            active.append(host)
+            active_by_host[host] = active_by_host.get(host, 0) + 1
+            launched += 1
+        elapsed += time.perf_counter() - started
+        if active:
+            finished = active.pop(rng.randrange(len(active)))
+            active_by_host[finished] -= 1
+    return elapsed, launched
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=1800)
+    parser.add_argument("--parallel", type=int, default=40)
+    parser.add_argument("--per-host-parallel", type=int, default=1)
+    args = parser.parse_args()
+
+    targets = synthetic_targets(args.targets)
+
+    def priority_key(target: dict) -> tuple[int, str]:
+        return -int(target["priority_score"]), str(target["slug"])
+
+    hosts = len({target_host(target) for target in targets})
+    print(f"[INFO] targets={len(targets)} hosts={hosts} parallel={args.parallel} per_host={args.per_host_parallel}")
+    for label, queue_class in (("flat", FlatPriorityTargetQueue), ("per_host", PriorityTargetQueue)):
+        elapsed, launched = drain(
+            queue_class(targets, priority_key),
+            parallel=args.parallel,
+            per_host_parallel=args.per_host_parallel,
+        )
+        print(f"[BENCH] queue={label} launched={launched} pop_seconds={elapsed:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
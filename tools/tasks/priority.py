@@ -10,12 +10,17 @@
 from __future__ import annotations
 
 import json
+import sys
 from collections.abc import Callable
 from datetime import timedelta
 from pathlib import Path
 from typing import Any
 
+TOOLS_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(TOOLS_DIR))
+
 import freshness_metadata
+from tools.tasks import status as batch_status
 
 
 # priority_score が大きいほど先に実行し、0 は今回のキューに載せない。
@@ -24,17 +29,11 @@ _TASK_STATUS_CACHE: dict[str, dict[str, Any]] = {}
 ProgressReader = Callable[[dict[str, Any]], tuple[int, int]]
 
 
-# background_tasks JSON を読み、同じプロセス内ではキャッシュして使い回す。
+# background_tasks JSON を journal 込みで読み、同じプロセス内ではキャッシュして使い回す。
 def task_status(task_name: str) -> dict[str, Any]:
     if task_name in _TASK_STATUS_CACHE:
         return _TASK_STATUS_CACHE[task_name]
-    path = Path(__file__).resolve().parents[2] / "data" / "background_tasks" / f"{task_name}.json"
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        payload = {}
-    if not isinstance(payload, dict):
-        payload = {}
+    payload = batch_status.read_state(task_name)
     _TASK_STATUS_CACHE[task_name] = payload
     return payload
 
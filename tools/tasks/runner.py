@@ -7,12 +7,17 @@
 
 from __future__ import annotations
 
+import ctypes
+import ctypes.util
 import json
 import heapq
 import os
 import re
+import selectors
 import signal
+import struct
 import subprocess
+import sys
 import time
 from pathlib import Path
 from urllib.parse import urlsplit
@@ -176,11 +181,22 @@ class StopController:
     def __init__(self) -> None:
         self.requested = False
         self.signum: int | None = None
+        self._listeners: list = []
+
+    # 停止要求時に呼ぶ関数を登録する（待機中のメインループを起こすため）。
+    # シグナルハンドラから呼ばれるので、listener は非ブロッキングで済むものに限る。
+    def add_listener(self, listener) -> None:
+        self._listeners.append(listener)
 
     # シグナルハンドラから停止要求を記録する。
     def request(self, signum: int) -> None:
         self.requested = True
         self.signum = signum
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception:
+                pass
 
     # メインループが新規起動を止めるべきかを返す。
     def should_stop(self) -> bool:
@@ -365,49 +381,263 @@ def count_active_by_host(active_workers: list[dict]) -> dict[str, int]:
         counts[host] = counts.get(host, 0) + 1
     return counts
 
-# ひとつの優先度付きキューから、実行可能な自治体を先頭順に取り出す。
-# 同一ホスト制限などで今だけ起動できないものは一時退避し、順序を保って戻す。
+# 優先度付きキューから、実行可能な自治体を優先度順に取り出す。
+# 同一ホスト制限で今だけ起動できないものが先頭に大量に並んでも、全件を掘り返さないよう、
+# ホストごとの heap と「各ホストの先頭」だけを積んだ上位 heap の 2 段で持つ。
+# 起動可否はホスト単位で決まる（同じホストの target はまとめて可否が同じ）前提。
 class PriorityTargetQueue:
-    # 初期 target 群を優先度付き heap に積む。
-    def __init__(self, targets: list[dict], key_func) -> None:
+    # 初期 target 群をホスト別の優先度付き heap に積む。
+    def __init__(self, targets: list[dict], key_func, host_func=None) -> None:
         self._key_func = key_func
+        self._host_func = host_func or target_host
         self._sequence = 0
-        self._heap: list[tuple[object, int, dict]] = []
+        self._count = 0
+        self._host_heaps: dict[str, list[tuple[object, int, dict]]] = {}
+        # (先頭 target の key, sequence, host)。push で先頭が入れ替わったホストの古い項目は
+        # 取り出し時に捨てる（sequence が一致しないものは古い）。
+        self._heads: list[tuple[object, int, str]] = []
         for target in targets:
             self.push(target)
 
     # キューに未起動 target が残っているかを bool として返す。
     def __bool__(self) -> bool:
-        return bool(self._heap)
+        return self._count > 0
 
     # 未起動 target の件数を返す。
     def __len__(self) -> int:
-        return len(self._heap)
+        return self._count
 
-    # target を優先度順に取り出せるよう heap へ追加する。
+    # target をホスト別 heap へ追加し、ホストの先頭が変わったら上位 heap にも積む。
     def push(self, target: dict) -> None:
-        heapq.heappush(self._heap, (self._key_func(target), self._sequence, target))
+        host = self._host_func(target)
+        entry = (self._key_func(target), self._sequence, target)
         self._sequence += 1
+        host_heap = self._host_heaps.setdefault(host, [])
+        heapq.heappush(host_heap, entry)
+        self._count += 1
+        if host_heap[0] is entry:
+            heapq.heappush(self._heads, (entry[0], entry[1], host))
 
     # 停止時などに未起動 target をすべて捨てる。
     def clear(self) -> None:
-        self._heap.clear()
+        self._host_heaps.clear()
+        self._heads.clear()
+        self._count = 0
 
     # まだ起動していない target を優先度順の一覧として返す。
     def remaining_targets(self) -> list[dict]:
-        return [entry[2] for entry in sorted(self._heap)]
+        entries = [entry for host_heap in self._host_heaps.values() for entry in host_heap]
+        return [entry[2] for entry in sorted(entries, key=lambda entry: (entry[0], entry[1]))]
 
-    # 優先度順に見て、ホスト制限などを満たす最初の target だけを取り出す。
+    # 優先度順にホストの先頭だけを見て、can_launch を満たす最初の target を取り出す。
+    # 詰まっているホストは先頭 1 件を見るだけで飛ばすので、コストはホスト数にしか比例しない。
     def pop_runnable(self, can_launch) -> dict | None:
-        blocked: list[tuple[object, int, dict]] = []
+        blocked: list[tuple[object, int, str]] = []
         try:
-            while self._heap:
-                entry = heapq.heappop(self._heap)
-                target = entry[2]
-                if can_launch(target):
-                    return target
-                blocked.append(entry)
+            while self._heads:
+                head = heapq.heappop(self._heads)
+                host_heap = self._host_heaps.get(head[2])
+                if not host_heap or host_heap[0][1] != head[1]:
+                    continue
+                target = host_heap[0][2]
+                if not can_launch(target):
+                    blocked.append(head)
+                    continue
+                heapq.heappop(host_heap)
+                self._count -= 1
+                if host_heap:
+                    heapq.heappush(self._heads, (host_heap[0][0], host_heap[0][1], head[2]))
+                else:
+                    del self._host_heaps[head[2]]
+                return target
             return None
         finally:
-            for entry in blocked:
-                heapq.heappush(self._heap, entry)
+            for head in blocked:
+                heapq.heappush(self._heads, head)
+
+# inotify(7) の定数。Linux 以外や libc が見つからない環境では使わない。
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# pidfd が使えない環境では、子プロセス終了をこの間隔の poll() で拾う。
+CHILD_POLL_FALLBACK_SECONDS = 1.0
+
+
+def _load_inotify_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+# 子プロセスの終了と scrape_state.json の書き込みを待つための待機口。
+# 終了は os.pidfd_open、state の書き込みは親ディレクトリの inotify で検知し、
+# どちらも無い環境では CHILD_POLL_FALLBACK_SECONDS 間隔の待機に落ちる。
+# scrape_state.json は一時ファイルからの os.replace で書かれるため、ファイル自体ではなく
+# ディレクトリを IN_MOVED_TO / IN_CLOSE_WRITE で見る。
+class ChildEventWaiter:
+    def __init__(self) -> None:
+        self._selector = selectors.DefaultSelector()
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, ("wake", None))
+        self._pidfds: dict[int, int] = {}
+        self._pidfd_supported = hasattr(os, "pidfd_open")
+        # 監視したいディレクトリ -> その中で見るファイル名。ディレクトリがまだ無い間は wd なし。
+        self._watched_names: dict[Path, set[str]] = {}
+        self._watch_descriptors: dict[Path, int] = {}
+        self._watch_dirs_by_wd: dict[int, Path] = {}
+        self._libc = _load_inotify_libc()
+        self._inotify_fd = -1
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._inotify_fd = fd
+                self._selector.register(fd, selectors.EVENT_READ, ("inotify", None))
+
+    # 子プロセス終了を待てるか（False なら呼び出し側は短い間隔で poll() する）。
+    @property
+    def watches_exit(self) -> bool:
+        return self._pidfd_supported
+
+    # 子プロセスの終了を待機対象に加える。
+    def watch_process(self, process: subprocess.Popen) -> None:
+        if not self._pidfd_supported or process.pid in self._pidfds:
+            return
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError:
+            # 既に回収済み・権限なしなどは poll() 側で拾う。
+            return
+        self._pidfds[process.pid] = pidfd
+        self._selector.register(pidfd, selectors.EVENT_READ, ("exit", process.pid))
+
+    # 回収した子プロセスの pidfd を閉じる。
+    def unwatch_process(self, process: subprocess.Popen) -> None:
+        pidfd = self._pidfds.pop(process.pid, None)
+        if pidfd is None:
+            return
+        try:
+            self._selector.unregister(pidfd)
+        except (KeyError, ValueError):
+            pass
+        os.close(pidfd)
+
+    # ファイルへの書き込み完了を待機対象に加える。
+    def watch_file(self, path: Path) -> None:
+        if self._inotify_fd < 0:
+            return
+        path = Path(path)
+        self._watched_names.setdefault(path.parent, set()).add(path.name)
+        self._add_directory_watch(path.parent)
+
+    def unwatch_file(self, path: Path) -> None:
+        path = Path(path)
+        names = self._watched_names.get(path.parent)
+        if names is None:
+            return
+        names.discard(path.name)
+        if names:
+            return
+        del self._watched_names[path.parent]
+        wd = self._watch_descriptors.pop(path.parent, None)
+        if wd is not None:
+            self._watch_dirs_by_wd.pop(wd, None)
+            self._libc.inotify_rm_watch(self._inotify_fd, wd)
+
+    def _add_directory_watch(self, directory: Path) -> None:
+        if directory in self._watch_descriptors:
+            return
+        wd = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            # 子スクレイパが作業ディレクトリを作る前。次の wait で付け直す。
+            return
+        self._watch_descriptors[directory] = wd
+        self._watch_dirs_by_wd[wd] = directory
+
+    # 停止シグナルなどで待機を打ち切る。シグナルハンドラから呼んでよい。
+    def wake(self) -> None:
+        try:
+            os.write(self._wake_write, b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    # timeout 秒（None なら無期限）まで、子プロセス終了・監視ファイル書き込み・wake のいずれかを待つ。
+    # 戻り値は (終了した pid, 書き込まれた監視ファイル)。
+    def wait(self, timeout: float | None) -> tuple[set[int], set[Path]]:
+        for directory in list(self._watched_names):
+            if directory not in self._watch_descriptors:
+                self._add_directory_watch(directory)
+        if not self._pidfd_supported:
+            timeout = CHILD_POLL_FALLBACK_SECONDS if timeout is None else min(timeout, CHILD_POLL_FALLBACK_SECONDS)
+        exited: set[int] = set()
+        changed: set[Path] = set()
+        for key, _mask in self._selector.select(None if timeout is None else max(0.0, timeout)):
+            kind, pid = key.data
+            if kind == "exit":
+                exited.add(int(pid))
+            elif kind == "inotify":
+                changed.update(self._read_inotify_events())
+            else:
+                self._drain_wake_pipe()
+        return exited, changed
+
+    def _drain_wake_pipe(self) -> None:
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _read_inotify_events(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._inotify_fd, 65536)
+            except (BlockingIOError, OSError):
+                return changed
+            if not buffer:
+                return changed
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(buffer):
+                wd, mask, _cookie, name_length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += INOTIFY_EVENT.size
+                name = os.fsdecode(buffer[offset : offset + name_length].rstrip(b"\0"))
+                offset += name_length
+                if mask & IN_IGNORED:
+                    # ディレクトリが消えた。作り直されたら次の wait で付け直す。
+                    directory = self._watch_dirs_by_wd.pop(wd, None)
+                    if directory is not None:
+                        self._watch_descriptors.pop(directory, None)
+                    continue
+                directory = self._watch_dirs_by_wd.get(wd)
+                if directory is not None and name in self._watched_names.get(directory, ()):
+                    changed.add(directory / name)
+
+    def __enter__(self) -> "ChildEventWaiter":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for pidfd in self._pidfds.values():
+            os.close(pidfd)
+        self._pidfds.clear()
+        if self._inotify_fd >= 0:
+            os.close(self._inotify_fd)
+            self._inotify_fd = -1
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
@@ -3,14 +3,34 @@
 data/background_tasks 配下の state ファイルは、batch runner、復旧ツール、
 Web UI の間の運用上の契約になる。このモジュールが JSON の形を管理し、
 利用可能な場合は任意の管理 DB にも同じ更新をミラーする。
+
+長いバッチでは数千自治体分の items を数秒おきに丸ごと書き直すと、それだけで
+書き込み量が支配的になる。そこで state dict ごとに変更された item を覚えておき、
+`<task>.json`（snapshot）の全体書き直しは SNAPSHOT_INTERVAL_SECONDS に 1 回までにする。
+その間の write_state は、変わった item と上位フィールドだけを
+`<task>.journal.ndjson` に 1 行追記する:
+
+    {"journal": "<snapshot の journal_id>", "state": {...}, "items": {"<slug>": {...}}}
+
+読み手は snapshot の journal_id と一致する行だけを順に上書きすれば最新の state になる
+（read_state と PHP の background_task_state_with_journal）。snapshot を書き直すたびに
+journal_id を振り直して journal を消すので、古い snapshot と新しい journal が混ざることはない。
+
+注意:
+- items を呼び出し側で直接書き換えた場合は refresh_counts を呼ぶこと。件数を数え直し、
+  次の write_state で snapshot ごと書き直す。
+- journal を読まない読み手（celery runtime の stale 判定など）から見た snapshot は、
+  実行中は最大 SNAPSHOT_INTERVAL_SECONDS 遅れる。running=False の state は必ず snapshot に書く。
 """
 
 from __future__ import annotations
 
+import copy
 import json
 import os
 import sys
 import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -25,6 +45,10 @@ except Exception:
 _UNSET = object()
 TOKYO = timezone(timedelta(hours=9))
 _STATUS_ROOT_OVERRIDE: Path | None = None
+SNAPSHOT_INTERVAL_SECONDS = max(0.0, float(os.environ.get("MIYABE_STATUS_SNAPSHOT_SECONDS", "30") or 30))
+JOURNAL_MAX_BYTES = 4 * 1024 * 1024
+MAX_TRACKED_STATES = 64
+COMPLETED_STATUSES = frozenset({"done", "ok", "failed", "snapshot"})
 
 
 # プロジェクト直下のパスを返す。相対ログパスや state 保存先の基準に使う。
@@ -39,6 +63,11 @@ def status_root() -> Path:
     return project_root() / "data" / "background_tasks"
 
 
+# snapshot 以降の差分を追記する journal のパスを返す。
+def journal_path(task_name: str) -> Path:
+    return status_root() / f"{task_name}.journal.ndjson"
+
+
 # state 保存先を一時的に差し替える。主にテストや検証スクリプト用。
 def configure_status_root(path: Path | str | None) -> None:
     global _STATUS_ROOT_OVERRIDE
@@ -83,14 +112,116 @@ def rel_path(path: Path) -> str:
         return str(path)
 
 
-# 既存の background_tasks JSON を読み込む。壊れていれば空 state として扱う。
+# 既存の background_tasks JSON を読み込み、journal の差分を重ねる。壊れていれば空 state として扱う。
 def read_state(task_name: str) -> dict[str, Any]:
     path = status_path(task_name)
     try:
         loaded = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
         return {}
-    return loaded if isinstance(loaded, dict) else {}
+    if not isinstance(loaded, dict):
+        return {}
+    return apply_journal(loaded, journal_path(task_name))
+
+
+# snapshot と同じ journal_id の行だけを順に上書きする。途中で切れた末尾行は捨てる。
+def apply_journal(state: dict[str, Any], path: Path) -> dict[str, Any]:
+    journal_id = str(state.pop("journal_id", "") or "")
+    if journal_id == "":
+        return state
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not isinstance(entry, dict) or entry.get("journal") != journal_id:
+                    continue
+                fields = entry.get("state")
+                if isinstance(fields, dict):
+                    state.update((key, value) for key, value in fields.items() if key != "items")
+                changed_items = entry.get("items")
+                if isinstance(changed_items, dict) and changed_items:
+                    items = state.get("items")
+                    if not isinstance(items, dict):
+                        items = state["items"] = {}
+                    items.update(changed_items)
+    except OSError:
+        pass
+    return state
+
+
+class _StateTracker:
+    """state dict 1 つ分の件数集計と、前回書き込み以降の変更の記録。"""
+
+    def __init__(self, state: dict[str, Any]) -> None:
+        self.state = state
+        self.items_ref: Any = None
+        self.categories: dict[str, str] = {}
+        self.counts: dict[str, int] = {}
+        self.dirty_items: set[str] = set()
+        # 次の write_state で snapshot を書き直すか。初回と items の直接書き換え後は必ず書く。
+        self.needs_snapshot = True
+        self.task_name = ""
+        self.journal_id = ""
+        self.written_fields: dict[str, Any] = {}
+        self.snapshot_at = 0.0
+        self.journal_bytes = 0
+
+
+# state dict の id -> tracker。state は呼び出し側が dict のまま持ち回るので、ここで対応付ける。
+_TRACKERS: dict[int, _StateTracker] = {}
+
+
+def _tracker(state: dict[str, Any]) -> _StateTracker:
+    tracker = _TRACKERS.get(id(state))
+    if tracker is None or tracker.state is not state:
+        tracker = _StateTracker(state)
+        _TRACKERS[id(state)] = tracker
+        while len(_TRACKERS) > MAX_TRACKED_STATES:
+            _TRACKERS.pop(next(iter(_TRACKERS)))
+    return tracker
+
+
+def _item_category(item: Any) -> str:
+    if not isinstance(item, dict):
+        return ""
+    status = str(item.get("status", "")).strip()
+    if status in COMPLETED_STATUSES:
+        return "completed"
+    if status == "running":
+        return "active"
+    if status == "pending":
+        return "pending"
+    return ""
+
+
+def _store_counts(state: dict[str, Any], tracker: _StateTracker) -> None:
+    state["total_count"] = len(tracker.categories)
+    state["completed_count"] = tracker.counts.get("completed", 0)
+    state["active_count"] = tracker.counts.get("active", 0)
+    state["pending_count"] = tracker.counts.get("pending", 0)
+
+
+# 1 item の変更を件数へ差分反映し、次の journal に載せる。
+def _track_item(state: dict[str, Any], slug: str) -> None:
+    tracker = _tracker(state)
+    items = state.get("items")
+    if not isinstance(items, dict) or tracker.items_ref is not items or len(items) != len(tracker.categories) + (
+        0 if slug in tracker.categories else 1
+    ):
+        # 集計前の state か、どこかで items が直接増減された。数え直す。
+        refresh_counts(state)
+        return
+    previous = tracker.categories.get(slug)
+    if previous is not None:
+        tracker.counts[previous] = tracker.counts.get(previous, 0) - 1
+    category = _item_category(items.get(slug))
+    tracker.categories[slug] = category
+    tracker.counts[category] = tracker.counts.get(category, 0) + 1
+    tracker.dirty_items.add(slug)
+    _store_counts(state, tracker)
 
 
 # 新しい一括実行の state 初期値を作る。
@@ -221,7 +352,7 @@ def register_target(state: dict[str, Any], target: dict[str, Any], host: str) ->
     }
     # バッチ全体の updated_at は、実際に item 構成が増えたときだけ進める。
     state["updated_at"] = now_text()
-    refresh_counts(state)
+    _track_item(state, slug)
 
 
 # 自治体 1 件の状態・メッセージ・進捗・ログ情報を更新する。
@@ -307,34 +438,25 @@ def update_item(
         item["updated_at"] = now_text()
         # バッチ全体の updated_at も、実データが変わったときだけ進める。
         state["updated_at"] = now_text()
-    refresh_counts(state)
+        _track_item(state, slug)
 
 
 # items の status を集計し直し、バッチ全体の completed/active/pending を保つ。
 # item 一覧から completed / active / pending 件数を再計算する。
+# update_item / register_target は差分で数えるので、items を直接書き換えたときだけ呼べばよい。
 def refresh_counts(state: dict[str, Any]) -> None:
     items = state.get("items", {})
     if not isinstance(items, dict):
         items = {}
-    total_count = len(items)
-    completed_count = 0
-    active_count = 0
-    pending_count = 0
-    for item in items.values():
-        if not isinstance(item, dict):
-            continue
-        status = str(item.get("status", "")).strip()
-        if status in {"done", "ok", "failed", "snapshot"}:
-            completed_count += 1
-        elif status == "running":
-            active_count += 1
-        elif status == "pending":
-            pending_count += 1
-
-    state["total_count"] = total_count
-    state["completed_count"] = completed_count
-    state["active_count"] = active_count
-    state["pending_count"] = pending_count
+    tracker = _tracker(state)
+    tracker.items_ref = state.get("items")
+    tracker.categories = {slug: _item_category(item) for slug, item in items.items()}
+    tracker.counts = {}
+    for category in tracker.categories.values():
+        tracker.counts[category] = tracker.counts.get(category, 0) + 1
+    # どの item が書き換えられたか分からないので、次回は snapshot ごと書く。
+    tracker.needs_snapshot = True
+    _store_counts(state, tracker)
     # 集計値の再計算だけでは updated_at を動かさない。
     # heartbeat のたびに時刻が進むと、件数が増えていないのに「更新」だけ動いて見えてしまう。
 
@@ -360,15 +482,53 @@ def touch_heartbeat(state: dict[str, Any]) -> None:
 
 # state を JSON と PostgreSQL に保存する。失敗しても本体バッチは止めない。
 def write_state(task_name: str, state: dict[str, Any]) -> Path:
-    # ファイルは一旦 tmp に書いてから置換し、読み手が途中の JSON を拾わないようにする。
+    # snapshot は一旦 tmp に書いてから置換し、読み手が途中の JSON を拾わないようにする。
     # PostgreSQL 側にも同じ内容を保存し、UI/API のキャッシュは必要箇所で明示的に消す。
     root = status_root()
     root.mkdir(parents=True, exist_ok=True)
     path = status_path(task_name)
-    temp_path = path.with_suffix(".json.tmp")
     touch_heartbeat(state)
-    # 自治体数ぶんの items を数秒おきに書くため、整形なしの compact JSON にする。
-    payload = json.dumps(state, ensure_ascii=False, separators=(",", ":")) + "\n"
+    tracker = _tracker(state)
+    fields = {key: value for key, value in state.items() if key != "items"}
+    now = time.monotonic()
+    if (
+        tracker.needs_snapshot
+        or tracker.task_name != task_name
+        or not bool(state.get("running", False))
+        or now - tracker.snapshot_at >= SNAPSHOT_INTERVAL_SECONDS
+        or tracker.journal_bytes >= JOURNAL_MAX_BYTES
+        or any(key not in fields for key in tracker.written_fields)
+    ):
+        if _write_snapshot(task_name, path, state, tracker):
+            tracker.needs_snapshot = False
+            tracker.task_name = task_name
+            tracker.snapshot_at = now
+            tracker.dirty_items.clear()
+            tracker.written_fields = copy.deepcopy(fields)
+    else:
+        _append_journal(task_name, state, fields, tracker)
+    if not bool(state.get("running", False)):
+        # 終わった state はもう差分で書かないので、対応付けを外す。
+        _TRACKERS.pop(id(state), None)
+    if management_db is not None:
+        try:
+            management_db.store_task_status(task_name, state, path)
+        except Exception as exc:
+            print(
+                f"[WARN] management DB state write failed task={task_name} "
+                f"[{type(exc).__name__}] {exc}",
+                file=sys.stderr,
+                flush=True,
+            )
+    return path
+
+
+# state 全体を snapshot として書き直し、journal を空にする。
+def _write_snapshot(task_name: str, path: Path, state: dict[str, Any], tracker: _StateTracker) -> bool:
+    temp_path = path.with_suffix(".json.tmp")
+    journal_id = uuid.uuid4().hex[:16]
+    # 自治体数ぶんの items を書くため、整形なしの compact JSON にする。
+    payload = json.dumps({**state, "journal_id": journal_id}, ensure_ascii=False, separators=(",", ":")) + "\n"
     try:
         temp_path.write_text(payload, encoding="utf-8")
         os.replace(temp_path, path)
@@ -384,17 +544,47 @@ def write_state(task_name: str, state: dict[str, Any]) -> Path:
             file=sys.stderr,
             flush=True,
         )
-    if management_db is not None:
-        try:
-            management_db.store_task_status(task_name, state, path)
-        except Exception as exc:
-            print(
-                f"[WARN] management DB state write failed task={task_name} "
-                f"[{type(exc).__name__}] {exc}",
-                file=sys.stderr,
-                flush=True,
-            )
-    return path
+        return False
+    # snapshot を置き換えたあとで消すので、古い journal は新しい journal_id と一致せず読まれない。
+    try:
+        journal_path(task_name).unlink(missing_ok=True)
+    except Exception:
+        pass
+    tracker.journal_id = journal_id
+    tracker.journal_bytes = 0
+    return True
+
+
+# 前回書き込み以降に変わった上位フィールドと item だけを journal に追記する。
+def _append_journal(task_name: str, state: dict[str, Any], fields: dict[str, Any], tracker: _StateTracker) -> None:
+    items = state.get("items")
+    if not isinstance(items, dict):
+        items = {}
+    changed_fields = {
+        key: value for key, value in fields.items() if key not in tracker.written_fields or tracker.written_fields[key] != value
+    }
+    entry = {
+        "journal": tracker.journal_id,
+        "state": changed_fields,
+        "items": {slug: items[slug] for slug in tracker.dirty_items if slug in items},
+    }
+    line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+    try:
+        with journal_path(task_name).open("a", encoding="utf-8") as handle:
+            handle.write(line)
+    except Exception as exc:
+        # 追記に失敗したら次回 snapshot ごと書き直す。
+        tracker.needs_snapshot = True
+        print(
+            f"[WARN] background task journal write failed task={task_name} "
+            f"[{type(exc).__name__}] {exc}",
+            file=sys.stderr,
+            flush=True,
+        )
+        return
+    tracker.journal_bytes += len(line)
+    tracker.dirty_items.clear()
+    tracker.written_fields.update(copy.deepcopy(changed_fields))
 
 
 # state の変更後に古い集計キャッシュを消し、次回 API で再生成させる。
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from tools.tasks.bench_priority_queue import FlatPriorityTargetQueue, synthetic_targets
+from tools.tasks.runner import ChildEventWaiter, PriorityTargetQueue, StopController, target_host
+
+
+def priority_key(target: dict) -> tuple[int, str]:
+    return -int(target["priority_score"]), str(target["slug"])
+
+
+class ChildEventWaiterTest(unittest.TestCase):
+    def test_wakes_on_child_exit(self) -> None:
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+        with ChildEventWaiter() as waiter:
+            waiter.watch_process(process)
+            started = time.monotonic()
+            deadline = started + 10.0
+            while process.poll() is None and time.monotonic() < deadline:
+                waiter.wait(deadline - time.monotonic())
+            waiter.unwatch_process(process)
+        self.assertEqual(process.returncode, 0)
+        self.assertLess(time.monotonic() - started, 5.0)
+
+    def test_reports_replaced_state_file(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir, ChildEventWaiter() as waiter:
+            work_dir = Path(temp_dir) / "work"
+            state_path = work_dir / "scrape_state.json"
+            # 子スクレイパが作業ディレクトリを作る前から監視しておける。
+            waiter.watch_file(state_path)
+            work_dir.mkdir()
+            waiter.wait(0.0)
+            (work_dir / "other.json").write_text("{}", encoding="utf-8")
+            temp_path = work_dir / "scrape_state.json.tmp"
+            temp_path.write_text('{"progress_current": 1}', encoding="utf-8")
+            os.replace(temp_path, state_path)
+            changed: set[Path] = set()
+            deadline = time.monotonic() + 5.0
+            while not changed and time.monotonic() < deadline:
+                changed = waiter.wait(deadline - time.monotonic())[1]
+            if sys.platform.startswith("linux"):
+                self.assertEqual(changed, {state_path})
+            waiter.unwatch_file(state_path)
+
+    def test_stop_request_wakes_waiter(self) -> None:
+        controller = StopController()
+        with ChildEventWaiter() as waiter:
+            controller.add_listener(waiter.wake)
+            controller.request(15)
+            started = time.monotonic()
+            waiter.wait(30.0)
+        self.assertLess(time.monotonic() - started, 5.0)
+        self.assertTrue(controller.should_stop())
+
+
+class PriorityTargetQueueTest(unittest.TestCase):
+    def test_launch_order_matches_single_heap(self) -> None:
+        targets = synthetic_targets(300)
+        per_host = PriorityTargetQueue(targets, priority_key)
+        flat = FlatPriorityTargetQueue(targets, priority_key)
+        self.assertEqual(len(per_host), 300)
+        self.assertEqual(per_host.remaining_targets(), sorted(targets, key=priority_key))
+
+        busy_hosts = {"ssp.kaigiroku.net", "www.city.dbsr.jp"}
+
+        def can_launch(target: dict) -> bool:
+            return target_host(target) not in busy_hosts
+
+        launched = []
+        for round_index in range(400):
+            if round_index == 200:
+                busy_hosts.clear()
+            expected = flat.pop_runnable(can_launch)
+            self.assertIs(per_host.pop_runnable(can_launch), expected)
+            if expected is not None:
+                launched.append(expected)
+                if round_index % 7 == 0:
+                    # 起動に失敗した target を戻すケースも同じ順序を保つ。
+                    per_host.push(expected)
+                    flat = FlatPriorityTargetQueue(per_host.remaining_targets(), priority_key)
+        self.assertFalse(per_host)
+        self.assertEqual(len(per_host), 0)
+
+    def test_clear_drops_everything(self) -> None:
+        queue = PriorityTargetQueue(synthetic_targets(20), priority_key)
+        queue.clear()
+        self.assertFalse(queue)
+        self.assertIsNone(queue.pop_runnable(lambda _target: True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.tasks import priority, status
+
+
+def _counts(state: dict) -> tuple[int, int, int, int]:
+    return state["total_count"], state["completed_count"], state["active_count"], state["pending_count"]
+
+
+class StatusJournalTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        status.configure_status_root(self.temp_dir.name)
+        self.addCleanup(status.configure_status_root, None)
+        patcher = mock.patch.object(status, "management_db", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        root = Path(self.temp_dir.name)
+        self.state = status.build_state("demo", "run-1", 0, root / "demo.csv", root / "logs")
+        for index in range(5):
+            status.register_target(self.state, {"slug": f"slug{index}", "code": str(index)}, "example.jp")
+
+    def test_incremental_counts_match_full_recount(self) -> None:
+        status.update_item(self.state, "slug0", status="running")
+        status.update_item(self.state, "slug1", status="done")
+        status.update_item(self.state, "slug0", status="failed")
+        incremental = _counts(self.state)
+        status.refresh_counts(self.state)
+        self.assertEqual(incremental, _counts(self.state))
+        self.assertEqual(incremental, (5, 2, 0, 3))
+
+    def test_deltas_go_to_journal_and_read_state_replays_them(self) -> None:
+        status.write_state("demo", self.state)
+        snapshot = status.status_path("demo").read_text(encoding="utf-8")
+        status.update_item(self.state, "slug2", status="running", progress_current=3, progress_total=10)
+        status.write_state("demo", self.state)
+        status.update_item(self.state, "slug2", progress_current=7)
+        status.write_state("demo", self.state)
+
+        self.assertEqual(status.status_path("demo").read_text(encoding="utf-8"), snapshot)
+        lines = status.journal_path("demo").read_text(encoding="utf-8").splitlines()
+        self.assertEqual([list(json.loads(line)["items"]) for line in lines], [["slug2"], ["slug2"]])
+        self.assertEqual(status.read_state("demo"), self.state)
+
+    def test_finished_state_is_compacted_into_snapshot(self) -> None:
+        status.write_state("demo", self.state)
+        status.update_item(self.state, "slug3", status="done")
+        status.write_state("demo", self.state)
+        status.finish_batch(self.state)
+        status.write_state("demo", self.state)
+
+        self.assertFalse(status.journal_path("demo").exists())
+        loaded = json.loads(status.status_path("demo").read_text(encoding="utf-8"))
+        self.assertEqual(loaded["items"]["slug3"]["status"], "done")
+        self.assertFalse(loaded["running"])
+        self.assertEqual(status.read_state("demo"), self.state)
+
+    def test_journal_from_older_snapshot_is_ignored(self) -> None:
+        status.write_state("demo", self.state)
+        status.update_item(self.state, "slug4", status="running")
+        status.write_state("demo", self.state)
+        stale_journal = status.journal_path("demo").read_text(encoding="utf-8")
+        # items を直接書き換えたら refresh_counts で snapshot ごと書き直す。
+        self.state["items"]["slug4"]["status"] = "failed"
+        status.refresh_counts(self.state)
+        status.write_state("demo", self.state)
+        status.journal_path("demo").write_text(stale_journal, encoding="utf-8")
+        self.assertEqual(status.read_state("demo")["items"]["slug4"]["status"], "failed")
+
+
+    def test_status_readers_see_journaled_items(self) -> None:
+        status.write_state("demo", self.state)
+        status.update_item(
+            self.state, "slug1", status="running", extra_fields={"last_checked_at": "2026-10-01 09:00:00"}
+        )
+        status.write_state("demo", self.state)
+        self.assertTrue(status.journal_path("demo").exists())
+
+        for cache in (priority.freshness_metadata._STATUS_CACHE, priority._TASK_STATUS_CACHE):
+            self.addCleanup(cache.clear)
+            cache.clear()
+        item = priority.freshness_metadata.status_item("demo", "slug1")
+        self.assertEqual(item["last_checked_at"], "2026-10-01 09:00:00")
+        self.assertEqual(priority.task_item("demo", "slug1")["status"], "running")
+
+
+
+class ScrapeStateProgressTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.work_dir = Path(temp_dir.name)
+
+    def write_state(self, payload: object) -> None:
+        (self.work_dir / "scrape_state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    def test_reads_progress_from_scrape_state(self) -> None:
+        target = {"work_dir": str(self.work_dir)}
+        self.assertEqual(priority.scrape_state_progress(target), (0, 0))
+
+        self.write_state({"progress_current": 4, "progress_total": 10})
+        self.assertEqual(priority.scrape_state_progress(target), (4, 10))
+
+        self.write_state(
+            {
+                "progress_current": 4,
+                "progress_total": 10,
+                "validation": {"mode": "classified_scrape_result", "progress_current": 9, "progress_total": 12},
+            }
+        )
+        self.assertEqual(priority.scrape_state_progress(target), (9, 12))
+
+        self.write_state(["not", "a", "state"])
+        self.assertEqual(priority.scrape_state_progress(target), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
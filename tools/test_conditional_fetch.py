@@ -0,0 +1,64 @@
+import unittest
+
+import requests
+
+from tools import conditional_fetch
+
+
+def _response(status_code: int, content: bytes = b"", headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = "https://example.jp/minutes/1.html"
+    return response
+
+
+class _Server:
+    def __init__(self, *responses: requests.Response) -> None:
+        self.responses = list(responses)
+        self.headers: list[dict[str, str]] = []
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.headers.append(dict(kwargs.get("headers") or {}))
+        return self.responses.pop(0)
+
+
+class ConditionalGetTest(unittest.TestCase):
+    def test_first_fetch_records_validators_and_304_keeps_them(self) -> None:
+        server = _Server(
+            _response(200, b"<html>a</html>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+            _response(304),
+        )
+        first = conditional_fetch.conditional_get(server.get, "https://example.jp/a", headers={"Referer": "x"})
+        self.assertEqual(first.status, "fetched")
+        self.assertFalse(first.conditional)
+        self.assertEqual(server.headers[0], {"Referer": "x"})
+        row = {"source_file": "a.html", **first.validators.as_fields()}
+
+        second = conditional_fetch.conditional_get(server.get, "https://example.jp/a", previous=row, timeout=5)
+        self.assertEqual(server.headers[1], {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        self.assertTrue(second.unchanged)
+        self.assertEqual(second.status, "not_modified")
+        self.assertEqual(second.validators, first.validators)
+
+    def test_same_body_without_validators_is_unchanged_by_hash(self) -> None:
+        server = _Server(_response(200, b"%PDF-1.4 same"), _response(200, b"%PDF-1.4 edited"))
+        previous = conditional_fetch.Validators(sha256=conditional_fetch.sha256_bytes(b"%PDF-1.4 same"))
+
+        same = conditional_fetch.conditional_get(server.get, "https://example.jp/a.pdf", previous=previous)
+        self.assertEqual(server.headers[0], {})
+        self.assertEqual(same.status, "unchanged")
+
+        edited = conditional_fetch.conditional_get(server.get, "https://example.jp/a.pdf", previous=previous)
+        self.assertFalse(edited.unchanged)
+        self.assertNotEqual(edited.validators.sha256, previous.sha256)
+
+    def test_http_errors_are_raised(self) -> None:
+        server = _Server(_response(404))
+        with self.assertRaises(requests.HTTPError):
+            conditional_fetch.conditional_get(server.get, "https://example.jp/missing", previous={"source_etag": '"v1"'})
+
+
+if __name__ == "__main__":
+    unittest.main()
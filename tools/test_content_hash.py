@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools import content_hash
+from tools.gijiroku import gijiroku_storage
+from tools.reiki import reiki_io
+
+
+def _xattr_supported(directory: str) -> bool:
+    probe = Path(directory) / "probe"
+    probe.write_bytes(b"")
+    return content_hash.record_sha256(probe, "0")
+
+
+class ContentHashTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        if not _xattr_supported(self.temp_dir.name):
+            self.skipTest("extended attributes are not supported here")
+        self.root = Path(self.temp_dir.name) / "gijiroku" / "demo"
+
+    def _archived(self) -> list[Path]:
+        archive = self.root / gijiroku_storage.ARCHIVE_MARKER
+        return [path for path in archive.rglob("*") if path.is_file()] if archive.exists() else []
+
+    def test_unchanged_write_compares_hashes_without_reading(self) -> None:
+        path = self.root / "minutes.html"
+        written = gijiroku_storage.write_bytes(path, "本文".encode("utf-8"), compress=True)
+        self.assertEqual(content_hash.recorded_sha256(written), content_hash.sha256_bytes("本文".encode("utf-8")))
+
+        with mock.patch.object(content_hash, "read_logical_bytes", side_effect=AssertionError("read")):
+            gijiroku_storage.write_bytes(path, "本文".encode("utf-8"), compress=True)
+        self.assertEqual(self._archived(), [])
+
+        gijiroku_storage.write_bytes(path, "改訂".encode("utf-8"), compress=True)
+        self.assertEqual(len(self._archived()), 1)
+
+    def test_stale_record_falls_back_to_reading(self) -> None:
+        path = reiki_io.write_bytes(self.root / "source.html", b"old")
+        path.write_bytes(b"edited outside write_bytes")
+        self.assertIsNone(content_hash.recorded_sha256(path))
+        self.assertEqual(reiki_io.sha256_path(path), content_hash.sha256_bytes(b"edited outside write_bytes"))
+        self.assertIsNotNone(content_hash.recorded_sha256(path))
+
+    def test_rebuild_and_verify(self) -> None:
+        self.root.mkdir(parents=True)
+        path = self.root / "plain.txt"
+        path.write_bytes(b"text")
+        self.assertEqual(content_hash.rebuild_one(path, False), "rebuilt")
+        self.assertEqual(content_hash.rebuild_one(path, False), "recorded")
+        self.assertEqual(content_hash.rebuild_one(path, True), "verified")
+
+        stat = path.stat()
+        os.setxattr(path, content_hash.XATTR_NAME, f"{'0' * 64}:{stat.st_size}:{stat.st_mtime_ns}".encode("ascii"))
+        self.assertEqual(content_hash.rebuild_one(path, True), "mismatched")
+        self.assertEqual(content_hash.recorded_sha256(path), content_hash.sha256_bytes(b"text"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import gzip
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from urllib3.util.retry import Retry
+
+from tools import http_transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures_left = 0
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/flaky":
+            if type(self).failures_left > 0:
+                type(self).failures_left -= 1
+                self._send(503, b"busy", {"Retry-After": "0"})
+                return
+            self._send(200, b"ok")
+        elif self.path == "/gzip":
+            self._send(200, gzip.compress("会議録".encode("utf-8") * 200), {"Content-Encoding": "gzip"})
+        else:
+            self._send(200, self.headers.get("Accept-Encoding", "").encode("ascii"))
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self._send(503, b"busy")
+
+
+class HttpTransportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        _Handler.failures_left = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.transport = http_transport.HttpTransport(user_agent="test", backoff_seconds=0, backoff_jitter_seconds=0)
+        self.addCleanup(self.transport.close)
+
+    def test_keep_alive_connection_is_reused_and_counted(self) -> None:
+        for _ in range(3):
+            response = self.transport.get(f"{self.base_url}/")
+            self.assertEqual(response.status_code, 200)
+        self.assertIn("gzip", response.text)
+        stats = self.transport.stats.as_dict()
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual((stats["connections_opened"], stats["connections_reused"]), (1, 2))
+
+    def test_gzip_body_is_decoded_and_wire_bytes_are_counted(self) -> None:
+        response = self.transport.get(f"{self.base_url}/gzip")
+        self.assertEqual(response.text, "会議録" * 200)
+        stats = self.transport.stats.as_dict()
+        self.assertEqual(stats["bytes_decoded"], len("会議録".encode("utf-8")) * 200)
+        self.assertLess(stats["bytes_received"], stats["bytes_decoded"])
+        self.assertGreater(stats["bytes_received"], 0)
+
+    def test_retryable_status_is_retried_for_get_only(self) -> None:
+        _Handler.failures_left = 2
+        response = self.transport.get(f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.transport.stats.retries, 2)
+
+        response = self.transport.post(f"{self.base_url}/flaky", data=b"x=1")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.transport.stats.retries, 2)
+
+    def test_retries_are_bounded(self) -> None:
+        _Handler.failures_left = 5
+        response = self.transport.get(f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.transport.stats.retries, http_transport.DEFAULT_RETRIES)
+
+
+class _RetryWithoutJitter(Retry):
+    """urllib3 1.26 の Retry と同じく backoff_jitter を受け付けない。"""
+
+    def __init__(self, **kwargs) -> None:
+        if "backoff_jitter" in kwargs:
+            raise TypeError("__init__() got an unexpected keyword argument 'backoff_jitter'")
+        super().__init__(**kwargs)
+
+
+class RetryCompatibilityTest(unittest.TestCase):
+    def test_transport_builds_when_retry_has_no_backoff_jitter(self) -> None:
+        with mock.patch.object(http_transport, "Retry", _RetryWithoutJitter):
+            self.assertFalse(http_transport.retry_supports_backoff_jitter())
+            transport = http_transport.HttpTransport(user_agent="test", retries=3)
+        self.addCleanup(transport.close)
+        self.assertIsInstance(transport.adapter.max_retries, _RetryWithoutJitter)
+        self.assertEqual(transport.adapter.max_retries.total, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import contextlib
+import json
+import unittest
+from unittest import mock
+
+from tools import management_db
+
+
+class _FakeCopy:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def write_row(self, row: tuple) -> None:
+        self.rows.append(row)
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConnection") -> None:
+        self.conn = conn
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        self.conn.calls.append(("execute", " ".join(sql.split()), params))
+
+    def executemany(self, sql: str, rows: list) -> None:
+        self.conn.calls.append(("executemany", " ".join(sql.split()), list(rows)))
+
+    @contextlib.contextmanager
+    def copy(self, sql: str):
+        rows: list = []
+        yield _FakeCopy(rows)
+        self.conn.calls.append(("copy", sql, rows))
+
+
+class _FakeConnection:
+    closed = False
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        pass
+
+    def transaction(self):
+        return contextlib.nullcontext()
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+    def close(self) -> None:
+        pass
+
+
+def _status(count: int, **overrides: dict) -> dict:
+    items = {f"slug{index:03d}": {"code": str(index), "status": "pending"} for index in range(count)}
+    for slug, item in overrides.items():
+        items[slug] = item
+    return {"running": True, "heartbeat_at": "2026-01-01T00:00:00Z", "items": items}
+
+
+class StoreTaskStatusTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = _FakeConnection()
+        management_db._ITEM_CACHE.clear()
+        patches = [
+            mock.patch.object(management_db, "_get_connection", return_value=self.conn),
+            mock.patch.object(management_db, "_MIGRATED", True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(management_db._ITEM_CACHE.clear)
+
+    def _kinds(self) -> list[str]:
+        return [call[0] for call in self.conn.calls]
+
+    def test_full_sync_copies_rows_and_omits_items_from_task_row(self) -> None:
+        management_db.store_task_status("reiki", _status(management_db.ITEM_COPY_MIN_ROWS))
+        copies = [call for call in self.conn.calls if call[0] == "copy"]
+        self.assertEqual(len(copies), 1)
+        self.assertEqual(len(copies[0][2]), management_db.ITEM_COPY_MIN_ROWS)
+        self.assertEqual([row[-2] for row in copies[0][2]], list(range(management_db.ITEM_COPY_MIN_ROWS)))
+        self.assertNotIn("executemany", self._kinds())
+        task_row = next(call for call in self.conn.calls if "management_task_statuses" in call[1])
+        stored = json.loads(task_row[2][-1])
+        self.assertNotIn("items", stored)
+        self.assertTrue(stored[management_db.ITEMS_TABLE_MARKER])
+
+    def test_heartbeat_writes_only_changed_items_with_executemany(self) -> None:
+        management_db.store_task_status("reiki", _status(3))
+        self.conn.calls.clear()
+        management_db.store_task_status("reiki", _status(3, slug001={"code": "1", "status": "running"}))
+        batches = [call for call in self.conn.calls if call[0] == "executemany"]
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([(row[1], row[7], row[-2]) for row in batches[0][2]], [("slug001", "running", 1)])
+        self.assertNotIn("copy", self._kinds())
+
+        self.conn.calls.clear()
+        management_db.store_task_status("reiki", _status(3, slug001={"code": "1", "status": "running"}))
+        self.assertEqual(self._kinds(), ["execute"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools import target_registry
+
+
+def _aliases(target: dict) -> set[str]:
+    return {target["slug"], target["code"]}
+
+
+class TargetRegistryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "urls.tsv"
+        self.source.write_text("01100\tsapporo\n", encoding="utf-8")
+        self.builds = 0
+        target_registry.clear()
+        self.addCleanup(target_registry.clear)
+
+    def _build(self) -> list[dict]:
+        self.builds += 1
+        rows = [line.split("\t") for line in self.source.read_text(encoding="utf-8").splitlines()]
+        return [{"code": code, "slug": f"{code}-{name}", "data_dir": self.root / name} for code, name in rows]
+
+    def _load(self) -> target_registry.TargetRegistry:
+        return target_registry.load_registry("demo", [self.source], self._build, _aliases)
+
+    def test_rebuilds_only_when_source_changes(self) -> None:
+        registry = self._load()
+        self.assertIs(self._load(), registry)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(registry.lookup("01100")[0]["slug"], "01100-sapporo")
+        self.assertIsNone(registry.get("01100"))
+
+        self.source.write_text("01100\tsapporo\n01202\thakodate\n", encoding="utf-8")
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual([target["code"] for target in self._load().all()], ["01100", "01202"])
+        self.assertEqual(self.builds, 2)
+
+    def test_returned_targets_are_copies(self) -> None:
+        registry = self._load()
+        registry.get("01100-sapporo")["slug"] = "changed"
+        self.assertEqual(registry.all()[0]["slug"], "01100-sapporo")
+
+    def test_persisted_snapshot_is_reused_by_next_process(self) -> None:
+        environ = {"MIYABE_TARGET_REGISTRY_CACHE": "1", "MIYABE_TARGET_REGISTRY_CACHE_ROOT": str(self.root / "cache")}
+        with mock.patch.dict(os.environ, environ):
+            first = self._load().all()
+            target_registry.clear()
+            self.assertEqual(self._load().all(), first)
+        self.assertEqual(self.builds, 1)
+        self.assertTrue((self.root / "cache" / "demo.pickle").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()